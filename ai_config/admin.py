@@ -24,6 +24,7 @@ from core.types.status import EntityStatus
 from .models import ( 
     AIClientGlobalConfiguration, 
     AIClientConfiguration,
+    AIClientTokenConfig,
     AIFilesManager,
     AIModelsManager,
     AITraining,
@@ -142,6 +143,13 @@ class TokenAIConfigurationAdmin(admin.ModelAdmin):
     search_fields = ('token__name', 'token__user__email')
     list_filter = ('token',)
 
+class AIClientTokenConfigAdmin(admin.ModelAdmin):
+    """Administração das IAs habilitadas por token e da cobertura de chamadas lentas."""
+    list_display = ('token', 'ai_config', 'enabled', 'hedge_enabled', 'hedge_fallback')
+    list_filter = ('enabled', 'hedge_enabled')
+    search_fields = ('token__name', 'ai_config__name')
+    fields = ('token', 'ai_config', 'enabled', 'hedge_enabled', 'hedge_fallback')
+
 class AITrainingFileAdmin(admin.ModelAdmin):
     """Administração dos arquivos de treinamento.
 
@@ -809,6 +817,7 @@ class AIFilesAdmin(admin.ModelAdmin):
 admin.site.register(AIClientGlobalConfiguration, AIClientGlobalConfigAdmin)
 admin.site.register(AIClientConfiguration, AIClientConfigurationAdmin)
 admin.site.register(TokenAIConfiguration, TokenAIConfigurationAdmin)
+admin.site.register(AIClientTokenConfig, AIClientTokenConfigAdmin)
 admin.site.register(AITrainingFile, AITrainingFileAdmin)
 admin.site.register(DoclingConfiguration, DoclingConfigurationAdmin)
 admin.site.register(AIFilesManager, AIFilesAdmin)
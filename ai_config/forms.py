@@ -82,7 +82,11 @@ class AIClientGlobalConfigForm(forms.ModelForm):
 
     class Meta:
         model = AIClientGlobalConfiguration
-        fields = ['name', 'api_client_class', 'api_url', 'api_key']
+        fields = [
+            'name', 'api_client_class', 'api_url', 'api_key',
+            'http_pool_size', 'connect_timeout', 'read_timeout', 'http_compression',
+            'requests_per_minute', 'tokens_per_minute'
+        ]
 
     def __init__(self, *args, **kwargs):
         """Inicializa o formulário e aplica mascaramento na API key.
@@ -477,10 +481,16 @@ class TokenAIConfigurationForm(forms.ModelForm):
         required=False,
         help_text='Insira as respostas para todas as comparações.'
     )
+    use_response_cache = forms.BooleanField(
+        label='Reaproveitar respostas em cache',
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+        required=False,
+        help_text='Quando marcado, comparações idênticas já processadas reutilizam a resposta anterior da IA.'
+    )
 
     class Meta:
         model = TokenAIConfiguration
-        fields = ['base_instruction', 'prompt', 'responses']
+        fields = ['base_instruction', 'prompt', 'responses', 'use_response_cache']
 
     def __init__(self, *args, **kwargs):
 <<<<<<< HEAD
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_config', '0025_alter_aitraining_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tokenaiconfiguration',
+            name='use_response_cache',
+            field=models.BooleanField(default=False, help_text='Reaproveita respostas de IA para prompts idênticos já processados.'),
+        ),
+    ]
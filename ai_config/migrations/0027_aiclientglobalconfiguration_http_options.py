@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_config', '0026_tokenaiconfiguration_use_response_cache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aiclientglobalconfiguration',
+            name='http_pool_size',
+            field=models.PositiveIntegerField(default=10, help_text='Número máximo de conexões keep-alive mantidas com a API.', verbose_name='Conexões HTTP'),
+        ),
+        migrations.AddField(
+            model_name='aiclientglobalconfiguration',
+            name='connect_timeout',
+            field=models.FloatField(default=10.0, verbose_name='Timeout de conexão (s)'),
+        ),
+        migrations.AddField(
+            model_name='aiclientglobalconfiguration',
+            name='read_timeout',
+            field=models.FloatField(default=120.0, verbose_name='Timeout de leitura (s)'),
+        ),
+        migrations.AddField(
+            model_name='aiclientglobalconfiguration',
+            name='http_compression',
+            field=models.BooleanField(default=True, help_text='Solicita respostas comprimidas (gzip) à API.', verbose_name='Compressão HTTP'),
+        ),
+    ]
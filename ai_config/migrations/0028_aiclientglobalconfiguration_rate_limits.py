@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_config', '0027_aiclientglobalconfiguration_http_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aiclientglobalconfiguration',
+            name='requests_per_minute',
+            field=models.PositiveIntegerField(default=0, help_text='Limite de requisições por minuto por chave e modelo (0 = sem limite).', verbose_name='Requisições por minuto'),
+        ),
+        migrations.AddField(
+            model_name='aiclientglobalconfiguration',
+            name='tokens_per_minute',
+            field=models.PositiveIntegerField(default=0, help_text='Limite de tokens por minuto por chave e modelo (0 = sem limite).', verbose_name='Tokens por minuto'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_config', '0028_aiclientglobalconfiguration_rate_limits'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aiclienttokenconfig',
+            name='hedge_enabled',
+            field=models.BooleanField(default=False, help_text='Duplica a chamada quando ela excede o p95 de latência do provedor.', verbose_name='Requisições de cobertura'),
+        ),
+        migrations.AddField(
+            model_name='aiclienttokenconfig',
+            name='hedge_fallback',
+            field=models.ForeignKey(blank=True, help_text='Configuração usada na chamada duplicada (vazio = a mesma configuração).', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='hedge_token_configs', to='ai_config.aiclientconfiguration', verbose_name='Configuração de cobertura'),
+        ),
+    ]
@@ -8,7 +8,7 @@ e gerenciamento de modelos treinados.
 import json
 import logging
 import os
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 import uuid
 <<<<<<< HEAD
 =======
@@ -28,10 +28,11 @@ from django.conf import settings
 
 from accounts.models import UserToken
 from api.utils.clientsIA import AI_CLIENT_MAPPING, APIClient
+from api.utils.template_cache import clear_template_cache
 from core.types.ai import AIConfig, AIExample, AIExampleDict, AIPrompt, AIResponseDict
 from core.types.status import EntityStatus
 from core.types.training import TrainingCaptureConfig, TrainingResponse
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save
 from core.types.ai_file import AIFileDict, AIFile
 
 logger = logging.getLogger(__name__)
@@ -68,6 +69,34 @@ class AIClientGlobalConfiguration(models.Model):
     api_client_class = models.CharField(max_length=255)
     api_url = models.URLField(blank=True, null=True)
     api_key = models.CharField(max_length=255)
+    http_pool_size = models.PositiveIntegerField(
+        default=10,
+        verbose_name="Conexões HTTP",
+        help_text="Número máximo de conexões keep-alive mantidas com a API."
+    )
+    connect_timeout = models.FloatField(
+        default=10.0,
+        verbose_name="Timeout de conexão (s)"
+    )
+    read_timeout = models.FloatField(
+        default=120.0,
+        verbose_name="Timeout de leitura (s)"
+    )
+    http_compression = models.BooleanField(
+        default=True,
+        verbose_name="Compressão HTTP",
+        help_text="Solicita respostas comprimidas (gzip) à API."
+    )
+    requests_per_minute = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Requisições por minuto",
+        help_text="Limite de requisições por minuto por chave e modelo (0 = sem limite)."
+    )
+    tokens_per_minute = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Tokens por minuto",
+        help_text="Limite de tokens por minuto por chave e modelo (0 = sem limite)."
+    )
 
     class Meta:
         verbose_name = "Global - Cliente de IA"
@@ -102,6 +131,27 @@ class AIClientGlobalConfiguration(models.Model):
             logger.error(f"Erro ao salvar configuração global de IA: {e}", exc_info=True)
             raise
 
+    def get_http_options(self) -> Dict[str, Any]:
+        """Retorna as opções de transporte HTTP desta configuração.
+
+        Returns:
+            Dict[str, Any]: Tamanho do pool, timeouts e uso de compressão.
+        """
+        return {
+            'pool_size': self.http_pool_size,
+            'connect_timeout': self.connect_timeout,
+            'read_timeout': self.read_timeout,
+            'compression': self.http_compression,
+        }
+
+    def get_rate_limits(self) -> Dict[str, int]:
+        """Retorna os limites de taxa desta configuração.
+
+        Returns:
+            Dict[str, int]: Requisições ('rpm') e tokens ('tpm') por minuto.
+        """
+        return {'rpm': self.requests_per_minute, 'tpm': self.tokens_per_minute}
+
     def create_api_client_instance(self) -> APIClient:
         """Cria uma instância do cliente de API configurado globalmente.
 
@@ -119,7 +169,9 @@ class AIClientGlobalConfiguration(models.Model):
             return client_class(
                 AIConfig(
                     api_key=self.api_key,
-                    api_url=self.api_url
+                    api_url=self.api_url,
+                    http_options=self.get_http_options(),
+                    rate_limits=self.get_rate_limits()
                 )
             )
         except KeyError:
@@ -204,12 +256,14 @@ class AIClientConfiguration(models.Model):
             base_instruction = ''
             prompt = ''
             responses = ''
+            use_response_cache = False
             if token:
                 try:
                     token_config = token.ai_configuration
                     base_instruction = token_config.base_instruction or ''
                     prompt = token_config.prompt or ''
                     responses = token_config.responses or ''
+                    use_response_cache = token_config.use_response_cache
                 except Exception as e:
                     logger.warning(f"Erro ao obter configuração de prompt para token {token.id}: {e}", exc_info=True)
 
@@ -222,7 +276,10 @@ class AIClientConfiguration(models.Model):
                 training_configurations=self.training_configurations,
                 base_instruction=base_instruction,
                 prompt=prompt,
-                responses=responses
+                responses=responses,
+                use_response_cache=use_response_cache,
+                http_options=self.ai_client.get_http_options(),
+                rate_limits=self.ai_client.get_rate_limits()
             ))
         except Exception as e:
             logger.error(f"Erro ao criar instância do cliente de API: {e}", exc_info=True)
@@ -252,11 +309,28 @@ class AIClientTokenConfig(models.Model):
         token (UserToken): Token do usuário.
         ai_config (AIClientConfiguration): Configuração de IA associada.
         enabled (bool): Indica se a configuração está habilitada para o token.
+        hedge_enabled (bool): Indica se chamadas lentas disparam uma requisição duplicada.
+        hedge_fallback (AIClientConfiguration): Configuração usada na requisição duplicada
+            (se vazio, repete a própria configuração).
         created_at (datetime): Data de criação da associação.
     """
     token = models.ForeignKey('accounts.UserToken', on_delete=models.CASCADE)
     ai_config = models.ForeignKey(AIClientConfiguration, on_delete=models.CASCADE)
     enabled = models.BooleanField(default=False)
+    hedge_enabled = models.BooleanField(
+        "Requisições de cobertura",
+        default=False,
+        help_text="Duplica a chamada quando ela excede o p95 de latência do provedor."
+    )
+    hedge_fallback = models.ForeignKey(
+        AIClientConfiguration,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='hedge_token_configs',
+        verbose_name="Configuração de cobertura",
+        help_text="Configuração usada na chamada duplicada (vazio = a mesma configuração)."
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -282,6 +356,8 @@ class AIClientTokenConfig(models.Model):
         super().clean()
         if self.token.user != self.ai_config.user:
             raise ValidationError("O token deve pertencer ao mesmo usuário do AIClientConfiguration.")
+        if self.hedge_fallback and self.hedge_fallback.user != self.ai_config.user:
+            raise ValidationError("A configuração de cobertura deve pertencer ao mesmo usuário.")
 
 
 class AITrainingFile(models.Model):
@@ -477,6 +553,7 @@ class TokenAIConfiguration(models.Model):
         base_instruction (str): Instrução base (opcional).
         prompt (str): Prompt personalizado (obrigatório).
         responses (str): Respostas personalizadas (opcional).
+        use_response_cache (bool): Permite reaproveitar respostas de IA em cache.
     """
     token = models.OneToOneField(UserToken, related_name='ai_configuration', on_delete=models.CASCADE)
     base_instruction = models.TextField(
@@ -494,6 +571,10 @@ class TokenAIConfiguration(models.Model):
         null=True,
         help_text='Respostas personalizadas para este token.'
     )
+    use_response_cache = models.BooleanField(
+        default=False,
+        help_text='Reaproveita respostas de IA para prompts idênticos já processados.'
+    )
 
     class Meta:
         verbose_name = "Token - Configuração de IA"
@@ -540,6 +621,12 @@ class AIClientTraining(models.Model):
         )
 
 
+@receiver(post_save, sender=TokenAIConfiguration)
+def invalidate_prompt_templates_on_save(sender: Any, instance: 'TokenAIConfiguration', **kwargs: Any) -> None:
+    """Descarta os templates de prompt compilados quando a configuração do token é alterada."""
+    clear_template_cache()
+
+
 class TrainingCapture(models.Model):
     """Captura de treinamento contendo informações temporárias.
 
@@ -1,3 +1,5 @@
 # Este arquivo torna o diretório 'exceptions' um pacote Python.
 from .api_exceptions import BaseAPIException, APIClientException, APICommunicationException, MissingAPIKeyException
 from .circuit_breaker_exceptions import CircuitOpenException
+from .rate_limit_exceptions import RateLimitExceededException
+from .prompt_exceptions import PromptTooLargeException
@@ -0,0 +1,20 @@
+from api.exceptions import BaseAPIException
+from rest_framework import status
+
+
+class PromptTooLargeException(BaseAPIException):
+    """Exceção levantada quando o prompt excede a janela de contexto do modelo."""
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_message = "Prompt excede a janela de contexto do modelo."
+
+    def __init__(self, message=None, prompt_tokens=None, limit=None, **kwargs):
+        additional_data = kwargs.pop('additional_data', {})
+        if prompt_tokens:
+            additional_data['prompt_tokens'] = prompt_tokens
+        if limit:
+            additional_data['limit'] = limit
+            
+        super().__init__(message=message or self.default_message, 
+                        status_code=self.status_code,
+                        additional_data=additional_data, 
+                        **kwargs)
@@ -0,0 +1,20 @@
+from api.exceptions import BaseAPIException
+from rest_framework import status
+
+
+class RateLimitExceededException(BaseAPIException):
+    """Exceção levantada quando não há capacidade de taxa dentro do tempo máximo de espera."""
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    default_message = "Limite de taxa do provedor de IA excedido."
+
+    def __init__(self, message=None, service_name=None, retry_after=None, **kwargs):
+        additional_data = kwargs.pop('additional_data', {})
+        if service_name:
+            additional_data['service_name'] = service_name
+        if retry_after:
+            additional_data['retry_after'] = retry_after
+            
+        super().__init__(message=message or self.default_message, 
+                        status_code=self.status_code,
+                        additional_data=additional_data, 
+                        **kwargs)
@@ -0,0 +1,38 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+        ('ai_config', '0026_tokenaiconfiguration_use_response_cache'),
+        ('core', '0003_operation_meta'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComparisonBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.CharField(max_length=255, verbose_name='ID da Tarefa')),
+                ('client_name', models.CharField(max_length=100, verbose_name='Cliente')),
+                ('batch_id', models.CharField(max_length=255, verbose_name='ID do Lote')),
+                ('status', models.CharField(choices=[('in_progress', 'In Progress'), ('completed', 'Completed'), ('failed', 'Failed')], default='in_progress', max_length=20, verbose_name='Status')),
+                ('request_map', models.JSONField(default=dict, verbose_name='Mapa de Requisições')),
+                ('custom_ids', models.JSONField(default=list, verbose_name='Ordem das Requisições')),
+                ('results', models.JSONField(blank=True, null=True, verbose_name='Resultados')),
+                ('error', models.TextField(blank=True, null=True, verbose_name='Erro')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('ai_config', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to='ai_config.aiclientconfiguration', verbose_name='Configuração de IA')),
+                ('operation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comparison_batches', to='core.operation', verbose_name='Operação')),
+            ],
+            options={
+                'verbose_name': 'Lote de Comparação',
+                'verbose_name_plural': 'Lotes de Comparação',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status'], name='api_compari_status_7c1d2e_idx'), models.Index(fields=['task_id'], name='api_compari_task_id_5b8e41_idx')],
+            },
+        ),
+    ]
@@ -1 +1,2 @@
-from .api_log import APILog
\ No newline at end of file
+from .api_log import APILog
+from .comparison_batch import ComparisonBatch
@@ -0,0 +1,103 @@
+"""Modelo de lotes de comparação enviados às Batch APIs dos provedores."""
+
+import logging
+from django.db import models
+
+from core.models.operations import Operation
+from core.types import EntityStatus
+
+logger = logging.getLogger(__name__)
+
+BATCH_STATUS_CHOICES = [
+    (status.value, status.name.replace('_', ' ').title())
+    for status in (EntityStatus.IN_PROGRESS, EntityStatus.COMPLETED, EntityStatus.FAILED)
+]
+
+class ComparisonBatch(models.Model):
+    """Lote de comparações submetido à Batch API de um provedor de IA.
+
+    Cada registro corresponde a uma configuração de IA de uma tarefa de comparação
+    assíncrona. O lote é consultado periodicamente por uma task do Celery beat até
+    ser concluído, quando suas respostas são incorporadas ao resultado da tarefa.
+
+    Attributes:
+        operation: Operação à qual o lote pertence.
+        task_id: ID da AsyncTask de comparação.
+        ai_config: Configuração de IA usada para montar e consultar o lote.
+        client_name: Nome da classe do cliente (chave no ComparisonDict).
+        batch_id: Identificador do lote no provedor.
+        status: Estado do lote (em andamento, concluído ou falho).
+        request_map: custom_id -> IDs dos alunos que compartilham a requisição.
+        custom_ids: IDs das requisições na ordem de envio.
+        results: Respostas serializadas por custom_id, quando concluído.
+        error: Mensagem de erro, se o lote falhou.
+    """
+
+    operation = models.ForeignKey(
+        Operation,
+        on_delete=models.CASCADE,
+        related_name='comparison_batches',
+        verbose_name="Operação"
+    )
+    task_id = models.CharField(
+        max_length=255,
+        verbose_name="ID da Tarefa"
+    )
+    ai_config = models.ForeignKey(
+        'ai_config.AIClientConfiguration',
+        on_delete=models.SET_NULL,
+        null=True,
+        verbose_name="Configuração de IA"
+    )
+    client_name = models.CharField(
+        max_length=100,
+        verbose_name="Cliente"
+    )
+    batch_id = models.CharField(
+        max_length=255,
+        verbose_name="ID do Lote"
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=BATCH_STATUS_CHOICES,
+        default=EntityStatus.IN_PROGRESS.value,
+        verbose_name="Status"
+    )
+    request_map = models.JSONField(
+        default=dict,
+        verbose_name="Mapa de Requisições"
+    )
+    custom_ids = models.JSONField(
+        default=list,
+        verbose_name="Ordem das Requisições"
+    )
+    results = models.JSONField(
+        null=True,
+        blank=True,
+        verbose_name="Resultados"
+    )
+    error = models.TextField(
+        null=True,
+        blank=True,
+        verbose_name="Erro"
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Criado em"
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Atualizado em"
+    )
+
+    class Meta:
+        verbose_name = "Lote de Comparação"
+        verbose_name_plural = "Lotes de Comparação"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status']),
+            models.Index(fields=['task_id']),
+        ]
+
+    def __str__(self) -> str:
+        return f"Lote {self.batch_id} ({self.client_name}, {self.status})"
@@ -1,7 +1,19 @@
+import asyncio
+import contextlib
+import functools
+import hashlib
+import json
 import logging
 import threading
 import time
 import uuid
+from queue import Full, Queue
+from typing import Dict, Iterator, List, Optional
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import connection
 
 from api.exceptions import (
     MissingAPIKeyException, 
@@ -11,10 +23,16 @@ from api.exceptions import (
 from api.tasks.comparison import process_comparison_job
 from core.exceptions import FileProcessingException
 from api.service.training import handle_training_capture
+from api.service.comparison_batch import should_use_batch, submit_comparison_batches
+from api.service.comparison_shard import dispatch_sharded_comparison, should_shard
+from api.utils.adaptive_concurrency import AIMDLimiter, get_concurrency_registry
+from api.utils.hedging import get_hedger, get_hedging_settings
+from api.utils.streaming import StreamCancelled
 
 from core.models.operations import Operation
 from core.types import (
     JSONDict,
+    APPError,
     APPResponse,
     SingleComparisonRequestData
 )
@@ -22,22 +40,74 @@ from core.types import (
 from ai_config.models import AIClientConfiguration, AIClientTokenConfig
 from accounts.models import UserToken
 
-from core.types.ai import AIResponseDict
+from core.types.ai import AIResponse, AIResponseDict
+from core.types.errors import APIError
 from core.types.base import DataModel
-from core.types.comparison import AsyncComparisonTask, ComparisonDict, ComparisonRequestData, ComparisonJob, ComparisonTask
+from core.types.comparison import (
+    LARGE_TASK_STUDENT_COUNT, AsyncComparisonTask, ComparisonDict, ComparisonRequestData, ComparisonJob, ComparisonTask
+)
 from core.types.operation import OperationData
 from core.types.task import AsyncTask, QueueConfig, QueueableTask
 from core.types.status import EntityStatus
+from core.utils.deadline import deadline_from_timeout
 from core.utils.doc_extractor import extract_text
+from core.utils.progress_tracker import ProgressTracker
+from core.utils.progress_writer import ProgressWriter
 from core.utils.queue_manager import TaskManager, TaskQueue
+from core.utils.task_executor import PRIORITY_INTERACTIVE, PRIORITY_LARGE_BATCH, PRIORITY_SMALL_BATCH
 
 logger = logging.getLogger(__name__)
 
+def _compare_with_hedging(
+    client,
+    ai_config: AIClientConfiguration,
+    hedge_config: AIClientConfiguration,
+    student_data: SingleComparisonRequestData,
+    user_token: UserToken
+):
+    """Executa a comparação com cobertura: se ela exceder o p95 do provedor, uma
+    duplicata é enviada a `hedge_config` e vale a primeira resposta válida.
+
+    Args:
+        client: Cliente de IA da configuração principal.
+        ai_config: Configuração principal.
+        hedge_config: Configuração usada na duplicata (pode ser a própria principal).
+        student_data: Dados da comparação individual.
+        user_token: Token do usuário autenticado.
+
+    Returns:
+        Tuple[AIResponse, AIPrompt]: Resposta vencedora e prompts utilizados.
+    """
+    def hedge_factory():
+        hedge_client = client if hedge_config.pk == ai_config.pk else hedge_config.create_api_client_instance(user_token)
+        hedge_data = SingleComparisonRequestData(
+            instructor=student_data.instructor,
+            student_id=student_data.student_id,
+            student=student_data.student
+        )
+        hedge_client.deadline = client.deadline
+        return lambda: hedge_client.compare(hedge_data)
+
+    (comparison_result, message), hedge_info = get_hedger().call(
+        provider=ai_config.ai_client.api_client_class,
+        token_key=user_token.pk,
+        primary=lambda: client.compare(student_data),
+        hedge_factory=hedge_factory,
+        is_success=lambda result: not result[0].error
+    )
+    if hedge_info.get('hedged'):
+        hedge_info['config'] = hedge_config.name if hedge_info['winner'] == 'hedge' else ai_config.name
+        comparison_result.metadata['hedge'] = hedge_info
+    return comparison_result, message
+
 def process_client(
     ai_config: AIClientConfiguration, 
     student_data: SingleComparisonRequestData, 
     student_id: str,
-    user_token: UserToken
+    user_token: UserToken,
+    hedge_config: Optional[AIClientConfiguration] = None,
+    deadline: Optional[float] = None,
+    on_delta=None
 ) -> APPResponse:
     try:
         client_name = ai_config.ai_client.api_client_class
@@ -45,12 +115,18 @@ def process_client(
         
         # Cria instância do cliente de IA
         client = ai_config.create_api_client_instance(user_token)
+        client.deadline = deadline
         client_name = client.__class__.__name__
         logger.debug(f"Cliente {client_name} instanciado com sucesso")
         
         # Processa a comparação
         start_time = time.time()
-        comparison_result, message = client.compare(student_data)
+        if hedge_config is not None:
+            comparison_result, message = _compare_with_hedging(
+                client, ai_config, hedge_config, student_data, user_token
+            )
+        else:
+            comparison_result, message = client.compare(student_data, on_delta=on_delta)
         elapsed_time = time.time() - start_time
         
         logger.info(f"Comparação para {client_name} - Aluno: {student_id} "
@@ -65,6 +141,10 @@ def process_client(
         
         return comparison_result
         
+    except StreamCancelled:
+        logger.info(f"Comparação para {ai_config.ai_client.api_client_class} - Aluno: {student_id} "
+                    f"cancelada durante o streaming")
+        return _cancelled_response(ai_config)
     except MissingAPIKeyException as e:
         logger.error(f"Chave de API ausente para {ai_config.ai_client.api_client_class}: {str(e)}")
         return APPResponse(
@@ -85,6 +165,93 @@ def process_client(
             error=f"Erro interno: {str(e)}"
         )
 
+async def process_client_async(
+    ai_config: AIClientConfiguration,
+    client,
+    student_data: SingleComparisonRequestData,
+    student_id: str,
+    user_token: UserToken
+) -> AIResponse:
+    """Versão assíncrona de process_client, executada dentro do event loop do job.
+
+    Recebe o cliente já instanciado, pois a criação envolve acesso ao banco e
+    deve ocorrer fora do loop.
+
+    Args:
+        ai_config: Configuração de IA utilizada.
+        client: Instância de APIClient criada para a configuração.
+        student_data: Dados da comparação individual.
+        student_id: Identificador do aluno.
+        user_token: Token do usuário autenticado.
+
+    Returns:
+        AIResponse: Resultado da comparação.
+
+    Raises:
+        APICommunicationException: Em falhas de comunicação (passíveis de retentativa).
+    """
+    client_name = client.__class__.__name__
+    logger.info(f"Processando requisição assíncrona para {client_name} - Aluno: {student_id}")
+
+    start_time = time.time()
+    comparison_result, message = await client.compare_async(student_data)
+    elapsed_time = time.time() - start_time
+
+    logger.info(f"Comparação para {client_name} - Aluno: {student_id} "
+                f"concluída em {elapsed_time:.3f}s")
+
+    await sync_to_async(handle_training_capture)(
+        user_token=user_token,
+        ai_config=ai_config,
+        message=message,
+        comparison_result=comparison_result
+    )
+
+    return comparison_result
+
+def _deadline_exceeded_response(ai_config: AIClientConfiguration, message: str, deadline: Optional[float]) -> AIResponse:
+    """Cria o resultado de uma comparação abandonada pela fila por tempo esgotado.
+
+    Args:
+        ai_config: Configuração de IA da tarefa abandonada.
+        message: Motivo informado pela fila.
+        deadline: Prazo da requisição (epoch), se houver.
+
+    Returns:
+        AIResponse: Resposta contendo o erro estruturado de timeout.
+    """
+    return AIResponse(
+        model_name=ai_config.ai_client.api_client_class,
+        configurations={},
+        processing_time=0.0,
+        error=APIError(
+            message=message,
+            code="deadline_exceeded",
+            status_code=504,
+            additional_data={'deadline': deadline}
+        )
+    )
+
+def _cancelled_response(ai_config: AIClientConfiguration) -> AIResponse:
+    """Cria o resultado de uma comparação interrompida por cancelamento da requisição.
+
+    Args:
+        ai_config: Configuração de IA da tarefa cancelada.
+
+    Returns:
+        AIResponse: Resposta contendo o erro estruturado de cancelamento.
+    """
+    return AIResponse(
+        model_name=ai_config.ai_client.api_client_class,
+        configurations={},
+        processing_time=0.0,
+        error=APIError(
+            message="Comparação cancelada: o cliente encerrou a requisição",
+            code="cancelled",
+            status_code=499
+        )
+    )
+
 def process_request_data(data: JSONDict) -> JSONDict:
     logger.debug("Iniciando processamento de dados da requisição")
     
@@ -114,20 +281,141 @@ def process_request_data(data: JSONDict) -> JSONDict:
         logger.error(f"Erro não esperado ao processar dados: {str(e)}", exc_info=True)
         raise APIClientException(f"Erro ao processar dados da requisição: {str(e)}")
     
+def _build_queue_config(global_id, adaptive: bool = False) -> QueueConfig:
+    """Cria a configuração de fila usada para um provedor de IA.
+
+    Args:
+        global_id: ID da configuração global (provedor) de IA.
+        adaptive: Se a concorrência é controlada pelo limite adaptativo do
+            provedor; nesse caso a fila não impõe limites fixos.
+
+    Returns:
+        QueueConfig: Configuração de concorrência e retentativas do provedor.
+    """
+    return QueueConfig(
+        name=f"comp_{global_id}",
+        max_attempts=2,
+        initial_wait=1.0,
+        backoff_factor=2.0,
+        max_parallel_first=0 if adaptive else 3,
+        max_parallel_retry=0 if adaptive else 1
+    )
+
+def _provider_limiter(ai_client) -> Optional[AIMDLimiter]:
+    """Obtém o limite adaptativo de concorrência de um provedor e sua chave.
+
+    Args:
+        ai_client: Configuração global (AIClientGlobalConfiguration) do provedor.
+
+    Returns:
+        Optional[AIMDLimiter]: Limitador compartilhado, ou None se a concorrência
+        adaptativa estiver desabilitada.
+    """
+    registry = get_concurrency_registry()
+    if registry is None:
+        return None
+    client_class = ai_client.get_client_class()
+    provider = client_class.name if client_class else ai_client.api_client_class
+    return registry.limiter_for(provider, ai_client.api_key)
+
+def _student_content_hash(student_data: JSONDict) -> str:
+    """Calcula o hash do conteúdo enviado por um aluno.
+
+    Args:
+        student_data: Dados do aluno já processados por process_request_data.
+
+    Returns:
+        str: Hash SHA-256 da serialização canônica dos dados.
+    """
+    payload = json.dumps(student_data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def _prompt_uses_student_id(user_token: UserToken) -> bool:
+    """Verifica se os templates de prompt do token referenciam o identificador do aluno.
+
+    Nesse caso os prompts de alunos com conteúdo idêntico diferem e não podem
+    compartilhar a mesma resposta.
+    """
+    try:
+        token_config = user_token.ai_configuration
+    except ObjectDoesNotExist:
+        return False
+    templates = (token_config.base_instruction or '', token_config.prompt or '')
+    return any('student_id' in template for template in templates)
+
+def group_duplicate_students(compare_data: ComparisonRequestData, user_token: UserToken) -> Dict[str, List[str]]:
+    """Agrupa os alunos que enviaram conteúdo idêntico.
+
+    Cada grupo é indexado pelo primeiro aluno com aquele conteúdo (representante),
+    que será o único enviado às IAs; a resposta é replicada para os demais.
+
+    Args:
+        compare_data: Dados de comparação validados.
+        user_token: Token do usuário autenticado.
+
+    Returns:
+        Dict[str, List[str]]: Representante -> IDs de todos os alunos do grupo.
+    """
+    if _prompt_uses_student_id(user_token):
+        logger.debug("Prompt referencia student_id, deduplicação de alunos desativada")
+        return {student_id: [student_id] for student_id in compare_data.students.keys()}
+
+    representatives = {}
+    groups = {}
+    for student_id, student_data in compare_data.students.items():
+        content_hash = _student_content_hash(student_data)
+        representative = representatives.setdefault(content_hash, student_id)
+        groups.setdefault(representative, []).append(student_id)
+    return groups
+
+def get_dedup_stats(student_groups: Dict[str, List[str]]) -> JSONDict:
+    """Resume a economia obtida com a deduplicação de alunos.
+
+    Args:
+        student_groups: Grupos retornados por group_duplicate_students.
+
+    Returns:
+        JSONDict: Total de alunos, alunos únicos e fração de chamadas evitadas.
+    """
+    total_students = sum(len(group) for group in student_groups.values())
+    unique_students = len(student_groups)
+    return {
+        "total_students": total_students,
+        "unique_students": unique_students,
+        "dedup_ratio": round(1 - unique_students / total_students, 4) if total_students else 0.0
+    }
+
 def process_comparison(
     user_token,
     compare_data,
     progress_callback=None,
-    callback_on_complete=None
+    callback_on_complete=None,
+    student_groups=None,
+    on_result=None,
+    global_ids=None,
+    on_delta=None,
+    priority=PRIORITY_INTERACTIVE,
+    cancel_event: Optional[threading.Event] = None
 ):
     """
     Processa uma comparação usando múltiplas IAs.
     
+    Alunos com conteúdo idêntico geram uma única chamada por IA, cuja resposta
+    é replicada para todos os alunos do grupo.
+    
     Args:
         user_token: Token do usuário autenticado
         compare_data: Dados de comparação validados (ComparisonRequestData)
         progress_callback: Função opcional para reportar o progresso do processamento
         callback_on_complete: Função opcional chamada após completar o processamento
+        student_groups: Grupos de alunos duplicados (calculados se não informados)
+        on_result: Função opcional chamada com (student_id, ai_name, resultado) a cada resultado
+        global_ids: Restringe o processamento às IAs destes provedores (usado por shards)
+        on_delta: Função opcional chamada com (student_id, ai_name, trecho) a cada trecho
+            gerado em streaming (chamadas com cobertura não emitem trechos)
+        priority: Classe de prioridade das tarefas no executor compartilhado (PRIORITY_*)
+        cancel_event: Evento opcional que, quando sinalizado, faz as tarefas ainda não
+            iniciadas retornarem sem chamar o provedor e interrompe os streamings em curso
         
     Returns:
         ComparisonDict: Resultados das comparações por cada IA para cada aluno
@@ -138,9 +426,12 @@ def process_comparison(
     user_ai_configs = AIClientTokenConfig.objects.filter(
         token=user_token,
         enabled=True
-    ).select_related('ai_config', 'ai_config__ai_client')
+    ).select_related('ai_config', 'ai_config__ai_client', 'hedge_fallback')
+    if global_ids is not None:
+        user_ai_configs = user_ai_configs.filter(ai_config__ai_client__id__in=global_ids)
+    user_ai_configs = list(user_ai_configs)
     
-    if not user_ai_configs.exists():
+    if not user_ai_configs:
         logger.warning(f"Sem configurações de IA ativas para o token: {user_token}")
         raise APIClientException("Sem configurações de IA ativas para este token", status_code=400)
 
@@ -152,18 +443,48 @@ def process_comparison(
         # Inicializa o dicionário de respostas para cada aluno
         response_data.put_item(student_id, AIResponseDict())
           
+    if student_groups is None:
+        student_groups = group_duplicate_students(compare_data, user_token)
+    
+    # Progresso por contadores: cada comparação concluída notifica os assinantes
+    total_configs = len(user_ai_configs)
+    total_tasks = len(student_groups) * total_configs
+    tracker = ProgressTracker(total_tasks)
+    if progress_callback:
+        tracker.subscribe(progress_callback)
+          
     def store_result(config_data, student_id, result):
-        """Armazena o resultado de uma comparação no dicionário de respostas."""
+        """Armazena o resultado de uma comparação para todos os alunos do grupo."""
         with results_lock:
             client_name = config_data.ai_client.api_client_class
-            response_data[student_id].put_item(client_name, result)
-            
-            # Calcula e notifica o progresso quando apropriado
-            if progress_callback:
-                completed_tasks = sum(len(resp) for resp in response_data.values())
-                total_tasks = len(compare_data.students) * user_ai_configs.count()
-                progress_percent = (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0
-                progress_callback(progress_percent)
+            for grouped_id in student_groups[student_id]:
+                response_data[grouped_id].put_item(client_name, result)
+                if on_result:
+                    on_result(grouped_id, client_name, result)
+        tracker.complete()
+
+    def emit_delta(config_data, student_id, delta):
+        """Repassa um trecho gerado em streaming para todos os alunos do grupo."""
+        if cancel_event is not None and cancel_event.is_set():
+            raise StreamCancelled()
+        client_name = config_data.ai_client.api_client_class
+        for grouped_id in student_groups[student_id]:
+            on_delta(grouped_id, client_name, delta)
+
+    def run_client(config_data, *args, **kwargs):
+        """Executa a comparação de um aluno, a menos que a requisição tenha sido cancelada."""
+        if cancel_event is not None and cancel_event.is_set():
+            return _cancelled_response(config_data)
+        return process_client(config_data, *args, **kwargs)
+
+    # Configurações com cobertura habilitada -> configuração usada na duplicata
+    hedge_targets = {}
+    if get_hedging_settings()['ENABLED']:
+        hedge_targets = {
+            config.ai_config.id: config.hedge_fallback or config.ai_config
+            for config in user_ai_configs
+            if config.hedge_enabled
+        }
 
     # Agrupa configurações por Provedor de IA
     configs_by_global = {}
@@ -177,30 +498,28 @@ def process_comparison(
     manager = TaskManager()
     logger.debug("TaskManager inicializado")
     
-    # Calcula totais para monitoramento de progresso
-    total_students = len(compare_data.students)
-    total_configs = user_ai_configs.count() 
-    total_tasks = total_students * total_configs
-    
     # Notifica progresso inicial
     if progress_callback:
         progress_callback(0.0)
     
+    deadline = compare_data.deadline
+
     # Cria filas de processamento
     for global_id, group in configs_by_global.items():
-        queue_config = QueueConfig(
-            name=f"comp_{global_id}",
-            max_attempts=2,
-            initial_wait=1.0,
-            backoff_factor=2.0,
-            max_parallel_first=3,
-            max_parallel_retry=1
-        )
+        limiter = _provider_limiter(group[0].ai_client)
+        queue_config = _build_queue_config(global_id, adaptive=limiter is not None)
         
-        queue = TaskQueue(queue_config)
+        queue = TaskQueue(
+            queue_config,
+            priority=priority,
+            tenant=str(user_token.id),
+            limiter=limiter,
+            provider=group[0].ai_client.api_client_class
+        )
         
-        # Adiciona tarefas para cada combinação de aluno e configuração
-        for student_id, student_data in compare_data.students.items():
+        # Adiciona tarefas para cada combinação de aluno único e configuração
+        for student_id in student_groups.keys():
+            student_data = compare_data.students[student_id]
             for config in group:
                 # Cria dados para a comparação individual
                 single_data = SingleComparisonRequestData(
@@ -211,9 +530,15 @@ def process_comparison(
                 
                 # Cria uma tarefa para esta comparação
                 task = QueueableTask(
-                    func=process_client,
-                    args=(config, single_data, student_id, user_token),
-                    result_callback=lambda tid, res, sid=student_id, cfg=config: store_result(cfg, sid, res)
+                    func=run_client,
+                    args=(config, single_data, student_id, user_token, hedge_targets.get(config.id)),
+                    kwargs={
+                        'deadline': deadline,
+                        'on_delta': functools.partial(emit_delta, config, student_id) if on_delta else None
+                    },
+                    result_callback=lambda tid, res, sid=student_id, cfg=config: store_result(cfg, sid, res),
+                    deadline=deadline,
+                    timeout_result=lambda msg, cfg=config: _deadline_exceeded_response(cfg, msg, deadline)
                 )
                 
                 # Adiciona à fila de processamento
@@ -226,20 +551,6 @@ def process_comparison(
     logger.info("Iniciando processamento paralelo das tarefas")
     start_time = time.time()
     
-    # Monitoramento periódico de progresso durante o processamento
-    if progress_callback:
-        def monitor_progress():
-            # Thread para monitorar o progresso enquanto o processamento ocorre
-            while manager.is_processing():
-                completed = sum(queue.stats.completed_tasks for queue in manager.queues)
-                progress = (completed / total_tasks) * 100 if total_tasks > 0 else 0
-                progress_callback(progress)
-                time.sleep(0.5)  # Atualiza a cada meio segundo
-                
-        progress_thread = threading.Thread(target=monitor_progress)
-        progress_thread.daemon = True
-        progress_thread.start()
-    
     # Executa o processamento
     manager.run()
     elapsed = time.time() - start_time
@@ -250,7 +561,7 @@ def process_comparison(
     
     logger.info(
         f"Processamento paralelo concluído em {elapsed:.2f}s - "
-        f"{len(compare_data.students)} alunos com {user_ai_configs.count()} IAs"
+        f"{len(compare_data.students)} alunos com {total_configs} IAs"
     )
     
     if callback_on_complete:
@@ -258,6 +569,216 @@ def process_comparison(
         
     return response_data
 
+def process_comparison_async(
+    user_token,
+    compare_data,
+    progress_callback=None,
+    callback_on_complete=None,
+    student_groups=None,
+    on_result=None
+):
+    """
+    Processa uma comparação usando múltiplas IAs em um único event loop.
+
+    Alternativa a process_comparison: em vez de uma thread por requisição, todas as
+    chamadas do job compartilham um event loop e a concorrência de cada provedor é
+    limitada, a cada chamada, pelo seu limite adaptativo (ou por um asyncio.Semaphore
+    derivado do QueueConfig, se desabilitado).
+
+    A coroutine é executada via async_to_sync: fora de um event loop, um novo loop é
+    criado; chamada de uma thread síncrona de um servidor ASGI, usa o loop já em
+    execução, em vez de falhar como asyncio.run.
+    
+    Args:
+        user_token: Token do usuário autenticado
+        compare_data: Dados de comparação validados (ComparisonRequestData)
+        progress_callback: Função opcional para reportar o progresso do processamento
+        callback_on_complete: Função opcional chamada após completar o processamento
+        student_groups: Grupos de alunos duplicados (calculados se não informados)
+        on_result: Função opcional chamada com (student_id, ai_name, resultado) a cada resultado
+        
+    Returns:
+        ComparisonDict: Resultados das comparações por cada IA para cada aluno
+    """
+    logger.info(f"Iniciando processamento assíncrono de comparação para {len(compare_data.students)} alunos")
+
+    # Consultas ao banco são feitas antes de entrar no event loop
+    user_ai_configs = list(AIClientTokenConfig.objects.filter(
+        token=user_token,
+        enabled=True
+    ).select_related('ai_config', 'ai_config__ai_client'))
+
+    if not user_ai_configs:
+        logger.warning(f"Sem configurações de IA ativas para o token: {user_token}")
+        raise APIClientException("Sem configurações de IA ativas para este token", status_code=400)
+
+    response_data = ComparisonDict()
+    for student_id in compare_data.students.keys():
+        response_data.put_item(student_id, AIResponseDict())
+
+    if student_groups is None:
+        student_groups = group_duplicate_students(compare_data, user_token)
+
+    total_tasks = len(student_groups) * len(user_ai_configs)
+    tracker = ProgressTracker(total_tasks)
+
+    def store_result(config_data, student_id, result):
+        """Armazena o resultado de uma comparação para todos os alunos do grupo."""
+        client_name = config_data.ai_client.api_client_class
+        for grouped_id in student_groups[student_id]:
+            response_data[grouped_id].put_item(client_name, result)
+            if on_result:
+                on_result(grouped_id, client_name, result)
+        return tracker.complete()
+
+    # Agrupa configurações por Provedor de IA e instancia os clientes
+    configs_by_global = {}
+    for config in user_ai_configs:
+        ai_config = config.ai_config
+        try:
+            client = ai_config.create_api_client_instance(user_token)
+            client.deadline = compare_data.deadline
+        except MissingAPIKeyException as e:
+            logger.error(f"Chave de API ausente para {ai_config.ai_client.api_client_class}: {str(e)}")
+            for student_id in student_groups.keys():
+                store_result(ai_config, student_id, AIResponse(
+                    model_name=ai_config.ai_client.api_client_class,
+                    configurations={},
+                    processing_time=0.0,
+                    error=APIError(message=str(e))
+                ))
+            continue
+        configs_by_global.setdefault(ai_config.ai_client.id, []).append((ai_config, client))
+
+    if progress_callback:
+        progress_callback(0.0)
+
+    start_time = time.time()
+    async_to_sync(_run_comparison_async)(
+        user_token,
+        compare_data,
+        student_groups,
+        configs_by_global,
+        store_result,
+        total_tasks,
+        progress_callback
+    )
+    elapsed = time.time() - start_time
+
+    if progress_callback:
+        progress_callback(100.0)
+
+    logger.info(
+        f"Processamento assíncrono concluído em {elapsed:.2f}s - "
+        f"{len(compare_data.students)} alunos com {len(user_ai_configs)} IAs"
+    )
+
+    if callback_on_complete:
+        callback_on_complete(response_data)
+
+    return response_data
+
+@contextlib.asynccontextmanager
+async def _limiter_slot(limiter: AIMDLimiter):
+    """Ocupa uma vaga do limite adaptativo do provedor durante uma chamada assíncrona."""
+    await limiter.acquire_async()
+    try:
+        yield
+    finally:
+        limiter.release()
+
+async def _run_comparison_async(
+    user_token,
+    compare_data,
+    student_groups,
+    configs_by_global,
+    store_result,
+    total_tasks,
+    progress_callback=None
+):
+    """Executa todas as comparações do job dentro do event loop corrente.
+
+    Args:
+        user_token: Token do usuário autenticado.
+        compare_data: Dados de comparação validados.
+        student_groups: Grupos de alunos com conteúdo idêntico.
+        configs_by_global: Pares (configuração, cliente) agrupados por provedor.
+        store_result: Função que registra o resultado de uma comparação e retorna o progresso.
+        total_tasks: Número total de comparações do job.
+        progress_callback: Função opcional para reportar o progresso.
+    """
+    notify_progress = sync_to_async(progress_callback) if progress_callback else None
+
+    async def run_one(queue_config, gate, ai_config, client, student_id, single_data):
+        result = None
+        for attempt in range(1, queue_config.max_attempts + 1):
+            wait_time = queue_config.calculate_wait_time(attempt)
+            if wait_time > 0:
+                await asyncio.sleep(wait_time)
+            async with gate():
+                try:
+                    result = await process_client_async(
+                        ai_config, client, single_data, student_id, user_token
+                    )
+                    break
+                except APICommunicationException as e:
+                    logger.warning(f"Tentativa #{attempt} falhou para {ai_config.ai_client.api_client_class} "
+                                   f"- Aluno: {student_id}: {str(e)}")
+                    result = AIResponse(
+                        model_name=ai_config.ai_client.api_client_class,
+                        configurations={},
+                        processing_time=0.0,
+                        error=APIError(message=str(e))
+                    )
+                except Exception as e:
+                    logger.exception(f"Erro não esperado ao processar {ai_config.ai_client.api_client_class} "
+                                     f"- Aluno: {student_id}")
+                    result = AIResponse(
+                        model_name=ai_config.ai_client.api_client_class,
+                        configurations={},
+                        processing_time=0.0,
+                        error=APIError(message=f"Erro interno: {str(e)}")
+                    )
+                    break
+
+        progress_percent = store_result(ai_config, student_id, result)
+        if notify_progress:
+            await notify_progress(progress_percent)
+
+    coroutines = []
+    for global_id, group in configs_by_global.items():
+        limiter = _provider_limiter(group[0][0].ai_client)
+        queue_config = _build_queue_config(global_id, adaptive=limiter is not None)
+        if limiter is not None:
+            # Cada chamada ocupa uma vaga do limite atual do provedor
+            gate = functools.partial(_limiter_slot, limiter)
+        else:
+            max_parallel = queue_config.max_parallel_first if queue_config.max_parallel_first > 0 else total_tasks or 1
+            semaphore = asyncio.Semaphore(max_parallel)
+            gate = lambda semaphore=semaphore: semaphore
+
+        for student_id in student_groups.keys():
+            student_data = compare_data.students[student_id]
+            for ai_config, client in group:
+                single_data = SingleComparisonRequestData(
+                    instructor=compare_data.instructor,
+                    student_id=student_id,
+                    student=student_data
+                )
+                coroutines.append(
+                    run_one(queue_config, gate, ai_config, client, student_id, single_data)
+                )
+
+    try:
+        await asyncio.gather(*coroutines)
+    finally:
+        for group in configs_by_global.values():
+            for _, client in group:
+                try:
+                    await client.aclose()
+                except Exception as e:
+                    logger.warning(f"Erro ao fechar cliente {client.__class__.__name__}: {str(e)}")
+
 def create_comparison_job(compare_data: ComparisonRequestData, user_token: UserToken) -> ComparisonJob:
     """
     Cria um job de comparação como uma operação de longa duração.
@@ -316,6 +837,8 @@ def setup_comparison_callbacks(job, task, operation_id):
     Returns:
         tuple: (update_progress_callback, on_complete_callback)
     """
+    progress_writer = ProgressWriter(task.task_id)
+    
     # Função para atualizar o progresso do job
     def update_job_progress(progress: float):
         try:
@@ -323,13 +846,14 @@ def setup_comparison_callbacks(job, task, operation_id):
             # Atualizamos o status apenas se for a primeira atualização
             if task.status != EntityStatus.PROCESSING:
                 job.update_status(EntityStatus.PROCESSING)
-            # Salva o estado atualizado no banco
-            Operation.from_operation_data(job)
+            # Grava apenas progresso/status, de forma coalescida
+            progress_writer.update(progress, task.status)
         except Exception as e:
             logger.error(f"Erro ao atualizar progresso do job {operation_id}: {str(e)}")
     
     # Função para atualizar o resultado final
     def on_complete(response_data):
+        progress_writer.close()
         job.update_status(EntityStatus.COMPLETED)
         task.set_result(response_data)
         # Salva o job completo no banco
@@ -338,7 +862,30 @@ def setup_comparison_callbacks(job, task, operation_id):
         
     return update_job_progress, on_complete
 
-def execute_comparison(job: ComparisonJob) -> ComparisonJob:
+def comparison_priority(compare_data: ComparisonRequestData) -> int:
+    """
+    Define a classe de prioridade de uma comparação assíncrona pelo seu tamanho.
+    
+    Args:
+        compare_data: Dados da comparação
+        
+    Returns:
+        int: PRIORITY_LARGE_BATCH para tarefas grandes (mais de LARGE_TASK_STUDENT_COUNT
+        alunos, como em ComparisonTask.is_large_task), senão PRIORITY_SMALL_BATCH
+    """
+    if len(compare_data.students) > LARGE_TASK_STUDENT_COUNT:
+        return PRIORITY_LARGE_BATCH
+    return PRIORITY_SMALL_BATCH
+
+def execute_comparison(
+    job: ComparisonJob,
+    on_result=None,
+    on_delta=None,
+    allow_batch: bool = False,
+    allow_sharding: bool = False,
+    priority: Optional[int] = None,
+    cancel_event: Optional[threading.Event] = None
+) -> ComparisonJob:
     """
     Executa o processamento de todas as tarefas de comparação em um job.
     
@@ -346,6 +893,17 @@ def execute_comparison(job: ComparisonJob) -> ComparisonJob:
     
     Args:
         job: Job de comparação contendo todas as tarefas a serem processadas
+        on_result: Função opcional chamada com (student_id, ai_name, resultado) a cada resultado
+        on_delta: Função opcional chamada com (student_id, ai_name, trecho) a cada trecho
+            gerado em streaming (apenas no modo de execução por threads)
+        allow_batch: Se True, tarefas elegíveis são enviadas às Batch APIs dos provedores
+            e concluídas posteriormente pela task poll_comparison_batches
+        allow_sharding: Se True, tarefas grandes são distribuídas em shards (chord do Celery)
+            e concluídas pelo callback merge_comparison_shards
+        priority: Classe de prioridade das tarefas; se None, é definida pelo tamanho de
+            cada tarefa (comparison_priority)
+        cancel_event: Evento opcional de cancelamento repassado a process_comparison
+            (apenas no modo de execução por threads)
         
     Returns:
         O job atualizado com os resultados das comparações
@@ -376,6 +934,10 @@ def execute_comparison(job: ComparisonJob) -> ComparisonJob:
         task.update_status(EntityStatus.PROCESSING)
         task.progress = 0
         Operation.from_operation_data(job)
+        
+        # O progresso grava apenas progress/status (UPDATE coalescido); o estado
+        # completo da operação é salvo somente na conclusão.
+        progress_writer = ProgressWriter(task.task_id)
             
         try:
             # Extrair os dados de comparação
@@ -385,36 +947,72 @@ def execute_comparison(job: ComparisonJob) -> ComparisonJob:
             compare_data = task.input_data
             
             # Configurar callbacks para atualizar progresso e resultado
-            def update_task_progress(progress: float, task_ref=task, job_ref=job):
-                try:
-                    task_ref.progress = progress
-                    Operation.from_operation_data(job_ref)
-                except Exception as e:
-                    logger.error(f"Erro ao atualizar progresso da tarefa {task_ref.task_id}: {str(e)}")
+            def update_task_progress(progress: float, task_ref=task, writer=progress_writer):
+                task_ref.progress = progress
+                writer.update(progress, task_ref.status)
             
-            def on_task_complete(response_data, task_ref=task, job_ref=job):
+            def on_task_complete(response_data, task_ref=task, job_ref=job, writer=progress_writer):
+                writer.close()
                 task_ref.set_result(response_data)
                 Operation.from_operation_data(job_ref)
                 logger.info(f"Tarefa {task_ref.task_id} concluída com sucesso")
             
             # Executa o processamento da comparação
             logger.info(f"Processando tarefa {task_id} - Alunos: {len(compare_data.students)}")
-            result = process_comparison(
+            student_groups = group_duplicate_students(compare_data, user_token)
+            dedup_stats = get_dedup_stats(student_groups)
+            job.meta["dedup"] = dedup_stats
+            logger.info(f"Tarefa {task_id}: {dedup_stats['unique_students']} alunos únicos de "
+                        f"{dedup_stats['total_students']} (dedup_ratio={dedup_stats['dedup_ratio']})")
+            
+            if allow_batch and should_use_batch(compare_data):
+                if submit_comparison_batches(job, task, user_token, compare_data, student_groups):
+                    logger.info(f"Tarefa {task_id} enviada em lote; resultado será obtido por consulta periódica")
+                    continue
+            
+            if allow_sharding and should_shard(compare_data):
+                if dispatch_sharded_comparison(job, task, user_token, compare_data, student_groups):
+                    logger.info(f"Tarefa {task_id} distribuída em shards; resultado será consolidado pelo callback")
+                    continue
+            
+            if getattr(settings, 'COMPARISON_EXECUTION_MODE', 'threads') == 'asyncio':
+                run_comparison = process_comparison_async
+                stream_args = {}
+            else:
+                run_comparison = process_comparison
+                stream_args = {
+                    'on_delta': on_delta,
+                    'priority': comparison_priority(compare_data) if priority is None else priority,
+                    'cancel_event': cancel_event
+                }
+            result = run_comparison(
                 user_token, 
                 compare_data,
                 progress_callback=update_task_progress,
-                callback_on_complete=on_task_complete
+                callback_on_complete=on_task_complete,
+                student_groups=student_groups,
+                on_result=on_result,
+                **stream_args
             )
                 
         except Exception as e:
             error_msg = f"Erro ao processar tarefa {task_id}: {str(e)}"
             logger.exception(error_msg)
+            progress_writer.close()
             task.set_failure(error_msg)
             Operation.from_operation_data(job)
     
     return job
 
-def compare_data(data, token_key: str, sync: bool = True) -> OperationData:
+def compare_data(
+    data,
+    token_key: str,
+    sync: bool = True,
+    on_result=None,
+    timeout: Optional[float] = None,
+    on_delta=None,
+    cancel_event: Optional[threading.Event] = None
+) -> OperationData:
     """
     Processa dados de comparação de forma síncrona ou assíncrona.
     
@@ -422,6 +1020,11 @@ def compare_data(data, token_key: str, sync: bool = True) -> OperationData:
         data: Dados da requisição de comparação
         token_key: Token do usuário autenticado
         sync: Se True, executa processamento síncrono; se False, cria job assíncrono
+        on_result: Função opcional chamada a cada resultado (apenas no modo síncrono)
+        timeout: Tempo limite da requisição em segundos; no modo síncrono, o padrão
+            é settings.COMPARISON_REQUEST_TIMEOUT (0 ou None = sem prazo)
+        on_delta: Função opcional chamada a cada trecho gerado em streaming (apenas no modo síncrono)
+        cancel_event: Evento opcional que interrompe o processamento síncrono quando sinalizado
         
     Returns:
         OperationData: Job de comparação (com resultado se síncrono)
@@ -432,9 +1035,12 @@ def compare_data(data, token_key: str, sync: bool = True) -> OperationData:
     
     # Processa os dados da requisição
     processed_data = process_request_data(data)
+    if timeout is None and sync:
+        timeout = getattr(settings, 'COMPARISON_REQUEST_TIMEOUT', None)
     compare_data = ComparisonRequestData(
         instructor=processed_data.get('instructor', {}),
-        students=processed_data.get('students', {})
+        students=processed_data.get('students', {}),
+        deadline=deadline_from_timeout(timeout)
     )
     
     # Criar e registrar um job de comparação 
@@ -449,7 +1055,10 @@ def compare_data(data, token_key: str, sync: bool = True) -> OperationData:
         logger.info(f"Processando job síncrono {job.operation_id} para usuário {user_token.user.username}")
         
         # Executa o processamento 
-        return execute_comparison(job)
+        return execute_comparison(
+            job, on_result=on_result, on_delta=on_delta, priority=PRIORITY_INTERACTIVE,
+            cancel_event=cancel_event
+        )
     else:
         # Para assíncrono, enviamos para o Celery
         process_comparison_job.delay(job.operation_id)
@@ -458,3 +1067,100 @@ def compare_data(data, token_key: str, sync: bool = True) -> OperationData:
         
         return job
 
+def stream_comparison(data, token_key: str, timeout: Optional[float] = None) -> Iterator[JSONDict]:
+    """
+    Executa uma comparação síncrona emitindo cada resultado assim que fica pronto.
+
+    O processamento ocorre em uma thread auxiliar; os resultados são repassados
+    por uma fila limitada (COMPARISON_STREAM_QUEUE_SIZE) e produzidos na ordem de
+    conclusão. Antes de cada resultado, os trechos de texto gerados pelas IAs com
+    suporte a streaming são emitidos como registros "delta". O último registro é
+    o resumo da operação (sem os resultados, já emitidos) ou o erro ocorrido.
+
+    Se o gerador for fechado antes do fim (cliente desconectado), a comparação é
+    cancelada: os streamings em curso são interrompidos e os alunos ainda não
+    processados não chegam a chamar os provedores.
+
+    Args:
+        data: Dados da requisição de comparação
+        token_key: Token do usuário autenticado
+        timeout: Tempo limite da requisição em segundos (opcional)
+
+    Yields:
+        JSONDict: Registros do tipo "delta" e "result", seguidos de um "summary" ou "error".
+    """
+    records = Queue(maxsize=getattr(settings, 'COMPARISON_STREAM_QUEUE_SIZE', 256))
+    cancel = threading.Event()
+    finished = object()
+    outcome = {}
+
+    def publish(record) -> bool:
+        """Enfileira um registro, desistindo se a comparação for cancelada."""
+        while not cancel.is_set():
+            try:
+                records.put(record, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def on_result(student_id, ai_name, result):
+        publish({
+            "type": "result",
+            "student_id": student_id,
+            "ai_name": ai_name,
+            "result": result.to_dict() if hasattr(result, 'to_dict') else result
+        })
+
+    def on_delta(student_id, ai_name, delta):
+        if not publish({
+            "type": "delta",
+            "student_id": student_id,
+            "ai_name": ai_name,
+            "delta": delta
+        }):
+            raise StreamCancelled()
+
+    def run():
+        try:
+            outcome["job"] = compare_data(
+                data=data, token_key=token_key, sync=True, on_result=on_result, timeout=timeout,
+                on_delta=on_delta, cancel_event=cancel
+            )
+        except Exception as e:
+            logger.exception("Erro na comparação em streaming")
+            outcome["error"] = e
+        finally:
+            connection.close()
+            publish(finished)
+
+    worker = threading.Thread(target=run, name="compare-stream", daemon=True)
+    worker.start()
+
+    try:
+        while True:
+            record = records.get()
+            if record is finished:
+                break
+            yield record
+    except GeneratorExit:
+        logger.info("Cliente desconectado; cancelando a comparação em streaming")
+        cancel.set()
+        raise
+
+    if "error" in outcome:
+        yield {"type": "error", **APPResponse.from_exception(outcome["error"]).to_dict()}
+        return
+
+    job = outcome["job"]
+    summary = job.get_summary()
+    summary.pop("results", None)
+    summary["meta"] = job.meta
+    if job.get_status() == EntityStatus.COMPLETED:
+        yield {"type": "summary", **APPResponse.create_success(summary).to_dict()}
+    else:
+        error = job.get_error()
+        error_msg = f"Processamento não completado com sucesso. Status: {job.get_status()}"
+        if error:
+            error_msg += f". Erro: {error}"
+        yield {"type": "error", **APPResponse.create_failure(APPError(message=error_msg)).to_dict()}
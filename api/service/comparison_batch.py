@@ -0,0 +1,241 @@
+"""Modo de comparação em lote via Batch APIs dos provedores de IA.
+
+Para jobs assíncronos grandes, as requisições de cada configuração de IA são
+enviadas de uma só vez à Batch API do provedor (com custo reduzido e sem
+consumir limites de taxa interativos). Uma task periódica do Celery consulta
+os lotes pendentes e, quando todos os lotes de uma tarefa terminam, monta o
+ComparisonDict e conclui a tarefa.
+"""
+
+import logging
+import time
+from typing import Dict, List
+
+from django.conf import settings
+
+from ai_config.models import AIClientTokenConfig
+from accounts.models import UserToken
+from api.models import ComparisonBatch
+from core.models.operations import Operation
+from core.types import JSONDict, SingleComparisonRequestData
+from core.types.ai import AIResponse, AIResponseDict
+from core.types.comparison import ComparisonDict, ComparisonRequestData
+from core.types.errors import APIError
+from core.types.status import EntityStatus
+
+logger = logging.getLogger(__name__)
+
+
+def should_use_batch(compare_data: ComparisonRequestData) -> bool:
+    """Indica se a comparação deve ser enviada em lote.
+
+    O modo em lote é opcional (COMPARISON_BATCH_MODE) e só é usado quando o
+    número de alunos atinge COMPARISON_BATCH_MIN_STUDENTS.
+
+    Args:
+        compare_data: Dados de comparação da tarefa.
+
+    Returns:
+        bool: True se o modo em lote deve ser utilizado.
+    """
+    if not getattr(settings, 'COMPARISON_BATCH_MODE', False):
+        return False
+    min_students = getattr(settings, 'COMPARISON_BATCH_MIN_STUDENTS', 50)
+    return len(compare_data.students) >= min_students
+
+
+def submit_comparison_batches(
+    job,
+    task,
+    user_token: UserToken,
+    compare_data: ComparisonRequestData,
+    student_groups: Dict[str, List[str]]
+) -> bool:
+    """Envia as requisições da tarefa às Batch APIs, um lote por configuração de IA.
+
+    Se alguma configuração ativa não suportar envio em lote, nada é enviado e a
+    tarefa deve seguir pelo processamento interativo.
+
+    Args:
+        job: Job de comparação.
+        task: Tarefa de comparação do job.
+        user_token: Token do usuário autenticado.
+        compare_data: Dados de comparação validados.
+        student_groups: Grupos de alunos com conteúdo idêntico (representante -> IDs).
+
+    Returns:
+        bool: True se os lotes foram enviados; False se o modo em lote não se aplica.
+
+    Raises:
+        APICommunicationException: Se o envio de algum lote falhar.
+    """
+    user_ai_configs = AIClientTokenConfig.objects.filter(
+        token=user_token,
+        enabled=True
+    ).select_related('ai_config', 'ai_config__ai_client')
+
+    clients = []
+    for config in user_ai_configs:
+        client = config.ai_config.create_api_client_instance(user_token)
+        if not client.supports_batch:
+            logger.info(f"Tarefa {task.task_id}: {client.name} não suporta envio em lote, "
+                        f"usando processamento interativo")
+            return False
+        clients.append((config.ai_config, client))
+
+    if not clients:
+        return False
+
+    # Um custom_id por aluno único; a resposta é replicada para todo o grupo
+    request_map = {f"s{index}": group for index, group in enumerate(student_groups.values())}
+    custom_ids = list(request_map.keys())
+    representatives = dict(zip(custom_ids, student_groups.keys()))
+
+    task.update_status(EntityStatus.PROCESSING)
+    job.meta["batch"] = {
+        "batches": len(clients),
+        "requests_per_batch": len(custom_ids),
+        "submitted_at": time.time()
+    }
+    operation = Operation.from_operation_data(job)
+
+    for ai_config, client in clients:
+        client_name = ai_config.ai_client.api_client_class
+        requests = []
+        for custom_id in custom_ids:
+            student_id = representatives[custom_id]
+            single_data = SingleComparisonRequestData(
+                instructor=compare_data.instructor,
+                student_id=student_id,
+                student=compare_data.students[student_id]
+            )
+            requests.append(client.build_batch_request(custom_id, client._prepare_prompts(single_data)))
+
+        batch_id = client.submit_batch(requests)
+        ComparisonBatch.objects.create(
+            operation=operation,
+            task_id=task.task_id,
+            ai_config=ai_config,
+            client_name=client_name,
+            batch_id=batch_id,
+            request_map=request_map,
+            custom_ids=custom_ids
+        )
+        logger.info(f"Tarefa {task.task_id}: lote {batch_id} enviado para {client_name} "
+                    f"({len(requests)} requisições)")
+
+    return True
+
+
+def _missing_result(batch: ComparisonBatch) -> AIResponse:
+    """Cria a resposta de erro para uma requisição sem resultado no lote.
+
+    Args:
+        batch: Lote ao qual a requisição pertence.
+
+    Returns:
+        AIResponse: Resposta contendo o erro.
+    """
+    return AIResponse(
+        model_name=batch.client_name,
+        configurations={},
+        processing_time=0.0,
+        error=APIError(
+            message=batch.error or "Resultado ausente no lote do provedor.",
+            endpoint="batches",
+            resource=f"batch/{batch.batch_id}"
+        )
+    )
+
+
+def _finalize_task(task_id: str) -> bool:
+    """Monta o resultado de uma tarefa cujos lotes terminaram e a conclui.
+
+    Args:
+        task_id: ID da tarefa de comparação.
+
+    Returns:
+        bool: True se a tarefa foi concluída nesta chamada.
+    """
+    batches = list(ComparisonBatch.objects.filter(task_id=task_id).select_related('operation'))
+    if not batches or any(b.status == EntityStatus.IN_PROGRESS.value for b in batches):
+        return False
+
+    job = batches[0].operation.to_operation_data()
+    task = job.tasks._items.get(task_id)
+    if task is None or task.status in [EntityStatus.COMPLETED, EntityStatus.FAILED]:
+        return False
+
+    response_data = ComparisonDict()
+    for batch in batches:
+        results = batch.results or {}
+        for custom_id, student_ids in batch.request_map.items():
+            data = results.get(custom_id)
+            result = AIResponse.from_dict(data) if data else _missing_result(batch)
+            for student_id in student_ids:
+                if student_id not in response_data:
+                    response_data.put_item(student_id, AIResponseDict())
+                response_data[student_id].put_item(batch.client_name, result)
+
+    task.progress = 100.0
+    task.set_result(response_data)
+    Operation.from_operation_data(job)
+    logger.info(f"Tarefa {task_id} concluída a partir de {len(batches)} lote(s)")
+    return True
+
+
+def poll_comparison_batches() -> JSONDict:
+    """Consulta os lotes em andamento e conclui as tarefas cujos lotes terminaram.
+
+    Falhas de comunicação mantêm o lote pendente para a próxima consulta.
+
+    Returns:
+        JSONDict: Contadores de lotes consultados, concluídos, falhos e tarefas finalizadas.
+    """
+    pending = ComparisonBatch.objects.filter(
+        status=EntityStatus.IN_PROGRESS.value
+    ).select_related('ai_config', 'ai_config__ai_client', 'operation__user_token')
+
+    stats = {"polled": 0, "completed": 0, "failed": 0, "tasks_completed": 0}
+    touched_tasks = set()
+
+    for batch in pending:
+        stats["polled"] += 1
+        if batch.ai_config is None:
+            batch.status = EntityStatus.FAILED.value
+            batch.error = "Configuração de IA removida durante o processamento do lote."
+            batch.save(update_fields=['status', 'error', 'updated_at'])
+            stats["failed"] += 1
+            touched_tasks.add(batch.task_id)
+            continue
+
+        try:
+            client = batch.ai_config.create_api_client_instance(batch.operation.user_token)
+            status, results = client.poll_batch(batch.batch_id, batch.custom_ids)
+        except Exception as e:
+            logger.warning(f"Erro ao consultar lote {batch.batch_id} ({batch.client_name}): {str(e)}")
+            continue
+
+        if status == EntityStatus.COMPLETED:
+            batch.status = EntityStatus.COMPLETED.value
+            batch.results = {custom_id: result.to_dict() for custom_id, result in results.items()}
+            stats["completed"] += 1
+        elif status == EntityStatus.FAILED:
+            batch.status = EntityStatus.FAILED.value
+            batch.error = f"Lote {batch.batch_id} encerrado sem conclusão pelo provedor."
+            stats["failed"] += 1
+        else:
+            continue
+
+        batch.save(update_fields=['status', 'results', 'error', 'updated_at'])
+        touched_tasks.add(batch.task_id)
+        logger.info(f"Lote {batch.batch_id} ({batch.client_name}) finalizado: {batch.status}")
+
+    for task_id in touched_tasks:
+        try:
+            if _finalize_task(task_id):
+                stats["tasks_completed"] += 1
+        except Exception as e:
+            logger.exception(f"Erro ao concluir tarefa {task_id} a partir dos lotes: {str(e)}")
+
+    return stats
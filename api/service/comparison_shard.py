@@ -0,0 +1,289 @@
+"""Execução distribuída (sharded) de jobs de comparação no Celery.
+
+Um job grande é dividido em shards de (provedor de IA, bloco de alunos) e
+despachado como um chord do Celery: cada shard roda em qualquer worker
+disponível e um callback final junta os ComparisonDict parciais e conclui a
+operação. Shards de provedores específicos podem ser roteados para filas
+dedicadas.
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from celery import chord
+from django.conf import settings
+
+from ai_config.models import AIClientTokenConfig
+from accounts.models import UserToken
+from core.models.async_task_record import AsyncTaskRecord
+from core.models.operations import Operation
+from core.types import JSONDict
+from core.types.ai import AIResponse, AIResponseDict
+from core.types.comparison import ComparisonDict, ComparisonRequestData
+from core.types.errors import APIError
+from core.types.status import EntityStatus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHARDING_SETTINGS: Dict[str, Any] = {
+    'ENABLED': False,
+    'MIN_STUDENTS': 20,
+    'CHUNK_SIZE': 10,
+    'QUEUE': None,
+    'PROVIDER_QUEUES': {},
+}
+
+
+def _sharding_settings() -> Dict[str, Any]:
+    """Retorna as configurações de sharding mescladas aos valores padrão."""
+    return {**DEFAULT_SHARDING_SETTINGS, **getattr(settings, 'COMPARISON_SHARDING', {})}
+
+
+def should_shard(compare_data: ComparisonRequestData) -> bool:
+    """Indica se a comparação deve ser distribuída em shards.
+
+    Args:
+        compare_data: Dados de comparação da tarefa.
+
+    Returns:
+        bool: True se o modo sharded está ativo e o job é grande o suficiente.
+    """
+    config = _sharding_settings()
+    return bool(config['ENABLED']) and len(compare_data.students) >= config['MIN_STUDENTS']
+
+
+def plan_comparison_shards(
+    student_groups: Dict[str, List[str]],
+    providers: Dict[int, JSONDict],
+    chunk_size: int,
+    default_queue: Optional[str] = None,
+    provider_queues: Optional[Dict[str, str]] = None
+) -> List[JSONDict]:
+    """Divide os alunos únicos em blocos e gera um shard por (provedor, bloco).
+
+    Args:
+        student_groups: Grupos de alunos com conteúdo idêntico (representante -> IDs).
+        providers: ID do provedor -> {'client_class': ..., 'client_names': [...]}.
+        chunk_size: Número máximo de alunos únicos por shard.
+        default_queue: Fila padrão dos shards (None usa a fila padrão do Celery).
+        provider_queues: Classe do cliente -> fila dedicada.
+
+    Returns:
+        List[JSONDict]: Especificações dos shards (global_id, groups, client_names, queue).
+    """
+    provider_queues = provider_queues or {}
+    representatives = list(student_groups.keys())
+    chunk_size = max(1, chunk_size)
+
+    shards = []
+    for global_id, provider in providers.items():
+        queue = provider_queues.get(provider['client_class'], default_queue)
+        for start in range(0, len(representatives), chunk_size):
+            chunk = representatives[start:start + chunk_size]
+            shards.append({
+                'global_id': global_id,
+                'groups': {rep: student_groups[rep] for rep in chunk},
+                'client_names': provider['client_names'],
+                'queue': queue,
+            })
+    return shards
+
+
+def dispatch_sharded_comparison(
+    job,
+    task,
+    user_token: UserToken,
+    compare_data: ComparisonRequestData,
+    student_groups: Dict[str, List[str]]
+) -> bool:
+    """Despacha a tarefa como um chord de shards do Celery.
+
+    Args:
+        job: Job de comparação.
+        task: Tarefa de comparação do job.
+        user_token: Token do usuário autenticado.
+        compare_data: Dados de comparação validados.
+        student_groups: Grupos de alunos com conteúdo idêntico.
+
+    Returns:
+        bool: True se os shards foram despachados; False se não há IAs ativas.
+    """
+    from api.tasks.comparison import merge_comparison_shards, process_comparison_shard
+
+    providers: Dict[int, JSONDict] = {}
+    user_ai_configs = AIClientTokenConfig.objects.filter(
+        token=user_token,
+        enabled=True
+    ).select_related('ai_config', 'ai_config__ai_client')
+    for config in user_ai_configs:
+        ai_client = config.ai_config.ai_client
+        provider = providers.setdefault(ai_client.id, {
+            'client_class': ai_client.api_client_class,
+            'client_names': [],
+        })
+        provider['client_names'].append(ai_client.api_client_class)
+
+    if not providers:
+        return False
+
+    config = _sharding_settings()
+    shards = plan_comparison_shards(
+        student_groups,
+        providers,
+        config['CHUNK_SIZE'],
+        config['QUEUE'],
+        config['PROVIDER_QUEUES']
+    )
+    progress_share = 100.0 / len(shards)
+
+    task.update_status(EntityStatus.PROCESSING)
+    job.meta["sharding"] = {
+        "shards": len(shards),
+        "chunk_size": config['CHUNK_SIZE'],
+        "dispatched_at": time.time()
+    }
+    Operation.from_operation_data(job)
+
+    header = [
+        process_comparison_shard.s(
+            job.operation_id,
+            task.task_id,
+            shard['global_id'],
+            shard['groups'],
+            shard['client_names'],
+            progress_share
+        ).set(queue=shard['queue'])
+        for shard in shards
+    ]
+    callback = merge_comparison_shards.s(job.operation_id, task.task_id).set(queue=config['QUEUE'])
+    chord(header)(callback)
+
+    logger.info(f"Tarefa {task.task_id} distribuída em {len(shards)} shards "
+                f"({len(providers)} provedores, blocos de {config['CHUNK_SIZE']} alunos)")
+    return True
+
+
+def run_comparison_shard(
+    operation_id: str,
+    task_id: str,
+    global_id: int,
+    groups: Dict[str, List[str]],
+    client_names: List[str],
+    progress_share: float = 0.0
+) -> JSONDict:
+    """Processa um shard: um bloco de alunos com as IAs de um provedor.
+
+    Erros não são propagados, para que o callback do chord sempre execute; o
+    shard retorna o erro e o merge gera respostas de erro para seus alunos.
+
+    Args:
+        operation_id: ID da operação.
+        task_id: ID da tarefa de comparação.
+        global_id: ID do provedor de IA deste shard.
+        groups: Representante -> IDs dos alunos do grupo.
+        client_names: Nomes dos clientes do provedor (usados em caso de erro).
+        progress_share: Pontos de progresso somados à tarefa ao concluir o shard.
+
+    Returns:
+        JSONDict: {'results': {aluno: {cliente: AIResponse serializada}}, 'error', ...}.
+    """
+    from api.service.comparator import comparison_priority, process_comparison
+
+    student_ids = [sid for ids in groups.values() for sid in ids]
+    payload = {
+        'results': {},
+        'error': None,
+        'student_ids': student_ids,
+        'client_names': client_names,
+    }
+    try:
+        job = Operation.objects.get(operation_id=operation_id).to_operation_data()
+        task = job.tasks._items[task_id]
+        user_token = UserToken.objects.get(key=job.user_token_id)
+        full_data = task.input_data
+
+        shard_data = ComparisonRequestData(
+            instructor=full_data.instructor,
+            students={sid: full_data.students[sid] for sid in student_ids},
+            deadline=full_data.deadline
+        )
+        result = process_comparison(
+            user_token,
+            shard_data,
+            student_groups=groups,
+            global_ids=[global_id],
+            priority=comparison_priority(full_data)
+        )
+        payload['results'] = {
+            student_id: {name: response.to_dict() for name, response in responses.items()}
+            for student_id, responses in result.items()
+        }
+    except Exception as e:
+        logger.exception(f"[JOB:{operation_id}] Erro no shard do provedor {global_id}: {str(e)}")
+        payload['error'] = str(e)
+
+    if progress_share:
+        AsyncTaskRecord.increment_progress(task_id, progress_share)
+    return payload
+
+
+def merge_shard_payloads(payloads: List[JSONDict]) -> ComparisonDict:
+    """Junta os resultados parciais dos shards em um único ComparisonDict.
+
+    Args:
+        payloads: Retornos de run_comparison_shard.
+
+    Returns:
+        ComparisonDict: Resultados por aluno e por IA.
+    """
+    response_data = ComparisonDict()
+
+    def put(student_id: str, client_name: str, response: AIResponse) -> None:
+        if student_id not in response_data:
+            response_data.put_item(student_id, AIResponseDict())
+        response_data[student_id].put_item(client_name, response)
+
+    for payload in payloads:
+        for student_id, responses in payload['results'].items():
+            for client_name, data in responses.items():
+                put(student_id, client_name, AIResponse.from_dict(data))
+
+        if payload['error']:
+            for student_id in payload['student_ids']:
+                for client_name in payload['client_names']:
+                    put(student_id, client_name, AIResponse(
+                        model_name=client_name,
+                        configurations={},
+                        processing_time=0.0,
+                        error=APIError(message=f"Erro no processamento do shard: {payload['error']}")
+                    ))
+    return response_data
+
+
+def finalize_sharded_comparison(payloads: List[JSONDict], operation_id: str, task_id: str) -> JSONDict:
+    """Conclui a tarefa com o resultado combinado dos shards.
+
+    Args:
+        payloads: Retornos de run_comparison_shard, na ordem do chord.
+        operation_id: ID da operação.
+        task_id: ID da tarefa de comparação.
+
+    Returns:
+        JSONDict: Resumo com o status final e o número de shards com erro.
+    """
+    job = Operation.objects.get(operation_id=operation_id).to_operation_data()
+    task = job.tasks._items[task_id]
+    failed = sum(1 for payload in payloads if payload['error'])
+
+    if payloads and failed == len(payloads):
+        task.set_failure(f"Todos os {failed} shards falharam: {payloads[0]['error']}")
+    else:
+        task.progress = 100.0
+        task.set_result(merge_shard_payloads(payloads))
+    job.meta.setdefault("sharding", {})["failed_shards"] = failed
+    Operation.from_operation_data(job)
+
+    logger.info(f"[JOB:{operation_id}] Tarefa {task_id} consolidada a partir de {len(payloads)} shards "
+                f"({failed} com erro)")
+    return {"status": str(task.status), "shards": len(payloads), "failed_shards": failed}
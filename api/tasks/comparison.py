@@ -52,7 +52,7 @@ def process_comparison_job(self, operation_id: str) -> JSONDict:
             return {"success": False, "error": error_msg}
         
         # Executa a função de processamento
-        updated_job = execute_comparison(job)
+        updated_job = execute_comparison(job, allow_batch=True, allow_sharding=True)
         
         logger.info(f"[JOB:{operation_id}] Job processado com status final: {updated_job.get_status()}")
         return {
@@ -84,4 +84,81 @@ def process_comparison_job(self, operation_id: str) -> JSONDict:
         except Exception as retry_error:
             logger.error(f"[JOB:{operation_id}] Erro ao agendar retry: {str(retry_error)}")
             
-        return {"success": False, "error": str(e)}
\ No newline at end of file
+        return {"success": False, "error": str(e)}
+
+
+@shared_task(name="process_comparison_shard", ignore_result=False)
+def process_comparison_shard(
+    operation_id: str,
+    task_id: str,
+    global_id: int,
+    groups: dict,
+    client_names: list,
+    progress_share: float = 0.0
+) -> JSONDict:
+    """Processa um shard (provedor de IA, bloco de alunos) de um job de comparação.
+
+    É a única task que grava resultado no backend (CELERY_TASK_IGNORE_RESULT é
+    True): o chord precisa dele para entregar os payloads a merge_comparison_shards.
+
+    Args:
+        operation_id: Identificador da operação.
+        task_id: ID da tarefa de comparação.
+        global_id: ID do provedor de IA do shard.
+        groups: Representante -> IDs dos alunos do grupo.
+        client_names: Nomes dos clientes do provedor.
+        progress_share: Pontos de progresso somados à tarefa ao concluir.
+
+    Returns:
+        JSONDict com os resultados parciais serializados.
+    """
+    from api.service.comparison_shard import run_comparison_shard
+
+    logger.info(f"[JOB:{operation_id}] Processando shard do provedor {global_id} com {len(groups)} alunos únicos")
+    return run_comparison_shard(operation_id, task_id, global_id, groups, client_names, progress_share)
+
+
+@shared_task(name="merge_comparison_shards")
+def merge_comparison_shards(payloads: list, operation_id: str, task_id: str) -> JSONDict:
+    """Callback do chord: consolida os shards e conclui a tarefa de comparação.
+
+    Args:
+        payloads: Resultados dos shards, recebidos do chord.
+        operation_id: Identificador da operação.
+        task_id: ID da tarefa de comparação.
+
+    Returns:
+        JSONDict com o resumo da consolidação.
+    """
+    from api.service.comparison_shard import finalize_sharded_comparison
+
+    try:
+        return finalize_sharded_comparison(payloads, operation_id, task_id)
+    except Exception as e:
+        logger.exception(f"[JOB:{operation_id}] Erro ao consolidar shards: {str(e)}")
+        try:
+            operation = Operation.objects.get(operation_id=operation_id)
+            job = operation.to_operation_data()
+            job.update_status(EntityStatus.FAILED, f"Erro ao consolidar shards: {str(e)}")
+            Operation.from_operation_data(job)
+        except Exception:
+            logger.exception(f"[JOB:{operation_id}] Erro ao atualizar status do job após falha")
+        return {"success": False, "error": str(e)}
+
+
+@shared_task(name="poll_comparison_batches")
+def poll_comparison_batches() -> JSONDict:
+    """Consulta os lotes de comparação enviados às Batch APIs dos provedores.
+
+    Executada periodicamente pelo Celery beat. Tarefas cujos lotes terminaram
+    têm seus resultados montados e são marcadas como concluídas.
+
+    Returns:
+        JSONDict contendo os contadores da consulta.
+    """
+    from api.service.comparison_batch import poll_comparison_batches as poll_batches
+
+    stats = poll_batches()
+    if stats["polled"]:
+        logger.info(f"Lotes de comparação consultados: {stats}")
+    return stats
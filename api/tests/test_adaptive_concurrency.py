@@ -0,0 +1,234 @@
+# api/tests/test_adaptive_concurrency.py
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+from django.test import SimpleTestCase, override_settings
+
+from core.types import AIConfig, AIPrompt
+from core.types.ai import AIResponse
+from core.types.errors import APIError
+from core.types.task import QueueConfig, QueueableTask
+from core.utils.queue_manager import TaskManager, TaskQueue
+from core.utils.task_executor import reset_task_executor
+from api.utils.adaptive_concurrency import (
+    DEFAULT_ADAPTIVE_CONCURRENCY_SETTINGS,
+    OUTCOME_ERROR,
+    OUTCOME_SUCCESS,
+    OUTCOME_THROTTLED,
+    OUTCOME_TIMEOUT,
+    AIMDLimiter,
+    classify_response,
+    get_concurrency_registry,
+    reset_concurrency_registry,
+)
+from api.utils.clientsIA import PerplexityClient, SimulatedClient
+
+
+def make_limiter(**overrides):
+    config = {**DEFAULT_ADAPTIVE_CONCURRENCY_SETTINGS, 'DECREASE_COOLDOWN': 0.0, **overrides}
+    return AIMDLimiter("teste", config)
+
+
+def error_response(**error):
+    return AIResponse(model_name="m", configurations={}, processing_time=0.0, error=APIError(message="erro", **error))
+
+
+class AIMDLimiterTests(SimpleTestCase):
+    """Testes do aumento aditivo e da redução multiplicativa do limite."""
+
+    def _saturate(self, limiter):
+        while limiter.try_acquire():
+            pass
+
+    def test_limit_grows_one_step_per_round_of_healthy_calls(self):
+        limiter = make_limiter(INITIAL_LIMIT=2)
+        self._saturate(limiter)
+        limiter.record(1.0, OUTCOME_SUCCESS)
+        limiter.record(1.0, OUTCOME_SUCCESS)
+        self.assertEqual(limiter.slots, 3)
+
+    def test_limit_does_not_grow_while_slots_are_idle(self):
+        limiter = make_limiter(INITIAL_LIMIT=2)
+        for _ in range(10):
+            limiter.record(1.0, OUTCOME_SUCCESS)
+        self.assertEqual(limiter.slots, 2)
+
+    def test_limit_stays_under_ceiling(self):
+        limiter = make_limiter(INITIAL_LIMIT=3, MAX_LIMIT=4)
+        for _ in range(50):
+            self._saturate(limiter)
+            limiter.record(1.0, OUTCOME_SUCCESS)
+        self.assertEqual(limiter.slots, 4)
+
+    def test_throttling_and_timeouts_cut_the_limit_down_to_the_floor(self):
+        limiter = make_limiter(INITIAL_LIMIT=8, MIN_LIMIT=2)
+        limiter.record(1.0, OUTCOME_THROTTLED)
+        self.assertEqual(limiter.slots, 4)
+        limiter.record(1.0, OUTCOME_TIMEOUT)
+        limiter.record(1.0, OUTCOME_THROTTLED)
+        self.assertEqual(limiter.slots, 2)
+
+    def test_cooldown_applies_one_cut_per_burst(self):
+        limiter = make_limiter(INITIAL_LIMIT=8, DECREASE_COOLDOWN=60.0)
+        for _ in range(5):
+            limiter.record(1.0, OUTCOME_THROTTLED)
+        self.assertEqual(limiter.slots, 4)
+        self.assertEqual(limiter.stats()['outcomes']['throttled'], 5)
+
+    def test_latency_spike_cuts_the_limit(self):
+        limiter = make_limiter(INITIAL_LIMIT=8, MIN_SAMPLES=3)
+        for _ in range(3):
+            limiter.record(1.0, OUTCOME_SUCCESS)
+        limiter.record(1.5, OUTCOME_SUCCESS)
+        self.assertEqual(limiter.slots, 8)
+        limiter.record(5.0, OUTCOME_SUCCESS)
+        self.assertEqual(limiter.slots, 4)
+        self.assertEqual(limiter.stats()['outcomes']['latency_spike'], 1)
+
+    def test_other_errors_do_not_change_the_limit(self):
+        limiter = make_limiter(INITIAL_LIMIT=4)
+        limiter.record(1.0, OUTCOME_ERROR)
+        self.assertEqual(limiter.slots, 4)
+
+    def test_async_callers_follow_the_current_limit(self):
+        limiter = make_limiter(INITIAL_LIMIT=4)
+        running = []
+        peaks = []
+
+        async def call(index):
+            await limiter.acquire_async()
+            try:
+                running.append(index)
+                peaks.append(len(running))
+                await asyncio.sleep(0.02)
+                if index == 0:
+                    # 429 no meio do job: as chamadas seguintes usam o limite reduzido
+                    limiter.record(1.0, OUTCOME_THROTTLED)
+            finally:
+                running.remove(index)
+                limiter.release()
+
+        async def run_all():
+            await asyncio.gather(*(call(i) for i in range(4)))
+            await asyncio.gather(*(call(i) for i in range(4, 10)))
+
+        asyncio.run(run_all())
+        self.assertEqual(max(peaks[:4]), 4)
+        self.assertEqual(max(peaks[4:]), 2)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_response_classification(self):
+        ok = AIResponse(model_name="m", configurations={}, processing_time=0.1, response="ok")
+        self.assertEqual(classify_response(ok), OUTCOME_SUCCESS)
+        self.assertEqual(classify_response(error_response(status_code=429)), OUTCOME_THROTTLED)
+        self.assertEqual(classify_response(error_response(code="rate_limit_exceeded")), OUTCOME_THROTTLED)
+        self.assertEqual(classify_response(error_response(code="timeout", status_code=504)), OUTCOME_TIMEOUT)
+        self.assertEqual(classify_response(error_response(status_code=400)), OUTCOME_ERROR)
+
+
+class ProviderThrottlingShapeTests(SimpleTestCase):
+    """Testes da classificação dos 429 no formato de erro de cada provedor."""
+
+    def _config(self):
+        return AIConfig(api_key="chave", api_url=None, model_name="modelo", configurations={})
+
+    def test_perplexity_http_429_is_throttled(self):
+        client = PerplexityClient(self._config())
+        response = client._parse_response(429, None, PerplexityClient.DEFAULT_URL, datetime.now())
+        self.assertEqual(response.error.status_code, 429)
+        self.assertEqual(classify_response(response), OUTCOME_THROTTLED)
+
+    def test_gemini_numeric_code_429_is_throttled(self):
+        class ClientError(Exception):
+            """Formato dos erros do google.genai: código HTTP numérico em `code`, sem status_code."""
+            code = 429
+            status = "RESOURCE_EXHAUSTED"
+
+        client = SimulatedClient(self._config())
+        response = client._error_response(ClientError("Resource exhausted"), datetime.now(), "generate_content")
+        self.assertIsNone(response.error.status_code)
+        self.assertEqual(classify_response(response), OUTCOME_THROTTLED)
+
+    def test_resource_exhausted_code_is_throttled(self):
+        self.assertEqual(classify_response(error_response(code="RESOURCE_EXHAUSTED")), OUTCOME_THROTTLED)
+
+
+class LimitedQueueTests(SimpleTestCase):
+    """Testes das filas compartilhando o limite de um provedor."""
+
+    def setUp(self):
+        reset_task_executor()
+        self.addCleanup(reset_task_executor)
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+
+    def _tracked(self):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(0.03)
+        with self.lock:
+            self.running -= 1
+
+    def test_queues_share_the_provider_limit(self):
+        limiter = make_limiter(INITIAL_LIMIT=2)
+        manager = TaskManager()
+        queues = []
+        for i in range(3):
+            queue = TaskQueue(QueueConfig(name=f"prov-{i}", max_parallel_first=0, max_parallel_retry=0),
+                              limiter=limiter)
+            for _ in range(4):
+                queue.add_task(QueueableTask(func=self._tracked))
+            manager.add_queue(queue)
+            queues.append(queue)
+
+        manager.run()
+
+        self.assertEqual(self.peak, 2)
+        self.assertEqual(sum(queue.stats.completed_tasks for queue in queues), 12)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_raised_limit_admits_waiting_tasks(self):
+        limiter = make_limiter(INITIAL_LIMIT=1)
+        queue = TaskQueue(QueueConfig(name="prov", max_parallel_first=0), limiter=limiter)
+        for _ in range(6):
+            # Cada chamada saudável com a vaga ocupada amplia o limite
+            queue.add_task(QueueableTask(func=lambda: (self._tracked(), limiter.record(0.03, OUTCOME_SUCCESS))))
+
+        queue.process_tasks()
+
+        self.assertGreater(limiter.slots, 1)
+        self.assertGreater(self.peak, 1)
+        self.assertEqual(queue.stats.completed_tasks, 6)
+
+
+@override_settings(COMPARISON_ADAPTIVE_CONCURRENCY={'INITIAL_LIMIT': 8, 'DECREASE_COOLDOWN': 0.0})
+class ClientFeedbackTests(SimpleTestCase):
+    """Testes do desfecho das chamadas informado pelos clientes."""
+
+    def setUp(self):
+        reset_concurrency_registry()
+        self.addCleanup(reset_concurrency_registry)
+
+    def test_rate_limited_calls_cut_the_provider_limit(self):
+        client = SimulatedClient(AIConfig(
+            api_key="chave-simulada",
+            api_url=None,
+            model_name="sim-1",
+            configurations={'latency': 'fixed', 'latency_mean': 0.0, 'rate_limit_rate': 1.0}
+        ))
+        response = client._call_api_limited(AIPrompt(system_message="Compare.", user_message="Resposta"))
+
+        self.assertIsNotNone(response.error)
+        limiter = get_concurrency_registry().limiter_for(SimulatedClient.name, "chave-simulada")
+        self.assertEqual(limiter.slots, 4)
+        self.assertEqual(limiter.stats()['outcomes']['throttled'], 1)
+
+    @override_settings(COMPARISON_ADAPTIVE_CONCURRENCY={'ENABLED': False})
+    def test_registry_is_disabled_by_settings(self):
+        reset_concurrency_registry()
+        self.assertIsNone(get_concurrency_registry())
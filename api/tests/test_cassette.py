@@ -0,0 +1,125 @@
+# api/tests/test_cassette.py
+
+import os
+import tempfile
+import time
+
+from django.test import SimpleTestCase, override_settings
+
+from core.types import AIConfig, AIPrompt, AIResponse
+from api.utils.cassette import Cassette, get_cassette, reset_cassette
+from api.utils.clientsIA import APIClient
+
+
+class CountingClient(APIClient):
+    """Cliente sem chamadas externas que conta as chamadas ao provedor."""
+    name = "CassetteTest"
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.calls = 0
+
+    def _call_api(self, prompts: AIPrompt) -> AIResponse:
+        self.calls += 1
+        time.sleep(0.05)
+        return AIResponse(
+            response=f"Avaliação {self.calls}: {prompts.user_message}",
+            model_name=self.model_name,
+            configurations=self.configurations,
+            processing_time=0.05,
+            metadata={'usage': {'output_tokens': 3}}
+        )
+
+
+def make_client():
+    config = AIConfig(
+        api_key="dummy-key",
+        api_url="http://dummy",
+        model_name="cassette-test",
+        base_instruction="Compare.",
+        prompt="{{ student.answer }}",
+        use_response_cache=False
+    )
+    return CountingClient(config)
+
+
+PROMPT = AIPrompt(system_message="Compare.", user_message="Resposta do aluno")
+OTHER_PROMPT = AIPrompt(system_message="Compare.", user_message="Outra resposta")
+
+
+class CassetteTests(SimpleTestCase):
+    """Testes da gravação e reprodução de chamadas às IAs."""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(fd)
+        reset_cassette()
+        self.addCleanup(reset_cassette)
+        self.addCleanup(os.remove, self.path)
+
+    def cassette_settings(self, mode, **options):
+        return override_settings(AI_CASSETTE={'MODE': mode, 'PATH': self.path, **options})
+
+    def record(self, *prompts):
+        with self.cassette_settings('record'):
+            client = make_client()
+            responses = [client._call_api_limited(prompt) for prompt in prompts]
+        reset_cassette()
+        return responses
+
+    def test_disabled_by_default(self):
+        with override_settings(AI_CASSETTE={'MODE': 'off'}):
+            self.assertIsNone(get_cassette())
+
+    def test_replay_serves_recorded_responses_in_order(self):
+        recorded = self.record(PROMPT, PROMPT)
+
+        with self.cassette_settings('replay'):
+            client = make_client()
+            first = client._call_api_limited(PROMPT)
+            second = client._call_api_limited(PROMPT)
+            third = client._call_api_limited(PROMPT)
+
+        self.assertEqual(client.calls, 0)
+        self.assertEqual(first.response, recorded[0].response)
+        self.assertEqual(second.response, recorded[1].response)
+        self.assertEqual(third.response, recorded[1].response)
+        self.assertEqual(first.metadata['usage'], {'output_tokens': 3})
+        self.assertTrue(first.metadata['cassette']['replayed'])
+
+    def test_replay_preserves_latency_when_configured(self):
+        self.record(PROMPT)
+
+        with self.cassette_settings('replay', PRESERVE_LATENCY=True):
+            start = time.monotonic()
+            make_client()._call_api_limited(PROMPT)
+            self.assertGreaterEqual(time.monotonic() - start, 0.04)
+
+    def test_recorded_errors_are_replayed(self):
+        cassette = Cassette(self.path, 'record')
+        error_response = make_client()._deadline_response()
+        cassette.record('chave', 'CountingClient', PROMPT, error_response, 0.1)
+
+        response, latency = Cassette(self.path, 'replay').replay('chave')
+        self.assertEqual(response.error.code, error_response.error.code)
+        self.assertEqual(latency, 0.1)
+
+    def test_miss_returns_error_by_default(self):
+        self.record(PROMPT)
+
+        with self.cassette_settings('replay'):
+            client = make_client()
+            response = client._call_api_limited(OTHER_PROMPT)
+
+        self.assertEqual(response.error.code, "cassette_miss")
+        self.assertEqual(client.calls, 0)
+
+    def test_miss_can_fall_back_to_live_call(self):
+        self.record(PROMPT)
+
+        with self.cassette_settings('replay', ON_MISS='live'):
+            client = make_client()
+            response = client._call_api_limited(OTHER_PROMPT)
+
+        self.assertIsNone(response.error)
+        self.assertEqual(client.calls, 1)
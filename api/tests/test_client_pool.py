@@ -0,0 +1,145 @@
+# api/tests/test_client_pool.py
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import SimpleTestCase, override_settings
+
+from core.types import AIConfig, AIPrompt
+from api.utils.client_pool import ClientPool, build_pool_key, reset_client_pool
+from api.utils.clientsIA import OpenAiClient
+
+logger = logging.getLogger(__name__)
+
+
+class ClientPoolTests(SimpleTestCase):
+    """Testes do pool de SDK clients."""
+
+    def test_same_key_reuses_client(self):
+        pool = ClientPool(idle_timeout=60, max_size=10)
+        key = build_pool_key("OpenAi", "sync", "sk-1", None)
+        first = pool.acquire(key, object)
+        second = pool.acquire(key, object)
+        self.assertIs(first, second)
+        self.assertEqual(pool.get_stats()['hits'], 1)
+
+    def test_api_key_is_hashed_and_distinguishes_clients(self):
+        pool = ClientPool(idle_timeout=60, max_size=10)
+        key_a = build_pool_key("OpenAi", "sync", "sk-a", None)
+        key_b = build_pool_key("OpenAi", "sync", "sk-b", None)
+        self.assertNotIn("sk-a", key_a)
+        self.assertIsNot(pool.acquire(key_a, object), pool.acquire(key_b, object))
+
+    def test_idle_entries_are_evicted(self):
+        pool = ClientPool(idle_timeout=0.05, max_size=10)
+        key = build_pool_key("Anthropic", "sync", "sk-1", None)
+        first = pool.acquire(key, object)
+        time.sleep(0.1)
+        pool.evict_idle()
+        self.assertEqual(pool.get_stats()['size'], 0)
+        self.assertIsNot(pool.acquire(key, object), first)
+
+    def test_max_size_evicts_least_recently_used(self):
+        pool = ClientPool(idle_timeout=60, max_size=2)
+        keys = [build_pool_key("Gemini", "sync", f"sk-{i}", None) for i in range(3)]
+        for key in keys:
+            pool.acquire(key, object)
+        stats = pool.get_stats()
+        self.assertEqual(stats['size'], 2)
+        self.assertEqual(stats['evictions'], 1)
+
+
+class AsyncClientLifecycleTests(SimpleTestCase):
+    """Testes da criação tardia do cliente assíncrono."""
+
+    def test_async_client_is_created_only_on_async_use(self):
+        client = OpenAiClient(AIConfig(api_key="dummy-key", api_url="http://127.0.0.1:9/v1", model_name="stub"))
+        self.assertIsNone(client._async_client)
+        # Fechar sem uso assíncrono não cria o cliente
+        asyncio.run(client.aclose())
+        self.assertIsNone(client._async_client)
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """Servidor local que responde como /chat/completions e conta conexões."""
+
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with KeepAliveHandler.lock:
+            KeepAliveHandler.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        body = json.dumps({
+            "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "stub",
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": "ok"}}],
+        }).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class ClientPoolBenchmarkTests(SimpleTestCase):
+    """Benchmark do reuso de conexões keep-alive contra um servidor local."""
+
+    calls = 20
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        reset_client_pool()
+        super().tearDownClass()
+
+    def _run(self):
+        """Cria um APIClient por chamada, como process_client, e mede a latência média."""
+        KeepAliveHandler.connections = 0
+        reset_client_pool()
+        config = AIConfig(
+            api_key="dummy-key",
+            api_url=f"http://127.0.0.1:{self.server.server_address[1]}/v1",
+            model_name="stub",
+            use_response_cache=False
+        )
+        prompt = AIPrompt(user_message="olá", system_message="")
+        start = time.perf_counter()
+        for _ in range(self.calls):
+            response = OpenAiClient(config)._call_api(prompt)
+            self.assertEqual(response.response, "ok")
+        return (time.perf_counter() - start) / self.calls, KeepAliveHandler.connections
+
+    def test_pooled_clients_reuse_connections(self):
+        with override_settings(AI_CLIENT_POOL={'ENABLED': False}):
+            fresh_latency, fresh_connections = self._run()
+        with override_settings(AI_CLIENT_POOL={'ENABLED': True}):
+            pooled_latency, pooled_connections = self._run()
+
+        logger.info(
+            f"[benchmark] {self.calls} chamadas: sem pool {fresh_latency * 1000:.2f} ms/chamada "
+            f"({fresh_connections} conexões), com pool {pooled_latency * 1000:.2f} ms/chamada "
+            f"({pooled_connections} conexões), economia "
+            f"{(fresh_latency - pooled_latency) * 1000:.2f} ms/chamada"
+        )
+        self.assertEqual(fresh_connections, self.calls)
+        self.assertEqual(pooled_connections, 1)
@@ -0,0 +1,60 @@
+# api/tests/test_comparator_async.py
+
+import asyncio
+import time
+
+from django.test import SimpleTestCase
+
+from core.types import AIConfig, AIPrompt, AIResponse
+from api.utils.clientsIA import APIClient
+
+
+class SlowDummyClient(APIClient):
+    """Cliente síncrono que simula latência de rede."""
+    name = "SlowDummy"
+
+    def _call_api(self, prompts: AIPrompt) -> AIResponse:
+        time.sleep(0.2)
+        return AIResponse(
+            response=prompts.user_message,
+            model_name=self.model_name,
+            configurations=self.configurations,
+            processing_time=0.2
+        )
+
+
+class CompareAsyncTests(SimpleTestCase):
+    """Testes da execução assíncrona de APIClient.compare_async."""
+
+    def setUp(self):
+        self.client_ia = SlowDummyClient(AIConfig(
+            api_key="dummy-key",
+            api_url="http://dummy",
+            model_name="dummy-model",
+            prompt="{{ student_id }}",
+            use_system_message=False
+        ))
+
+    def test_compare_async_fallback_returns_response(self):
+        data = {"student_id": "aluno1", "instructor": {}, "student": {}}
+
+        class Data:
+            def __init__(self, values):
+                self.__dict__.update(values)
+
+        response, message = asyncio.run(self.client_ia.compare_async(Data(data)))
+        self.assertEqual(response.response, "aluno1")
+        self.assertEqual(message.user_message, "aluno1")
+
+    def test_calls_share_event_loop_concurrently(self):
+        prompts = [AIPrompt(user_message=f"p{i}", system_message="") for i in range(5)]
+
+        async def run_all():
+            return await asyncio.gather(*(self.client_ia._call_api_async(p) for p in prompts))
+
+        start = time.time()
+        results = asyncio.run(run_all())
+        elapsed = time.time() - start
+
+        self.assertEqual([r.response for r in results], [p.user_message for p in prompts])
+        self.assertLess(elapsed, 0.2 * len(prompts))
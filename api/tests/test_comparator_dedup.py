@@ -0,0 +1,47 @@
+# api/tests/test_comparator_dedup.py
+
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+
+from api.service.comparator import get_dedup_stats, group_duplicate_students
+from core.types.comparison import ComparisonRequestData
+
+
+def make_token(prompt="Compare {{ student }}", base_instruction=""):
+    """Cria um token simulado com configuração de prompt."""
+    return SimpleNamespace(ai_configuration=SimpleNamespace(
+        prompt=prompt,
+        base_instruction=base_instruction
+    ))
+
+
+class DuplicateStudentsTests(SimpleTestCase):
+    """Testes da deduplicação de alunos com conteúdo idêntico."""
+
+    def setUp(self):
+        self.data = ComparisonRequestData(
+            instructor={"answer": "42"},
+            students={
+                "a1": {"answer": "41", "files": ["x"]},
+                "a2": {"files": ["x"], "answer": "41"},
+                "a3": {"answer": ""},
+                "a4": {"answer": ""},
+                "a5": {"answer": "42"},
+            }
+        )
+
+    def test_identical_payloads_share_representative(self):
+        groups = group_duplicate_students(self.data, make_token())
+
+        self.assertEqual(groups, {"a1": ["a1", "a2"], "a3": ["a3", "a4"], "a5": ["a5"]})
+        stats = get_dedup_stats(groups)
+        self.assertEqual(stats["total_students"], 5)
+        self.assertEqual(stats["unique_students"], 3)
+        self.assertEqual(stats["dedup_ratio"], 0.4)
+
+    def test_prompt_using_student_id_disables_dedup(self):
+        groups = group_duplicate_students(self.data, make_token(prompt="Aluno {{ student_id }}"))
+
+        self.assertEqual(len(groups), 5)
+        self.assertEqual(get_dedup_stats(groups)["dedup_ratio"], 0.0)
@@ -0,0 +1,77 @@
+# api/tests/test_compare_stream.py
+
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from api.service.comparator import stream_comparison
+from core.types import AIResponse, EntityStatus
+
+
+class FakeJob(SimpleNamespace):
+    """Job simulado com a interface usada pelo streaming."""
+
+    def get_status(self):
+        return EntityStatus.COMPLETED
+
+    def get_error(self):
+        return None
+
+    def get_summary(self):
+        return {"operation_id": "op-1", "status": "COMPLETED", "results": {"big": "payload"}}
+
+
+class StreamComparisonTests(SimpleTestCase):
+    """Testes do gerador de resultados em streaming."""
+
+    def test_results_are_emitted_before_summary(self):
+        received = {}
+
+        def fake_compare_data(data, token_key, sync, on_result, timeout=None, on_delta=None, cancel_event=None):
+            received["timeout"] = timeout
+            for student_id in ("a1", "a2"):
+                on_result(student_id, "OpenAi", AIResponse(
+                    model_name="gpt",
+                    configurations={},
+                    processing_time=0.1,
+                    response=f"nota {student_id}"
+                ))
+            return FakeJob(meta={"dedup": {"dedup_ratio": 0.0}})
+
+        with mock.patch("api.service.comparator.compare_data", side_effect=fake_compare_data):
+            records = list(stream_comparison(data={}, token_key="token", timeout=12.5))
+
+        self.assertEqual(received["timeout"], 12.5)
+        self.assertEqual([r["type"] for r in records], ["result", "result", "summary"])
+        self.assertEqual(records[0]["student_id"], "a1")
+        self.assertEqual(records[0]["result"]["response"], "nota a1")
+        self.assertNotIn("results", records[-1]["data"][0])
+
+    def test_exception_is_reported_as_error_record(self):
+        with mock.patch("api.service.comparator.compare_data", side_effect=ValueError("falhou")):
+            records = list(stream_comparison(data={}, token_key="token"))
+
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["type"], "error")
+
+    def test_closing_the_stream_cancels_the_comparison(self):
+        received = {}
+        stopped = threading.Event()
+
+        def fake_compare_data(data, token_key, sync, on_result, timeout=None, on_delta=None, cancel_event=None):
+            received["cancel_event"] = cancel_event
+            try:
+                while True:
+                    on_delta("a1", "OpenAi", "trecho")
+            finally:
+                stopped.set()
+
+        with mock.patch("api.service.comparator.compare_data", side_effect=fake_compare_data):
+            stream = stream_comparison(data={}, token_key="token")
+            self.assertEqual(next(stream)["type"], "delta")
+            stream.close()
+            self.assertTrue(stopped.wait(2.0))
+
+        self.assertTrue(received["cancel_event"].is_set())
@@ -0,0 +1,152 @@
+# api/tests/test_comparison_batch.py
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import SimpleTestCase, override_settings
+
+from core.types import AIConfig, AIPrompt
+from core.types.comparison import ComparisonRequestData
+from core.types.status import EntityStatus
+from api.service.comparison_batch import should_use_batch
+from api.utils.clientsIA import OpenAiClient
+
+
+class StubBatchHandler(BaseHTTPRequestHandler):
+    """Servidor local que imita os endpoints de Batch API da OpenAI."""
+
+    state = {}
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, data, status=200):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _batch(self):
+        polls = self.state['polls']
+        return {
+            "id": "batch_1",
+            "object": "batch",
+            "endpoint": "/v1/chat/completions",
+            "input_file_id": "file_in",
+            "completion_window": "24h",
+            "created_at": int(time.time()),
+            "status": "completed" if polls >= 2 else "in_progress",
+            "output_file_id": "file_out" if polls >= 2 else None,
+            "error_file_id": None,
+        }
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8', 'replace')
+        if self.path.endswith('/files'):
+            self.state['requests'] = [
+                json.loads(line) for line in re.findall(r'^\{"custom_id".*$', body, re.MULTILINE)
+            ]
+            self._send_json({
+                "id": "file_in", "object": "file", "bytes": len(body),
+                "created_at": int(time.time()), "filename": "batch.jsonl",
+                "purpose": "batch", "status": "processed",
+            })
+        elif self.path.endswith('/batches'):
+            self._send_json(self._batch())
+        else:
+            self._send_json({"error": {"message": "not found"}}, status=404)
+
+    def do_GET(self):
+        if self.path.endswith('/batches/batch_1'):
+            self.state['polls'] += 1
+            self._send_json(self._batch())
+        elif self.path.endswith('/files/file_out/content'):
+            lines = []
+            for request in self.state['requests']:
+                user_message = request['body']['messages'][-1]['content']
+                lines.append(json.dumps({
+                    "custom_id": request['custom_id'],
+                    "response": {
+                        "status_code": 200,
+                        "body": {"choices": [{"message": {"content": f"ok: {user_message}"}}]},
+                    },
+                    "error": None,
+                }))
+            body = "\n".join(lines).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/octet-stream')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send_json({"error": {"message": "not found"}}, status=404)
+
+
+class OpenAiBatchClientTests(SimpleTestCase):
+    """Testes de envio e consulta de lotes contra um servidor local."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubBatchHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        StubBatchHandler.state = {'polls': 0, 'requests': []}
+        self.client_ia = OpenAiClient(AIConfig(
+            api_key="dummy-key",
+            api_url=f"http://127.0.0.1:{self.server.server_address[1]}/v1",
+            model_name="gpt-4o-mini",
+            use_system_message=True
+        ))
+
+    def test_submit_and_poll_until_completed(self):
+        custom_ids = ["s0", "s1"]
+        requests = [
+            self.client_ia.build_batch_request(cid, AIPrompt(user_message=f"aluno {cid}", system_message="sys"))
+            for cid in custom_ids
+        ]
+
+        batch_id = self.client_ia.submit_batch(requests)
+        self.assertEqual(batch_id, "batch_1")
+        self.assertEqual([r['custom_id'] for r in StubBatchHandler.state['requests']], custom_ids)
+
+        status, results = self.client_ia.poll_batch(batch_id, custom_ids)
+        self.assertEqual(status, EntityStatus.IN_PROGRESS)
+        self.assertEqual(results, {})
+
+        status, results = self.client_ia.poll_batch(batch_id, custom_ids)
+        self.assertEqual(status, EntityStatus.COMPLETED)
+        self.assertEqual(results["s0"].response, "ok: aluno s0")
+        self.assertEqual(results["s1"].response, "ok: aluno s1")
+
+
+class ShouldUseBatchTests(SimpleTestCase):
+    """Testes da decisão de uso do modo em lote."""
+
+    def _data(self, count):
+        return ComparisonRequestData(
+            instructor={"answer": "42"},
+            students={f"aluno{i}": {"answer": str(i)} for i in range(count)}
+        )
+
+    @override_settings(COMPARISON_BATCH_MODE=False, COMPARISON_BATCH_MIN_STUDENTS=1)
+    def test_disabled_by_default(self):
+        self.assertFalse(should_use_batch(self._data(10)))
+
+    @override_settings(COMPARISON_BATCH_MODE=True, COMPARISON_BATCH_MIN_STUDENTS=5)
+    def test_requires_minimum_students(self):
+        self.assertFalse(should_use_batch(self._data(4)))
+        self.assertTrue(should_use_batch(self._data(5)))
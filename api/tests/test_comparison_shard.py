@@ -0,0 +1,71 @@
+# api/tests/test_comparison_shard.py
+
+from django.test import SimpleTestCase, override_settings
+
+from core.types.ai import AIResponse
+from core.types.comparison import ComparisonRequestData
+from api.service.comparison_shard import merge_shard_payloads, plan_comparison_shards, should_shard
+
+
+class PlanComparisonShardsTests(SimpleTestCase):
+    """Testes da divisão de um job em shards."""
+
+    def setUp(self):
+        self.groups = {f"a{i}": [f"a{i}"] for i in range(5)}
+        self.groups["a0"].append("a5")
+        self.providers = {
+            1: {'client_class': 'OpenAi', 'client_names': ['OpenAi']},
+            2: {'client_class': 'Gemini', 'client_names': ['Gemini']},
+        }
+
+    def test_one_shard_per_provider_and_chunk(self):
+        shards = plan_comparison_shards(self.groups, self.providers, chunk_size=2)
+        self.assertEqual(len(shards), 6)
+        openai_shards = [s for s in shards if s['global_id'] == 1]
+        self.assertEqual([list(s['groups']) for s in openai_shards], [["a0", "a1"], ["a2", "a3"], ["a4"]])
+        self.assertEqual(openai_shards[0]['groups']["a0"], ["a0", "a5"])
+
+    def test_provider_queues_override_default_queue(self):
+        shards = plan_comparison_shards(
+            self.groups, self.providers, chunk_size=10,
+            default_queue="comparisons", provider_queues={'OpenAi': 'ai-openai'}
+        )
+        queues = {s['global_id']: s['queue'] for s in shards}
+        self.assertEqual(queues, {1: 'ai-openai', 2: 'comparisons'})
+
+    @override_settings(COMPARISON_SHARDING={'ENABLED': True, 'MIN_STUDENTS': 3})
+    def test_should_shard_respects_minimum(self):
+        small = ComparisonRequestData(instructor={"answer": "1"}, students={"a": {"answer": "1"}})
+        large = ComparisonRequestData(
+            instructor={"answer": "1"},
+            students={f"a{i}": {"answer": str(i)} for i in range(3)}
+        )
+        self.assertFalse(should_shard(small))
+        self.assertTrue(should_shard(large))
+
+
+class MergeShardPayloadsTests(SimpleTestCase):
+    """Testes da consolidação dos resultados parciais."""
+
+    def test_merges_results_and_fills_failed_shards_with_errors(self):
+        ok = AIResponse(model_name="gpt", configurations={}, processing_time=0.1, response="bom")
+        payloads = [
+            {
+                'results': {"a1": {"OpenAi": ok.to_dict()}},
+                'error': None,
+                'student_ids': ["a1"],
+                'client_names': ["OpenAi"],
+            },
+            {
+                'results': {},
+                'error': "timeout",
+                'student_ids': ["a1", "a2"],
+                'client_names': ["Gemini"],
+            },
+        ]
+
+        merged = merge_shard_payloads(payloads)
+
+        self.assertEqual(merged["a1"]["OpenAi"].response, "bom")
+        self.assertIn("timeout", merged["a1"]["Gemini"].error.message)
+        self.assertIn("timeout", merged["a2"]["Gemini"].error.message)
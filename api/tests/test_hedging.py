@@ -0,0 +1,147 @@
+# api/tests/test_hedging.py
+
+import time
+
+from django.test import SimpleTestCase, override_settings
+
+from api.utils.hedging import DEFAULT_HEDGING_SETTINGS, HedgeBudget, Hedger, LatencyTracker
+from core.utils.task_executor import get_task_executor, reset_task_executor
+
+
+def make_hedger(**overrides):
+    config = {**DEFAULT_HEDGING_SETTINGS, 'MIN_SAMPLES': 5, 'MIN_DELAY': 0.05, 'MAX_HEDGE_RATIO': 1.0, **overrides}
+    return Hedger(config)
+
+
+def warm_up(hedger, provider, seconds, samples=10):
+    for _ in range(samples):
+        hedger.latencies.record(provider, seconds)
+
+
+def is_success(result):
+    return result != "erro"
+
+
+class LatencyTrackerTests(SimpleTestCase):
+    """Testes do cálculo de percentil."""
+
+    def test_percentile_requires_minimum_samples(self):
+        tracker = LatencyTracker(window=100)
+        for value in range(1, 5):
+            tracker.record("Gemini", float(value))
+        self.assertIsNone(tracker.percentile("Gemini", 95, min_samples=5))
+
+        for value in range(5, 101):
+            tracker.record("Gemini", float(value))
+        self.assertEqual(tracker.percentile("Gemini", 95, min_samples=5), 95.0)
+
+
+class HedgeBudgetTests(SimpleTestCase):
+    """Testes do limite de duplicatas por token."""
+
+    def test_limits_per_minute_and_ratio_per_token(self):
+        budget = HedgeBudget(max_per_minute=2, max_ratio=0.5)
+        for _ in range(4):
+            budget.record_call("t1")
+        self.assertTrue(budget.try_acquire("t1"))
+        self.assertTrue(budget.try_acquire("t1"))
+        self.assertFalse(budget.try_acquire("t1"))
+
+        budget.record_call("t2")
+        self.assertFalse(budget.try_acquire("t2"))
+        budget.record_call("t2")
+        self.assertTrue(budget.try_acquire("t2"))
+
+
+class HedgerTests(SimpleTestCase):
+    """Testes da execução com cobertura."""
+
+    def setUp(self):
+        reset_task_executor()
+        self.addCleanup(reset_task_executor)
+
+    def test_fast_call_is_not_hedged(self):
+        hedger = make_hedger()
+        warm_up(hedger, "Gemini", 0.2)
+
+        result, info = hedger.call("Gemini", 1, lambda: "ok", lambda: (lambda: "hedge"), is_success)
+
+        self.assertEqual(result, "ok")
+        self.assertFalse(info["hedged"])
+
+    def test_slow_call_is_won_by_hedge(self):
+        hedger = make_hedger()
+        warm_up(hedger, "Gemini", 0.05)
+
+        def slow():
+            time.sleep(1.0)
+            return "lenta"
+
+        start = time.monotonic()
+        result, info = hedger.call("Gemini", 1, slow, lambda: (lambda: "cobertura"), is_success)
+
+        self.assertEqual(result, "cobertura")
+        self.assertEqual(info["winner"], "hedge")
+        self.assertLess(time.monotonic() - start, 0.8)
+        stats = hedger.stats.snapshot()["Gemini"]
+        self.assertEqual(stats["hedge_wins"], 1)
+        self.assertEqual(stats["hedge_win_rate"], 1.0)
+
+    def test_failed_hedge_falls_back_to_primary(self):
+        hedger = make_hedger()
+        warm_up(hedger, "Gemini", 0.05)
+
+        def slow():
+            time.sleep(0.3)
+            return "lenta"
+
+        result, info = hedger.call("Gemini", 1, slow, lambda: (lambda: "erro"), is_success)
+
+        self.assertEqual(result, "lenta")
+        self.assertEqual(info["winner"], "primary")
+
+    def test_budget_exhausted_waits_for_primary(self):
+        hedger = make_hedger(MAX_HEDGES_PER_MINUTE=0)
+        warm_up(hedger, "Gemini", 0.05)
+
+        def slow():
+            time.sleep(0.2)
+            return "lenta"
+
+        result, info = hedger.call("Gemini", 1, slow, lambda: (lambda: "cobertura"), is_success)
+
+        self.assertEqual(result, "lenta")
+        self.assertTrue(info["budget_denied"])
+        self.assertEqual(hedger.stats.snapshot()["Gemini"]["budget_denied"], 1)
+
+    @override_settings(TASK_EXECUTOR={'MAX_WORKERS': 1})
+    def test_caller_on_a_busy_executor_runs_the_call_itself(self):
+        hedger = make_hedger()
+        warm_up(hedger, "Gemini", 0.05)
+
+        # A chamadora ocupa o único worker do executor compartilhado
+        future = get_task_executor().submit(
+            hedger.call, "Gemini", 1, lambda: "ok", lambda: (lambda: "cobertura"), is_success
+        )
+
+        result, info = future.result(timeout=5)
+        self.assertEqual(result, "ok")
+        self.assertFalse(info["hedged"])
+
+    @override_settings(TASK_EXECUTOR={'MAX_PROVIDER_CALLS': 1})
+    def test_no_hedge_while_provider_calls_are_capped(self):
+        hedger = make_hedger()
+        warm_up(hedger, "Gemini", 0.05)
+        executor = get_task_executor()
+        self.assertTrue(executor.acquire_provider_slot(0))
+        self.addCleanup(executor.release_provider_slot)
+
+        def slow():
+            time.sleep(0.2)
+            return "lenta"
+
+        result, info = hedger.call("Gemini", 1, slow, lambda: (lambda: "cobertura"), is_success)
+
+        self.assertEqual(result, "lenta")
+        self.assertTrue(info["capacity_denied"])
+        self.assertEqual(hedger.stats.snapshot()["Gemini"]["hedged"], 0)
@@ -0,0 +1,76 @@
+# api/tests/test_import_time.py
+
+import json
+import logging
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from unittest import skipUnless
+
+from django.test import SimpleTestCase
+
+# Módulos pesados que não devem ser carregados na inicialização dos processos
+HEAVY_MODULES = ('anthropic', 'openai', 'google.genai', 'azure.ai.inference', 'llamaapi', 'docling')
+
+logger = logging.getLogger(__name__)
+
+# Orçamento de inicialização, verificado apenas com IMPORT_TIME_BENCHMARK=1
+# (tempo e memória variam com a carga da máquina)
+RUN_BENCHMARK = os.getenv('IMPORT_TIME_BENCHMARK', 'False').lower() in ('true', '1')
+MAX_STARTUP_SECONDS = float(os.getenv('IMPORT_TIME_MAX_SECONDS', '5.0'))
+MAX_STARTUP_RSS_MB = float(os.getenv('IMPORT_TIME_MAX_RSS_MB', '250'))
+
+STARTUP_SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+import api.urls, api.utils.clientsIA, api.service.comparator
+{extra}
+print(json.dumps({{
+    'seconds': time.perf_counter() - start,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+    'loaded': [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def measure_startup(extra: str = '') -> dict:
+    """Inicializa o Django em um processo novo e mede tempo, RSS e módulos carregados."""
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'myproject.settings')}
+    script = STARTUP_SCRIPT.format(extra=extra, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, '-c', script],
+        cwd=str(settings.BASE_DIR),
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+        check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+class ImportTimeBenchmarkTests(SimpleTestCase):
+    """Benchmark de inicialização dos processos web e workers."""
+
+    def test_startup_does_not_import_provider_sdks(self):
+        result = measure_startup()
+        self.assertEqual(result['loaded'], [])
+
+    @skipUnless(RUN_BENCHMARK, "defina IMPORT_TIME_BENCHMARK=1 para medir o orçamento de inicialização")
+    def test_startup_stays_within_budget(self):
+        result = measure_startup()
+        logger.info(f"[import-time] {result['seconds']:.2f}s, RSS {result['rss_mb']:.0f} MB")
+
+        self.assertLess(result['seconds'], MAX_STARTUP_SECONDS)
+        self.assertLess(result['rss_mb'], MAX_STARTUP_RSS_MB)
+
+    def test_client_class_loads_only_its_sdk(self):
+        result = measure_startup(
+            "from api.utils.clientsIA import AnthropicClient, load_client_sdk\n"
+            "load_client_sdk(AnthropicClient)"
+        )
+        self.assertEqual(result['loaded'], ['anthropic'])
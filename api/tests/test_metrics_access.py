@@ -0,0 +1,48 @@
+# api/tests/test_metrics_access.py
+
+from types import SimpleNamespace
+from unittest import mock
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from api.views import monitoring
+
+
+def make_request(remote_addr, is_staff=False, is_authenticated=False):
+    request = RequestFactory().get('/metrics', REMOTE_ADDR=remote_addr)
+    request.user = SimpleNamespace(is_authenticated=is_authenticated, is_staff=is_staff)
+    return request
+
+
+@override_settings(PROMETHEUS_METRICS_ALLOWED_IPS=['127.0.0.1', '10.0.0.0/8'])
+class MetricsAccessTests(SimpleTestCase):
+    """Testes da restrição de acesso ao /metrics."""
+
+    def setUp(self):
+        patcher = mock.patch.object(monitoring, 'ExportToDjangoView', return_value=HttpResponse("metricas"))
+        self.export = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_anonymous_client_outside_allowlist_is_forbidden(self):
+        response = monitoring.metrics_export(make_request('203.0.113.7'))
+        self.assertEqual(response.status_code, 403)
+        self.export.assert_not_called()
+
+    def test_allowed_address_and_network_can_scrape(self):
+        for address in ('127.0.0.1', '10.1.2.3'):
+            response = monitoring.metrics_export(make_request(address))
+            self.assertEqual(response.status_code, 200)
+
+    def test_staff_user_can_read_from_any_address(self):
+        request = make_request('203.0.113.7', is_staff=True, is_authenticated=True)
+        self.assertEqual(monitoring.metrics_export(request).status_code, 200)
+
+    @override_settings(PROMETHEUS_METRICS_ALLOWED_IPS=[])
+    def test_default_allowlist_is_staff_only(self):
+        response = monitoring.metrics_export(make_request('127.0.0.1'))
+        self.assertEqual(response.status_code, 403)
+
+    def test_non_staff_user_is_forbidden(self):
+        request = make_request('203.0.113.7', is_authenticated=True)
+        self.assertEqual(monitoring.metrics_export(request).status_code, 403)
@@ -0,0 +1,103 @@
+# api/tests/test_perplexity_session.py
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from django.test import SimpleTestCase
+
+from core.types import AIConfig, AIPrompt
+from api.utils.client_pool import reset_client_pool
+from api.utils.clientsIA import PerplexityClient
+
+
+class StubChatHandler(BaseHTTPRequestHandler):
+    """Servidor local keep-alive que responde como /chat/completions e conta conexões."""
+
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with StubChatHandler.lock:
+            StubChatHandler.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path.startswith('/slow'):
+            time.sleep(0.5)
+        body = json.dumps({"choices": [{"message": {"content": "ok"}}]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class PerplexitySessionTests(SimpleTestCase):
+    """Testes e benchmark da sessão HTTP compartilhada da Perplexity."""
+
+    calls = 20
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubChatHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        reset_client_pool()
+        super().tearDownClass()
+
+    def setUp(self):
+        reset_client_pool()
+        StubChatHandler.connections = 0
+
+    def _client(self, path="/chat/completions", **http_options):
+        return PerplexityClient(AIConfig(
+            api_key="dummy-key",
+            api_url=f"{self.base_url}{path}",
+            model_name="sonar",
+            use_response_cache=False,
+            http_options=http_options
+        ))
+
+    def test_read_timeout_returns_error_response(self):
+        response = self._client("/slow", read_timeout=0.1)._call_api(AIPrompt(user_message="olá", system_message=""))
+        self.assertIsNotNone(response.error)
+
+    def test_benchmark_cold_vs_pooled_calls(self):
+        prompt = AIPrompt(user_message="olá", system_message="")
+
+        start = time.perf_counter()
+        for _ in range(self.calls):
+            url, body, headers = self._client()._build_request(prompt)
+            self.assertEqual(requests.post(url, json=body, headers=headers).status_code, 200)
+        cold_latency = (time.perf_counter() - start) / self.calls
+        cold_connections = StubChatHandler.connections
+
+        StubChatHandler.connections = 0
+        start = time.perf_counter()
+        for _ in range(self.calls):
+            self.assertEqual(self._client()._call_api(prompt).response, "ok")
+        pooled_latency = (time.perf_counter() - start) / self.calls
+        pooled_connections = StubChatHandler.connections
+
+        print(
+            f"\n[benchmark] Perplexity {self.calls} chamadas: requests.post {cold_latency * 1000:.2f} ms/chamada "
+            f"({cold_connections} conexões), sessão compartilhada {pooled_latency * 1000:.2f} ms/chamada "
+            f"({pooled_connections} conexões)"
+        )
+        self.assertEqual(cold_connections, self.calls)
+        self.assertEqual(pooled_connections, 1)
@@ -0,0 +1,166 @@
+# api/tests/test_prompt_cache.py
+
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from core.types import AIConfig, AIPrompt, AIResponse
+from core.types.comparison import SingleComparisonRequestData
+from api.utils.clientsIA import AnthropicClient, APIClient
+from api.utils.prompt_cache import CachedContentRegistry, clear_probe_cache
+
+PROMPT = "Referência: {{ instructor.answer }}\nAluno {{ student_id }}: {{ student.answer }}\nFim."
+
+
+class EchoClient(APIClient):
+    """Cliente sem chamadas externas, usado para preparar prompts."""
+    name = "Echo"
+
+    def _call_api(self, prompts: AIPrompt) -> AIResponse:
+        return AIResponse(response="ok", model_name=self.model_name, configurations={}, processing_time=0.0)
+
+
+def make_config(**kwargs):
+    return AIConfig(
+        api_key="dummy-key",
+        api_url="http://dummy",
+        model_name="claude-test",
+        base_instruction="Compare as respostas.",
+        prompt=PROMPT,
+        **kwargs
+    )
+
+
+def make_data(student_id, answer):
+    return SingleComparisonRequestData(
+        instructor={"answer": "resposta do professor"},
+        student_id=student_id,
+        student={"answer": answer}
+    )
+
+
+class CacheablePrefixTests(SimpleTestCase):
+    """Testes da separação entre prefixo comum e sufixo do aluno."""
+
+    def setUp(self):
+        clear_probe_cache()
+        self.addCleanup(clear_probe_cache)
+
+    def test_prefix_is_identical_for_every_student(self):
+        client = EchoClient(make_config())
+        first = client._prepare_prompts(make_data("a1", "Resposta A"))
+        second = client._prepare_prompts(make_data("b2", "Rascunho B"))
+
+        self.assertEqual(first.cacheable_prefix, second.cacheable_prefix)
+        self.assertTrue(first.cacheable_prefix.endswith("Aluno "))
+        self.assertEqual(first.cacheable_prefix + first.variable_suffix, first.user_message)
+        self.assertIn("Resposta A", first.variable_suffix)
+
+    def test_probes_are_rendered_once_per_instructor(self):
+        client = EchoClient(make_config())
+        with mock.patch.object(EchoClient, '_render_prompts', autospec=True,
+                               side_effect=APIClient._render_prompts) as render:
+            first = client._prepare_prompts(make_data("a1", "Resposta A"))
+            second = client._prepare_prompts(make_data("b2", "Rascunho B"))
+
+        # Uma renderização real por aluno e as duas sondas apenas no primeiro
+        self.assertEqual(render.call_count, 4)
+        self.assertEqual(first.cacheable_prefix, second.cacheable_prefix)
+
+        other = make_data("c3", "Resposta C")
+        other.instructor = {"answer": "outra referência"}
+        third = client._prepare_prompts(other)
+        self.assertIn("outra referência", third.cacheable_prefix)
+
+    @override_settings(AI_PROMPT_PREFIX_CACHE={'ENABLED': False})
+    def test_disabled_setting_keeps_prompt_unsplit(self):
+        message = EchoClient(make_config())._prepare_prompts(make_data("a1", "Resposta A"))
+        self.assertEqual(message.cache_prefix_length, 0)
+
+
+class AnthropicPromptCacheTests(SimpleTestCase):
+    """Testes da marcação cache_control e da contagem de tokens em cache."""
+
+    def setUp(self):
+        self.client = AnthropicClient(make_config(use_system_message=True))
+
+    def test_prefix_block_is_marked_for_caching(self):
+        message = self.client._prepare_prompts(make_data("a1", "Resposta A"))
+        request = self.client._build_request(message)
+
+        blocks = request["messages"][0]["content"]
+        self.assertEqual(blocks[0]["cache_control"], {"type": "ephemeral"})
+        self.assertNotIn("cache_control", blocks[1])
+        self.assertEqual(blocks[0]["text"] + blocks[1]["text"], message.user_message)
+
+    def test_response_reports_cached_tokens(self):
+        response = SimpleNamespace(
+            content=[SimpleNamespace(type="text", text="ok")],
+            usage=SimpleNamespace(input_tokens=50, cache_read_input_tokens=1500, cache_creation_input_tokens=0)
+        )
+        result = self.client._parse_response(response, datetime.now())
+
+        self.assertEqual(result.metadata["prompt_cache"]["cached_tokens"], 1500)
+        self.assertEqual(result.metadata["prompt_cache"]["input_tokens"], 1550)
+
+
+class CachedContentRegistryTests(SimpleTestCase):
+    """Testes do registro de handles de cache explícito."""
+
+    def test_handle_is_reused_until_discarded(self):
+        registry = CachedContentRegistry()
+        created = []
+
+        def factory():
+            created.append(1)
+            return f"cachedContents/{len(created)}"
+
+        key = registry.build_key("Gemini", "key", "gemini-2.0-flash", "prefixo")
+        self.assertEqual(registry.get_or_create(key, factory, ttl=600), "cachedContents/1")
+        self.assertEqual(registry.get_or_create(key, factory, ttl=600), "cachedContents/1")
+
+        registry.discard("cachedContents/1")
+        self.assertEqual(registry.get_or_create(key, factory, ttl=600), "cachedContents/2")
+
+    def test_concurrent_misses_create_a_single_cache(self):
+        registry = CachedContentRegistry()
+        created = []
+        started = threading.Event()
+
+        def factory():
+            created.append(1)
+            started.set()
+            time.sleep(0.1)
+            return "cachedContents/1"
+
+        key = registry.build_key("Gemini", "key", "gemini-2.0-flash", "prefixo")
+        handles = []
+        threads = [
+            threading.Thread(target=lambda: handles.append(registry.get_or_create(key, factory, ttl=600)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(created, [1])
+        self.assertEqual(handles, ["cachedContents/1"] * 5)
+
+    def test_failed_creation_is_not_retried_within_failure_ttl(self):
+        registry = CachedContentRegistry()
+        attempts = []
+
+        def factory():
+            attempts.append(1)
+            raise ValueError("prefixo abaixo do mínimo")
+
+        key = registry.build_key("Gemini", "key", "gemini-2.0-flash", "prefixo")
+        with self.assertRaises(ValueError):
+            registry.get_or_create(key, factory, ttl=600, failure_ttl=300)
+        self.assertIsNone(registry.get_or_create(key, factory, ttl=600, failure_ttl=300))
+        self.assertEqual(len(attempts), 1)
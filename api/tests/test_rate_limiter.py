@@ -0,0 +1,98 @@
+# api/tests/test_rate_limiter.py
+
+import asyncio
+import threading
+import time
+
+from django.test import SimpleTestCase
+
+from api.exceptions import RateLimitExceededException
+from api.utils.rate_limiter import MemoryRateLimitBackend, RateLimiter
+
+
+class MemoryRateLimitBackendTests(SimpleTestCase):
+    """Testes do token bucket em memória."""
+
+    def test_reserves_until_capacity_then_reports_wait(self):
+        backend = MemoryRateLimitBackend()
+        self.assertEqual(backend.reserve("k", capacity=2, rate=10.0, amount=1), 0.0)
+        self.assertEqual(backend.reserve("k", capacity=2, rate=10.0, amount=1), 0.0)
+        wait = backend.reserve("k", capacity=2, rate=10.0, amount=1)
+        self.assertGreater(wait, 0.0)
+        self.assertLessEqual(wait, 0.1)
+
+    def test_bucket_refills_over_time(self):
+        backend = MemoryRateLimitBackend()
+        backend.reserve("k", capacity=1, rate=20.0, amount=1)
+        time.sleep(0.06)
+        self.assertEqual(backend.reserve("k", capacity=1, rate=20.0, amount=1), 0.0)
+
+
+class ThreadRecordingBackend(MemoryRateLimitBackend):
+    """Backend bloqueante (como o Redis) que registra a thread de cada reserva."""
+
+    blocking = True
+
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+
+    def reserve_all(self, buckets):
+        self.threads.append(threading.get_ident())
+        return super().reserve_all(buckets)
+
+
+class RateLimiterTests(SimpleTestCase):
+    """Testes da espera por capacidade de RPM/TPM."""
+
+    def test_waits_for_token_capacity_instead_of_failing(self):
+        limiter = RateLimiter(MemoryRateLimitBackend(), max_wait=5.0)
+        self.assertEqual(limiter.acquire("OpenAi", "sk-1", "gpt", tpm=600, tokens=600), 0.0)
+
+        start = time.monotonic()
+        waited = limiter.acquire("OpenAi", "sk-1", "gpt", tpm=600, tokens=5)
+        self.assertGreater(waited, 0.0)
+        self.assertGreaterEqual(time.monotonic() - start, 0.4)
+
+    def test_keys_and_models_have_independent_buckets(self):
+        limiter = RateLimiter(MemoryRateLimitBackend(), max_wait=0.0)
+        limiter.acquire("OpenAi", "sk-1", "gpt", rpm=1)
+        self.assertEqual(limiter.acquire("OpenAi", "sk-2", "gpt", rpm=1), 0.0)
+        self.assertEqual(limiter.acquire("OpenAi", "sk-1", "gpt-mini", rpm=1), 0.0)
+
+    def test_raises_when_wait_exceeds_maximum(self):
+        limiter = RateLimiter(MemoryRateLimitBackend(), max_wait=0.5)
+        limiter.acquire("Gemini", "key", "flash", rpm=1)
+        with self.assertRaises(RateLimitExceededException):
+            limiter.acquire("Gemini", "key", "flash", rpm=1)
+
+    def test_call_budget_caps_the_wait(self):
+        limiter = RateLimiter(MemoryRateLimitBackend(), max_wait=60.0)
+        limiter.acquire("Perplexity", "key", "sonar", rpm=1)
+        start = time.monotonic()
+        with self.assertRaises(RateLimitExceededException):
+            # Restante do prazo da requisição menor que a espera por capacidade
+            limiter.acquire("Perplexity", "key", "sonar", rpm=1, max_wait=0.5)
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_tpm_timeout_does_not_consume_rpm(self):
+        limiter = RateLimiter(MemoryRateLimitBackend(), max_wait=0.1)
+        limiter.acquire("OpenAi", "sk-1", "gpt", rpm=2, tpm=100, tokens=100)
+        with self.assertRaises(RateLimitExceededException):
+            limiter.acquire("OpenAi", "sk-1", "gpt", rpm=2, tpm=100, tokens=100)
+
+        # A requisição recusada não descontou o RPM: ainda há uma vaga
+        self.assertEqual(limiter.acquire("OpenAi", "sk-1", "gpt", rpm=2), 0.0)
+
+    def test_async_acquire_reserves_blocking_backends_off_the_event_loop(self):
+        backend = ThreadRecordingBackend()
+        limiter = RateLimiter(backend, max_wait=5.0)
+
+        async def acquire():
+            loop_thread = threading.get_ident()
+            await limiter.acquire_async("OpenAi", "sk-1", "gpt", rpm=60)
+            return loop_thread
+
+        loop_thread = asyncio.run(acquire())
+        self.assertEqual(len(backend.threads), 1)
+        self.assertNotEqual(backend.threads[0], loop_thread)
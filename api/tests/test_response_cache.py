@@ -0,0 +1,139 @@
+# api/tests/test_response_cache.py
+
+import os
+import tempfile
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from core.types import AIConfig, AIPrompt, AIResponse
+from api.utils.clientsIA import APIClient
+from api.utils.response_cache import (
+    DjangoResponseCacheBackend,
+    MemoryResponseCacheBackend,
+    SQLiteResponseCacheBackend,
+    build_response_cache_key,
+    reset_response_cache,
+)
+
+
+class CountingClient(APIClient):
+    """Cliente que conta as chamadas efetivas à API."""
+    name = "Counting"
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.calls = 0
+
+    def _call_api(self, prompts: AIPrompt) -> AIResponse:
+        self.calls += 1
+        return AIResponse(
+            response=f"resposta {self.calls}",
+            model_name=self.model_name,
+            configurations=self.configurations,
+            processing_time=0.5
+        )
+
+
+class ResponseCacheBackendTests(SimpleTestCase):
+    """Testes dos backends de armazenamento."""
+
+    def test_memory_backend_evicts_least_recently_used(self):
+        backend = MemoryResponseCacheBackend(max_entries=2)
+        backend.set("a", {"v": 1}, ttl=60)
+        backend.set("b", {"v": 2}, ttl=60)
+        backend.get("a")
+        backend.set("c", {"v": 3}, ttl=60)
+
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(backend.get("a"), {"v": 1})
+
+    def test_memory_backend_expires_entries(self):
+        backend = MemoryResponseCacheBackend(max_entries=10)
+        backend.set("a", {"v": 1}, ttl=60)
+        with mock.patch("api.utils.response_cache.time.time", return_value=time.time() + 61):
+            self.assertIsNone(backend.get("a"))
+
+    def test_sqlite_backend_persists_and_evicts(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.sqlite3")
+            backend = SQLiteResponseCacheBackend(path, max_entries=2)
+            backend.set("a", {"v": 1}, ttl=60)
+            backend.set("b", {"v": 2}, ttl=60)
+            backend.set("c", {"v": 3}, ttl=60)
+
+            reopened = SQLiteResponseCacheBackend(path, max_entries=2)
+            self.assertIsNone(reopened.get("a"))
+            self.assertEqual(reopened.get("c"), {"v": 3})
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                           'LOCATION': 'response-cache-tests'}})
+    def test_django_backend_clear_keeps_other_keys(self):
+        backend = DjangoResponseCacheBackend('default')
+        backend.cache.set("sessao-do-usuario", "valor")
+        backend.set("a", {"v": 1}, ttl=60)
+        self.assertEqual(backend.get("a"), {"v": 1})
+
+        backend.clear()
+
+        self.assertIsNone(backend.get("a"))
+        self.assertEqual(backend.cache.get("sessao-do-usuario"), "valor")
+        backend.set("a", {"v": 2}, ttl=60)
+        self.assertEqual(backend.get("a"), {"v": 2})
+
+
+@override_settings(AI_RESPONSE_CACHE={'BACKEND': 'memory', 'TTL': 60, 'MAX_ENTRIES': 10})
+class APIClientResponseCacheTests(SimpleTestCase):
+    """Testes da integração do cache com APIClient.compare."""
+
+    def setUp(self):
+        reset_response_cache()
+        self.addCleanup(reset_response_cache)
+
+    def make_client(self, **kwargs):
+        return CountingClient(AIConfig(
+            api_key="dummy-key",
+            api_url="http://dummy",
+            model_name="dummy-model",
+            prompt="Compare",
+            **{'use_response_cache': True, **kwargs}
+        ))
+
+    def test_identical_prompt_is_served_from_cache(self):
+        client = self.make_client()
+        prompt = AIPrompt(user_message="Compare", system_message="")
+
+        first = client._call_api_cached(prompt)
+        second = client._call_api_cached(prompt)
+
+        self.assertEqual(client.calls, 1)
+        self.assertFalse(first.metadata["cache"]["hit"])
+        self.assertTrue(second.metadata["cache"]["hit"])
+        self.assertEqual(second.response, first.response)
+        self.assertEqual(second.metadata["cache"]["original_processing_time"], 0.5)
+
+    def test_cache_is_opt_in(self):
+        client = CountingClient(AIConfig(api_key="dummy-key", api_url="http://dummy", model_name="dummy-model"))
+        prompt = AIPrompt(user_message="Compare", system_message="")
+
+        client._call_api_cached(prompt)
+        client._call_api_cached(prompt)
+
+        self.assertEqual(client.calls, 2)
+
+    def test_token_opt_out_skips_cache(self):
+        client = self.make_client(use_response_cache=False)
+        prompt = AIPrompt(user_message="Compare", system_message="")
+
+        client._call_api_cached(prompt)
+        response = client._call_api_cached(prompt)
+
+        self.assertEqual(client.calls, 2)
+        self.assertNotIn("cache", response.metadata)
+
+    def test_key_depends_on_configurations(self):
+        prompt = AIPrompt(user_message="Compare", system_message="")
+        key_a = build_response_cache_key("Counting", "m", {"temperature": 0}, prompt)
+        key_b = build_response_cache_key("Counting", "m", {"temperature": 1}, prompt)
+        self.assertNotEqual(key_a, key_b)
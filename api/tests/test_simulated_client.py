@@ -0,0 +1,91 @@
+# api/tests/test_simulated_client.py
+
+import random
+import time
+
+from django.test import SimpleTestCase
+
+from core.types import AIConfig, AIPrompt
+from api.utils.clientsIA import AI_CLIENT_MAPPING, SimulatedClient
+from api.utils.simulation import SimulationProfile, reset_simulation
+
+
+def make_client(**configurations):
+    config = AIConfig(
+        api_key="simulated",
+        api_url=None,
+        model_name="sim-1",
+        base_instruction="Compare.",
+        prompt="{{ student.answer }}",
+        configurations={'latency': 'fixed', 'latency_mean': 0.0, **configurations}
+    )
+    return SimulatedClient(config)
+
+
+PROMPT = AIPrompt(system_message="Compare.", user_message="Resposta do aluno")
+
+
+class SimulationProfileTests(SimpleTestCase):
+    """Testes das distribuições de latência e desfechos simulados."""
+
+    def setUp(self):
+        reset_simulation()
+
+    def test_fixed_latency(self):
+        profile = SimulationProfile({'latency': 'fixed', 'latency_mean': 0.3})
+        self.assertEqual(profile.sample_latency(random.Random(1)), 0.3)
+
+    def test_heavy_tail_is_bounded_below_by_scale_and_above_by_max(self):
+        profile = SimulationProfile({'latency': 'heavy_tail', 'latency_mean': 0.5, 'latency_max': 5.0})
+        rng = random.Random(7)
+        samples = [profile.sample_latency(rng) for _ in range(2000)]
+        self.assertGreaterEqual(min(samples), 0.5)
+        self.assertLessEqual(max(samples), 5.0)
+
+    def test_outcome_rates(self):
+        profile = SimulationProfile({'error_rate': 0.2, 'rate_limit_rate': 0.1})
+        rng = random.Random(3)
+        outcomes = [profile.sample_outcome(rng) for _ in range(10000)]
+        self.assertAlmostEqual(outcomes.count('error') / len(outcomes), 0.2, delta=0.02)
+        self.assertAlmostEqual(outcomes.count('rate_limited') / len(outcomes), 0.1, delta=0.02)
+
+    def test_same_workload_is_reproducible(self):
+        profile = SimulationProfile({'latency': 'lognormal'})
+        digest = profile.prompt_digest(PROMPT)
+        first = [profile.sample_latency(profile.rng_for(digest)) for _ in range(3)]
+        reset_simulation()
+        second = [profile.sample_latency(profile.rng_for(digest)) for _ in range(3)]
+        self.assertEqual(first, second)
+        self.assertEqual(len(set(first)), 3)
+
+
+class SimulatedClientTests(SimpleTestCase):
+    """Testes do cliente simulado registrado."""
+
+    def setUp(self):
+        reset_simulation()
+
+    def test_is_registered(self):
+        self.assertIs(AI_CLIENT_MAPPING['Simulated'], SimulatedClient)
+
+    def test_response_is_deterministic(self):
+        client = make_client(output_tokens=50)
+        first = client._call_api(PROMPT)
+        second = client._call_api(PROMPT)
+        self.assertIsNone(first.error)
+        self.assertEqual(first.response, second.response)
+        self.assertEqual(first.metadata['usage']['output_tokens'], 50)
+
+    def test_latency_is_applied(self):
+        client = make_client(latency_mean=0.2)
+        start = time.monotonic()
+        client._call_api(PROMPT)
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+    def test_rate_limited_call_returns_429(self):
+        response = make_client(rate_limit_rate=1.0)._call_api(PROMPT)
+        self.assertEqual(response.error.status_code, 429)
+
+    def test_failed_call_returns_error(self):
+        response = make_client(error_rate=1.0)._call_api(PROMPT)
+        self.assertEqual(response.error.code, "simulated_error")
@@ -0,0 +1,126 @@
+# api/tests/test_streaming.py
+
+from django.test import SimpleTestCase, override_settings
+
+from core.types import AIConfig, AIPrompt, AIResponse
+from core.types.comparison import SingleComparisonRequestData
+from api.utils.clientsIA import APIClient
+from api.utils.streaming import StreamCancelled, consume, guard_output
+
+
+class StreamingClient(APIClient):
+    """Cliente sem chamadas externas que gera a resposta em trechos."""
+    name = "StreamingTest"
+    supports_streaming = True
+
+    def __init__(self, config, chunks):
+        super().__init__(config)
+        self.chunks = chunks
+        self.closed = False
+        self.plain_calls = 0
+
+    def _call_api(self, prompts: AIPrompt) -> AIResponse:
+        self.plain_calls += 1
+        return AIResponse(response="".join(self.chunks), model_name=self.model_name,
+                          configurations={}, processing_time=0.0)
+
+    def _stream_api(self, prompts: AIPrompt):
+        try:
+            for chunk in self.chunks:
+                yield chunk
+        finally:
+            self.closed = True
+        return {'metadata': {'usage': 'ok'}}
+
+
+def make_client(chunks):
+    config = AIConfig(
+        api_key="dummy-key",
+        api_url="http://dummy",
+        model_name="stream-test",
+        base_instruction="Compare.",
+        prompt="{{ student.answer }}"
+    )
+    return StreamingClient(config, chunks)
+
+
+def make_data():
+    return SingleComparisonRequestData(
+        instructor={"answer": "referência"},
+        student_id="a1",
+        student={"answer": "resposta"}
+    )
+
+
+class GuardOutputTests(SimpleTestCase):
+    """Testes do limite de tokens de saída sobre o iterador de deltas."""
+
+    def test_passes_deltas_and_return_value(self):
+        def source():
+            yield "abc"
+            yield "def"
+            return {'metadata': {'x': 1}}
+
+        text, info = consume(guard_output(source(), max_tokens=0))
+        self.assertEqual(text, "abcdef")
+        self.assertFalse(info['aborted'])
+        self.assertEqual(info['metadata'], {'x': 1})
+
+    def test_aborts_and_closes_source_over_limit(self):
+        closed = []
+
+        def source():
+            try:
+                while True:
+                    yield "palavra " * 10
+            finally:
+                closed.append(True)
+
+        text, info = consume(guard_output(source(), max_tokens=20))
+        self.assertTrue(info['aborted'])
+        self.assertGreaterEqual(info['output_tokens'], 20)
+        self.assertTrue(text)
+        self.assertEqual(closed, [True])
+
+
+class ClientStreamingTests(SimpleTestCase):
+    """Testes do consumo em streaming pelo APIClient."""
+
+    def test_compare_emits_deltas_and_builds_response(self):
+        client = make_client(["Nota ", "8: ", "bom trabalho"])
+        deltas = []
+        response, _ = client.compare(make_data(), on_delta=deltas.append)
+
+        self.assertEqual(deltas, ["Nota ", "8: ", "bom trabalho"])
+        self.assertEqual(response.response, "Nota 8: bom trabalho")
+        self.assertIsNone(response.error)
+        self.assertEqual(response.metadata['usage'], 'ok')
+        self.assertFalse(response.metadata['stream']['aborted'])
+        self.assertEqual(client.plain_calls, 0)
+
+    @override_settings(AI_STREAMING={'MAX_OUTPUT_TOKENS': 5})
+    def test_runaway_generation_is_aborted(self):
+        client = make_client(["texto longo demais " * 5] * 100)
+        response, _ = client.compare(make_data(), on_delta=lambda delta: None)
+
+        self.assertEqual(response.error.code, "output_limit_exceeded")
+        self.assertTrue(response.response)
+        self.assertTrue(response.metadata['stream']['aborted'])
+        self.assertTrue(client.closed)
+
+    def test_cancelled_receiver_stops_the_generation(self):
+        client = make_client(["Nota ", "8: ", "bom trabalho"])
+
+        def cancel(delta):
+            raise StreamCancelled()
+
+        with self.assertRaises(StreamCancelled):
+            client.compare(make_data(), on_delta=cancel)
+        self.assertTrue(client.closed)
+
+    def test_without_receiver_uses_plain_call(self):
+        client = make_client(["ok"])
+        response, _ = client.compare(make_data())
+
+        self.assertEqual(response.response, "ok")
+        self.assertEqual(client.plain_calls, 1)
@@ -0,0 +1,47 @@
+# api/tests/test_template_cache.py
+
+from django.test import SimpleTestCase, override_settings
+
+from api.utils.template_cache import (
+    clear_template_cache,
+    get_compiled_template,
+    get_template_cache_stats,
+    reset_template_cache_stats,
+)
+
+
+class TemplateCacheTests(SimpleTestCase):
+    """Testes do cache de templates de prompt compilados."""
+
+    def setUp(self):
+        clear_template_cache()
+        reset_template_cache_stats()
+
+    def test_same_source_is_compiled_once(self):
+        first = get_compiled_template("Olá {{ nome }}")
+        second = get_compiled_template("Olá {{ nome }}")
+
+        self.assertIs(first, second)
+        self.assertEqual(first.render({"nome": "Ana"}), "Olá Ana")
+        stats = get_template_cache_stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 1)
+
+    @override_settings(PROMPT_TEMPLATE_CACHE_SIZE=2)
+    def test_least_recently_used_entry_is_evicted(self):
+        get_compiled_template("a")
+        get_compiled_template("b")
+        get_compiled_template("a")
+        get_compiled_template("c")
+
+        stats = get_template_cache_stats()
+        self.assertEqual(stats["size"], 2)
+        self.assertEqual(stats["evictions"], 1)
+
+        get_compiled_template("a")
+        self.assertEqual(get_template_cache_stats()["hits"], 2)
+
+    def test_clear_removes_compiled_templates(self):
+        get_compiled_template("x")
+        clear_template_cache()
+        self.assertEqual(get_template_cache_stats()["size"], 0)
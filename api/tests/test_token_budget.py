@@ -0,0 +1,136 @@
+# api/tests/test_token_budget.py
+
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from core.types import AIConfig, AIPrompt, AIResponse
+from core.types.comparison import SingleComparisonRequestData
+from api.utils.clientsIA import APIClient
+from api.utils.response_cache import reset_response_cache
+from api.utils.token_budget import (
+    count_tokens,
+    get_context_limit,
+    get_prompt_limit,
+    reset_tokenizer,
+    shrink_student_content,
+)
+
+# Sem arquivo de tokenizer, a estimativa determinística de ~4 caracteres por token é usada
+BUDGET = {
+    'TOKENIZER_FILE': None,
+    'DEFAULT_CONTEXT_LIMIT': 1000,
+    'CONTEXT_LIMITS': {'tiny': 300},
+    'OUTPUT_RESERVE': 100,
+}
+
+
+class BudgetClient(APIClient):
+    """Cliente que registra os prompts enviados e resume textos."""
+    name = "Budget"
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.prompts = []
+
+    def _call_api(self, prompts: AIPrompt) -> AIResponse:
+        self.prompts.append(prompts)
+        return AIResponse(
+            response="resumo curto",
+            model_name=self.model_name,
+            configurations=self.configurations,
+            processing_time=0.1
+        )
+
+
+class TokenBudgetTests(SimpleTestCase):
+    """Testes das funções de estimativa e redução."""
+
+    def setUp(self):
+        reset_tokenizer()
+        self.addCleanup(reset_tokenizer)
+
+    @override_settings(AI_PROMPT_BUDGET=BUDGET)
+    def test_without_tokenizer_file_nothing_is_loaded(self):
+        with mock.patch.dict('sys.modules', {'tokenizers': None}):
+            self.assertEqual(count_tokens("a" * 40), 10)
+
+    @override_settings(AI_PROMPT_BUDGET=BUDGET)
+    def test_context_limit_uses_longest_prefix_and_output_reserve(self):
+        self.assertEqual(get_context_limit("gpt-4o-mini"), 128000)
+        self.assertEqual(get_context_limit("gpt-4"), 8192)
+        self.assertEqual(get_context_limit("desconhecido"), 1000)
+        self.assertEqual(get_prompt_limit("tiny-model"), 200)
+        self.assertEqual(get_prompt_limit("tiny-model", {"max_tokens": 50}), 250)
+
+    @override_settings(AI_PROMPT_BUDGET=BUDGET)
+    def test_shrink_truncates_longest_field_without_mutating_input(self):
+        student = {"answer": "a" * 4000, "name": "Ana"}
+        shrunk = shrink_student_content(student, excess_tokens=500)
+
+        self.assertEqual(len(student["answer"]), 4000)
+        self.assertEqual(shrunk["name"], "Ana")
+        self.assertLessEqual(count_tokens(shrunk["answer"]), 1000 - 500)
+
+
+@override_settings(AI_PROMPT_BUDGET=BUDGET, AI_RESPONSE_CACHE={'BACKEND': 'none'})
+class APIClientPromptBudgetTests(SimpleTestCase):
+    """Testes da aplicação do orçamento em APIClient.compare."""
+
+    def setUp(self):
+        reset_tokenizer()
+        reset_response_cache()
+        self.addCleanup(reset_tokenizer)
+        self.addCleanup(reset_response_cache)
+
+    def make_client(self):
+        return BudgetClient(AIConfig(
+            api_key="dummy-key",
+            api_url="http://dummy",
+            model_name="tiny-model",
+            prompt="{{ student.answer }}",
+        ))
+
+    def make_data(self, size):
+        return SingleComparisonRequestData(
+            instructor={"answer": "referência"},
+            student_id="s1",
+            student={"answer": "x" * size}
+        )
+
+    def test_small_prompt_records_token_counts(self):
+        client = self.make_client()
+        response, _ = client.compare(self.make_data(100))
+
+        self.assertEqual(response.metadata["tokens"]["limit"], 200)
+        self.assertIsNone(response.metadata["tokens"]["policy"])
+        self.assertEqual(len(client.prompts), 1)
+
+    def test_reject_policy_skips_api_call(self):
+        client = self.make_client()
+        with self.settings(AI_PROMPT_BUDGET={**BUDGET, 'POLICY': 'reject'}):
+            response, _ = client.compare(self.make_data(4000))
+
+        self.assertEqual(response.error.code, "prompt_too_large")
+        self.assertGreater(response.metadata["tokens"]["prompt_tokens"], 200)
+        self.assertEqual(client.prompts, [])
+
+    def test_truncate_policy_fits_prompt_in_budget(self):
+        client = self.make_client()
+        with self.settings(AI_PROMPT_BUDGET={**BUDGET, 'POLICY': 'truncate'}):
+            response, message = client.compare(self.make_data(4000))
+
+        tokens = response.metadata["tokens"]
+        self.assertEqual(tokens["policy"], "truncate")
+        self.assertLessEqual(tokens["prompt"], 200)
+        self.assertGreater(tokens["original_prompt"], 200)
+        self.assertIn("truncado", message.user_message)
+
+    def test_summarize_policy_replaces_student_text(self):
+        client = self.make_client()
+        with self.settings(AI_PROMPT_BUDGET={**BUDGET, 'POLICY': 'summarize'}):
+            response, message = client.compare(self.make_data(4000))
+
+        self.assertEqual(response.metadata["tokens"]["policy"], "summarize")
+        self.assertEqual(len(client.prompts), 2)
+        self.assertIn("resumo curto", message.user_message)
@@ -6,11 +6,12 @@ estabelecendo as rotas de acesso para todos os recursos disponíveis.
 """
 
 import logging
-from anthropic import APIError
 from django.urls import path, include
 from django.urls.resolvers import URLPattern, URLResolver
 from typing import List, Union
 
+from api.exceptions import APIClientException
+
 from api.views.monitoring import (
     monitoring_dashboard, 
     monitoring_data,
@@ -70,7 +71,7 @@ def get_available_endpoints() -> List[str]:
         List[str]: Lista de endpoints registrados.
     
     Raises:
-        APIError: Se ocorrer erro ao analisar as URLs.
+        APIClientException: Se ocorrer erro ao analisar as URLs.
     """
     try:
         result = []
@@ -86,4 +87,4 @@ def get_available_endpoints() -> List[str]:
         return result
     except Exception as e:
         logger.error(f"Erro ao obter endpoints disponíveis: {str(e)}", exc_info=True)
-        raise APIError(f"Erro ao processar rotas da API: {str(e)}")
+        raise APIClientException(f"Erro ao processar rotas da API: {str(e)}")
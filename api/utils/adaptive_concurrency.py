@@ -0,0 +1,301 @@
+"""Limite adaptativo de chamadas simultâneas por provedor e chave de API (AIMD).
+
+Cada par (provedor, chave) tem um limite de concorrência que cresce de forma
+aditiva enquanto as chamadas terminam bem e dentro da latência habitual, e é
+reduzido de forma multiplicativa quando o provedor responde 429, estoura o
+tempo limite ou a latência dispara em relação à linha de base. O limite fica
+sempre entre o piso e o teto configurados.
+
+As filas de comparação (TaskQueue) ocupam uma vaga do limitador a cada
+execução; os clientes de IA informam o desfecho de cada chamada real.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+
+from core.types import JSONDict
+from core.types.ai import AIResponse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ADAPTIVE_CONCURRENCY_SETTINGS: Dict[str, Any] = {
+    'ENABLED': True,
+    'INITIAL_LIMIT': 3,
+    'MIN_LIMIT': 1,
+    'MAX_LIMIT': 16,
+    'INCREASE_STEP': 1,
+    'DECREASE_FACTOR': 0.5,
+    'LATENCY_SPIKE_RATIO': 2.0,
+    'LATENCY_ALPHA': 0.1,
+    'MIN_SAMPLES': 5,
+    'DECREASE_COOLDOWN': 2.0,
+}
+
+OUTCOME_SUCCESS = 'success'
+OUTCOME_THROTTLED = 'throttled'
+OUTCOME_TIMEOUT = 'timeout'
+OUTCOME_ERROR = 'error'
+
+# Intervalo entre tentativas de obter vaga no modo asyncio (segundos)
+ASYNC_POLL_INTERVAL = 0.01
+
+# Instância global para uso em toda a aplicação
+_registry = None
+_registry_lock = threading.RLock()
+
+
+def get_adaptive_concurrency_settings() -> Dict[str, Any]:
+    """Retorna as configurações de concorrência adaptativa mescladas aos valores padrão."""
+    return {**DEFAULT_ADAPTIVE_CONCURRENCY_SETTINGS, **getattr(settings, 'COMPARISON_ADAPTIVE_CONCURRENCY', {})}
+
+
+def classify_response(response: AIResponse) -> str:
+    """Classifica o desfecho de uma chamada para o controle de concorrência.
+
+    Args:
+        response: Resposta da chamada ao provedor.
+
+    O 429 pode vir em status_code ou, nos erros do google.genai, como código
+    numérico em `code` (com status RESOURCE_EXHAUSTED).
+
+    Returns:
+        str: OUTCOME_SUCCESS, OUTCOME_THROTTLED (429), OUTCOME_TIMEOUT ou
+        OUTCOME_ERROR (demais erros, que não alteram o limite).
+    """
+    error = response.error
+    if error is None:
+        return OUTCOME_SUCCESS
+    code = str(error.code or '').lower()
+    if str(error.status_code) == '429' or code == '429' or 'rate_limit' in code or 'resource_exhausted' in code:
+        return OUTCOME_THROTTLED
+    if code == 'timeout':
+        return OUTCOME_TIMEOUT
+    return OUTCOME_ERROR
+
+
+class AIMDLimiter:
+    """Limite de concorrência de um provedor, ajustado por aumento aditivo e redução multiplicativa.
+
+    O aumento é de INCREASE_STEP a cada `limit` chamadas saudáveis (um passo por
+    "rodada" completa de vagas) e só ocorre quando as vagas estão em uso. Uma
+    redução por vez é aplicada a cada DECREASE_COOLDOWN segundos, para que uma
+    rajada de 429 de chamadas já em andamento não derrube o limite ao piso.
+
+    Attributes:
+        name: Identificador do limitador (provedor e hash da chave).
+        limit: Limite atual (fracionário; a parte inteira é o número de vagas).
+        in_flight: Vagas ocupadas.
+    """
+
+    def __init__(self, name: str, config: Dict[str, Any]) -> None:
+        self.name = name
+        self.min_limit = max(1, int(config['MIN_LIMIT']))
+        self.max_limit = max(self.min_limit, int(config['MAX_LIMIT']))
+        self.increase_step = float(config['INCREASE_STEP'])
+        self.decrease_factor = min(max(float(config['DECREASE_FACTOR']), 0.0), 1.0)
+        self.spike_ratio = float(config['LATENCY_SPIKE_RATIO'])
+        self.alpha = float(config['LATENCY_ALPHA'])
+        self.min_samples = int(config['MIN_SAMPLES'])
+        self.cooldown = float(config['DECREASE_COOLDOWN'])
+        self.limit = float(min(max(int(config['INITIAL_LIMIT']), self.min_limit), self.max_limit))
+        self.in_flight = 0
+        self._baseline: Optional[float] = None
+        self._samples = 0
+        self._healthy = 0
+        self._last_decrease = float('-inf')
+        self._counts = {OUTCOME_SUCCESS: 0, OUTCOME_THROTTLED: 0, OUTCOME_TIMEOUT: 0, 'latency_spike': 0}
+        self._listeners: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def slots(self) -> int:
+        """Número de vagas disponíveis pelo limite atual."""
+        return int(self.limit)
+
+    def try_acquire(self) -> bool:
+        """Ocupa uma vaga, se houver.
+
+        Returns:
+            bool: True se a vaga foi obtida.
+        """
+        with self._lock:
+            if self.in_flight >= int(self.limit):
+                return False
+            self.in_flight += 1
+            return True
+
+    async def acquire_async(self) -> None:
+        """Aguarda uma vaga sem bloquear o event loop (usado no modo asyncio).
+
+        Cada chamada consulta o limite atual, de modo que aumentos e reduções
+        valem também para comparações já em andamento.
+        """
+        while not self.try_acquire():
+            await asyncio.sleep(ASYNC_POLL_INTERVAL)
+
+    def release(self) -> None:
+        """Libera uma vaga e avisa as filas que aguardam capacidade."""
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+        self._notify()
+
+    def subscribe(self, callback: Callable[[], None]) -> None:
+        """Registra uma função chamada (sem locks do limitador) quando surgir capacidade."""
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def unsubscribe(self, callback: Callable[[], None]) -> None:
+        """Remove uma função registrada por subscribe()."""
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def _notify(self) -> None:
+        """Avisa os assinantes, alternando quem é avisado primeiro entre as liberações."""
+        with self._lock:
+            listeners = list(self._listeners)
+            if len(self._listeners) > 1:
+                self._listeners.append(self._listeners.pop(0))
+        for callback in listeners:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"[{self.name}] Erro ao avisar fila sobre capacidade: {e}", exc_info=True)
+
+    def record(self, latency: float, outcome: str) -> None:
+        """Ajusta o limite a partir do desfecho de uma chamada ao provedor.
+
+        Args:
+            latency: Duração da chamada em segundos.
+            outcome: Desfecho (OUTCOME_*), ver classify_response.
+        """
+        grew = False
+        with self._lock:
+            previous = self.limit
+            if outcome == OUTCOME_SUCCESS:
+                spike = (
+                    self._baseline is not None
+                    and self._samples >= self.min_samples
+                    and latency > self._baseline * self.spike_ratio
+                )
+                self._samples += 1
+                self._baseline = latency if self._baseline is None else (
+                    self.alpha * latency + (1 - self.alpha) * self._baseline
+                )
+                if spike:
+                    self._counts['latency_spike'] += 1
+                    self._decrease(f"latência {latency:.2f}s acima de {self.spike_ratio}x a linha de base")
+                else:
+                    self._counts[OUTCOME_SUCCESS] += 1
+                    # Só cresce quando as vagas atuais estão sendo usadas
+                    if self.in_flight >= int(self.limit):
+                        self._healthy += 1
+                        if self._healthy >= int(self.limit):
+                            self._healthy = 0
+                            self.limit = min(float(self.max_limit), self.limit + self.increase_step)
+                            grew = int(self.limit) > int(previous)
+            elif outcome in (OUTCOME_THROTTLED, OUTCOME_TIMEOUT):
+                self._counts[outcome] += 1
+                self._decrease(outcome)
+        if grew:
+            logger.debug(f"[{self.name}] Limite de concorrência aumentado para {int(self.limit)}")
+            self._notify()
+
+    def _decrease(self, reason: str) -> None:
+        """Reduz o limite multiplicativamente, respeitando o intervalo mínimo (com _lock)."""
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self._healthy = 0
+        previous = int(self.limit)
+        self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+        logger.info(f"[{self.name}] Limite de concorrência reduzido de {previous} para {int(self.limit)} ({reason})")
+
+    def stats(self) -> JSONDict:
+        """Retorna o estado atual do limitador."""
+        with self._lock:
+            return {
+                'limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'min_limit': self.min_limit,
+                'max_limit': self.max_limit,
+                'baseline_latency': round(self._baseline, 3) if self._baseline is not None else None,
+                'outcomes': dict(self._counts),
+            }
+
+
+class ConcurrencyRegistry:
+    """Limitadores AIMD do processo, um por provedor e chave de API.
+
+    Attributes:
+        config: Configurações de concorrência adaptativa.
+    """
+
+    def __init__(self, config: Dict[str, Any]) -> None:
+        self.config = config
+        self._limiters: Dict[str, AIMDLimiter] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(provider: str, api_key: Optional[str]) -> str:
+        """Gera a chave do limitador sem expor a chave de API."""
+        key_hash = hashlib.sha256((api_key or '').encode('utf-8')).hexdigest()[:16]
+        return f"{provider}:{key_hash}"
+
+    def limiter_for(self, provider: str, api_key: Optional[str]) -> AIMDLimiter:
+        """Obtém (ou cria) o limitador do provedor e chave.
+
+        Args:
+            provider: Nome do provedor (APIClient.name).
+            api_key: Chave de API usada nas chamadas.
+
+        Returns:
+            AIMDLimiter: Limitador compartilhado pelas filas e clientes do par.
+        """
+        key = self.key(provider, api_key)
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = AIMDLimiter(key, self.config)
+                self._limiters[key] = limiter
+            return limiter
+
+    def record(self, provider: str, api_key: Optional[str], latency: float, response: AIResponse) -> None:
+        """Informa o desfecho de uma chamada ao limitador do provedor e chave."""
+        self.limiter_for(provider, api_key).record(latency, classify_response(response))
+
+    def stats(self) -> JSONDict:
+        """Retorna o estado de todos os limitadores, por chave."""
+        with self._lock:
+            limiters = list(self._limiters.items())
+        return {key: limiter.stats() for key, limiter in limiters}
+
+
+def get_concurrency_registry() -> Optional[ConcurrencyRegistry]:
+    """Obtém o registro global de limitadores.
+
+    Returns:
+        Optional[ConcurrencyRegistry]: Registro, ou None se a concorrência
+        adaptativa estiver desabilitada.
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            config = get_adaptive_concurrency_settings()
+            _registry = ConcurrencyRegistry(config) if config['ENABLED'] else False
+        return _registry if _registry is not False else None
+
+
+def reset_concurrency_registry() -> None:
+    """Descarta o registro global (útil em testes e após mudar as configurações)."""
+    global _registry
+    with _registry_lock:
+        _registry = None
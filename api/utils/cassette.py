@@ -0,0 +1,213 @@
+"""Gravação e reprodução (cassete) das chamadas às IAs.
+
+No modo 'record', cada chamada ao provedor (prompts renderizados, modelo,
+configurações, resposta e tempo de resposta) é anexada a um arquivo JSONL. No
+modo 'replay', as respostas gravadas são servidas sem contato com os
+provedores, opcionalmente com as latências originais, o que permite comparar a
+vazão de process_comparison entre versões do código com entradas idênticas.
+
+As chamadas são identificadas pela mesma chave do cache de respostas (cliente,
+modelo, configurações e prompts). Chamadas repetidas da mesma chave são
+reproduzidas na ordem em que foram gravadas; esgotadas as gravações, a última
+é repetida.
+"""
+
+import dataclasses
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from core.types import AIPrompt, AIResponse, APIError, JSONDict
+
+logger = logging.getLogger(__name__)
+
+MODE_OFF = 'off'
+MODE_RECORD = 'record'
+MODE_REPLAY = 'replay'
+
+# Comportamento do replay para chamadas não gravadas
+ON_MISS_ERROR = 'error'
+ON_MISS_LIVE = 'live'
+
+DEFAULT_CASSETTE_SETTINGS: Dict[str, Any] = {
+    'MODE': MODE_OFF,
+    'PATH': 'ai_cassette.jsonl',
+    'PRESERVE_LATENCY': False,
+    'ON_MISS': ON_MISS_ERROR,
+}
+
+# Instância global para uso em toda a aplicação
+_cassette = None
+_cassette_lock = threading.RLock()
+
+
+def serialize_response(response: AIResponse) -> JSONDict:
+    """Converte uma resposta em dicionário serializável."""
+    return {
+        'model_name': response.model_name,
+        'configurations': response.configurations,
+        'processing_time': response.processing_time,
+        'response': response.response,
+        'thinking': response.thinking,
+        'error': dataclasses.asdict(response.error) if response.error else None,
+        'metadata': {k: v for k, v in (response.metadata or {}).items() if k != 'cache'},
+    }
+
+
+def deserialize_response(data: JSONDict) -> AIResponse:
+    """Reconstrói uma resposta gravada."""
+    error = data.get('error')
+    return AIResponse(
+        model_name=data['model_name'],
+        configurations=data.get('configurations') or {},
+        processing_time=data.get('processing_time') or 0.0,
+        response=data.get('response'),
+        thinking=data.get('thinking'),
+        error=APIError(**error) if error else None,
+        metadata=dict(data.get('metadata') or {})
+    )
+
+
+class Cassette:
+    """Arquivo JSONL de chamadas gravadas.
+
+    Attributes:
+        path: Caminho do arquivo.
+        mode: 'record' ou 'replay'.
+        preserve_latency: Se o replay deve aguardar a latência gravada.
+        on_miss: 'error' ou 'live' para chamadas não gravadas no replay.
+    """
+
+    def __init__(self, path: str, mode: str, preserve_latency: bool = False, on_miss: str = ON_MISS_ERROR) -> None:
+        self.path = str(path)
+        self.mode = mode
+        self.preserve_latency = preserve_latency
+        self.on_miss = on_miss
+        self._entries: Dict[str, List[JSONDict]] = defaultdict(list)
+        self._positions: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        if mode == MODE_REPLAY:
+            self._load()
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == MODE_RECORD
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == MODE_REPLAY
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def _load(self) -> None:
+        """Lê as gravações do arquivo, ignorando linhas corrompidas."""
+        if not os.path.exists(self.path):
+            logger.warning(f"Cassete não encontrado para replay: {self.path}")
+            return
+        with open(self.path, encoding='utf-8') as f:
+            for number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    self._entries[entry['key']].append(entry)
+                except (ValueError, KeyError) as e:
+                    logger.warning(f"Linha {number} do cassete ignorada: {e}")
+        logger.info(f"Cassete carregado: {len(self)} chamadas de {self.path}")
+
+    def record(
+        self,
+        key: str,
+        client_name: str,
+        prompts: AIPrompt,
+        response: AIResponse,
+        latency: float
+    ) -> None:
+        """Anexa uma chamada ao arquivo.
+
+        Cada chamada é gravada com uma única escrita em modo append, de forma
+        que processos distintos podem gravar no mesmo arquivo local.
+
+        Args:
+            key: Chave da chamada (build_response_cache_key).
+            client_name: Nome da classe do cliente.
+            prompts: Prompts enviados.
+            response: Resposta obtida.
+            latency: Tempo da chamada em segundos.
+        """
+        entry = {
+            'key': key,
+            'client': client_name,
+            'model': response.model_name,
+            'configurations': response.configurations,
+            'prompts': {'system_message': prompts.system_message, 'user_message': prompts.user_message},
+            'response': serialize_response(response),
+            'latency': round(latency, 4),
+            'recorded_at': time.time(),
+        }
+        line = json.dumps(entry, ensure_ascii=False, default=str) + '\n'
+        try:
+            with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+        except OSError as e:
+            logger.warning(f"Falha ao gravar chamada no cassete {self.path}: {e}")
+
+    def replay(self, key: str) -> Optional[Tuple[AIResponse, float]]:
+        """Obtém a próxima resposta gravada para a chave.
+
+        Args:
+            key: Chave da chamada.
+
+        Returns:
+            Optional[Tuple[AIResponse, float]]: Resposta e latência gravada, ou None se não gravada.
+        """
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                return None
+            position = self._positions[key]
+            self._positions[key] = position + 1
+            entry = entries[min(position, len(entries) - 1)]
+        response = deserialize_response(entry['response'])
+        response.metadata['cassette'] = {'replayed': True, 'original_latency': entry['latency']}
+        return response, entry['latency']
+
+
+def get_cassette_settings() -> Dict[str, Any]:
+    """Retorna as configurações do cassete mescladas aos valores padrão."""
+    return {**DEFAULT_CASSETTE_SETTINGS, **getattr(settings, 'AI_CASSETTE', {})}
+
+
+def get_cassette() -> Optional[Cassette]:
+    """Obtém o cassete do processo conforme settings.AI_CASSETTE.
+
+    Returns:
+        Optional[Cassette]: Cassete ativo ou None se o modo for 'off'.
+    """
+    global _cassette
+    with _cassette_lock:
+        if _cassette is None:
+            config = get_cassette_settings()
+            mode = (config['MODE'] or MODE_OFF).lower()
+            if mode in (MODE_RECORD, MODE_REPLAY):
+                _cassette = Cassette(config['PATH'], mode, config['PRESERVE_LATENCY'], config['ON_MISS'])
+                logger.info(f"Cassete de chamadas de IA ativo: modo={mode}, arquivo={config['PATH']}")
+            else:
+                if mode != MODE_OFF:
+                    logger.warning(f"Modo de cassete desconhecido: {mode}, cassete desativado")
+                _cassette = False
+        return _cassette if _cassette is not False else None
+
+
+def reset_cassette() -> None:
+    """Descarta o cassete global, forçando nova leitura das configurações."""
+    global _cassette
+    with _cassette_lock:
+        _cassette = None
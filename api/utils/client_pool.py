@@ -0,0 +1,188 @@
+"""Pool de clientes de SDK dos provedores de IA.
+
+Cada instância de APIClient é criada por tarefa, mas os objetos de transporte
+dos SDKs (OpenAI, Anthropic, genai, Azure) mantêm pools de conexões HTTP que
+só compensam quando reaproveitados. Este módulo mantém, por processo, um SDK
+client por (classe do cliente, tipo, hash da chave de API, URL), permitindo
+reutilizar conexões keep-alive e evitar novos handshakes TLS a cada chamada.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SETTINGS: Dict[str, Any] = {
+    'ENABLED': True,
+    'IDLE_TIMEOUT': 300,
+    'MAX_SIZE': 64,
+}
+
+PoolKey = Tuple[str, str, str, str]
+
+# Instância global para uso em toda a aplicação
+_client_pool = None
+_client_pool_lock = threading.RLock()
+
+
+def build_pool_key(client_name: str, kind: str, api_key: Optional[str], api_url: Optional[str]) -> PoolKey:
+    """Gera a chave do pool sem manter a chave de API em texto claro.
+
+    Args:
+        client_name: Nome do cliente de IA (ex: 'OpenAi').
+        kind: Tipo do objeto de SDK (ex: 'sync').
+        api_key: Chave de API utilizada.
+        api_url: URL base da API.
+
+    Returns:
+        PoolKey: Tupla que identifica o SDK client.
+    """
+    key_hash = hashlib.sha256((api_key or '').encode('utf-8')).hexdigest()[:16]
+    return (client_name, kind, key_hash, api_url or '')
+
+
+class ClientPool:
+    """Pool thread-safe de SDK clients compartilhados entre instâncias de APIClient.
+
+    Entradas sem uso por mais de `idle_timeout` segundos são removidas do pool;
+    quando o limite `max_size` é atingido, a entrada usada há mais tempo é removida.
+    Entradas removidas não são fechadas explicitamente, pois ainda podem estar
+    em uso por uma tarefa em andamento; suas conexões são liberadas quando o
+    objeto deixa de ser referenciado.
+
+    Attributes:
+        idle_timeout: Tempo máximo sem uso antes da remoção (segundos).
+        max_size: Número máximo de SDK clients mantidos.
+    """
+
+    def __init__(self, idle_timeout: float, max_size: int) -> None:
+        self.idle_timeout = idle_timeout
+        self.max_size = max_size
+        self._entries: Dict[PoolKey, list] = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def acquire(self, key: PoolKey, factory: Callable[[], Any]) -> Any:
+        """Obtém o SDK client da chave, criando-o com `factory` se necessário.
+
+        Args:
+            key: Chave gerada por build_pool_key.
+            factory: Função que cria o SDK client.
+
+        Returns:
+            Any: SDK client compartilhado.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[1] = now
+                self._stats['hits'] += 1
+                return entry[0]
+            self._stats['misses'] += 1
+
+        # Cria fora do lock; em caso de corrida, prevalece o primeiro registrado
+        client = factory()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[1] = now
+                return entry[0]
+            self._entries[key] = [client, now]
+            while len(self._entries) > self.max_size:
+                oldest = min(self._entries, key=lambda k: self._entries[k][1])
+                del self._entries[oldest]
+                self._stats['evictions'] += 1
+        logger.debug(f"SDK client criado para {key[0]}/{key[1]} ({key[3] or 'url padrão'})")
+        return client
+
+    def _evict_idle(self, now: float) -> None:
+        """Remove entradas ociosas (chamado com o lock)."""
+        expired = [k for k, (_, last_used) in self._entries.items() if now - last_used > self.idle_timeout]
+        for key in expired:
+            del self._entries[key]
+            self._stats['evictions'] += 1
+        if expired:
+            logger.debug(f"{len(expired)} SDK clients ociosos removidos do pool")
+
+    def evict_idle(self) -> None:
+        """Remove imediatamente as entradas ociosas."""
+        with self._lock:
+            self._evict_idle(time.monotonic())
+
+    def clear(self) -> None:
+        """Remove todas as entradas do pool."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Retorna as estatísticas de uso do pool.
+
+        Returns:
+            Dict[str, int]: Contadores de hits, misses, evictions e tamanho atual.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+        return stats
+
+
+def _pool_settings() -> Dict[str, Any]:
+    """Retorna as configurações do pool mescladas aos valores padrão."""
+    return {**DEFAULT_POOL_SETTINGS, **getattr(settings, 'AI_CLIENT_POOL', {})}
+
+
+def get_client_pool() -> Optional[ClientPool]:
+    """Obtém o pool de SDK clients do processo, criando-o na primeira chamada.
+
+    Returns:
+        Optional[ClientPool]: Pool configurado ou None se desativado.
+    """
+    global _client_pool
+    with _client_pool_lock:
+        if _client_pool is None:
+            config = _pool_settings()
+            if config['ENABLED']:
+                _client_pool = ClientPool(config['IDLE_TIMEOUT'], config['MAX_SIZE'])
+            else:
+                _client_pool = False
+        return _client_pool or None
+
+
+def get_pooled_client(
+    client_name: str,
+    kind: str,
+    api_key: Optional[str],
+    api_url: Optional[str],
+    factory: Callable[[], Any]
+) -> Any:
+    """Obtém um SDK client do pool ou cria um novo se o pool estiver desativado.
+
+    Args:
+        client_name: Nome do cliente de IA.
+        kind: Tipo do objeto de SDK.
+        api_key: Chave de API utilizada.
+        api_url: URL base da API.
+        factory: Função que cria o SDK client.
+
+    Returns:
+        Any: SDK client.
+    """
+    pool = get_client_pool()
+    if pool is None:
+        return factory()
+    return pool.acquire(build_pool_key(client_name, kind, api_key, api_url), factory)
+
+
+def reset_client_pool() -> None:
+    """Descarta o pool global, forçando nova leitura das configurações."""
+    global _client_pool
+    with _client_pool_lock:
+        _client_pool = None
@@ -6,29 +6,30 @@ diversas APIs de IA. A documentação segue o padrão Google e os tratamentos de
 exceções centralizadas para uniformizar os erros.
 """
 
+from __future__ import annotations
+
+import asyncio
 from datetime import datetime
+import importlib
 import io
 import json
 import os
-from typing import Any, Dict, TypeVar, Tuple
+import threading
+import time
+from typing import Any, Dict, List, Optional, TypeVar, Tuple
 import uuid
-import anthropic
-from google import genai
-from google.genai import types as google_types
+import httpx
 import requests
-from azure.ai.inference import ChatCompletionsClient
-from azure.core.credentials import AzureKeyCredential
-from llamaapi import LlamaAPI
-from openai import AsyncOpenAI, AzureOpenAI, OpenAI
-from openai.types import FileObject
-from openai.types.fine_tuning import FineTuningJob
+from requests.adapters import HTTPAdapter
 import html
 import logging
 from dotenv import load_dotenv
 
 from api.exceptions import (
     APICommunicationException, 
-    MissingAPIKeyException
+    MissingAPIKeyException,
+    PromptTooLargeException,
+    RateLimitExceededException
 )
 
 from core.types import (
@@ -42,12 +43,45 @@ from core.types import (
     APIError
 )
 
-from django.template import engines
 from api.utils.circuit_breaker import (
     attempt_call,
     record_failure,
     record_success,
 )
+from api.utils.adaptive_concurrency import get_concurrency_registry
+from api.utils.cassette import ON_MISS_LIVE as CASSETTE_ON_MISS_LIVE, Cassette, get_cassette
+from api.utils.client_pool import get_pooled_client
+from api.utils.rate_limiter import estimate_prompt_tokens, get_rate_limiter
+from api.utils.response_cache import build_response_cache_key, get_response_cache
+from api.utils.prompt_cache import (
+    PROBE_MARKERS,
+    TemplateProbe,
+    cache_usage,
+    get_cached_content_registry,
+    get_prefix_cache_settings,
+    get_probe_prefix,
+    probe_key,
+    shared_prefix_length,
+)
+from api.utils.simulation import OUTCOME_ERROR, OUTCOME_OK, OUTCOME_RATE_LIMITED, SimulationProfile
+from api.utils.streaming import (
+    DeltaCallback, DeltaStream, StreamCancelled, consume, get_streaming_settings, guard_output
+)
+from api.utils.template_cache import get_compiled_template
+from core.utils.deadline import bounded_timeout, is_expired
+from core.utils.task_executor import get_task_executor
+from api.utils.token_budget import (
+    POLICY_NONE,
+    POLICY_REJECT,
+    POLICY_SUMMARIZE,
+    count_prompt_tokens,
+    get_budget_settings,
+    get_prompt_limit,
+    longest_text_fields,
+    replace_text_field,
+    shrink_student_content,
+    truncate_to_tokens,
+)
 from core.types.ai import AIExampleDict, AIResult
 from core.types.api import APIFile, APIFileCollection, APIModel, APIModelCollection
 from core.types.status import EntityStatus
@@ -60,6 +94,27 @@ load_dotenv()
 T = TypeVar('T')
 AI_CLIENT_MAPPING: Dict[str, type] = {}
 
+# SDKs dos provedores. São importados na primeira instanciação de cada cliente
+# (ver load_client_sdk), para que processos que usam apenas alguns provedores
+# não paguem o tempo de importação e a memória dos demais.
+anthropic = None
+genai = None
+google_types = None
+openai = None
+azure_inference = None
+azure_inference_aio = None
+azure_credentials = None
+llamaapi = None
+_sdk_lock = threading.Lock()
+
+# Opções de transporte HTTP usadas quando a configuração global não as define
+DEFAULT_HTTP_OPTIONS: Dict[str, Any] = {
+    'pool_size': 10,
+    'connect_timeout': 10.0,
+    'read_timeout': 120.0,
+    'compression': True,
+}
+
 def register_ai_client(cls: type) -> type:
     """Registra uma classe de cliente de IA no mapeamento global.
 
@@ -74,6 +129,36 @@ def register_ai_client(cls: type) -> type:
     return cls
 
 
+def load_client_sdk(cls: type) -> None:
+    """Importa os SDKs declarados em `cls.sdk_modules`, se ainda não carregados.
+
+    Os módulos são publicados nos nomes globais deste módulo (ex: `openai`),
+    usados pelos métodos dos clientes.
+
+    Args:
+        cls (type): Classe de cliente registrada.
+    """
+    module_globals = globals()
+    with _sdk_lock:
+        for alias, module_path in cls.sdk_modules.items():
+            if module_globals.get(alias) is not None:
+                continue
+            start = time.perf_counter()
+            module_globals[alias] = importlib.import_module(module_path)
+            logger.info(f"[{cls.name}] SDK {module_path} carregado em {time.perf_counter() - start:.2f}s")
+
+
+def _is_timeout_error(error: Exception) -> bool:
+    """Indica se a exceção de um SDK corresponde a um timeout da chamada."""
+    timeout_types = (
+        TimeoutError,
+        httpx.TimeoutException,
+        requests.exceptions.Timeout,
+    )
+    # Os SDKs (openai.APITimeoutError, anthropic.APITimeoutError) são reconhecidos pelo nome
+    return isinstance(error, timeout_types) or 'timeout' in type(error).__name__.lower()
+
+
 class APIClient:
     """Classe base abstrata para implementação de clientes de IA.
 
@@ -82,6 +167,9 @@ class APIClient:
     Atributos:
         name (str): Nome identificador do cliente.
         can_train (bool): Indica se o cliente suporta treinamento.
+        supports_batch (bool): Indica se o cliente suporta envio em lote (Batch API).
+        supports_streaming (bool): Indica se o cliente implementa _stream_api.
+        sdk_modules (dict): SDKs importados na primeira instanciação (nome global -> módulo).
 <<<<<<< HEAD
         supports_system_message (bool): Indica se o cliente aceita mensagem do sistema.
 =======
@@ -106,6 +194,9 @@ class APIClient:
     name = ''
     can_train = False
     supports_system_message = True
+    supports_batch = False
+    supports_streaming = False
+    sdk_modules: Dict[str, str] = {}
 
     def __init__(self, config: AIConfig) -> None:
         """Inicializa o cliente com as configurações de IA.
@@ -128,12 +219,34 @@ class APIClient:
         self.base_instruction = config.base_instruction or ''
         self.prompt = config.prompt or ''
         self.responses = config.responses or ''
+        self.use_response_cache = config.use_response_cache
+        self.http_options = {**DEFAULT_HTTP_OPTIONS, **(config.http_options or {})}
+        self.rate_limits = config.rate_limits or {}
+        # Prazo da requisição (epoch); limita o timeout de cada chamada ao SDK
+        self.deadline: Optional[float] = None
 
         if not self.api_key:
             raise MissingAPIKeyException(f"{self.name}: Chave de API não configurada.")
 
+        load_client_sdk(type(self))
+
         logger.debug(f"[{self.name}] {self.__class__.__name__}.__init__: Inicializado com configurações: {self.configurations}")
 
+    def _pooled_client(self, kind: str, factory) -> Any:
+        """Obtém um SDK client compartilhado do pool do processo.
+
+        Instâncias com a mesma chave de API e URL reutilizam o mesmo objeto de
+        transporte e, com ele, as conexões HTTP já abertas.
+
+        Args:
+            kind (str): Tipo do objeto de SDK (ex: 'sync').
+            factory (Callable[[], Any]): Função que cria o SDK client.
+
+        Returns:
+            Any: SDK client.
+        """
+        return get_pooled_client(self.name, kind, self.api_key, self.api_url, factory)
+
     def _render_template(self, template: str, context: JSONDict) -> str:
         """Renderiza um template utilizando a engine Django.
 
@@ -148,8 +261,7 @@ class APIClient:
             APICommunicationException: Se ocorrer erro na renderização.
         """
         try:
-            django_engine = engines['django']
-            template_engine = django_engine.from_string(template)
+            template_engine = get_compiled_template(template)
             return template_engine.render(context)
         except Exception as e:
             logger.error(f"[{self.name}] Erro ao renderizar template: {e}", exc_info=True)
@@ -172,291 +284,958 @@ class APIClient:
             data_dict['ai_name'] = self.name
             data_dict['answer_format'] = self.responses
 
-            base_instruction = html.unescape(self._render_template(self.base_instruction, data_dict))
-            prompt = html.unescape(self._render_template(self.prompt, data_dict))
-
-            if self.use_system_message and self.supports_system_message:
-                return AIPrompt(
-                    system_message=base_instruction,
-                    user_message=prompt
-                )
-            else:
-                combined_prompt = (base_instruction + "\n" + prompt).strip()
-                return AIPrompt(
-                    system_message='',
-                    user_message=combined_prompt
-                )
+            message = self._render_prompts(data_dict)
+            if get_prefix_cache_settings()['ENABLED']:
+                message.cache_prefix_length = self._cacheable_prefix_length(data_dict, message)
+            return message
         except Exception as e:
             logger.error(f"[{self.name}] Erro ao preparar prompts: {e}", exc_info=True)
             raise APICommunicationException(f"Erro ao preparar prompts: {e}")
 
-    def compare(self, data: SingleComparisonRequestData) -> Tuple[AIResponse, AIPrompt]:
+    def _render_prompts(self, context: JSONDict) -> AIPrompt:
+        """Renderiza a instrução base e o prompt com o contexto informado.
+
+        Args:
+            context (JSONDict): Variáveis dos templates.
+
+        Returns:
+            AIPrompt: Mensagens de sistema e do usuário.
+        """
+        base_instruction = html.unescape(self._render_template(self.base_instruction, context))
+        prompt = html.unescape(self._render_template(self.prompt, context))
+
+        if self.use_system_message and self.supports_system_message:
+            return AIPrompt(
+                system_message=base_instruction,
+                user_message=prompt
+            )
+        combined_prompt = (base_instruction + "\n" + prompt).strip()
+        return AIPrompt(
+            system_message='',
+            user_message=combined_prompt
+        )
+
+    def _cacheable_prefix_length(self, context: JSONDict, message: AIPrompt) -> int:
+        """Localiza o prefixo da mensagem do usuário que não depende do aluno.
+
+        Os templates são renderizados com sondas no lugar dos dados do aluno; o
+        trecho comum às duas renderizações é o prefixo cacheável. As sondas são
+        renderizadas uma vez por template e instrutor e reaproveitadas para os
+        demais alunos do job.
+
+        Args:
+            context (JSONDict): Variáveis usadas na renderização real.
+            message (AIPrompt): Prompts renderizados com os dados reais.
+
+        Returns:
+            int: Tamanho do prefixo (0 se a mensagem de sistema depender do aluno).
+        """
+        use_system = self.use_system_message and self.supports_system_message
+        key = probe_key(context, self.name, self.base_instruction, self.prompt, use_system)
+        prefix = get_probe_prefix(key, lambda: self._probe_prefix(context))
+        if prefix is None:
+            return 0
+        return shared_prefix_length(message.user_message, prefix, prefix)
+
+    def _probe_prefix(self, context: JSONDict) -> Optional[str]:
+        """Renderiza os templates com as duas sondas e retorna o prefixo comum.
+
+        Args:
+            context (JSONDict): Variáveis usadas na renderização real.
+
+        Returns:
+            Optional[str]: Prefixo comum às sondas, ou None se a mensagem de
+            sistema depender do aluno ou a renderização falhar.
+        """
+        try:
+            probes = [
+                self._render_prompts({**context, 'student': TemplateProbe(marker), 'student_id': marker})
+                for marker in PROBE_MARKERS
+            ]
+        except Exception as e:
+            logger.debug(f"[{self.name}] Prefixo cacheável não determinado: {e}")
+            return None
+        if probes[0].system_message != probes[1].system_message:
+            return None
+        return os.path.commonprefix([probes[0].user_message, probes[1].user_message])
+
+    def compare(
+        self,
+        data: SingleComparisonRequestData,
+        on_delta: Optional[DeltaCallback] = None
+    ) -> Tuple[AIResponse, AIPrompt]:
         """Compara dados utilizando a API de IA.
 
         Args:
             data (SingleComparisonRequestData): Dados para comparação.
+            on_delta (Optional[DeltaCallback]): Função chamada com cada trecho de
+                texto gerado; ativa o streaming nos clientes que o suportam.
 
         Returns:
             Tuple[AIResponse, AIPrompt]: Tupla contendo a resposta da API e os prompts utilizados.
 
         Raises:
             APICommunicationException: Se ocorrer erro durante a comparação.
+            StreamCancelled: Se o receptor de trechos cancelar a geração.
         """
         try:
             logger.debug(f"[{self.name}] Iniciando comparação de dados")
             message = self._prepare_prompts(data)
-            response = self._call_api(message)
+            try:
+                message, token_info = self._apply_prompt_budget(data, message)
+            except PromptTooLargeException as e:
+                return (self._prompt_too_large_response(e), message)
+            if is_expired(self.deadline):
+                return (self._deadline_response(), message)
+            response = self._call_api_cached(message, on_delta)
+            response.metadata['tokens'] = token_info
             return (response, message)
+        except StreamCancelled:
+            raise
         except Exception as e:
             logger.error(f"[{self.name}] Erro ao comparar dados: {e}", exc_info=True)
             raise APICommunicationException(f"Erro na comparação: {e}")
 
-    def _call_api(self, prompts: AIPrompt) -> AIResponse:
-        """Método abstrato para chamar a API específica.
+    async def compare_async(self, data: SingleComparisonRequestData) -> Tuple[AIResponse, AIPrompt]:
+        """Versão assíncrona de compare, para uso dentro de um event loop.
 
         Args:
-            prompts (AIPrompt): Objeto com os prompts preparados.
+            data (SingleComparisonRequestData): Dados para comparação.
 
         Returns:
-            AIResponse: Resposta da API com metadados.
+            Tuple[AIResponse, AIPrompt]: Tupla contendo a resposta da API e os prompts utilizados.
 
         Raises:
-            NotImplementedError: Se não implementado pela subclasse.
+            APICommunicationException: Se ocorrer erro durante a comparação.
         """
-        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar _call_api")
+        try:
+            logger.debug(f"[{self.name}] Iniciando comparação assíncrona de dados")
+            message = self._prepare_prompts(data)
+            try:
+                # A redução do conteúdo pode chamar a API (resumo); roda fora do event loop
+                message, token_info = await asyncio.to_thread(self._apply_prompt_budget, data, message)
+            except PromptTooLargeException as e:
+                return (self._prompt_too_large_response(e), message)
+            if is_expired(self.deadline):
+                return (self._deadline_response(), message)
+            try:
+                response = await asyncio.wait_for(
+                    self._call_api_cached_async(message),
+                    timeout=bounded_timeout(None, self.deadline)
+                )
+            except asyncio.TimeoutError:
+                return (self._deadline_response(), message)
+            response.metadata['tokens'] = token_info
+            return (response, message)
+        except Exception as e:
+            logger.error(f"[{self.name}] Erro ao comparar dados: {e}", exc_info=True)
+            raise APICommunicationException(f"Erro na comparação: {e}")
 
-    def _prepare_train(self, file: AIFile) -> Any:
-        """Prepara os dados para treinamento no formato esperado pela API.
+    def _apply_prompt_budget(
+        self,
+        data: SingleComparisonRequestData,
+        message: AIPrompt
+    ) -> Tuple[AIPrompt, JSONDict]:
+        """Estima os tokens do prompt e aplica a política de orçamento se exceder o limite.
+
+        Com as políticas 'truncate' e 'summarize', o conteúdo do aluno é reduzido
+        (truncando ou resumindo os campos de texto mais longos) e os prompts são
+        preparados novamente.
 
         Args:
-            file (AIFile): Dados do arquivo de treinamento.
+            data (SingleComparisonRequestData): Dados da comparação.
+            message (AIPrompt): Prompts já preparados.
 
         Returns:
-            Any: Dados preparados para treinamento.
+            Tuple[AIPrompt, JSONDict]: Prompts dentro do limite e contagem de tokens
+            ('prompt', 'limit', 'policy' e, se reduzido, 'original_prompt').
 
         Raises:
-            NotImplementedError: Se não implementado pela subclasse.
+            PromptTooLargeException: Se o prompt exceder o limite e não puder ser reduzido.
         """
-        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar _prepare_train")
+        limit = get_prompt_limit(self.model_name, self.configurations)
+        tokens = count_prompt_tokens(message)
+        token_info = {'prompt': tokens, 'limit': limit, 'policy': None}
+        policy = get_budget_settings()['POLICY']
+        if tokens <= limit or policy == POLICY_NONE:
+            return message, token_info
+
+        if policy == POLICY_REJECT:
+            raise PromptTooLargeException(
+                f"Prompt com {tokens} tokens excede o limite de {limit} do modelo {self.model_name}",
+                prompt_tokens=tokens,
+                limit=limit
+            )
 
-    def train(self, file: AIFile) -> TrainingResponse:
-        """Prepara e inicia o treinamento utilizando os dados do arquivo.
+        logger.info(f"[{self.name}] Prompt com {tokens} tokens excede o limite de {limit}; aplicando '{policy}'")
+        original_tokens = tokens
+        if policy == POLICY_SUMMARIZE:
+            data.student = self._summarize_student_content(data.student, tokens - limit)
+            message = self._prepare_prompts(data)
+            tokens = count_prompt_tokens(message)
+
+        # Truncamento (também usado como complemento do resumo)
+        for _ in range(3):
+            if tokens <= limit:
+                break
+            data.student = shrink_student_content(data.student, tokens - limit)
+            message = self._prepare_prompts(data)
+            tokens = count_prompt_tokens(message)
+
+        if tokens > limit:
+            raise PromptTooLargeException(
+                f"Prompt com {tokens} tokens continua acima do limite de {limit} após '{policy}'",
+                prompt_tokens=tokens,
+                limit=limit
+            )
+        token_info.update({'prompt': tokens, 'original_prompt': original_tokens, 'policy': policy})
+        return message, token_info
+
+    def _summarize_student_content(self, student: JSONDict, excess_tokens: int) -> JSONDict:
+        """Substitui os campos de texto mais longos do aluno por resumos gerados pelo modelo.
 
         Args:
-            file (AIFile): Dados do arquivo de treinamento.
+            student (JSONDict): Dados do aluno (não são alterados).
+            excess_tokens (int): Tokens que precisam ser removidos.
 
         Returns:
-            TrainingResponse: Resultado inicial do treinamento com job_id.
+            JSONDict: Cópia dos dados com os campos resumidos.
+        """
+        limit = get_prompt_limit(self.model_name, self.configurations)
+        remaining = excess_tokens
+        for path, text in longest_text_fields(student):
+            if remaining <= 0:
+                break
+            original = count_prompt_tokens(AIPrompt(user_message=text, system_message=''))
+            summary_prompt = AIPrompt(
+                system_message=(
+                    "Resuma o texto a seguir em português, preservando o conteúdo técnico, "
+                    "as respostas e os argumentos do aluno. Responda apenas com o resumo."
+                ),
+                user_message=truncate_to_tokens(text, limit - 256)
+            )
+            summary = self._call_api_limited(summary_prompt)
+            if summary.error or not summary.response:
+                logger.warning(f"[{self.name}] Falha ao resumir conteúdo do aluno: {summary.error}")
+                break
+            student = replace_text_field(student, path, summary.response)
+            remaining -= original - count_prompt_tokens(AIPrompt(user_message=summary.response, system_message=''))
+        return student
 
-        Raises:
-            NotImplementedError: Se a IA não suportar treinamento.
+    def _call_timeout(self) -> float:
+        """Timeout de leitura da próxima chamada: read_timeout limitado ao restante do prazo.
+
+        Returns:
+            float: Tempo limite em segundos.
         """
-        if not self.can_train:
-            logger.warning(f"[{self.name}] Tentativa de treinamento em cliente sem suporte a treinamento")
-            raise NotImplementedError(f"[{self.name}] Este cliente não suporta treinamento.")
+        return max(0.1, bounded_timeout(self.http_options['read_timeout'], self.deadline))
 
-        prepared_file_data = self._prepare_train(file)
-        return self._start_training(prepared_file_data)
+    def _deadline_response(self) -> AIResponse:
+        """Cria a resposta de erro para uma chamada abandonada pelo prazo da requisição.
 
-    def _start_training(self, training_data: Any) -> TrainingResponse:
-        """Método abstrato para iniciar o treinamento.
+        Returns:
+            AIResponse: Resposta contendo o erro estruturado de timeout.
+        """
+        logger.warning(f"[{self.name}] Prazo da requisição esgotado; chamada não realizada")
+        return AIResponse(
+            model_name=self.model_name,
+            error=APIError(
+                message="Prazo da requisição esgotado antes da resposta da IA",
+                code="deadline_exceeded",
+                status_code=504,
+                resource=f"ai/{self.model_name}",
+                additional_data={'deadline': self.deadline}
+            ),
+            configurations=self.configurations,
+            processing_time=0.0
+        )
+
+    def _prompt_too_large_response(self, error: PromptTooLargeException) -> AIResponse:
+        """Cria a resposta de erro para um prompt rejeitado antes da chamada.
 
         Args:
-            training_data (Any): Dados preparados para treinamento.
+            error (PromptTooLargeException): Exceção com a contagem de tokens.
 
         Returns:
-            TrainingResponse: Resultado inicial do treinamento.
+            AIResponse: Resposta contendo o erro.
+        """
+        logger.warning(f"[{self.name}] {error}")
+        return AIResponse(
+            model_name=self.model_name,
+            error=APIError(
+                message=str(error),
+                code="prompt_too_large",
+                resource=f"ai/{self.model_name}"
+            ),
+            configurations=self.configurations,
+            processing_time=0.0,
+            metadata={'tokens': error.additional_data}
+        )
 
-        Raises:
-            NotImplementedError: Se não implementado pela subclasse.
+    def _response_cache_key(self, prompts: AIPrompt) -> str:
+        """Gera a chave de cache de resposta para os prompts informados.
+
+        Args:
+            prompts (AIPrompt): Objeto com os prompts preparados.
+
+        Returns:
+            str: Chave da chamada no cache de respostas.
         """
-        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar _start_training")
+        return build_response_cache_key(
+            self.__class__.__name__,
+            self.model_name,
+            self.configurations,
+            prompts
+        )
 
-    def get_training_status(self, job_id: str) -> TrainingResponse:
-        """Verifica o status atual do treinamento.
+    def _call_api_cached(self, prompts: AIPrompt, on_delta: Optional[DeltaCallback] = None) -> AIResponse:
+        """Chama a API reaproveitando respostas idênticas do cache, quando habilitado.
 
         Args:
-            job_id (str): ID do job de treinamento.
+            prompts (AIPrompt): Objeto com os prompts preparados.
+            on_delta (Optional[DeltaCallback]): Receptor dos trechos gerados; uma
+                resposta do cache é repassada como um único trecho.
 
         Returns:
-            TrainingResponse: Status atual do treinamento.
+            AIResponse: Resposta do cache ou da API.
+        """
+        cache = get_response_cache() if self.use_response_cache else None
+        if cache is None:
+            return self._call_api_limited(prompts, on_delta)
+
+        key = self._response_cache_key(prompts)
+        cached = cache.get(key)
+        if cached is not None:
+            logger.debug(f"[{self.name}] Resposta obtida do cache")
+            if on_delta and cached.response:
+                on_delta(cached.response)
+            return cached
+
+        response = self._call_api_limited(prompts, on_delta)
+        cache.set(key, response)
+        response.metadata['cache'] = {'hit': False}
+        return response
+
+    async def _call_api_cached_async(self, prompts: AIPrompt) -> AIResponse:
+        """Versão assíncrona de _call_api_cached.
 
-        Raises:
-            NotImplementedError: Se não implementado pela subclasse.
+        Args:
+            prompts (AIPrompt): Objeto com os prompts preparados.
+
+        Returns:
+            AIResponse: Resposta do cache ou da API.
         """
-        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar get_training_status.")
+        cache = get_response_cache() if self.use_response_cache else None
+        if cache is None:
+            return await self._call_api_limited_async(prompts)
 
-    def _call_train_api(self, training_data: str) -> AIResponse:
-        """Método abstrato para chamar a API de treinamento.
+        key = self._response_cache_key(prompts)
+        cached = cache.get(key)
+        if cached is not None:
+            logger.debug(f"[{self.name}] Resposta obtida do cache")
+            return cached
+
+        response = await self._call_api_limited_async(prompts)
+        cache.set(key, response)
+        response.metadata['cache'] = {'hit': False}
+        return response
+
+    def _rate_limit_args(self, prompts: AIPrompt) -> JSONDict:
+        """Monta os argumentos do limitador de taxa para a chamada.
 
         Args:
-            training_data (str): Dados de treinamento preparados.
+            prompts (AIPrompt): Objeto com os prompts preparados.
 
         Returns:
-            AIResponse: Objeto representando o modelo treinado.
+            JSONDict: Argumentos para RateLimiter.acquire.
+        """
+        return {
+            'api_name': self.name,
+            'api_key': self.api_key,
+            'model_name': self.model_name,
+            'rpm': self.rate_limits.get('rpm', 0),
+            'tpm': self.rate_limits.get('tpm', 0),
+            'tokens': estimate_prompt_tokens(prompts),
+            # A espera por capacidade não ultrapassa o prazo da requisição
+            'max_wait': bounded_timeout(None, self.deadline),
+        }
+
+    def _call_api_limited(self, prompts: AIPrompt, on_delta: Optional[DeltaCallback] = None) -> AIResponse:
+        """Aguarda capacidade no limitador de taxa e chama a API.
+
+        A chamada usa streaming quando há receptor de trechos ou quando
+        AI_STREAMING['ENABLED'] está ativo, desde que o cliente o suporte. Com o
+        cassete (AI_CASSETTE) ativo, a chamada é gravada ou servida da gravação.
+        Chamadas reais ocupam uma vaga do limite de chamadas simultâneas aos
+        provedores do processo (TASK_EXECUTOR['MAX_PROVIDER_CALLS']) e têm o
+        desfecho informado ao limite adaptativo do provedor
+        (COMPARISON_ADAPTIVE_CONCURRENCY).
+
+        Args:
+            prompts (AIPrompt): Objeto com os prompts preparados.
+            on_delta (Optional[DeltaCallback]): Receptor dos trechos gerados; uma
+                resposta reproduzida do cassete é repassada como um único trecho.
+
+        Returns:
+            AIResponse: Resposta da API.
 
         Raises:
-            NotImplementedError: Se não implementado pela subclasse.
+            RateLimitExceededException: Se não houver capacidade dentro do tempo máximo de espera.
         """
-        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar o método _call_train_api.")
+        cassette = get_cassette()
+        if cassette is not None and cassette.replaying:
+            replayed = self._replay_cassette(cassette, prompts)
+            if replayed is not None:
+                response, wait = replayed
+                if wait:
+                    time.sleep(wait)
+                if on_delta and response.response:
+                    on_delta(response.response)
+                return response
+
+        if self.rate_limits.get('rpm') or self.rate_limits.get('tpm'):
+            get_rate_limiter().acquire(**self._rate_limit_args(prompts))
+        executor = get_task_executor()
+        if not executor.acquire_provider_slot(bounded_timeout(None, self.deadline)):
+            return self._deadline_response()
+        start = time.monotonic()
+        try:
+            if self.supports_streaming and (on_delta or get_streaming_settings()['ENABLED']):
+                response = self._call_api_streaming(prompts, on_delta)
+            else:
+                response = self._call_api(prompts)
+        finally:
+            executor.release_provider_slot()
+        self._record_call(cassette, prompts, response, time.monotonic() - start)
+        return response
 
-    def api_list_models(self, list_trained_models: bool = True, list_base_models: bool = True) -> AIResponse:
-        """Lista os modelos disponíveis na API.
+    async def _call_api_limited_async(self, prompts: AIPrompt) -> AIResponse:
+        """Versão assíncrona de _call_api_limited.
 
         Args:
-            list_trained_models (bool): Se True, inclui modelos fine-tuned.
-            list_base_models (bool): Se True, inclui modelos base.
+            prompts (AIPrompt): Objeto com os prompts preparados.
 
         Returns:
-            APIModelCollection: Lista de modelos disponíveis.
+            AIResponse: Resposta da API.
+        """
+        cassette = get_cassette()
+        if cassette is not None and cassette.replaying:
+            replayed = self._replay_cassette(cassette, prompts)
+            if replayed is not None:
+                response, wait = replayed
+                if wait:
+                    await asyncio.sleep(wait)
+                return response
+
+        if self.rate_limits.get('rpm') or self.rate_limits.get('tpm'):
+            await get_rate_limiter().acquire_async(**self._rate_limit_args(prompts))
+        executor = get_task_executor()
+        if not await executor.acquire_provider_slot_async(bounded_timeout(None, self.deadline)):
+            return self._deadline_response()
+        start = time.monotonic()
+        try:
+            response = await self._call_api_async(prompts)
+        finally:
+            executor.release_provider_slot()
+        self._record_call(cassette, prompts, response, time.monotonic() - start)
+        return response
 
-        Raises:
-            NotImplementedError: Se não implementado pela subclasse.
+    def _record_call(self, cassette: Optional[Cassette], prompts: AIPrompt, response: AIResponse, latency: float) -> None:
+        """Informa o desfecho de uma chamada real ao limite adaptativo e ao cassete.
+
+        Args:
+            cassette (Optional[Cassette]): Cassete ativo, se houver.
+            prompts (AIPrompt): Objeto com os prompts enviados.
+            response (AIResponse): Resposta obtida do provedor.
+            latency (float): Duração da chamada em segundos.
         """
-        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar list_trained_models.")
+        registry = get_concurrency_registry()
+        if registry is not None:
+            registry.record(self.name, self.api_key, latency, response)
+        if cassette is not None and cassette.recording:
+            cassette.record(self._response_cache_key(prompts), self.__class__.__name__,
+                            prompts, response, latency)
 
-    def cancel_training(self, id: str) -> AIResponse:
-        """Cancela um job de treinamento em andamento.
+    def _replay_cassette(self, cassette: Cassette, prompts: AIPrompt) -> Optional[Tuple[AIResponse, float]]:
+        """Obtém a resposta gravada no cassete para os prompts.
 
         Args:
-            id (str): ID do job a ser cancelado.
+            cassette (Cassette): Cassete em modo replay.
+            prompts (AIPrompt): Objeto com os prompts preparados.
 
         Returns:
-            AIResponse: Objeto indicando sucesso ou falha da operação.
-
-        Raises:
-            NotImplementedError: Se não implementado pela subclasse.
+            Optional[Tuple[AIResponse, float]]: Resposta e tempo a aguardar antes de
+            entregá-la, ou None se a chamada não foi gravada e ON_MISS for 'live'.
         """
-        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar cancel_training.")
+        replayed = cassette.replay(self._response_cache_key(prompts))
+        if replayed is not None:
+            response, latency = replayed
+            wait = bounded_timeout(latency, self.deadline) if cassette.preserve_latency else 0.0
+            return response, wait
+        if cassette.on_miss == CASSETTE_ON_MISS_LIVE:
+            logger.debug(f"[{self.name}] Chamada ausente do cassete, consultando o provedor")
+            return None
+        logger.warning(f"[{self.name}] Chamada ausente do cassete {cassette.path}")
+        return AIResponse(
+            model_name=self.model_name,
+            error=APIError(
+                message="Chamada não encontrada no cassete de replay",
+                code="cassette_miss",
+                endpoint="cassette",
+                resource=f"ai/{self.model_name}",
+                additional_data={'path': cassette.path}
+            ),
+            configurations=self.configurations,
+            processing_time=0.0
+        ), 0.0
 
-    def delete_trained_model(self, model_name: str) -> AIResponse:
-        """Remove um modelo treinado.
+    def _call_api(self, prompts: AIPrompt) -> AIResponse:
+        """Método abstrato para chamar a API específica.
 
         Args:
-            model_name (str): Nome ou ID do modelo a ser removido.
+            prompts (AIPrompt): Objeto com os prompts preparados.
 
         Returns:
-            AIResponse: Objeto indicando sucesso ou falha da operação.
+            AIResponse: Resposta da API com metadados.
 
         Raises:
             NotImplementedError: Se não implementado pela subclasse.
         """
-        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar delete_trained_model.")
+        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar _call_api")
 
-    def api_list_files(self) -> AIResponse:
-        """Lista todos os arquivos disponíveis na API.
+    def stream(self, prompts: AIPrompt) -> DeltaStream:
+        """Itera sobre os trechos de texto gerados pela IA à medida que chegam.
 
-        Returns:
-            APIFileCollection: Lista de arquivos disponíveis.
+        A geração é interrompida (e a conexão encerrada) ao exceder
+        AI_STREAMING['MAX_OUTPUT_TOKENS'].
 
-        Raises:
-            NotImplementedError: Se não implementado pela subclasse.
+        Args:
+            prompts (AIPrompt): Objeto com os prompts preparados.
+
+        Returns:
+            DeltaStream: Gerador de trechos; seu valor de retorno contém os metadados
+            da geração, 'output_tokens' e 'aborted'.
         """
-        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar list_training_files.")
+        max_tokens = get_streaming_settings()['MAX_OUTPUT_TOKENS']
+        return guard_output(self._stream_api(prompts), max_tokens, label=self.name)
 
-    def delete_file(self, file_id: str) -> AIResponse:
-        """Remove um arquivo da API.
+    def _stream_api(self, prompts: AIPrompt) -> DeltaStream:
+        """Método abstrato que chama a API específica em modo streaming.
+
+        O gerador produz os trechos de texto e retorna um dicionário com os
+        metadados da resposta ('metadata' e, opcionalmente, 'thinking').
 
         Args:
-            file_id (str): ID do arquivo a ser removido.
+            prompts (AIPrompt): Objeto com os prompts preparados.
 
         Returns:
-            AIResponse: Objeto indicando sucesso ou falha da operação.
+            DeltaStream: Gerador de trechos de texto.
 
         Raises:
             NotImplementedError: Se não implementado pela subclasse.
         """
-        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar delete_training_file.")
-
+        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar _stream_api")
 
-@register_ai_client
-class OpenAiClient(APIClient):
-    """Cliente para interação com a API da OpenAI."""
-    name = "OpenAi"
-    can_train = True
+    def _call_api_streaming(self, prompts: AIPrompt, on_delta: Optional[DeltaCallback] = None) -> AIResponse:
+        """Chama a API em modo streaming e monta a resposta a partir dos trechos.
 
-    def __init__(self, config: AIConfig) -> None:
-        """Inicializa o cliente da OpenAI.
+        Uma geração interrompida pelo limite de saída retorna o texto parcial
+        com o erro 'output_limit_exceeded'.
 
         Args:
-            config (AIConfig): Configuração da API OpenAI.
+            prompts (AIPrompt): Objeto com os prompts preparados.
+            on_delta (Optional[DeltaCallback]): Receptor dos trechos gerados.
+
+        Returns:
+            AIResponse: Resposta da API com metadados ('stream').
         """
-        super().__init__(config)
-        args = {'api_key': self.api_key}
-        if self.api_url is not None:
-            args['base_url'] = self.api_url
-        self.client = OpenAI(**args)
-        self.async_client = AsyncOpenAI(**args)
+        logger.debug(f"[{self.name}] Iniciando chamada em streaming")
+        attempt_call(self.name)
+        start_time = datetime.now()
+        try:
+            text, info = consume(self.stream(prompts), on_delta)
+        except StreamCancelled:
+            raise
+        except Exception as e:
+            return self._error_response(e, start_time, "stream")
+
+        record_success(self.name)
+        processing_time = (datetime.now() - start_time).total_seconds()
+        metadata = info.pop('metadata', None) or {}
+        thinking = info.pop('thinking', None)
+        metadata['stream'] = info
+        error = None
+        if info['aborted']:
+            error = APIError(
+                message=f"Geração interrompida ao exceder {info['output_tokens']} tokens de saída",
+                code="output_limit_exceeded",
+                status_code=502,
+                endpoint="stream",
+                resource=f"ai/{self.model_name}",
+                additional_data={'output_tokens': info['output_tokens']}
+            )
+        elif not text:
+            error = APIError(
+                message="Nenhum texto retornado pelo streaming.",
+                endpoint="stream",
+                resource=f"ai/{self.model_name}"
+            )
+        return AIResponse(
+            response=text,
+            thinking=thinking or None,
+            model_name=self.model_name,
+            error=error,
+            configurations=self.configurations,
+            processing_time=processing_time,
+            metadata=metadata
+        )
 
-    def _call_api(self, message: AIPrompt) -> AIResponse:
-        """Realiza a chamada à API da OpenAI para comparação.
+    async def _call_api_async(self, prompts: AIPrompt) -> AIResponse:
+        """Chama a API específica sem bloquear o event loop.
+
+        A implementação padrão executa _call_api em uma thread auxiliar. Subclasses
+        cujo SDK oferece um cliente assíncrono devem sobrescrever este método.
 
         Args:
-            message (AIPrompt): Prompts preparados para a chamada.
+            prompts (AIPrompt): Objeto com os prompts preparados.
 
         Returns:
             AIResponse: Resposta da API com metadados.
         """
-        logger.debug(f"[{self.name}] Iniciando chamada para OpenAI")
-        attempt_call(self.name)
-        start_time = datetime.now()
-        try:
-            msgs = []
-            if message.system_message.strip():
-                msgs.append({"role": "system", "content": message.system_message})
-            msgs.append({"role": "user", "content": message.user_message})
+        return await asyncio.to_thread(self._call_api, prompts)
 
-            request_config = {
-                "model": self.model_name,
-                "messages": msgs,
-                **self.configurations
-            }
-            response = self.client.chat.completions.create(**request_config)
-            if not response:
-                logger.error(f"[{self.name}] _call_api: Nenhuma mensagem retornada do OpenAI.", exc_info=True)
-                error = APIError(
-                    message="Nenhuma mensagem retornada do OpenAI.",
-                    endpoint="chat/completions",
-                    resource=f"ai/{self.model_name}"
-                )
-                return AIResponse(
-                    model_name=self.model_name,
-                    error=error,
-                    configurations=self.configurations,
-                    processing_time=0.0
-                )
+    async def aclose(self) -> None:
+        """Libera os recursos assíncronos (conexões HTTP) mantidos pelo cliente.
 
-            processing_time = (datetime.now() - start_time).total_seconds()
+        Deve ser chamado pelo mesmo event loop que utilizou o cliente.
+        """
+        return None
 
-            if hasattr(response, 'choices') and response.choices:
-                record_success(self.name)
-                logger.debug(f"[{self.name}] Chamada concluída com sucesso")
-                reasoning_content = getattr(response.choices[0].message, 'reasoning_content', None)
-                return AIResponse(
-                    response=response.choices[0].message.content,
-                    thinking=reasoning_content,
-                    model_name=self.model_name,
-                    configurations=self.configurations,
-                    processing_time=processing_time
-                )
-            else:
-                logger.error(f"[{self.name}] _call_api: Resposta do OpenAI inválida: {response}", exc_info=True)
-                error = APIError(
-                    message="Resposta do OpenAI inválida.",
-                    endpoint="chat/completions",
-                    resource=f"ai/{self.model_name}"
-                )
-                return AIResponse(
-                    model_name=self.model_name,
-                    error=error,
-                    configurations=self.configurations,
-                    processing_time=processing_time
-                )
-        except APICommunicationException as e:
-            record_failure(self.name)
-            processing_time = (datetime.now() - start_time).total_seconds()
+    def _error_response(self, error: Exception, start_time: datetime, endpoint: str) -> AIResponse:
+        """Registra a falha no circuit breaker e monta a resposta de erro.
+
+        Args:
+            error (Exception): Exceção capturada durante a chamada.
+            start_time (datetime): Momento de início da chamada.
+            endpoint (str): Endpoint da API chamado.
+
+        Returns:
+            AIResponse: Resposta contendo o erro.
+        """
+        record_failure(self.name)
+        processing_time = (datetime.now() - start_time).total_seconds()
+        if _is_timeout_error(error):
+            logger.warning(f"[{self.name}] Timeout após {processing_time:.1f}s em {endpoint}")
+            return AIResponse(
+                model_name=self.model_name,
+                error=APIError(
+                    message=f"Tempo limite excedido após {processing_time:.1f}s",
+                    code="timeout",
+                    status_code=504,
+                    endpoint=endpoint,
+                    resource=f"ai/{self.model_name}",
+                    additional_data={'timeout': round(self._call_timeout(), 3), 'deadline': self.deadline}
+                ),
+                configurations=self.configurations,
+                processing_time=processing_time
+            )
+        if not isinstance(error, APICommunicationException):
+            logger.error(f"[{self.name}] _call_api: {error}", exc_info=True)
+        return AIResponse(
+            model_name=self.model_name,
+            error=APIError(
+                message=getattr(error, 'message', str(error)),
+                code=getattr(error, 'code', None),
+                status_code=getattr(error, 'status_code', None),
+                endpoint=endpoint,
+                resource=f"ai/{self.model_name}"
+            ),
+            configurations=self.configurations,
+            processing_time=processing_time
+        )
+
+    def build_batch_request(self, custom_id: str, message: AIPrompt) -> JSONDict:
+        """Monta uma requisição individual para envio em lote.
+
+        Args:
+            custom_id (str): Identificador da requisição dentro do lote.
+            message (AIPrompt): Prompts preparados para a chamada.
+
+        Returns:
+            JSONDict: Requisição no formato esperado pela Batch API do provedor.
+
+        Raises:
+            NotImplementedError: Se o cliente não suportar envio em lote.
+        """
+        raise NotImplementedError(f"[{self.name}] Este cliente não suporta envio em lote.")
+
+    def submit_batch(self, requests: List[JSONDict]) -> str:
+        """Envia um lote de requisições para processamento assíncrono no provedor.
+
+        Args:
+            requests (List[JSONDict]): Requisições montadas por build_batch_request.
+
+        Returns:
+            str: Identificador do lote no provedor.
+
+        Raises:
+            NotImplementedError: Se o cliente não suportar envio em lote.
+        """
+        raise NotImplementedError(f"[{self.name}] Este cliente não suporta envio em lote.")
+
+    def poll_batch(self, batch_id: str, custom_ids: List[str]) -> Tuple[EntityStatus, Dict[str, AIResponse]]:
+        """Consulta o estado de um lote e, se concluído, obtém seus resultados.
+
+        Args:
+            batch_id (str): Identificador do lote no provedor.
+            custom_ids (List[str]): IDs das requisições, na ordem de envio.
+
+        Returns:
+            Tuple[EntityStatus, Dict[str, AIResponse]]: Status do lote e respostas por custom_id
+            (vazio enquanto o lote estiver em andamento).
+
+        Raises:
+            NotImplementedError: Se o cliente não suportar envio em lote.
+        """
+        raise NotImplementedError(f"[{self.name}] Este cliente não suporta envio em lote.")
+
+    def _batch_item_error(self, message: str, endpoint: str) -> AIResponse:
+        """Cria a resposta de erro de um item de lote.
+
+        Args:
+            message (str): Descrição do erro.
+            endpoint (str): Endpoint da Batch API.
+
+        Returns:
+            AIResponse: Resposta contendo o erro.
+        """
+        return AIResponse(
+            model_name=self.model_name,
+            error=APIError(
+                message=message,
+                endpoint=endpoint,
+                resource=f"ai/{self.model_name}"
+            ),
+            configurations=self.configurations,
+            processing_time=0.0
+        )
+
+    def _prepare_train(self, file: AIFile) -> Any:
+        """Prepara os dados para treinamento no formato esperado pela API.
+
+        Args:
+            file (AIFile): Dados do arquivo de treinamento.
+
+        Returns:
+            Any: Dados preparados para treinamento.
+
+        Raises:
+            NotImplementedError: Se não implementado pela subclasse.
+        """
+        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar _prepare_train")
+
+    def train(self, file: AIFile) -> TrainingResponse:
+        """Prepara e inicia o treinamento utilizando os dados do arquivo.
+
+        Args:
+            file (AIFile): Dados do arquivo de treinamento.
+
+        Returns:
+            TrainingResponse: Resultado inicial do treinamento com job_id.
+
+        Raises:
+            NotImplementedError: Se a IA não suportar treinamento.
+        """
+        if not self.can_train:
+            logger.warning(f"[{self.name}] Tentativa de treinamento em cliente sem suporte a treinamento")
+            raise NotImplementedError(f"[{self.name}] Este cliente não suporta treinamento.")
+
+        prepared_file_data = self._prepare_train(file)
+        return self._start_training(prepared_file_data)
+
+    def _start_training(self, training_data: Any) -> TrainingResponse:
+        """Método abstrato para iniciar o treinamento.
+
+        Args:
+            training_data (Any): Dados preparados para treinamento.
+
+        Returns:
+            TrainingResponse: Resultado inicial do treinamento.
+
+        Raises:
+            NotImplementedError: Se não implementado pela subclasse.
+        """
+        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar _start_training")
+
+    def get_training_status(self, job_id: str) -> TrainingResponse:
+        """Verifica o status atual do treinamento.
+
+        Args:
+            job_id (str): ID do job de treinamento.
+
+        Returns:
+            TrainingResponse: Status atual do treinamento.
+
+        Raises:
+            NotImplementedError: Se não implementado pela subclasse.
+        """
+        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar get_training_status.")
+
+    def _call_train_api(self, training_data: str) -> AIResponse:
+        """Método abstrato para chamar a API de treinamento.
+
+        Args:
+            training_data (str): Dados de treinamento preparados.
+
+        Returns:
+            AIResponse: Objeto representando o modelo treinado.
+
+        Raises:
+            NotImplementedError: Se não implementado pela subclasse.
+        """
+        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar o método _call_train_api.")
+
+    def api_list_models(self, list_trained_models: bool = True, list_base_models: bool = True) -> AIResponse:
+        """Lista os modelos disponíveis na API.
+
+        Args:
+            list_trained_models (bool): Se True, inclui modelos fine-tuned.
+            list_base_models (bool): Se True, inclui modelos base.
+
+        Returns:
+            APIModelCollection: Lista de modelos disponíveis.
+
+        Raises:
+            NotImplementedError: Se não implementado pela subclasse.
+        """
+        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar list_trained_models.")
+
+    def cancel_training(self, id: str) -> AIResponse:
+        """Cancela um job de treinamento em andamento.
+
+        Args:
+            id (str): ID do job a ser cancelado.
+
+        Returns:
+            AIResponse: Objeto indicando sucesso ou falha da operação.
+
+        Raises:
+            NotImplementedError: Se não implementado pela subclasse.
+        """
+        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar cancel_training.")
+
+    def delete_trained_model(self, model_name: str) -> AIResponse:
+        """Remove um modelo treinado.
+
+        Args:
+            model_name (str): Nome ou ID do modelo a ser removido.
+
+        Returns:
+            AIResponse: Objeto indicando sucesso ou falha da operação.
+
+        Raises:
+            NotImplementedError: Se não implementado pela subclasse.
+        """
+        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar delete_trained_model.")
+
+    def api_list_files(self) -> AIResponse:
+        """Lista todos os arquivos disponíveis na API.
+
+        Returns:
+            APIFileCollection: Lista de arquivos disponíveis.
+
+        Raises:
+            NotImplementedError: Se não implementado pela subclasse.
+        """
+        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar list_training_files.")
+
+    def delete_file(self, file_id: str) -> AIResponse:
+        """Remove um arquivo da API.
+
+        Args:
+            file_id (str): ID do arquivo a ser removido.
+
+        Returns:
+            AIResponse: Objeto indicando sucesso ou falha da operação.
+
+        Raises:
+            NotImplementedError: Se não implementado pela subclasse.
+        """
+        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar delete_training_file.")
+
+
+@register_ai_client
+class OpenAiClient(APIClient):
+    """Cliente para interação com a API da OpenAI."""
+    name = "OpenAi"
+    can_train = True
+    supports_batch = True
+    supports_streaming = True
+    sdk_modules = {'openai': 'openai'}
+    # Solicita o uso de tokens no último trecho do streaming
+    stream_include_usage = True
+
+    def __init__(self, config: AIConfig) -> None:
+        """Inicializa o cliente da OpenAI.
+
+        Args:
+            config (AIConfig): Configuração da API OpenAI.
+        """
+        super().__init__(config)
+        self.client = self._pooled_client('sync', self._create_sdk_client)
+        # Clientes assíncronos ficam presos ao event loop e não são compartilhados;
+        # criados só no primeiro uso assíncrono
+        self._async_client = None
+
+    def _sdk_args(self) -> JSONDict:
+        """Retorna os argumentos de criação dos clientes do SDK."""
+        args = {'api_key': self.api_key}
+        if self.api_url is not None:
+            args['base_url'] = self.api_url
+        return args
+
+    def _create_sdk_client(self) -> openai.OpenAI:
+        """Cria o cliente síncrono do SDK."""
+        return openai.OpenAI(**self._sdk_args())
+
+    def _create_async_sdk_client(self) -> openai.AsyncOpenAI:
+        """Cria o cliente assíncrono do SDK."""
+        return openai.AsyncOpenAI(**self._sdk_args())
+
+    def _build_request(self, message: AIPrompt) -> JSONDict:
+        """Monta os parâmetros da requisição de chat completion.
+
+        Args:
+            message (AIPrompt): Prompts preparados para a chamada.
+
+        Returns:
+            JSONDict: Parâmetros para chat.completions.create.
+        """
+        msgs = []
+        if message.system_message.strip():
+            msgs.append({"role": "system", "content": message.system_message})
+        msgs.append({"role": "user", "content": message.user_message})
+
+        return {
+            "model": self.model_name,
+            "messages": msgs,
+            **self.configurations
+        }
+
+    def _parse_response(self, response: Any, start_time: datetime) -> AIResponse:
+        """Converte a resposta do SDK em AIResponse.
+
+        Args:
+            response (Any): Resposta retornada por chat.completions.create.
+            start_time (datetime): Momento de início da chamada.
+
+        Returns:
+            AIResponse: Resposta da API com metadados.
+        """
+        if not response:
+            logger.error(f"[{self.name}] _call_api: Nenhuma mensagem retornada do OpenAI.", exc_info=True)
             error = APIError(
-                message=str(e),
+                message="Nenhuma mensagem retornada do OpenAI.",
                 endpoint="chat/completions",
                 resource=f"ai/{self.model_name}"
             )
@@ -464,23 +1243,245 @@ class OpenAiClient(APIClient):
                 model_name=self.model_name,
                 error=error,
                 configurations=self.configurations,
-                processing_time=processing_time
+                processing_time=0.0
+            )
+
+        processing_time = (datetime.now() - start_time).total_seconds()
+
+        if hasattr(response, 'choices') and response.choices:
+            record_success(self.name)
+            logger.debug(f"[{self.name}] Chamada concluída com sucesso")
+            reasoning_content = getattr(response.choices[0].message, 'reasoning_content', None)
+            return AIResponse(
+                response=response.choices[0].message.content,
+                thinking=reasoning_content,
+                model_name=self.model_name,
+                configurations=self.configurations,
+                processing_time=processing_time,
+                metadata=self._usage_metadata(response)
+            )
+
+        logger.error(f"[{self.name}] _call_api: Resposta do OpenAI inválida: {response}", exc_info=True)
+        error = APIError(
+            message="Resposta do OpenAI inválida.",
+            endpoint="chat/completions",
+            resource=f"ai/{self.model_name}"
+        )
+        return AIResponse(
+            model_name=self.model_name,
+            error=error,
+            configurations=self.configurations,
+            processing_time=processing_time
+        )
+
+    def _usage_metadata(self, response: Any) -> JSONDict:
+        """Extrai a contagem de tokens lidos do cache de prefixo automático da OpenAI.
+
+        Args:
+            response (Any): Resposta retornada por chat.completions.create.
+
+        Returns:
+            JSONDict: {'prompt_cache': ...} ou vazio se a resposta não informar uso.
+        """
+        usage = getattr(response, 'usage', None)
+        if usage is None:
+            return {}
+        details = getattr(usage, 'prompt_tokens_details', None)
+        return {'prompt_cache': cache_usage(usage.prompt_tokens, getattr(details, 'cached_tokens', 0))}
+
+    def _call_api(self, message: AIPrompt) -> AIResponse:
+        """Realiza a chamada à API da OpenAI para comparação.
+
+        Args:
+            message (AIPrompt): Prompts preparados para a chamada.
+
+        Returns:
+            AIResponse: Resposta da API com metadados.
+        """
+        logger.debug(f"[{self.name}] Iniciando chamada para OpenAI")
+        attempt_call(self.name)
+        start_time = datetime.now()
+        try:
+            response = self.client.chat.completions.create(
+                **self._build_request(message),
+                timeout=self._call_timeout()
+            )
+            return self._parse_response(response, start_time)
+        except Exception as e:
+            return self._error_response(e, start_time, "chat/completions")
+
+    def _stream_api(self, message: AIPrompt) -> DeltaStream:
+        """Realiza a chamada à API da OpenAI em modo streaming.
+
+        Args:
+            message (AIPrompt): Prompts preparados para a chamada.
+
+        Returns:
+            DeltaStream: Trechos de texto; ao final, o raciocínio e o uso de tokens.
+        """
+        request = self._build_request(message)
+        request['stream'] = True
+        if self.stream_include_usage:
+            request['stream_options'] = {'include_usage': True}
+        stream = self.client.chat.completions.create(**request, timeout=self._call_timeout())
+        usage_chunk = None
+        thinking = []
+        try:
+            for chunk in stream:
+                if getattr(chunk, 'usage', None):
+                    usage_chunk = chunk
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if getattr(delta, 'reasoning_content', None):
+                    thinking.append(delta.reasoning_content)
+                if delta.content:
+                    yield delta.content
+        finally:
+            stream.close()
+        return {
+            'thinking': ''.join(thinking),
+            'metadata': self._usage_metadata(usage_chunk) if usage_chunk else {},
+        }
+
+    async def _call_api_async(self, message: AIPrompt) -> AIResponse:
+        """Realiza a chamada à API da OpenAI usando o cliente assíncrono.
+
+        Args:
+            message (AIPrompt): Prompts preparados para a chamada.
+
+        Returns:
+            AIResponse: Resposta da API com metadados.
+        """
+        logger.debug(f"[{self.name}] Iniciando chamada assíncrona para OpenAI")
+        attempt_call(self.name)
+        start_time = datetime.now()
+        try:
+            if self._async_client is None:
+                self._async_client = self._create_async_sdk_client()
+            response = await self._async_client.chat.completions.create(
+                **self._build_request(message),
+                timeout=self._call_timeout()
             )
+            return self._parse_response(response, start_time)
+        except Exception as e:
+            return self._error_response(e, start_time, "chat/completions")
+
+    async def aclose(self) -> None:
+        """Fecha o pool de conexões do cliente assíncrono, se criado."""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+
+    def build_batch_request(self, custom_id: str, message: AIPrompt) -> JSONDict:
+        """Monta uma linha do arquivo JSONL da Batch API da OpenAI.
+
+        Args:
+            custom_id (str): Identificador da requisição dentro do lote.
+            message (AIPrompt): Prompts preparados para a chamada.
+
+        Returns:
+            JSONDict: Requisição para o endpoint /v1/chat/completions.
+        """
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": self._build_request(message)
+        }
+
+    def submit_batch(self, requests: List[JSONDict]) -> str:
+        """Envia o arquivo JSONL e cria o lote na OpenAI.
+
+        Args:
+            requests (List[JSONDict]): Requisições montadas por build_batch_request.
+
+        Returns:
+            str: ID do lote criado.
+
+        Raises:
+            APICommunicationException: Se ocorrer erro no envio.
+        """
+        attempt_call(self.name)
+        try:
+            jsonl = "\n".join(json.dumps(request) for request in requests)
+            bytes_data = io.BytesIO(jsonl.encode('utf-8'))
+            bytes_data.name = 'batch.jsonl'
+            file_obj: openai.types.FileObject = self.client.files.create(file=bytes_data, purpose='batch')
+            batch = self.client.batches.create(
+                input_file_id=file_obj.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            record_success(self.name)
+            logger.info(f"[{self.name}] Lote {batch.id} criado com {len(requests)} requisições")
+            return batch.id
+        except Exception as e:
+            record_failure(self.name)
+            logger.error(f"[{self.name}] submit_batch: {e}", exc_info=True)
+            raise APICommunicationException(f"Erro ao enviar lote: {e}")
+
+    def poll_batch(self, batch_id: str, custom_ids: List[str]) -> Tuple[EntityStatus, Dict[str, AIResponse]]:
+        """Consulta um lote da OpenAI e lê o arquivo de saída quando concluído.
+
+        Args:
+            batch_id (str): ID do lote.
+            custom_ids (List[str]): IDs das requisições enviadas.
+
+        Returns:
+            Tuple[EntityStatus, Dict[str, AIResponse]]: Status e respostas por custom_id.
+
+        Raises:
+            APICommunicationException: Se ocorrer erro na consulta.
+        """
+        attempt_call(self.name)
+        try:
+            batch = self.client.batches.retrieve(batch_id)
+            record_success(self.name)
+            if batch.status in ('failed', 'expired', 'cancelled'):
+                return EntityStatus.FAILED, {}
+            if batch.status != 'completed':
+                return EntityStatus.IN_PROGRESS, {}
+
+            results = {}
+            for file_id in (batch.output_file_id, batch.error_file_id):
+                if not file_id:
+                    continue
+                content = self.client.files.content(file_id).text
+                for line in content.splitlines():
+                    if not line.strip():
+                        continue
+                    item = json.loads(line)
+                    results[item['custom_id']] = self._parse_batch_item(item)
+            return EntityStatus.COMPLETED, results
         except Exception as e:
             record_failure(self.name)
-            processing_time = (datetime.now() - start_time).total_seconds()
-            logger.error(f"[{self.name}] _call_api: Erro ao comunicar com OpenAI: {e}", exc_info=True)
-            error = APIError(
-                message=str(e),
-                endpoint="chat/completions",
-                resource=f"ai/{self.model_name}"
-            )
-            return AIResponse(
-                model_name=self.model_name,
-                error=error,
-                configurations=self.configurations,
-                processing_time=processing_time
-            )
+            logger.error(f"[{self.name}] poll_batch: {e}", exc_info=True)
+            raise APICommunicationException(f"Erro ao consultar lote: {e}")
+
+    def _parse_batch_item(self, item: JSONDict) -> AIResponse:
+        """Converte uma linha do arquivo de saída do lote em AIResponse.
+
+        Args:
+            item (JSONDict): Linha do arquivo de saída (ou de erros).
+
+        Returns:
+            AIResponse: Resposta correspondente à requisição.
+        """
+        response = item.get('response') or {}
+        body = response.get('body') or {}
+        if item.get('error') or response.get('status_code') != 200 or not body.get('choices'):
+            error = item.get('error') or body.get('error') or {}
+            message = error.get('message') if isinstance(error, dict) else str(error)
+            return self._batch_item_error(message or "Requisição do lote sem resposta válida.", "batches")
+        message = body['choices'][0].get('message') or {}
+        return AIResponse(
+            response=message.get('content'),
+            thinking=message.get('reasoning_content'),
+            model_name=self.model_name,
+            configurations=self.configurations,
+            processing_time=0.0
+        )
 
     def _prepare_train(self, file: AIFile) -> Any:
         """Prepara os dados de treinamento no formato esperado pela API.
@@ -533,7 +1534,7 @@ class OpenAiClient(APIClient):
         try:
             bytes_data = io.BytesIO(training_data.encode('utf-8'))
             bytes_data.name = 'training.jsonl'
-            file_obj: FileObject = self.client.files.create(
+            file_obj: openai.types.FileObject = self.client.files.create(
                 file=bytes_data,
                 purpose='fine-tune'
             )
@@ -544,7 +1545,7 @@ class OpenAiClient(APIClient):
                     training_type = self.training_configurations.pop('type')
                 training_params = self.training_configurations
 
-            job: FineTuningJob = self.client.fine_tuning.jobs.create(
+            job: openai.types.fine_tuning.FineTuningJob = self.client.fine_tuning.jobs.create(
                 training_file=file_obj.id,
                 model=self.model_name,
                 hyperparameters=training_params
@@ -753,6 +1754,9 @@ class GeminiClient(APIClient):
     """Cliente para interação com a API do Google Gemini."""
     name = "Gemini"
     can_train = True
+    supports_batch = True
+    supports_streaming = True
+    sdk_modules = {'genai': 'google.genai', 'google_types': 'google.genai.types'}
 
     def __init__(self, config: AIConfig) -> None:
         """Inicializa o cliente do Gemini.
@@ -761,7 +1765,129 @@ class GeminiClient(APIClient):
             config (AIConfig): Configuração da API Gemini.
         """
         super().__init__(config)
-        self.client = genai.Client(api_key=self.api_key)
+        self.client = self._pooled_client('sync', lambda: genai.Client(api_key=self.api_key))
+        self._async_client = None
+
+    def _build_config(
+        self,
+        message: AIPrompt,
+        cached_content: Optional[str] = None
+    ) -> google_types.GenerateContentConfig:
+        """Monta a configuração de geração de conteúdo.
+
+        Args:
+            message (AIPrompt): Prompts preparados para a chamada.
+            cached_content (Optional[str]): Handle do conteúdo em cache com a
+                instrução de sistema e o prefixo comum.
+
+        Returns:
+            google_types.GenerateContentConfig: Configuração da requisição.
+        """
+        request_config = self.configurations.copy()
+        if 'http_options' in google_types.GenerateContentConfig.model_fields:
+            # HttpOptions.timeout é em milissegundos
+            request_config['http_options'] = google_types.HttpOptions(timeout=int(self._call_timeout() * 1000))
+        if cached_content:
+            return google_types.GenerateContentConfig(cached_content=cached_content, **request_config)
+        if message.system_message.strip():
+            system_instruction = [google_types.Part.from_text(text=message.system_message)]
+            return google_types.GenerateContentConfig(
+                system_instruction=system_instruction,
+                **request_config
+            )
+        return google_types.GenerateContentConfig(**request_config)
+
+    def _parse_response(self, response: Any, start_time: datetime) -> AIResponse:
+        """Converte a resposta do SDK em AIResponse.
+
+        Args:
+            response (Any): Resposta retornada por generate_content.
+            start_time (datetime): Momento de início da chamada.
+
+        Returns:
+            AIResponse: Resposta da API do Gemini.
+        """
+        processing_time = (datetime.now() - start_time).total_seconds()
+        record_success(self.name)
+        logger.debug(f"[{self.name}] Chamada concluída com sucesso")
+        return AIResponse(
+            response=response.text,
+            model_name=self.model_name,
+            configurations=self.configurations,
+            processing_time=processing_time,
+            metadata=self._usage_metadata(response)
+        )
+
+    def _usage_metadata(self, response: Any) -> JSONDict:
+        """Extrai o uso do cache de conteúdo informado pelo Gemini.
+
+        Args:
+            response (Any): Resposta (ou último trecho do streaming) de generate_content.
+
+        Returns:
+            JSONDict: {'prompt_cache': ...} ou vazio se a resposta não informar uso.
+        """
+        usage = getattr(response, 'usage_metadata', None)
+        if usage is None:
+            return {}
+        return {'prompt_cache': cache_usage(usage.prompt_token_count, usage.cached_content_token_count)}
+
+    def _cached_content(self, message: AIPrompt) -> Optional[str]:
+        """Obtém ou cria o conteúdo em cache com a instrução de sistema e o prefixo comum.
+
+        O Gemini exige cache explícito com tamanho mínimo; prefixos menores que
+        MIN_PREFIX_TOKENS são enviados normalmente (e ainda podem ser aproveitados
+        pelo cache implícito dos modelos mais recentes).
+
+        Args:
+            message (AIPrompt): Prompts preparados para a chamada.
+
+        Returns:
+            Optional[str]: Handle do conteúdo em cache ou None.
+        """
+        config = get_prefix_cache_settings()
+        prefix = message.cacheable_prefix
+        if not config['ENABLED'] or not prefix or not message.variable_suffix.strip():
+            return None
+        if count_prompt_tokens(AIPrompt(user_message=prefix, system_message=message.system_message)) < config['MIN_PREFIX_TOKENS']:
+            return None
+
+        registry = get_cached_content_registry()
+        key = registry.build_key(self.name, self.api_key, self.model_name, message.system_message or '', prefix)
+        ttl = config['CACHED_CONTENT_TTL']
+
+        def create() -> str:
+            cache = self.client.caches.create(
+                model=self.model_name,
+                config=google_types.CreateCachedContentConfig(
+                    contents=[google_types.Content(role='user', parts=[google_types.Part.from_text(text=prefix)])],
+                    system_instruction=message.system_message if message.system_message.strip() else None,
+                    ttl=f"{int(ttl)}s"
+                )
+            )
+            return cache.name
+
+        try:
+            return registry.get_or_create(key, create, ttl, config['CREATE_FAILURE_TTL'])
+        except Exception as e:
+            logger.warning(f"[{self.name}] Falha ao criar conteúdo em cache, enviando prompt completo: {e}")
+            return None
+
+    def _generate_args(self, message: AIPrompt, cached_content: Optional[str]) -> JSONDict:
+        """Monta os argumentos de generate_content, enviando só o sufixo quando há cache.
+
+        Args:
+            message (AIPrompt): Prompts preparados para a chamada.
+            cached_content (Optional[str]): Handle do conteúdo em cache.
+
+        Returns:
+            JSONDict: Argumentos para models.generate_content.
+        """
+        return {
+            'model': self.model_name,
+            'contents': message.variable_suffix if cached_content else message.user_message,
+            'config': self._build_config(message, cached_content),
+        }
 
     def _call_api(self, message: AIPrompt) -> AIResponse:
         """Realiza a chamada à API do Gemini para comparação.
@@ -775,51 +1901,166 @@ class GeminiClient(APIClient):
         attempt_call(self.name)
         logger.debug(f"[{self.name}] Iniciando chamada para Gemini")
         start_time = datetime.now()
+        cached_content = self._cached_content(message)
         try:
-            request_config = self.configurations.copy()
-            config_obj = None
-            if message.system_message.strip():
-                system_instruction = [google_types.Part.from_text(text=message.system_message)]
-                config_obj = google_types.GenerateContentConfig(
-                    system_instruction=system_instruction,
-                    **request_config
-                )
-            else:
-                config_obj = google_types.GenerateContentConfig(**request_config)
-            response = self.client.models.generate_content(
+            response = self.client.models.generate_content(**self._generate_args(message, cached_content))
+            return self._parse_response(response, start_time)
+        except Exception as e:
+            if cached_content:
+                get_cached_content_registry().discard(cached_content)
+            return self._error_response(e, start_time, "generateContent")
+
+    def _stream_api(self, message: AIPrompt) -> DeltaStream:
+        """Realiza a chamada à API do Gemini em modo streaming.
+
+        Args:
+            message (AIPrompt): Prompts preparados para a chamada.
+
+        Returns:
+            DeltaStream: Trechos de texto; ao final, o uso de tokens.
+        """
+        cached_content = self._cached_content(message)
+        last_chunk = None
+        try:
+            stream = self.client.models.generate_content_stream(**self._generate_args(message, cached_content))
+            try:
+                for chunk in stream:
+                    last_chunk = chunk
+                    if chunk.text:
+                        yield chunk.text
+            finally:
+                close = getattr(stream, 'close', None)
+                if close:
+                    close()
+        except Exception:
+            if cached_content:
+                get_cached_content_registry().discard(cached_content)
+            raise
+        return {'metadata': self._usage_metadata(last_chunk)}
+
+    async def _call_api_async(self, message: AIPrompt) -> AIResponse:
+        """Realiza a chamada à API do Gemini usando o cliente assíncrono (client.aio).
+
+        Args:
+            message (AIPrompt): Prompts preparados para a chamada.
+
+        Returns:
+            AIResponse: Resposta da API do Gemini.
+        """
+        attempt_call(self.name)
+        logger.debug(f"[{self.name}] Iniciando chamada assíncrona para Gemini")
+        start_time = datetime.now()
+        # A criação do cache usa o cliente síncrono do pool; roda fora do event loop
+        cached_content = await asyncio.to_thread(self._cached_content, message)
+        try:
+            if self._async_client is None:
+                # O transporte assíncrono fica preso ao event loop; não usa o cliente do pool
+                self._async_client = genai.Client(api_key=self.api_key).aio
+            response = await self._async_client.models.generate_content(**self._generate_args(message, cached_content))
+            return self._parse_response(response, start_time)
+        except Exception as e:
+            if cached_content:
+                get_cached_content_registry().discard(cached_content)
+            return self._error_response(e, start_time, "generateContent")
+
+    async def aclose(self) -> None:
+        """Fecha o cliente assíncrono (client.aio), se criado."""
+        if self._async_client is not None:
+            # Versões do SDK sem aclose() não mantêm conexões entre as chamadas
+            close = getattr(self._async_client, 'aclose', None)
+            if close is not None:
+                await close()
+            self._async_client = None
+
+    def build_batch_request(self, custom_id: str, message: AIPrompt) -> JSONDict:
+        """Monta uma requisição inline para a Batch API do Gemini.
+
+        O Gemini não aceita identificadores por requisição em lotes inline; os
+        resultados são associados pela ordem de envio.
+
+        Args:
+            custom_id (str): Identificador da requisição dentro do lote.
+            message (AIPrompt): Prompts preparados para a chamada.
+
+        Returns:
+            JSONDict: Requisição inline (contents + config).
+        """
+        config = self.configurations.copy()
+        if message.system_message.strip():
+            config['system_instruction'] = {"parts": [{"text": message.system_message}]}
+        return {
+            "contents": [{"role": "user", "parts": [{"text": message.user_message}]}],
+            "config": config
+        }
+
+    def submit_batch(self, requests: List[JSONDict]) -> str:
+        """Cria um lote inline no Gemini.
+
+        Args:
+            requests (List[JSONDict]): Requisições montadas por build_batch_request.
+
+        Returns:
+            str: Nome (ID) do lote criado.
+
+        Raises:
+            APICommunicationException: Se ocorrer erro no envio.
+        """
+        attempt_call(self.name)
+        try:
+            batch_job = self.client.batches.create(
                 model=self.model_name,
-                contents=message.user_message,
-                config=config_obj
+                src=requests,
+                config={'display_name': f"comparison-{uuid.uuid4()}"}
             )
-            processing_time = (datetime.now() - start_time).total_seconds()
             record_success(self.name)
-            logger.debug(f"[{self.name}] Chamada concluída com sucesso")
-            return AIResponse(
-                response=response.text,
-                model_name=self.model_name,
-                configurations=self.configurations,
-                processing_time=processing_time
-            )
+            logger.info(f"[{self.name}] Lote {batch_job.name} criado com {len(requests)} requisições")
+            return batch_job.name
         except Exception as e:
             record_failure(self.name)
-            processing_time = (datetime.now() - start_time).total_seconds()
-            
-            # Verificação se os atributos existem na exceção
-            error_message = getattr(e, 'message', str(e))
-            error_code = getattr(e, 'code', None)
-            
-            error = APIError(
-                message=error_message,
-                code=error_code,
-                endpoint="generateContent",
-                resource=f"ai/{self.model_name}"
-            )
-            return AIResponse(
-                model_name=self.model_name,
-                configurations=self.configurations,
-                processing_time=processing_time,
-                error=error
-            )
+            logger.error(f"[{self.name}] submit_batch: {e}", exc_info=True)
+            raise APICommunicationException(f"Erro ao enviar lote: {e}")
+
+    def poll_batch(self, batch_id: str, custom_ids: List[str]) -> Tuple[EntityStatus, Dict[str, AIResponse]]:
+        """Consulta um lote do Gemini e obtém as respostas inline quando concluído.
+
+        Args:
+            batch_id (str): Nome do lote.
+            custom_ids (List[str]): IDs das requisições, na ordem de envio.
+
+        Returns:
+            Tuple[EntityStatus, Dict[str, AIResponse]]: Status e respostas por custom_id.
+
+        Raises:
+            APICommunicationException: Se ocorrer erro na consulta.
+        """
+        attempt_call(self.name)
+        try:
+            batch_job = self.client.batches.get(name=batch_id)
+            record_success(self.name)
+            state = batch_job.state.name if hasattr(batch_job.state, 'name') else str(batch_job.state)
+            if state in ('JOB_STATE_FAILED', 'JOB_STATE_CANCELLED', 'JOB_STATE_EXPIRED'):
+                return EntityStatus.FAILED, {}
+            if state != 'JOB_STATE_SUCCEEDED':
+                return EntityStatus.IN_PROGRESS, {}
+
+            results = {}
+            inlined = batch_job.dest.inlined_responses if batch_job.dest else []
+            for custom_id, item in zip(custom_ids, inlined or []):
+                if item.error or not item.response:
+                    message = getattr(item.error, 'message', None) or "Requisição do lote sem resposta válida."
+                    results[custom_id] = self._batch_item_error(message, "batches")
+                else:
+                    results[custom_id] = AIResponse(
+                        response=item.response.text,
+                        model_name=self.model_name,
+                        configurations=self.configurations,
+                        processing_time=0.0
+                    )
+            return EntityStatus.COMPLETED, results
+        except Exception as e:
+            record_failure(self.name)
+            logger.error(f"[{self.name}] poll_batch: {e}", exc_info=True)
+            raise APICommunicationException(f"Erro ao consultar lote: {e}")
 
     def _prepare_train(self, file: AIFile) -> google_types.TuningDataset:
         """Prepara os dados de treinamento para o Gemini.
@@ -1109,6 +2350,9 @@ class AnthropicClient(APIClient):
     """Cliente para interação com a API do Anthropic (Claude 3)."""
     name = "Anthropic"
     can_train = False
+    supports_batch = True
+    supports_streaming = True
+    sdk_modules = {'anthropic': 'anthropic'}
 
     def __init__(self, config: AIConfig) -> None:
         """Inicializa o cliente do Anthropic.
@@ -1120,76 +2364,68 @@ class AnthropicClient(APIClient):
             APICommunicationException: Se ocorrer erro ao inicializar o cliente.
         """
         super().__init__(config)
+        self._async_client = None
         try:
-            self.client = anthropic.Anthropic(api_key=self.api_key)
+            self.client = self._pooled_client('sync', lambda: anthropic.Anthropic(api_key=self.api_key))
         except Exception as e:
             logger.error(f"[{self.name}] __init__: Erro ao inicializar cliente Anthropic: {e}", exc_info=True)
             raise APICommunicationException(f"Erro ao inicializar cliente Anthropic: {e}")
 
-    def _call_api(self, message: AIPrompt) -> AIResponse:
-        """Realiza a chamada à API do Anthropic para comparação.
+    def _build_request(self, message: AIPrompt) -> JSONDict:
+        """Monta os parâmetros da requisição à Messages API.
 
         Args:
             message (AIPrompt): Prompts preparados para a chamada.
 
         Returns:
-            AIResponse: Resposta da API do Anthropic.
+            JSONDict: Parâmetros para messages.create.
         """
-        attempt_call(self.name)
-        start_time = datetime.now()
-        try:
-            request_config = {
-                "model": self.model_name,
-                "messages": [{
-                    "role": "user", 
-                    "content": [{
-                        "type": "text",
-                        "text": message.user_message
-                    }]
-                }],
-                **self.configurations
-            }
-            if 'max_tokens' not in request_config:
-                request_config['max_tokens'] = 1024
-            if 'stream' not in request_config:
-                request_config['stream'] = False
-            if message.system_message.strip():
+        use_cache = get_prefix_cache_settings()['ENABLED']
+        prefix = message.cacheable_prefix if use_cache else ''
+        if prefix:
+            # O breakpoint no prefixo cacheia também a mensagem de sistema que o precede
+            content = [{"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}}]
+            if message.variable_suffix:
+                content.append({"type": "text", "text": message.variable_suffix})
+        else:
+            content = [{"type": "text", "text": message.user_message}]
+
+        request_config = {
+            "model": self.model_name,
+            "messages": [{
+                "role": "user", 
+                "content": content
+            }],
+            **self.configurations
+        }
+        if 'max_tokens' not in request_config:
+            request_config['max_tokens'] = 1024
+        if 'stream' not in request_config:
+            request_config['stream'] = False
+        if message.system_message.strip():
+            if use_cache and not prefix:
+                request_config['system'] = [{
+                    "type": "text",
+                    "text": message.system_message,
+                    "cache_control": {"type": "ephemeral"}
+                }]
+            else:
                 request_config['system'] = message.system_message
-            response = self.client.messages.create(**request_config)
-            if not response or not response.content:
-                error = APIError(
-                    message="Nenhuma mensagem retornada de Anthropic.",
-                    endpoint="messages",
-                    resource=f"ai/{self.model_name}"
-                )
-                return AIResponse(
-                    model_name=self.model_name,
-                    error=error,
-                    configurations=self.configurations,
-                    processing_time=0.0
-                )
-            
-            extracted_text = ""
-            extracted_thinking = ""
-            for content_block in response.content:
-                if content_block.type == "thinking":
-                    extracted_thinking += content_block.thinking
-                if content_block.type == "text":
-                    extracted_text += content_block.text            
-            processing_time = (datetime.now() - start_time).total_seconds()
-            record_success(self.name)
-            return AIResponse(
-                response=extracted_text,
-                thinking=extracted_thinking if extracted_thinking.strip() else None,
-                model_name=self.model_name,
-                configurations=self.configurations,
-                processing_time=processing_time
-            )
-        except APICommunicationException as e:
-            record_failure(self.name)
-            processing_time = (datetime.now() - start_time).total_seconds()
+        return request_config
+
+    def _parse_response(self, response: Any, start_time: datetime) -> AIResponse:
+        """Converte a resposta do SDK em AIResponse.
+
+        Args:
+            response (Any): Resposta retornada por messages.create.
+            start_time (datetime): Momento de início da chamada.
+
+        Returns:
+            AIResponse: Resposta da API do Anthropic.
+        """
+        if not response or not response.content:
             error = APIError(
-                message=str(e),
+                message="Nenhuma mensagem retornada de Anthropic.",
                 endpoint="messages",
                 resource=f"ai/{self.model_name}"
             )
@@ -1197,23 +2433,184 @@ class AnthropicClient(APIClient):
                 model_name=self.model_name,
                 error=error,
                 configurations=self.configurations,
-                processing_time=processing_time
+                processing_time=0.0
+            )
+        
+        extracted_text = ""
+        extracted_thinking = ""
+        for content_block in response.content:
+            if content_block.type == "thinking":
+                extracted_thinking += content_block.thinking
+            if content_block.type == "text":
+                extracted_text += content_block.text            
+        processing_time = (datetime.now() - start_time).total_seconds()
+        record_success(self.name)
+        return AIResponse(
+            response=extracted_text,
+            thinking=extracted_thinking if extracted_thinking.strip() else None,
+            model_name=self.model_name,
+            configurations=self.configurations,
+            processing_time=processing_time,
+            metadata=self._usage_metadata(response)
+        )
+
+    def _usage_metadata(self, response: Any) -> JSONDict:
+        """Extrai o uso do cache de prefixo informado pela Messages API.
+
+        Args:
+            response (Any): Mensagem retornada pela API.
+
+        Returns:
+            JSONDict: {'prompt_cache': ...} ou vazio se a resposta não informar uso.
+        """
+        usage = getattr(response, 'usage', None)
+        if usage is None:
+            return {}
+        cached_tokens = getattr(usage, 'cache_read_input_tokens', 0) or 0
+        write_tokens = getattr(usage, 'cache_creation_input_tokens', 0) or 0
+        # input_tokens do Anthropic exclui os tokens lidos e gravados no cache
+        return {'prompt_cache': cache_usage(
+            usage.input_tokens + cached_tokens + write_tokens,
+            cached_tokens,
+            write_tokens
+        )}
+
+    def _call_api(self, message: AIPrompt) -> AIResponse:
+        """Realiza a chamada à API do Anthropic para comparação.
+
+        Args:
+            message (AIPrompt): Prompts preparados para a chamada.
+
+        Returns:
+            AIResponse: Resposta da API do Anthropic.
+        """
+        attempt_call(self.name)
+        start_time = datetime.now()
+        try:
+            response = self.client.messages.create(**self._build_request(message), timeout=self._call_timeout())
+            return self._parse_response(response, start_time)
+        except Exception as e:
+            return self._error_response(e, start_time, "messages")
+
+    def _stream_api(self, message: AIPrompt) -> DeltaStream:
+        """Realiza a chamada à API do Anthropic em modo streaming.
+
+        Interromper o gerador encerra o stream (e a conexão) pelo gerenciador de contexto do SDK.
+
+        Args:
+            message (AIPrompt): Prompts preparados para a chamada.
+
+        Returns:
+            DeltaStream: Trechos de texto; ao final, o raciocínio e o uso de tokens.
+        """
+        request = self._build_request(message)
+        request.pop('stream', None)
+        with self.client.messages.stream(**request, timeout=self._call_timeout()) as stream:
+            for text in stream.text_stream:
+                yield text
+            final = stream.get_final_message()
+        thinking = ''.join(block.thinking for block in final.content if block.type == "thinking")
+        return {'thinking': thinking, 'metadata': self._usage_metadata(final)}
+
+    async def _call_api_async(self, message: AIPrompt) -> AIResponse:
+        """Realiza a chamada à API do Anthropic usando o cliente assíncrono.
+
+        Args:
+            message (AIPrompt): Prompts preparados para a chamada.
+
+        Returns:
+            AIResponse: Resposta da API do Anthropic.
+        """
+        attempt_call(self.name)
+        start_time = datetime.now()
+        try:
+            if self._async_client is None:
+                self._async_client = anthropic.AsyncAnthropic(api_key=self.api_key)
+            response = await self._async_client.messages.create(
+                **self._build_request(message),
+                timeout=self._call_timeout()
             )
+            return self._parse_response(response, start_time)
+        except Exception as e:
+            return self._error_response(e, start_time, "messages")
+
+    async def aclose(self) -> None:
+        """Fecha o pool de conexões do cliente assíncrono, se criado."""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+
+    def build_batch_request(self, custom_id: str, message: AIPrompt) -> JSONDict:
+        """Monta uma requisição da Message Batches API do Anthropic.
+
+        Args:
+            custom_id (str): Identificador da requisição dentro do lote.
+            message (AIPrompt): Prompts preparados para a chamada.
+
+        Returns:
+            JSONDict: Requisição com custom_id e params.
+        """
+        params = self._build_request(message)
+        params.pop('stream', None)
+        return {"custom_id": custom_id, "params": params}
+
+    def submit_batch(self, requests: List[JSONDict]) -> str:
+        """Cria um lote na Message Batches API.
+
+        Args:
+            requests (List[JSONDict]): Requisições montadas por build_batch_request.
+
+        Returns:
+            str: ID do lote criado.
+
+        Raises:
+            APICommunicationException: Se ocorrer erro no envio.
+        """
+        attempt_call(self.name)
+        try:
+            batch = self.client.messages.batches.create(requests=requests)
+            record_success(self.name)
+            logger.info(f"[{self.name}] Lote {batch.id} criado com {len(requests)} requisições")
+            return batch.id
+        except Exception as e:
+            record_failure(self.name)
+            logger.error(f"[{self.name}] submit_batch: {e}", exc_info=True)
+            raise APICommunicationException(f"Erro ao enviar lote: {e}")
+
+    def poll_batch(self, batch_id: str, custom_ids: List[str]) -> Tuple[EntityStatus, Dict[str, AIResponse]]:
+        """Consulta um lote do Anthropic e lê seus resultados quando encerrado.
+
+        Args:
+            batch_id (str): ID do lote.
+            custom_ids (List[str]): IDs das requisições enviadas.
+
+        Returns:
+            Tuple[EntityStatus, Dict[str, AIResponse]]: Status e respostas por custom_id.
+
+        Raises:
+            APICommunicationException: Se ocorrer erro na consulta.
+        """
+        attempt_call(self.name)
+        try:
+            batch = self.client.messages.batches.retrieve(batch_id)
+            record_success(self.name)
+            if batch.processing_status != 'ended':
+                return EntityStatus.IN_PROGRESS, {}
+
+            results = {}
+            start_time = datetime.now()
+            for entry in self.client.messages.batches.results(batch_id):
+                if entry.result.type == 'succeeded':
+                    results[entry.custom_id] = self._parse_response(entry.result.message, start_time)
+                else:
+                    error = getattr(entry.result, 'error', None)
+                    message = getattr(getattr(error, 'error', None), 'message', None) or f"Requisição do lote: {entry.result.type}"
+                    results[entry.custom_id] = self._batch_item_error(message, "messages/batches")
+            return EntityStatus.COMPLETED, results
         except Exception as e:
             record_failure(self.name)
-            processing_time = (datetime.now() - start_time).total_seconds()
-            logger.error(f"[{self.name}] _call_api: {e}", exc_info=True)
-            error = APIError(
-                message=str(e),
-                endpoint="messages",
-                resource=f"ai/{self.model_name}"
-            )
-            return AIResponse(
-                model_name=self.model_name,
-                error=error,
-                configurations=self.configurations,
-                processing_time=processing_time
-            )
+            logger.error(f"[{self.name}] poll_batch: {e}", exc_info=True)
+            raise APICommunicationException(f"Erro ao consultar lote: {e}")
 
     def api_list_models(self, list_trained_models: bool = True, list_base_models: bool = True) -> APIModelCollection:
         """Lista os modelos disponíveis na API do Anthropic.
@@ -1256,6 +2653,8 @@ class PerplexityClient(APIClient):
     name = "Perplexity"
     can_train = False
 
+    DEFAULT_URL = "https://api.perplexity.ai/chat/completions"
+
     def __init__(self, config: AIConfig) -> None:
         """Inicializa o cliente da Perplexity.
 
@@ -1263,75 +2662,94 @@ class PerplexityClient(APIClient):
             config (AIConfig): Configuração da API Perplexity.
         """
         super().__init__(config)
+        self._async_http = None
+        options = self.http_options
+        self.session = self._pooled_client(
+            f"session:{options['pool_size']}:{int(bool(options['compression']))}",
+            self._create_session
+        )
 
-    def _call_api(self, message: AIPrompt) -> AIResponse:
-        """Realiza a chamada à API da Perplexity para comparação.
+    def _accept_encoding(self) -> str:
+        """Retorna o cabeçalho Accept-Encoding conforme a opção de compressão."""
+        return "gzip, deflate" if self.http_options['compression'] else "identity"
+
+    def _create_session(self) -> requests.Session:
+        """Cria a sessão HTTP compartilhada, com pool de conexões keep-alive limitado.
+
+        Returns:
+            requests.Session: Sessão configurada.
+        """
+        pool_size = self.http_options['pool_size']
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({
+            "Accept-Encoding": self._accept_encoding(),
+            "Connection": "keep-alive"
+        })
+        return session
+
+    def _create_async_http(self) -> httpx.AsyncClient:
+        """Cria o cliente httpx assíncrono com os mesmos limites e timeouts da sessão.
+
+        Returns:
+            httpx.AsyncClient: Cliente configurado.
+        """
+        options = self.http_options
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=options['pool_size'],
+                max_keepalive_connections=options['pool_size']
+            ),
+            timeout=httpx.Timeout(options['read_timeout'], connect=options['connect_timeout']),
+            headers={"Accept-Encoding": self._accept_encoding()}
+        )
+
+    def _build_request(self, message: AIPrompt) -> Tuple[str, JSONDict, Dict[str, str]]:
+        """Monta URL, corpo e cabeçalhos da requisição.
 
         Args:
             message (AIPrompt): Prompts preparados para a chamada.
 
+        Returns:
+            Tuple[str, JSONDict, Dict[str, str]]: URL, corpo JSON e cabeçalhos.
+        """
+        url = self.api_url if self.api_url else self.DEFAULT_URL
+        msgs = []
+        if message.system_message.strip():
+            msgs.append({"role": "system", "content": message.system_message})
+        msgs.append({"role": "user", "content": message.user_message})
+        request_config = {
+            "model": self.model_name,
+            "messages": msgs,
+            **self.configurations
+        }
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        return url, request_config, headers
+
+    def _parse_response(self, status_code: int, resp_json: Any, url: str, start_time: datetime) -> AIResponse:
+        """Converte a resposta HTTP em AIResponse.
+
+        Args:
+            status_code (int): Código de status HTTP.
+            resp_json (Any): Corpo da resposta já decodificado (None se status != 200).
+            url (str): URL chamada.
+            start_time (datetime): Momento de início da chamada.
+
         Returns:
             AIResponse: Resposta da API da Perplexity.
         """
-        attempt_call(self.name)
-        start_time = datetime.now()
-        try:
-            url = self.api_url if self.api_url else "https://api.perplexity.ai/chat/completions"
-            msgs = []
-            if message.system_message.strip():
-                msgs.append({"role": "system", "content": message.system_message})
-            msgs.append({"role": "user", "content": message.user_message})
-            request_config = {
-                "model": self.model_name,
-                "messages": msgs,
-                **self.configurations
-            }
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            response = requests.post(url, json=request_config, headers=headers)
-            processing_time = (datetime.now() - start_time).total_seconds()
-            
-            if response.status_code != 200:
-                error = APIError(
-                    message=f"API Perplexity retornou código {response.status_code}.",
-                    endpoint=url,
-                    resource=f"ai/{self.model_name}"
-                )
-                return AIResponse(
-                    model_name=self.model_name,
-                    error=error,
-                    configurations=self.configurations,
-                    processing_time=processing_time
-                )
-            resp_json = response.json()
-            generated_text = resp_json['choices'][0]['message'].get('content', '')
-            if not generated_text:
-                error = APIError(
-                    message="Nenhum texto retornado pela Perplexity.",
-                    endpoint=url,
-                    resource=f"ai/{self.model_name}"
-                )
-                return AIResponse(
-                    model_name=self.model_name,
-                    error=error,
-                    configurations=self.configurations,
-                    processing_time=processing_time
-                )
-            record_success(self.name)
-            return AIResponse(
-                response=generated_text,
-                model_name=self.model_name,
-                configurations=self.configurations,
-                processing_time=processing_time
-            )
-        except APICommunicationException as e:
-            record_failure(self.name)
-            processing_time = (datetime.now() - start_time).total_seconds()
+        processing_time = (datetime.now() - start_time).total_seconds()
+        
+        if status_code != 200:
             error = APIError(
-                message=str(e),
-                endpoint="chat/completions",
+                message=f"API Perplexity retornou código {status_code}.",
+                status_code=status_code,
+                endpoint=url,
                 resource=f"ai/{self.model_name}"
             )
             return AIResponse(
@@ -1340,13 +2758,11 @@ class PerplexityClient(APIClient):
                 configurations=self.configurations,
                 processing_time=processing_time
             )
-        except Exception as e:
-            record_failure(self.name)
-            processing_time = (datetime.now() - start_time).total_seconds()
-            logger.error(f"[{self.name}] _call_api: {e}", exc_info=True)
+        generated_text = resp_json['choices'][0]['message'].get('content', '')
+        if not generated_text:
             error = APIError(
-                message=str(e),
-                endpoint="chat/completions",
+                message="Nenhum texto retornado pela Perplexity.",
+                endpoint=url,
                 resource=f"ai/{self.model_name}"
             )
             return AIResponse(
@@ -1355,6 +2771,61 @@ class PerplexityClient(APIClient):
                 configurations=self.configurations,
                 processing_time=processing_time
             )
+        record_success(self.name)
+        return AIResponse(
+            response=generated_text,
+            model_name=self.model_name,
+            configurations=self.configurations,
+            processing_time=processing_time
+        )
+
+    def _call_api(self, message: AIPrompt) -> AIResponse:
+        """Realiza a chamada à API da Perplexity para comparação.
+
+        Args:
+            message (AIPrompt): Prompts preparados para a chamada.
+
+        Returns:
+            AIResponse: Resposta da API da Perplexity.
+        """
+        attempt_call(self.name)
+        start_time = datetime.now()
+        try:
+            url, request_config, headers = self._build_request(message)
+            timeout = (self.http_options['connect_timeout'], self._call_timeout())
+            response = self.session.post(url, json=request_config, headers=headers, timeout=timeout)
+            resp_json = response.json() if response.status_code == 200 else None
+            return self._parse_response(response.status_code, resp_json, url, start_time)
+        except Exception as e:
+            return self._error_response(e, start_time, "chat/completions")
+
+    async def _call_api_async(self, message: AIPrompt) -> AIResponse:
+        """Realiza a chamada à API da Perplexity usando httpx assíncrono.
+
+        Args:
+            message (AIPrompt): Prompts preparados para a chamada.
+
+        Returns:
+            AIResponse: Resposta da API da Perplexity.
+        """
+        attempt_call(self.name)
+        start_time = datetime.now()
+        try:
+            if self._async_http is None:
+                self._async_http = self._create_async_http()
+            url, request_config, headers = self._build_request(message)
+            timeout = httpx.Timeout(self._call_timeout(), connect=self.http_options['connect_timeout'])
+            response = await self._async_http.post(url, json=request_config, headers=headers, timeout=timeout)
+            resp_json = response.json() if response.status_code == 200 else None
+            return self._parse_response(response.status_code, resp_json, url, start_time)
+        except Exception as e:
+            return self._error_response(e, start_time, "chat/completions")
+
+    async def aclose(self) -> None:
+        """Fecha o cliente httpx assíncrono, se criado."""
+        if self._async_http is not None:
+            await self._async_http.aclose()
+            self._async_http = None
 
 
 @register_ai_client
@@ -1362,6 +2833,7 @@ class LlamaClient(APIClient):
     """Cliente para interação com a API do Llama."""
     name = "Llama"
     can_train = False
+    sdk_modules = {'llamaapi': 'llamaapi'}
 
     def __init__(self, config: AIConfig) -> None:
         """Inicializa o cliente do Llama.
@@ -1370,7 +2842,7 @@ class LlamaClient(APIClient):
             config (AIConfig): Configuração da API Llama.
         """
         super().__init__(config)
-        self.client = LlamaAPI(self.api_key)
+        self.client = self._pooled_client('sync', lambda: llamaapi.LlamaAPI(self.api_key))
 
     def _call_api(self, message: AIPrompt) -> AIResponse:
         """Realiza a chamada à API do Llama para comparação.
@@ -1483,20 +2955,27 @@ class AzureOpenAIClient(OpenAiClient):
     Herda a maior parte da lógica do OpenAiClient.
     """
     name = "AzureOpenAI"
+    # A Batch API do Azure exige deployments do tipo "global batch"
+    supports_batch = False
     can_train = False
+    # stream_options não é aceito pela versão de API utilizada
+    stream_include_usage = False
 
-    def __init__(self, config: AIConfig) -> None:
-        """Inicializa o cliente do Azure OpenAI.
+    def _sdk_args(self) -> JSONDict:
+        """Retorna os argumentos de criação dos clientes do SDK do Azure OpenAI."""
+        return {
+            'azure_endpoint': self.api_url,
+            'api_key': self.api_key,
+            'api_version': "2024-05-01-preview"
+        }
 
-        Args:
-            config (AIConfig): Configuração da API Azure OpenAI.
-        """
-        super().__init__(config)
-        self.client = AzureOpenAI(
-            azure_endpoint=self.api_url,
-            api_key=self.api_key,
-            api_version="2024-05-01-preview"
-        )
+    def _create_sdk_client(self) -> openai.AzureOpenAI:
+        """Cria o cliente síncrono do SDK do Azure OpenAI."""
+        return openai.AzureOpenAI(**self._sdk_args())
+
+    def _create_async_sdk_client(self) -> openai.AsyncAzureOpenAI:
+        """Cria o cliente assíncrono do SDK do Azure OpenAI."""
+        return openai.AsyncAzureOpenAI(**self._sdk_args())
 
 
 @register_ai_client
@@ -1504,6 +2983,12 @@ class AzureClient(APIClient):
     """Cliente para interação com a API do Azure (ChatCompletionsClient)."""
     name = "Azure"
     can_train = False
+    supports_streaming = True
+    sdk_modules = {
+        'azure_inference': 'azure.ai.inference',
+        'azure_inference_aio': 'azure.ai.inference.aio',
+        'azure_credentials': 'azure.core.credentials',
+    }
 
     def __init__(self, config: AIConfig) -> None:
         """Inicializa o cliente do Azure.
@@ -1512,58 +2997,45 @@ class AzureClient(APIClient):
             config (AIConfig): Configuração da API Azure.
         """
         super().__init__(config)
-        self.client = ChatCompletionsClient(
+        self.client = self._pooled_client('sync', lambda: azure_inference.ChatCompletionsClient(
             endpoint=self.api_url,
-            credential=AzureKeyCredential(self.api_key),
-        )
+            credential=azure_credentials.AzureKeyCredential(self.api_key),
+        ))
+        self._async_client = None
 
-    def _call_api(self, message: AIPrompt) -> AIResponse:
-        """Realiza a chamada à API do Azure para comparação.
+    def _build_request(self, message: AIPrompt) -> JSONDict:
+        """Monta os parâmetros da requisição de chat completion.
 
         Args:
             message (AIPrompt): Prompts preparados para a chamada.
 
+        Returns:
+            JSONDict: Parâmetros para ChatCompletionsClient.complete.
+        """
+        msgs = []
+        if message.system_message.strip():
+            msgs.append({"role": "system", "content": message.system_message})
+        msgs.append({"role": "user", "content": message.user_message})
+        return {
+            "messages": msgs,
+            **self.configurations
+        }
+
+    def _parse_response(self, response: Any, start_time: datetime) -> AIResponse:
+        """Converte a resposta do SDK em AIResponse.
+
+        Args:
+            response (Any): Resposta retornada por complete.
+            start_time (datetime): Momento de início da chamada.
+
         Returns:
             AIResponse: Resposta da API do Azure.
         """
-        attempt_call(self.name)
-        start_time = datetime.now()
-        try:
-            msgs = []
-            if message.system_message.strip():
-                msgs.append({"role": "system", "content": message.system_message})
-            msgs.append({"role": "user", "content": message.user_message})
-            request_config = {
-                "messages": msgs,
-                **self.configurations
-            }
-            response = self.client.complete(**request_config)
-            processing_time = (datetime.now() - start_time).total_seconds()
-            
-            if not response or not hasattr(response, 'choices') or not response.choices:
-                error = APIError(
-                    message="Resposta inválida da Azure API",
-                    endpoint="chat/completions",
-                    resource=f"ai/{self.model_name}"
-                )
-                return AIResponse(
-                    model_name=self.model_name,
-                    error=error,
-                    configurations=self.configurations,
-                    processing_time=processing_time
-                )
-            record_success(self.name)
-            return AIResponse(
-                response=response.choices[0].message.content,
-                model_name=self.model_name,
-                configurations=self.configurations,
-                processing_time=processing_time
-            )
-        except APICommunicationException as e:
-            record_failure(self.name)
-            processing_time = (datetime.now() - start_time).total_seconds()
+        processing_time = (datetime.now() - start_time).total_seconds()
+        
+        if not response or not hasattr(response, 'choices') or not response.choices:
             error = APIError(
-                message=str(e),
+                message="Resposta inválida da Azure API",
                 endpoint="chat/completions",
                 resource=f"ai/{self.model_name}"
             )
@@ -1573,18 +3045,212 @@ class AzureClient(APIClient):
                 configurations=self.configurations,
                 processing_time=processing_time
             )
+        record_success(self.name)
+        return AIResponse(
+            response=response.choices[0].message.content,
+            model_name=self.model_name,
+            configurations=self.configurations,
+            processing_time=processing_time
+        )
+
+    def _call_api(self, message: AIPrompt) -> AIResponse:
+        """Realiza a chamada à API do Azure para comparação.
+
+        Args:
+            message (AIPrompt): Prompts preparados para a chamada.
+
+        Returns:
+            AIResponse: Resposta da API do Azure.
+        """
+        attempt_call(self.name)
+        start_time = datetime.now()
+        try:
+            response = self.client.complete(**self._build_request(message), read_timeout=self._call_timeout())
+            return self._parse_response(response, start_time)
         except Exception as e:
-            record_failure(self.name)
-            processing_time = (datetime.now() - start_time).total_seconds()
-            logger.error(f"[{self.name}] _call_api: {e}", exc_info=True)
-            error = APIError(
-                message=str(e),
-                endpoint="chat/completions",
-                resource=f"ai/{self.model_name}"
+            return self._error_response(e, start_time, "chat/completions")
+
+    def _stream_api(self, message: AIPrompt) -> DeltaStream:
+        """Realiza a chamada à API do Azure em modo streaming.
+
+        Args:
+            message (AIPrompt): Prompts preparados para a chamada.
+
+        Returns:
+            DeltaStream: Trechos de texto gerados.
+        """
+        request = self._build_request(message)
+        request['stream'] = True
+        stream = self.client.complete(**request, read_timeout=self._call_timeout())
+        try:
+            for update in stream:
+                if update.choices and update.choices[0].delta.content:
+                    yield update.choices[0].delta.content
+        finally:
+            stream.close()
+        return {}
+
+    async def _call_api_async(self, message: AIPrompt) -> AIResponse:
+        """Realiza a chamada à API do Azure usando o cliente assíncrono (azure.ai.inference.aio).
+
+        Args:
+            message (AIPrompt): Prompts preparados para a chamada.
+
+        Returns:
+            AIResponse: Resposta da API do Azure.
+        """
+        attempt_call(self.name)
+        start_time = datetime.now()
+        try:
+            if self._async_client is None:
+                self._async_client = azure_inference_aio.ChatCompletionsClient(
+                    endpoint=self.api_url,
+                    credential=azure_credentials.AzureKeyCredential(self.api_key),
+                )
+            response = await self._async_client.complete(
+                **self._build_request(message),
+                read_timeout=self._call_timeout()
             )
-            return AIResponse(
-                model_name=self.model_name,
-                error=error,
-                configurations=self.configurations,
-                processing_time=processing_time
+            return self._parse_response(response, start_time)
+        except Exception as e:
+            return self._error_response(e, start_time, "chat/completions")
+
+    async def aclose(self) -> None:
+        """Fecha o cliente assíncrono do Azure, se criado."""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+
+
+@register_ai_client
+class SimulatedClient(APIClient):
+    """Provedor simulado local, sem rede e sem custo, para testes de carga.
+
+    Retorna respostas sintéticas determinísticas com latência, erros, 429 e
+    tamanho de saída definidos em `configurations` (ver
+    api.utils.simulation.DEFAULT_SIMULATION_PROFILE). As chamadas passam por
+    attempt_call/record_success/record_failure como as dos provedores reais,
+    para que filas, circuit breaker e persistência sejam medidos fielmente.
+    Qualquer valor serve como chave de API.
+    """
+    name = "Simulated"
+    can_train = False
+    supports_streaming = True
+
+    def __init__(self, config: AIConfig) -> None:
+        """Inicializa o cliente simulado.
+
+        Args:
+            config (AIConfig): Configuração com os parâmetros de simulação.
+        """
+        super().__init__(config)
+        self.profile = SimulationProfile(self.configurations)
+
+    def _plan(self, message: AIPrompt) -> Tuple[float, str, str]:
+        """Sorteia latência e desfecho da chamada e gera a resposta.
+
+        Args:
+            message (AIPrompt): Prompts preparados para a chamada.
+
+        Returns:
+            Tuple[float, str, str]: Latência (s), desfecho e texto da resposta.
+        """
+        digest = self.profile.prompt_digest(message)
+        rng = self.profile.rng_for(digest)
+        return self.profile.sample_latency(rng), self.profile.sample_outcome(rng), self.profile.synthesize(digest)
+
+    def _wait_time(self, latency: float) -> float:
+        """Tempo de espera efetivo: a latência limitada ao timeout da chamada."""
+        return min(latency, self._call_timeout())
+
+    def _raise_for_outcome(self, outcome: str, latency: float) -> None:
+        """Levanta o erro correspondente ao desfecho sorteado (timeout, 429 ou erro)."""
+        if latency > self._call_timeout():
+            raise TimeoutError(f"Chamada simulada excedeu {self._call_timeout():.1f}s")
+        if outcome == OUTCOME_RATE_LIMITED:
+            raise RateLimitExceededException(
+                "Limite de taxa simulado (429)", service_name=self.name, code="rate_limit_exceeded"
             )
+        if outcome == OUTCOME_ERROR:
+            raise APICommunicationException("Erro simulado do provedor", code="simulated_error")
+
+    def _build_response(self, message: AIPrompt, text: str, start_time: datetime) -> AIResponse:
+        """Registra o sucesso no circuit breaker e monta a resposta sintética."""
+        record_success(self.name)
+        return AIResponse(
+            response=text,
+            model_name=self.model_name,
+            configurations=self.configurations,
+            processing_time=(datetime.now() - start_time).total_seconds(),
+            metadata={'usage': {
+                'input_tokens': count_prompt_tokens(message),
+                'output_tokens': int(self.profile.options['output_tokens']),
+            }}
+        )
+
+    def _call_api(self, message: AIPrompt) -> AIResponse:
+        """Simula uma chamada síncrona.
+
+        Args:
+            message (AIPrompt): Prompts preparados para a chamada.
+
+        Returns:
+            AIResponse: Resposta sintética ou erro simulado.
+        """
+        attempt_call(self.name)
+        start_time = datetime.now()
+        try:
+            latency, outcome, text = self._plan(message)
+            time.sleep(self._wait_time(latency))
+            self._raise_for_outcome(outcome, latency)
+            return self._build_response(message, text, start_time)
+        except Exception as e:
+            return self._error_response(e, start_time, "simulated")
+
+    async def _call_api_async(self, message: AIPrompt) -> AIResponse:
+        """Simula uma chamada assíncrona, aguardando sem bloquear o event loop.
+
+        Args:
+            message (AIPrompt): Prompts preparados para a chamada.
+
+        Returns:
+            AIResponse: Resposta sintética ou erro simulado.
+        """
+        attempt_call(self.name)
+        start_time = datetime.now()
+        try:
+            latency, outcome, text = self._plan(message)
+            await asyncio.sleep(self._wait_time(latency))
+            self._raise_for_outcome(outcome, latency)
+            return self._build_response(message, text, start_time)
+        except Exception as e:
+            return self._error_response(e, start_time, "simulated")
+
+    def _stream_api(self, message: AIPrompt) -> DeltaStream:
+        """Simula uma geração em streaming.
+
+        O primeiro trecho chega após 20% da latência e o restante é distribuído
+        entre as palavras; erros são levantados após a latência completa.
+
+        Args:
+            message (AIPrompt): Prompts preparados para a chamada.
+
+        Returns:
+            DeltaStream: Trechos da resposta sintética.
+        """
+        latency, outcome, text = self._plan(message)
+        wait = self._wait_time(latency)
+        if outcome != OUTCOME_OK or latency > self._call_timeout():
+            time.sleep(wait)
+            self._raise_for_outcome(outcome, latency)
+        time.sleep(wait * 0.2)
+        words = text.split(' ')
+        per_word = wait * 0.8 / len(words)
+        for index, word in enumerate(words):
+            yield word if index == 0 else ' ' + word
+            if per_word:
+                time.sleep(per_word)
+        return {'metadata': {'usage': {
+            'input_tokens': count_prompt_tokens(message),
+            'output_tokens': int(self.profile.options['output_tokens']),
+        }}}
@@ -0,0 +1,345 @@
+"""Requisições de cobertura (hedged requests) para chamadas lentas às IAs.
+
+Quando uma chamada ultrapassa o percentil de latência observado do provedor
+(p95 por padrão), uma requisição duplicada é disparada para a mesma
+configuração ou para uma configuração de cobertura; vale a resposta que
+terminar primeiro com sucesso e a outra é ignorada. O volume de duplicatas é
+limitado por token (por minuto e em proporção às chamadas), e as contagens de
+vitórias de cada lado ficam disponíveis para o monitoramento.
+
+As tentativas rodam no executor compartilhado do processo
+(core.utils.task_executor) e ocupam vagas do limite de chamadas aos provedores
+dentro de APIClient._call_api_limited; a duplicata não é disparada quando esse
+limite já está esgotado.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from django.conf import settings
+
+from core.types import JSONDict
+from core.utils.task_executor import get_task_executor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEDGING_SETTINGS: Dict[str, Any] = {
+    'ENABLED': False,
+    'PERCENTILE': 95,
+    'MIN_SAMPLES': 20,
+    'WINDOW': 200,
+    'MIN_DELAY': 0.5,
+    'MAX_HEDGES_PER_MINUTE': 30,
+    'MAX_HEDGE_RATIO': 0.1,
+}
+
+# Instância global para uso em toda a aplicação
+_hedger = None
+_hedger_lock = threading.RLock()
+
+
+def get_hedging_settings() -> Dict[str, Any]:
+    """Retorna as configurações de hedging mescladas aos valores padrão."""
+    return {**DEFAULT_HEDGING_SETTINGS, **getattr(settings, 'COMPARISON_HEDGING', {})}
+
+
+class LatencyTracker:
+    """Janela deslizante das latências de chamadas bem-sucedidas por provedor.
+
+    Attributes:
+        window: Número de amostras mantidas por provedor.
+    """
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, seconds: float) -> None:
+        """Registra a latência de uma chamada."""
+        with self._lock:
+            self._samples[provider].append(seconds)
+
+    def percentile(self, provider: str, percent: float, min_samples: int) -> Optional[float]:
+        """Calcula o percentil das latências do provedor.
+
+        Args:
+            provider: Nome do provedor.
+            percent: Percentil desejado (0 a 100).
+            min_samples: Amostras mínimas para uma estimativa confiável.
+
+        Returns:
+            Optional[float]: Latência em segundos ou None se houver poucas amostras.
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(provider, ()))
+        if len(samples) < max(1, min_samples):
+            return None
+        index = min(len(samples) - 1, int(round(percent / 100.0 * (len(samples) - 1))))
+        return samples[index]
+
+
+class HedgeBudget:
+    """Limita o volume de requisições duplicadas por token.
+
+    Uma duplicata só é permitida se, no último minuto, o token disparou menos
+    de `max_per_minute` duplicatas e elas não excedem `max_ratio` das chamadas.
+    """
+
+    def __init__(self, max_per_minute: int, max_ratio: float) -> None:
+        self.max_per_minute = max_per_minute
+        self.max_ratio = max_ratio
+        self._calls: Dict[Any, Deque[float]] = defaultdict(deque)
+        self._hedges: Dict[Any, Deque[float]] = defaultdict(deque)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _trim(events: Deque[float], now: float) -> None:
+        while events and now - events[0] > 60.0:
+            events.popleft()
+
+    def record_call(self, token_key: Any) -> None:
+        """Registra uma chamada elegível a cobertura."""
+        now = time.monotonic()
+        with self._lock:
+            self._calls[token_key].append(now)
+            self._trim(self._calls[token_key], now)
+
+    def try_acquire(self, token_key: Any) -> bool:
+        """Reserva uma duplicata para o token, se houver orçamento.
+
+        Args:
+            token_key: Identificador do token do usuário.
+
+        Returns:
+            bool: True se a duplicata pode ser disparada.
+        """
+        now = time.monotonic()
+        with self._lock:
+            calls, hedges = self._calls[token_key], self._hedges[token_key]
+            self._trim(calls, now)
+            self._trim(hedges, now)
+            if len(hedges) >= self.max_per_minute:
+                return False
+            if (len(hedges) + 1) > max(1, len(calls)) * self.max_ratio:
+                return False
+            hedges.append(now)
+            return True
+
+
+class HedgeStats:
+    """Contadores de cobertura por provedor (chamadas, duplicatas e vencedores)."""
+
+    FIELDS = ('calls', 'hedged', 'hedge_wins', 'primary_wins', 'budget_denied', 'capacity_denied')
+
+    def __init__(self) -> None:
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(self.FIELDS, 0))
+        self._lock = threading.Lock()
+
+    def incr(self, provider: str, field: str) -> None:
+        with self._lock:
+            self._counters[provider][field] += 1
+
+    def snapshot(self) -> Dict[str, JSONDict]:
+        """Retorna os contadores e a taxa de vitória das duplicatas por provedor."""
+        with self._lock:
+            stats = {provider: dict(counters) for provider, counters in self._counters.items()}
+        for counters in stats.values():
+            counters['hedge_win_rate'] = (
+                round(counters['hedge_wins'] / counters['hedged'], 4) if counters['hedged'] else 0.0
+            )
+        return stats
+
+
+class Hedger:
+    """Executa chamadas com cobertura após o percentil de latência do provedor.
+
+    Attributes:
+        latencies: Latências observadas por provedor.
+        budget: Orçamento de duplicatas por token.
+        stats: Contadores de cobertura.
+    """
+
+    def __init__(self, config: Dict[str, Any]) -> None:
+        self.config = config
+        self.latencies = LatencyTracker(config['WINDOW'])
+        self.budget = HedgeBudget(config['MAX_HEDGES_PER_MINUTE'], config['MAX_HEDGE_RATIO'])
+        self.stats = HedgeStats()
+
+    def hedge_delay(self, provider: str) -> Optional[float]:
+        """Tempo de espera antes de disparar a duplicata (None sem amostras suficientes)."""
+        p = self.latencies.percentile(provider, self.config['PERCENTILE'], self.config['MIN_SAMPLES'])
+        if p is None:
+            return None
+        return max(p, self.config['MIN_DELAY'])
+
+    def _timed(self, provider: str, func: Callable[[], Any], is_success: Callable[[Any], bool]) -> Callable[[], Any]:
+        """Envolve a chamada para registrar sua latência quando bem-sucedida."""
+        def run():
+            start = time.monotonic()
+            result = func()
+            if is_success(result):
+                self.latencies.record(provider, time.monotonic() - start)
+            return result
+        return run
+
+    def call(
+        self,
+        provider: str,
+        token_key: Any,
+        primary: Callable[[], Any],
+        hedge_factory: Callable[[], Callable[[], Any]],
+        is_success: Callable[[Any], bool]
+    ) -> Tuple[Any, JSONDict]:
+        """Executa `primary` e, se ela demorar mais que o p95, também a duplicata.
+
+        Args:
+            provider: Nome do provedor (chave das latências e métricas).
+            token_key: Identificador do token (chave do orçamento).
+            primary: Chamada original.
+            hedge_factory: Cria a chamada duplicada; executada na thread chamadora
+                apenas quando a duplicata é disparada.
+            is_success: Indica se um resultado é uma resposta válida.
+
+        Returns:
+            Tuple[Any, JSONDict]: Resultado vencedor e informações de cobertura
+            ('hedged', 'winner', 'delay').
+
+        Raises:
+            Exception: A exceção da chamada original se nenhuma delas tiver resultado.
+        """
+        self.stats.incr(provider, 'calls')
+        self.budget.record_call(token_key)
+        primary = self._timed(provider, primary, is_success)
+
+        delay = self.hedge_delay(provider)
+        if delay is None:
+            return primary(), {'hedged': False}
+
+        executor = get_task_executor()
+        primary_future = executor.submit(primary)
+        done, _ = wait([primary_future], timeout=delay)
+        if done:
+            return primary_future.result(), {'hedged': False}
+        inline = self._run_inline(primary_future, primary)
+        if inline is not None:
+            # Nenhum worker livre: a thread chamadora executou a chamada original
+            return inline.result(), {'hedged': False}
+
+        if not executor.has_provider_capacity():
+            self.stats.incr(provider, 'capacity_denied')
+            return primary_future.result(), {'hedged': False, 'capacity_denied': True}
+        if not self.budget.try_acquire(token_key):
+            self.stats.incr(provider, 'budget_denied')
+            return primary_future.result(), {'hedged': False, 'budget_denied': True}
+
+        logger.info(f"[{provider}] Chamada excedeu {delay:.2f}s (p{self.config['PERCENTILE']}); disparando cobertura")
+        self.stats.incr(provider, 'hedged')
+        hedge = self._timed(provider, hedge_factory(), is_success)
+        hedge_future = executor.submit(hedge)
+        return self._first_success(
+            provider,
+            {primary_future: ('primary', primary), hedge_future: ('hedge', hedge)},
+            is_success,
+            delay
+        )
+
+    @staticmethod
+    def _run_inline(future: Future, func: Callable[[], Any]) -> Optional[Future]:
+        """Executa na thread chamadora uma tentativa que ainda não começou no executor.
+
+        Evita que a chamadora, que pode ser ela própria um worker do executor,
+        fique bloqueada à espera de um worker livre.
+
+        Args:
+            future: Resultado futuro da tentativa submetida.
+            func: Função da tentativa.
+
+        Returns:
+            Optional[Future]: Nova future já concluída com o resultado, ou None se
+            a tentativa já havia começado no executor.
+        """
+        if future.running() or not future.cancel():
+            return None
+        result = Future()
+        try:
+            result.set_result(func())
+        except Exception as e:
+            result.set_exception(e)
+        return result
+
+    def _first_success(
+        self,
+        provider: str,
+        futures: Dict[Future, Tuple[str, Callable[[], Any]]],
+        is_success: Callable[[Any], bool],
+        delay: float
+    ) -> Tuple[Any, JSONDict]:
+        """Aguarda a primeira resposta válida; a perdedora é cancelada ou ignorada.
+
+        Se nenhuma tentativa pendente estiver em execução (executor sem workers
+        livres), a thread chamadora executa uma delas.
+        """
+        pending = set(futures)
+        fallback: Optional[Tuple[Any, str]] = None
+        first_error: Optional[Exception] = None
+
+        while pending:
+            if not any(future.running() or future.done() for future in pending):
+                for future in list(pending):
+                    inline = self._run_inline(future, futures[future][1])
+                    if inline is not None:
+                        pending.discard(future)
+                        futures[inline] = futures[future]
+                        pending.add(inline)
+                        break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    first_error = first_error or e
+                    continue
+                if is_success(result):
+                    for loser in pending:
+                        loser.cancel()
+                    return self._finish(provider, result, futures[future][0], delay)
+                fallback = fallback or (result, futures[future][0])
+
+        if fallback is not None:
+            return self._finish(provider, fallback[0], fallback[1], delay)
+        raise first_error
+
+    def _finish(self, provider: str, result: Any, winner: str, delay: float) -> Tuple[Any, JSONDict]:
+        self.stats.incr(provider, f"{winner}_wins")
+        return result, {'hedged': True, 'winner': winner, 'delay': round(delay, 3)}
+
+
+def get_hedger() -> Hedger:
+    """Obtém o executor de cobertura do processo, criando-o na primeira chamada.
+
+    Returns:
+        Hedger: Executor configurado.
+    """
+    global _hedger
+    with _hedger_lock:
+        if _hedger is None:
+            _hedger = Hedger(get_hedging_settings())
+        return _hedger
+
+
+def get_hedge_stats() -> Dict[str, JSONDict]:
+    """Retorna as métricas de cobertura do processo por provedor."""
+    with _hedger_lock:
+        return _hedger.stats.snapshot() if _hedger is not None else {}
+
+
+def reset_hedger() -> None:
+    """Descarta o executor global, forçando nova leitura das configurações."""
+    global _hedger
+    with _hedger_lock:
+        _hedger = None
@@ -0,0 +1,271 @@
+"""Cache de prefixo de prompt nos provedores de IA.
+
+Em um job de comparação, a instrução base e os dados do instrutor se repetem
+para todos os alunos; só o trecho do aluno muda. Este módulo localiza o
+prefixo dos prompts que não depende do aluno (renderizando os templates com
+valores substitutos) e mantém os handles de conteúdo em cache criados nos
+provedores que exigem cache explícito (Gemini). Também normaliza as contagens
+de tokens lidos do cache informadas pelas respostas.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+
+from core.types import JSONDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PREFIX_CACHE_SETTINGS: Dict[str, Any] = {
+    'ENABLED': True,
+    'MIN_PREFIX_TOKENS': 1024,
+    'CACHED_CONTENT_TTL': 900,
+    'CREATE_FAILURE_TTL': 300,
+}
+
+# Marcadores usados nas duas renderizações de sondagem
+PROBE_MARKERS = ('\x00\x01', '\x00\x02')
+
+# Chaves do contexto que variam entre os alunos de um job
+STUDENT_CONTEXT_KEYS = ('student', 'student_id')
+
+PROBE_CACHE_SIZE = 256
+
+# Registro global para uso em toda a aplicação
+_cached_contents = None
+_cached_contents_lock = threading.RLock()
+
+# Cache LRU global (template + contexto sem o aluno -> prefixo das sondas)
+_probe_prefixes: "OrderedDict[str, Optional[str]]" = OrderedDict()
+_probe_prefixes_lock = threading.RLock()
+
+
+def get_prefix_cache_settings() -> Dict[str, Any]:
+    """Retorna as configurações de cache de prefixo mescladas aos valores padrão."""
+    return {**DEFAULT_PREFIX_CACHE_SETTINGS, **getattr(settings, 'AI_PROMPT_PREFIX_CACHE', {})}
+
+
+class TemplateProbe(dict):
+    """Valor substituto dos dados do aluno na renderização dos templates.
+
+    Qualquer acesso (chave ou atributo) retorna a própria sonda e a conversão
+    para texto retorna o marcador, de modo que a primeira diferença entre duas
+    renderizações com marcadores distintos indica onde o conteúdo do aluno começa.
+    """
+
+    def __init__(self, marker: str) -> None:
+        super().__init__()
+        self.marker = marker
+
+    def __getitem__(self, key: Any) -> 'TemplateProbe':
+        return self
+
+    def __getattr__(self, name: str) -> 'TemplateProbe':
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return self
+
+    def __str__(self) -> str:
+        return self.marker
+
+    def __iter__(self):
+        return iter(())
+
+    def __bool__(self) -> bool:
+        return True
+
+
+def shared_prefix_length(rendered: str, probe_a: str, probe_b: str) -> int:
+    """Calcula o tamanho do prefixo que não depende dos dados do aluno.
+
+    Args:
+        rendered: Texto renderizado com os dados reais.
+        probe_a: Texto renderizado com a primeira sonda.
+        probe_b: Texto renderizado com a segunda sonda.
+
+    Returns:
+        int: Número de caracteres iniciais de `rendered` comuns a todos os alunos.
+    """
+    prefix = os.path.commonprefix([probe_a, probe_b])
+    if not rendered.startswith(prefix):
+        prefix = os.path.commonprefix([rendered, prefix])
+    return len(prefix)
+
+
+def probe_key(context: Dict[str, Any], *templates: Any) -> str:
+    """Gera a chave das sondas a partir dos templates e do contexto sem o aluno.
+
+    Args:
+        context: Variáveis usadas na renderização.
+        *templates: Textos dos templates e demais opções que afetam a renderização.
+
+    Returns:
+        str: Hash SHA-256, igual para todos os alunos de um mesmo instrutor.
+    """
+    shared = {k: v for k, v in context.items() if k not in STUDENT_CONTEXT_KEYS}
+    payload = json.dumps([list(templates), shared], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def get_probe_prefix(key: str, factory: Callable[[], Optional[str]]) -> Optional[str]:
+    """Obtém o prefixo comum às sondas, renderizando-as só no primeiro aluno.
+
+    Args:
+        key: Chave gerada por probe_key.
+        factory: Função que renderiza as sondas e retorna o prefixo comum
+            (None se o prefixo não puder ser usado).
+
+    Returns:
+        Optional[str]: Prefixo comum às sondas, ou None.
+    """
+    with _probe_prefixes_lock:
+        if key in _probe_prefixes:
+            _probe_prefixes.move_to_end(key)
+            return _probe_prefixes[key]
+
+    prefix = factory()
+    with _probe_prefixes_lock:
+        _probe_prefixes[key] = prefix
+        _probe_prefixes.move_to_end(key)
+        while len(_probe_prefixes) > PROBE_CACHE_SIZE:
+            _probe_prefixes.popitem(last=False)
+    return prefix
+
+
+def clear_probe_cache() -> None:
+    """Descarta os prefixos de sondagem memorizados."""
+    with _probe_prefixes_lock:
+        _probe_prefixes.clear()
+
+
+def cache_usage(input_tokens: Optional[int], cached_tokens: Optional[int], cache_write_tokens: Optional[int] = None) -> JSONDict:
+    """Monta os metadados de uso do cache de prefixo de uma resposta.
+
+    Args:
+        input_tokens: Tokens de entrada informados pelo provedor.
+        cached_tokens: Tokens de entrada lidos do cache.
+        cache_write_tokens: Tokens gravados no cache nesta chamada.
+
+    Returns:
+        JSONDict: {'input_tokens', 'cached_tokens', 'cache_write_tokens'}.
+    """
+    return {
+        'input_tokens': input_tokens or 0,
+        'cached_tokens': cached_tokens or 0,
+        'cache_write_tokens': cache_write_tokens or 0,
+    }
+
+
+class CachedContentRegistry:
+    """Registro thread-safe dos handles de conteúdo em cache criados no provedor.
+
+    Cada handle expira no provedor após o TTL; o registro o descarta um pouco
+    antes (10% do TTL) para não referenciar um cache já removido. Chamadas
+    simultâneas para a mesma chave aguardam uma única criação (cada criação é
+    cobrada pelo provedor), e uma criação que falhou não é repetida durante
+    o intervalo informado.
+    """
+
+    def __init__(self) -> None:
+        # chave -> (handle ou None após falha, vencimento)
+        self._entries: Dict[str, tuple] = {}
+        self._creating: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def build_key(client_name: str, api_key: Optional[str], model_name: str, *parts: str) -> str:
+        """Gera a chave do handle a partir do modelo e do conteúdo em cache."""
+        digest = hashlib.sha256()
+        for part in (api_key or '', model_name or '', *parts):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\x00')
+        return f"{client_name}:{digest.hexdigest()}"
+
+    def get_or_create(
+        self,
+        key: str,
+        factory: Callable[[], str],
+        ttl: float,
+        failure_ttl: float = 0.0
+    ) -> Optional[str]:
+        """Obtém o handle da chave, criando-o com `factory` se ausente ou expirado.
+
+        Args:
+            key: Chave gerada por build_key.
+            factory: Função que cria o cache no provedor e retorna o handle.
+            ttl: Tempo de vida do cache no provedor (segundos).
+            failure_ttl: Tempo (segundos) durante o qual uma criação que falhou
+                não é tentada novamente.
+
+        Returns:
+            Optional[str]: Handle do conteúdo em cache, ou None se a criação
+            falhou há menos de `failure_ttl` segundos.
+
+        Raises:
+            Exception: O erro de `factory`, para a chamada que criou e para as
+            que aguardavam a mesma criação.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                return entry[0]
+            pending = self._creating.get(key)
+            if pending is None:
+                pending = self._creating[key] = Future()
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            return pending.result()
+
+        try:
+            handle = factory()
+        except BaseException as e:
+            with self._lock:
+                if failure_ttl > 0:
+                    self._entries[key] = (None, time.monotonic() + failure_ttl)
+                del self._creating[key]
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            self._entries[key] = (handle, now + ttl * 0.9)
+            del self._creating[key]
+        pending.set_result(handle)
+        logger.debug(f"Conteúdo em cache criado no provedor: {key.split(':')[0]} ({handle})")
+        return handle
+
+    def discard(self, handle: str) -> None:
+        """Remove um handle (ex: rejeitado ou expirado no provedor)."""
+        with self._lock:
+            for key in [k for k, (h, _) in self._entries.items() if h is not None and h == handle]:
+                del self._entries[key]
+
+
+def get_cached_content_registry() -> CachedContentRegistry:
+    """Obtém o registro de handles do processo, criando-o na primeira chamada.
+
+    Returns:
+        CachedContentRegistry: Registro compartilhado.
+    """
+    global _cached_contents
+    with _cached_contents_lock:
+        if _cached_contents is None:
+            _cached_contents = CachedContentRegistry()
+        return _cached_contents
+
+
+def reset_cached_content_registry() -> None:
+    """Descarta o registro global de handles."""
+    global _cached_contents
+    with _cached_contents_lock:
+        _cached_contents = None
@@ -0,0 +1,321 @@
+"""Limitador de taxa (token bucket) por provedor, chave de API e modelo.
+
+Complementa o circuit breaker: antes de cada chamada, o cliente reserva uma
+requisição no balde de RPM e os tokens estimados no balde de TPM, aguardando
+capacidade em vez de receber 429 do provedor. Os baldes de uma chamada são
+reservados juntos (tudo ou nada), para que uma espera que estoure o prazo não
+deixe a requisição já descontada do RPM. O backend em memória limita
+apenas o processo atual; o backend Redis compartilha o orçamento entre todos
+os processos (gunicorn e workers do Celery).
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from api.exceptions import RateLimitExceededException
+from api.utils.token_budget import count_prompt_tokens
+from core.types import AIPrompt
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE_LIMIT_SETTINGS: Dict[str, Any] = {
+    'BACKEND': 'memory',
+    'REDIS_URL': None,
+    'KEY_PREFIX': 'ai_rate:',
+    'MAX_WAIT': 60.0,
+}
+
+# Instância global para uso em toda a aplicação
+_rate_limiter = None
+_rate_limiter_lock = threading.RLock()
+
+# Baldes a reservar: (chave, capacidade, taxa/s, quantidade)
+Bucket = Tuple[str, float, float, float]
+
+# Script atômico do token bucket no Redis para vários baldes (ARGV em trios
+# capacidade, taxa, quantidade por chave): reserva todos ou nenhum e retorna 0
+# se reservou, ou o tempo de espera em ms até todos terem saldo
+_REDIS_TOKEN_BUCKET = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local levels = {}
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 3 - 2])
+    local rate = tonumber(ARGV[i * 3 - 1])
+    local amount = tonumber(ARGV[i * 3])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    levels[i] = tokens
+    if tokens < amount then
+        wait = math.max(wait, math.ceil((amount - tokens) / rate * 1000))
+    end
+end
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 3 - 2])
+    local rate = tonumber(ARGV[i * 3 - 1])
+    local tokens = levels[i]
+    if wait == 0 then
+        tokens = tokens - tonumber(ARGV[i * 3])
+    end
+    redis.call('HSET', key, 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', key, math.ceil(capacity / rate) + 60)
+end
+return wait
+"""
+
+
+def estimate_prompt_tokens(prompts: AIPrompt) -> int:
+    """Estima o número de tokens de entrada de uma chamada com o tokenizer local.
+
+    Args:
+        prompts: Prompts preparados para a chamada.
+
+    Returns:
+        int: Estimativa de tokens.
+    """
+    return max(1, count_prompt_tokens(prompts))
+
+
+class RateLimitBackend:
+    """Interface dos backends de armazenamento dos baldes.
+
+    Attributes:
+        blocking: Se reserve_all faz E/S bloqueante (executada fora do event
+            loop no modo asyncio).
+    """
+
+    name = ''
+    blocking = False
+
+    def reserve(self, key: str, capacity: float, rate: float, amount: float) -> float:
+        """Tenta consumir `amount` do balde; nada é consumido se não houver saldo.
+
+        Args:
+            key: Identificador do balde.
+            capacity: Capacidade máxima do balde.
+            rate: Reposição por segundo.
+            amount: Quantidade a consumir (limitada à capacidade).
+
+        Returns:
+            float: 0 se reservado, ou segundos até haver saldo suficiente.
+        """
+        return self.reserve_all([(key, capacity, rate, amount)])
+
+    def reserve_all(self, buckets: List[Bucket]) -> float:
+        """Consome de todos os baldes de uma vez; nada é consumido se algum não tiver saldo.
+
+        Args:
+            buckets: Baldes como (chave, capacidade, taxa/s, quantidade).
+
+        Returns:
+            float: 0 se reservado, ou segundos até todos terem saldo suficiente.
+        """
+        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar reserve_all")
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Baldes mantidos na memória do processo."""
+
+    name = 'memory'
+
+    def __init__(self) -> None:
+        self._buckets: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def reserve_all(self, buckets: List[Bucket]) -> float:
+        now = time.monotonic()
+        with self._lock:
+            levels = []
+            wait = 0.0
+            for key, capacity, rate, amount in buckets:
+                tokens, last = self._buckets.get(key, (capacity, now))
+                tokens = min(capacity, tokens + (now - last) * rate)
+                levels.append(tokens)
+                if tokens < amount:
+                    wait = max(wait, (amount - tokens) / rate)
+            for (key, _, _, amount), tokens in zip(buckets, levels):
+                self._buckets[key] = (tokens if wait else tokens - amount, now)
+            return wait
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Baldes compartilhados em Redis, atualizados por um script Lua atômico."""
+
+    name = 'redis'
+    blocking = True
+
+    def __init__(self, url: str, key_prefix: str) -> None:
+        import redis
+
+        self.key_prefix = key_prefix
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(_REDIS_TOKEN_BUCKET)
+
+    def reserve_all(self, buckets: List[Bucket]) -> float:
+        keys = [self.key_prefix + key for key, _, _, _ in buckets]
+        args = [value for _, capacity, rate, amount in buckets for value in (capacity, rate, amount)]
+        wait_ms = self._script(keys=keys, args=args)
+        return int(wait_ms) / 1000.0
+
+
+class RateLimiter:
+    """Aplica limites de requisições e tokens por minuto sobre um backend.
+
+    Attributes:
+        backend: Backend dos baldes.
+        max_wait: Tempo máximo de espera por capacidade (segundos).
+    """
+
+    def __init__(self, backend: RateLimitBackend, max_wait: float) -> None:
+        self.backend = backend
+        self.max_wait = max_wait
+
+    @staticmethod
+    def _bucket_key(api_name: str, api_key: Optional[str], model_name: str, kind: str) -> str:
+        """Gera a chave do balde sem expor a chave de API.
+
+        A parte comum fica entre chaves (hash tag), para que os baldes de RPM e
+        TPM caiam no mesmo slot de um Redis Cluster e o script os reserve juntos.
+        """
+        key_hash = hashlib.sha256((api_key or '').encode('utf-8')).hexdigest()[:16]
+        return f"{{{api_name}:{key_hash}:{model_name or ''}}}:{kind}"
+
+    def _plan(self, api_name, api_key, model_name, rpm, tpm, tokens) -> List[Bucket]:
+        """Lista os baldes a reservar como (chave, capacidade, taxa/s, quantidade)."""
+        buckets = []
+        if rpm:
+            buckets.append((self._bucket_key(api_name, api_key, model_name, 'rpm'), rpm, rpm / 60.0, 1))
+        if tpm:
+            amount = min(tokens, tpm)
+            buckets.append((self._bucket_key(api_name, api_key, model_name, 'tpm'), tpm, tpm / 60.0, amount))
+        return buckets
+
+    def _deadline_exceeded(self, api_name: str, waited: float, wait: float, max_wait: Optional[float]) -> None:
+        """Levanta RateLimitExceededException se a espera ultrapassar max_wait (ou o limite da chamada)."""
+        limit = self.max_wait if max_wait is None else min(self.max_wait, max_wait)
+        if waited + wait > limit:
+            raise RateLimitExceededException(
+                f"Limite de taxa de {api_name} excedido após {waited:.1f}s de espera",
+                service_name=api_name,
+                retry_after=round(wait, 3)
+            )
+
+    def acquire(
+        self,
+        api_name: str,
+        api_key: Optional[str],
+        model_name: str,
+        rpm: int = 0,
+        tpm: int = 0,
+        tokens: int = 0,
+        max_wait: Optional[float] = None
+    ) -> float:
+        """Aguarda capacidade nos baldes de RPM e TPM e a reserva.
+
+        Args:
+            api_name: Nome do provedor.
+            api_key: Chave de API (apenas o hash é usado).
+            model_name: Modelo chamado.
+            rpm: Requisições por minuto (0 = sem limite).
+            tpm: Tokens por minuto (0 = sem limite).
+            tokens: Tokens estimados da chamada.
+            max_wait: Espera máxima desta chamada (ex.: o restante do prazo da
+                requisição), limitada ao max_wait do limitador.
+
+        Returns:
+            float: Tempo total de espera em segundos.
+
+        Raises:
+            RateLimitExceededException: Se a espera ultrapassar max_wait.
+        """
+        buckets = self._plan(api_name, api_key, model_name, rpm, tpm, tokens)
+        waited = 0.0
+        while buckets:
+            wait = self.backend.reserve_all(buckets)
+            if wait <= 0:
+                break
+            self._deadline_exceeded(api_name, waited, wait, max_wait)
+            time.sleep(wait)
+            waited += wait
+        if waited:
+            logger.debug(f"[{api_name}] Aguardou {waited:.3f}s por capacidade de taxa")
+        return waited
+
+    async def acquire_async(
+        self,
+        api_name: str,
+        api_key: Optional[str],
+        model_name: str,
+        rpm: int = 0,
+        tpm: int = 0,
+        tokens: int = 0,
+        max_wait: Optional[float] = None
+    ) -> float:
+        """Versão assíncrona de acquire, que espera sem bloquear o event loop.
+
+        Backends com E/S bloqueante (Redis) são consultados em uma thread.
+
+        Returns:
+            float: Tempo total de espera em segundos.
+
+        Raises:
+            RateLimitExceededException: Se a espera ultrapassar max_wait.
+        """
+        buckets = self._plan(api_name, api_key, model_name, rpm, tpm, tokens)
+        waited = 0.0
+        while buckets:
+            if self.backend.blocking:
+                wait = await asyncio.to_thread(self.backend.reserve_all, buckets)
+            else:
+                wait = self.backend.reserve_all(buckets)
+            if wait <= 0:
+                break
+            self._deadline_exceeded(api_name, waited, wait, max_wait)
+            await asyncio.sleep(wait)
+            waited += wait
+        return waited
+
+
+def _create_rate_limiter() -> RateLimiter:
+    """Cria o limitador conforme settings.AI_RATE_LIMIT."""
+    config = {**DEFAULT_RATE_LIMIT_SETTINGS, **getattr(settings, 'AI_RATE_LIMIT', {})}
+    backend_name = (config['BACKEND'] or 'memory').lower()
+
+    if backend_name == 'redis':
+        backend = RedisRateLimitBackend(config['REDIS_URL'], config['KEY_PREFIX'])
+    else:
+        if backend_name != 'memory':
+            logger.warning(f"Backend de limite de taxa desconhecido: {backend_name}, usando memória")
+        backend = MemoryRateLimitBackend()
+
+    logger.info(f"Limitador de taxa inicializado: backend={backend.name}")
+    return RateLimiter(backend, config['MAX_WAIT'])
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Obtém o limitador de taxa do processo, criando-o na primeira chamada.
+
+    Returns:
+        RateLimiter: Limitador configurado.
+    """
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = _create_rate_limiter()
+        return _rate_limiter
+
+
+def reset_rate_limiter() -> None:
+    """Descarta a instância global, forçando nova leitura das configurações."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        _rate_limiter = None
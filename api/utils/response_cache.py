@@ -0,0 +1,348 @@
+"""Cache de respostas das APIs de IA.
+
+Permite reaproveitar respostas de chamadas idênticas (mesmo cliente, modelo,
+configurações e prompts) entre requisições, evitando latência e custo de
+provedor quando a mesma atividade é reenviada. O armazenamento é plugável:
+memória do processo, cache do Django (ex: Redis) ou tabela SQLite.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+
+from core.types import AIPrompt, AIResponse, JSONDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SETTINGS: Dict[str, Any] = {
+    'BACKEND': 'memory',
+    'TTL': 3600,
+    'MAX_ENTRIES': 1000,
+    'CACHE_ALIAS': 'default',
+    'SQLITE_PATH': 'ai_response_cache.sqlite3',
+}
+
+# Instância global para uso em toda a aplicação
+_response_cache = None
+_response_cache_lock = threading.RLock()
+
+
+def build_response_cache_key(
+    client_name: str,
+    model_name: str,
+    configurations: JSONDict,
+    prompt: AIPrompt
+) -> str:
+    """Gera a chave de cache de uma chamada.
+
+    Args:
+        client_name: Nome da classe do cliente de IA.
+        model_name: Nome do modelo utilizado.
+        configurations: Configurações enviadas ao modelo.
+        prompt: Prompts preparados para a chamada.
+
+    Returns:
+        str: Hash SHA-256 que identifica a chamada.
+    """
+    payload = json.dumps(
+        [
+            client_name,
+            model_name or '',
+            configurations or {},
+            prompt.system_message or '',
+            prompt.user_message or '',
+        ],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCacheBackend:
+    """Interface dos backends de armazenamento do cache de respostas."""
+
+    name = ''
+
+    def get(self, key: str) -> Optional[JSONDict]:
+        """Obtém uma entrada válida do cache.
+
+        Args:
+            key: Chave da entrada.
+
+        Returns:
+            Optional[JSONDict]: Dados armazenados ou None se ausente/expirado.
+        """
+        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar get")
+
+    def set(self, key: str, value: JSONDict, ttl: int) -> None:
+        """Armazena uma entrada no cache.
+
+        Args:
+            key: Chave da entrada.
+            value: Dados serializáveis em JSON.
+            ttl: Tempo de vida em segundos.
+        """
+        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar set")
+
+    def clear(self) -> None:
+        """Remove todas as entradas do cache."""
+        raise NotImplementedError(f"[{self.name}] Subclasses devem implementar clear")
+
+
+class MemoryResponseCacheBackend(ResponseCacheBackend):
+    """Backend em memória do processo com expiração e remoção LRU."""
+
+    name = 'memory'
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[JSONDict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: JSONDict, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DjangoResponseCacheBackend(ResponseCacheBackend):
+    """Backend sobre o framework de cache do Django (Redis, Memcached, etc).
+
+    A política de remoção por falta de espaço é a do próprio servidor de cache.
+    As entradas usam a geração atual como versão da chave: clear() apenas
+    avança a geração, invalidando só as respostas de IA sem afetar as demais
+    chaves do alias (as entradas antigas expiram pelo TTL).
+    """
+
+    name = 'django'
+    key_prefix = 'ai_response:'
+    generation_key = 'ai_response:generation'
+
+    def __init__(self, alias: str) -> None:
+        from django.core.cache import caches
+        self.cache = caches[alias]
+
+    def _generation(self) -> int:
+        """Retorna a geração atual das chaves, criando-a se ausente."""
+        generation = self.cache.get(self.generation_key)
+        if generation is None:
+            self.cache.add(self.generation_key, 1, timeout=None)
+            generation = self.cache.get(self.generation_key, 1)
+        return generation
+
+    def get(self, key: str) -> Optional[JSONDict]:
+        return self.cache.get(self.key_prefix + key, version=self._generation())
+
+    def set(self, key: str, value: JSONDict, ttl: int) -> None:
+        self.cache.set(self.key_prefix + key, value, timeout=ttl, version=self._generation())
+
+    def clear(self) -> None:
+        self._generation()
+        try:
+            self.cache.incr(self.generation_key)
+        except ValueError:
+            # Geração removida entre as chamadas (ex: remoção pelo servidor)
+            self.cache.add(self.generation_key, 2, timeout=None)
+
+
+class SQLiteResponseCacheBackend(ResponseCacheBackend):
+    """Backend persistente em uma tabela SQLite com expiração e remoção LRU."""
+
+    name = 'sqlite'
+
+    def __init__(self, path: str, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS ai_response_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ai_response_cache_last_access "
+                "ON ai_response_cache (last_access)"
+            )
+
+    def get(self, key: str) -> Optional[JSONDict]:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM ai_response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM ai_response_cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute(
+                "UPDATE ai_response_cache SET last_access = ? WHERE key = ?", (now, key)
+            )
+        return json.loads(value)
+
+    def set(self, key: str, value: JSONDict, ttl: int) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ai_response_cache (key, value, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, default=str), now + ttl, now)
+            )
+            self._conn.execute("DELETE FROM ai_response_cache WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "DELETE FROM ai_response_cache WHERE key IN ("
+                "SELECT key FROM ai_response_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM ai_response_cache")
+
+
+class ResponseCache:
+    """Cache de respostas de IA sobre um backend de armazenamento.
+
+    Apenas respostas bem-sucedidas são armazenadas. Respostas obtidas do cache
+    trazem em metadata['cache'] a indicação do hit, o backend e a idade da entrada.
+
+    Attributes:
+        backend: Backend de armazenamento.
+        ttl: Tempo de vida das entradas em segundos.
+    """
+
+    def __init__(self, backend: ResponseCacheBackend, ttl: int) -> None:
+        self.backend = backend
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[AIResponse]:
+        """Obtém a resposta armazenada para a chave.
+
+        Args:
+            key: Chave gerada por build_response_cache_key.
+
+        Returns:
+            Optional[AIResponse]: Resposta do cache ou None.
+        """
+        try:
+            data = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Falha ao consultar cache de respostas ({self.backend.name}): {e}")
+            return None
+        if data is None:
+            return None
+
+        metadata = dict(data.get('metadata') or {})
+        metadata['cache'] = {
+            'hit': True,
+            'backend': self.backend.name,
+            'age': round(time.time() - data['stored_at'], 3),
+            'original_processing_time': data['processing_time'],
+        }
+        return AIResponse(
+            model_name=data['model_name'],
+            configurations=data['configurations'],
+            processing_time=0.0,
+            response=data['response'],
+            thinking=data.get('thinking'),
+            metadata=metadata
+        )
+
+    def set(self, key: str, response: AIResponse) -> None:
+        """Armazena uma resposta bem-sucedida.
+
+        Args:
+            key: Chave gerada por build_response_cache_key.
+            response: Resposta retornada pela API.
+        """
+        if response.error or not response.response:
+            return
+        data = {
+            'model_name': response.model_name,
+            'configurations': response.configurations,
+            'processing_time': response.processing_time,
+            'response': response.response,
+            'thinking': response.thinking,
+            'metadata': {k: v for k, v in (response.metadata or {}).items() if k != 'cache'},
+            'stored_at': time.time(),
+        }
+        try:
+            self.backend.set(key, data, self.ttl)
+        except Exception as e:
+            logger.warning(f"Falha ao gravar no cache de respostas ({self.backend.name}): {e}")
+
+    def clear(self) -> None:
+        """Remove todas as respostas armazenadas."""
+        self.backend.clear()
+
+
+def _create_response_cache() -> Optional[ResponseCache]:
+    """Cria o cache de respostas conforme settings.AI_RESPONSE_CACHE.
+
+    Returns:
+        Optional[ResponseCache]: Cache configurado ou None se desativado.
+    """
+    config = {**DEFAULT_CACHE_SETTINGS, **getattr(settings, 'AI_RESPONSE_CACHE', {})}
+    backend_name = (config['BACKEND'] or 'none').lower()
+
+    if backend_name == 'memory':
+        backend = MemoryResponseCacheBackend(config['MAX_ENTRIES'])
+    elif backend_name == 'django':
+        backend = DjangoResponseCacheBackend(config['CACHE_ALIAS'])
+    elif backend_name == 'sqlite':
+        backend = SQLiteResponseCacheBackend(config['SQLITE_PATH'], config['MAX_ENTRIES'])
+    else:
+        if backend_name != 'none':
+            logger.warning(f"Backend de cache de respostas desconhecido: {backend_name}, cache desativado")
+        return None
+
+    logger.info(f"Cache de respostas de IA inicializado: backend={backend_name}, ttl={config['TTL']}s")
+    return ResponseCache(backend, config['TTL'])
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Obtém o cache de respostas do processo, criando-o na primeira chamada.
+
+    Returns:
+        Optional[ResponseCache]: Cache configurado ou None se desativado.
+    """
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = _create_response_cache() or False
+        return _response_cache or None
+
+
+def reset_response_cache() -> None:
+    """Descarta a instância global, forçando nova leitura das configurações."""
+    global _response_cache
+    with _response_cache_lock:
+        _response_cache = None
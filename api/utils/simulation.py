@@ -0,0 +1,128 @@
+"""Perfis de simulação do provedor de IA local (cliente "Simulated").
+
+Gera, sem rede e sem custo, respostas sintéticas determinísticas com latência,
+taxa de erros, taxa de 429 e tamanho de saída configuráveis, para testes de
+carga e planejamento de capacidade de process_comparison. Os parâmetros vêm do
+campo `configurations` da configuração de IA.
+
+Cada sorteio usa um gerador derivado da semente, do conteúdo do prompt e do
+número da tentativa daquele prompt: a mesma carga produz os mesmos tempos e
+falhas independentemente da ordem de execução das threads, e uma retentativa
+do mesmo prompt pode ter resultado diferente da primeira.
+"""
+
+import hashlib
+import logging
+import math
+import random
+import threading
+from typing import Any, Dict
+
+from core.types import AIPrompt, JSONDict
+
+logger = logging.getLogger(__name__)
+
+LATENCY_FIXED = 'fixed'
+LATENCY_LOGNORMAL = 'lognormal'
+LATENCY_HEAVY_TAIL = 'heavy_tail'
+
+OUTCOME_OK = 'ok'
+OUTCOME_ERROR = 'error'
+OUTCOME_RATE_LIMITED = 'rate_limited'
+
+DEFAULT_SIMULATION_PROFILE: Dict[str, Any] = {
+    'latency': LATENCY_LOGNORMAL,
+    # Latência fixa, mediana (lognormal) ou mínimo (heavy_tail), em segundos
+    'latency_mean': 1.0,
+    'latency_sigma': 0.5,
+    # Expoente da cauda de Pareto; valores menores geram caudas mais longas
+    'latency_alpha': 1.5,
+    'latency_max': 60.0,
+    'error_rate': 0.0,
+    'rate_limit_rate': 0.0,
+    'output_tokens': 200,
+    'seed': 0,
+}
+
+_VOCABULARY = (
+    'resposta', 'aluno', 'conceito', 'correto', 'parcial', 'critério', 'exemplo',
+    'justificativa', 'cálculo', 'resultado', 'argumento', 'coerente', 'incompleto',
+    'referência', 'desenvolvimento', 'conclusão', 'nota', 'adequado', 'revisar', 'clareza',
+)
+
+# Tentativas por prompt (digest -> número de chamadas)
+_attempts: Dict[str, int] = {}
+_attempts_lock = threading.Lock()
+
+
+class SimulationProfile:
+    """Parâmetros de simulação de uma configuração de IA.
+
+    Attributes:
+        options: Parâmetros mesclados a DEFAULT_SIMULATION_PROFILE.
+    """
+
+    def __init__(self, configurations: JSONDict) -> None:
+        self.options = {
+            **DEFAULT_SIMULATION_PROFILE,
+            **{key: value for key, value in (configurations or {}).items() if key in DEFAULT_SIMULATION_PROFILE}
+        }
+
+    @staticmethod
+    def prompt_digest(prompts: AIPrompt) -> str:
+        """Identificador estável do conteúdo dos prompts."""
+        content = f"{prompts.system_message or ''}\x00{prompts.user_message or ''}"
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def rng_for(self, digest: str) -> random.Random:
+        """Cria o gerador da próxima tentativa do prompt."""
+        with _attempts_lock:
+            attempt = _attempts.get(digest, 0) + 1
+            _attempts[digest] = attempt
+        return random.Random(f"{self.options['seed']}:{digest}:{attempt}")
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Sorteia a latência da chamada conforme a distribuição configurada.
+
+        Returns:
+            float: Latência em segundos, limitada a latency_max.
+        """
+        kind = self.options['latency']
+        mean = float(self.options['latency_mean'])
+        if kind == LATENCY_FIXED:
+            latency = mean
+        elif kind == LATENCY_HEAVY_TAIL:
+            latency = mean * rng.paretovariate(float(self.options['latency_alpha']))
+        else:
+            if kind != LATENCY_LOGNORMAL:
+                logger.warning(f"Distribuição de latência desconhecida: {kind}, usando lognormal")
+            latency = rng.lognormvariate(math.log(max(mean, 1e-6)), float(self.options['latency_sigma']))
+        return min(max(0.0, latency), float(self.options['latency_max']))
+
+    def sample_outcome(self, rng: random.Random) -> str:
+        """Sorteia o desfecho da chamada (sucesso, erro ou 429)."""
+        draw = rng.random()
+        if draw < self.options['rate_limit_rate']:
+            return OUTCOME_RATE_LIMITED
+        if draw < self.options['rate_limit_rate'] + self.options['error_rate']:
+            return OUTCOME_ERROR
+        return OUTCOME_OK
+
+    def synthesize(self, digest: str) -> str:
+        """Gera a resposta sintética do prompt, idêntica a cada chamada.
+
+        Args:
+            digest: Identificador do conteúdo dos prompts.
+
+        Returns:
+            str: Texto com aproximadamente output_tokens palavras.
+        """
+        rng = random.Random(f"{self.options['seed']}:{digest}")
+        words = [rng.choice(_VOCABULARY) for _ in range(max(1, int(self.options['output_tokens'])))]
+        return f"Avaliação simulada {digest[:8]}: " + ' '.join(words)
+
+
+def reset_simulation() -> None:
+    """Zera a contagem de tentativas por prompt."""
+    with _attempts_lock:
+        _attempts.clear()
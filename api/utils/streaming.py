@@ -0,0 +1,106 @@
+"""Consumo das respostas das IAs em streaming.
+
+Os clientes que suportam streaming expõem a geração como um iterador de
+trechos de texto (deltas). Este módulo aplica sobre esse iterador o limite de
+tokens de saída, interrompendo gerações descontroladas antes que terminem
+(e sejam cobradas por inteiro), e monta a resposta final a partir dos deltas.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Generator, Iterator, Optional, Tuple
+
+from django.conf import settings
+
+from api.utils.token_budget import count_tokens
+from core.types import JSONDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STREAMING_SETTINGS: Dict[str, Any] = {
+    'ENABLED': False,
+    'MAX_OUTPUT_TOKENS': 8192,
+}
+
+# Gerador de deltas de texto; o valor de retorno traz metadados da geração
+DeltaStream = Generator[str, None, JSONDict]
+DeltaCallback = Callable[[str], None]
+
+
+class StreamCancelled(Exception):
+    """Lançada pelo receptor de trechos para interromper a geração.
+
+    Usada quando ninguém mais consome os trechos (ex.: o cliente HTTP
+    desconectou); ao contrário dos demais erros do receptor, encerra o
+    streaming com o provedor e é propagada a quem iniciou a chamada.
+    """
+
+
+def get_streaming_settings() -> Dict[str, Any]:
+    """Retorna as configurações de streaming mescladas aos valores padrão."""
+    return {**DEFAULT_STREAMING_SETTINGS, **getattr(settings, 'AI_STREAMING', {})}
+
+
+def guard_output(deltas: Iterator[str], max_tokens: int, label: str = '') -> DeltaStream:
+    """Repassa os deltas de uma geração, interrompendo-a ao exceder `max_tokens`.
+
+    Ao interromper (ou quando o consumidor para de iterar), o iterador de
+    origem é fechado, o que encerra a conexão de streaming com o provedor.
+
+    Args:
+        deltas: Gerador de deltas do provedor (o valor de retorno é preservado).
+        max_tokens: Limite de tokens de saída (0 = sem limite).
+        label: Identificação usada nos logs.
+
+    Returns:
+        JSONDict: Metadados da geração acrescidos de 'output_tokens' e 'aborted'.
+    """
+    output_tokens = 0
+    try:
+        while True:
+            try:
+                delta = next(deltas)
+            except StopIteration as stop:
+                return {**(stop.value or {}), 'output_tokens': output_tokens, 'aborted': False}
+            if not delta:
+                continue
+            output_tokens += count_tokens(delta)
+            yield delta
+            if max_tokens and output_tokens >= max_tokens:
+                logger.warning(f"[{label}] Geração interrompida após {output_tokens} tokens de saída "
+                               f"(limite {max_tokens})")
+                return {'output_tokens': output_tokens, 'aborted': True}
+    finally:
+        close = getattr(deltas, 'close', None)
+        if close:
+            close()
+
+
+def consume(stream: DeltaStream, on_delta: Optional[DeltaCallback] = None) -> Tuple[str, JSONDict]:
+    """Consome um gerador de deltas, repassando cada trecho ao callback.
+
+    Args:
+        stream: Gerador de deltas.
+        on_delta: Função chamada com cada trecho; erros nela não interrompem a
+            geração, exceto StreamCancelled.
+
+    Returns:
+        Tuple[str, JSONDict]: Texto completo e metadados retornados pelo gerador.
+
+    Raises:
+        StreamCancelled: Se o receptor cancelar a geração; o gerador é fechado antes.
+    """
+    parts = []
+    while True:
+        try:
+            delta = next(stream)
+        except StopIteration as stop:
+            return ''.join(parts), dict(stop.value or {})
+        parts.append(delta)
+        if on_delta:
+            try:
+                on_delta(delta)
+            except StreamCancelled:
+                stream.close()
+                raise
+            except Exception as e:
+                logger.error(f"Erro ao repassar delta de streaming: {str(e)}")
@@ -0,0 +1,99 @@
+"""Cache de templates de prompt compilados.
+
+Mantém, por processo, os templates Django já compilados a partir do texto
+das configurações de prompt, evitando que o mesmo template seja analisado
+novamente a cada aluno e a cada IA de uma comparação.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict
+
+from django.conf import settings
+from django.template import engines
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 256
+
+# Cache LRU global (hash do template -> template compilado)
+_template_cache: "OrderedDict[str, Any]" = OrderedDict()
+_template_cache_lock = threading.RLock()
+_template_cache_stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+
+def _max_size() -> int:
+    """Retorna o tamanho máximo do cache definido nas configurações."""
+    return getattr(settings, 'PROMPT_TEMPLATE_CACHE_SIZE', DEFAULT_MAX_SIZE)
+
+
+def _template_key(source: str) -> str:
+    """Gera a chave do cache a partir do texto do template.
+
+    Args:
+        source: Texto do template.
+
+    Returns:
+        str: Hash SHA-256 do texto.
+    """
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+def get_compiled_template(source: str) -> Any:
+    """Obtém o template compilado, compilando-o apenas na primeira utilização.
+
+    Args:
+        source: Texto do template em sintaxe Django.
+
+    Returns:
+        Any: Template compilado pela engine Django, pronto para render().
+    """
+    key = _template_key(source)
+    with _template_cache_lock:
+        template = _template_cache.get(key)
+        if template is not None:
+            _template_cache.move_to_end(key)
+            _template_cache_stats['hits'] += 1
+            return template
+        _template_cache_stats['misses'] += 1
+
+    # Compila fora do lock; compilações concorrentes do mesmo texto são equivalentes
+    template = engines['django'].from_string(source)
+
+    with _template_cache_lock:
+        _template_cache[key] = template
+        _template_cache.move_to_end(key)
+        max_size = _max_size()
+        while len(_template_cache) > max_size:
+            _template_cache.popitem(last=False)
+            _template_cache_stats['evictions'] += 1
+    return template
+
+
+def clear_template_cache() -> None:
+    """Remove todos os templates compilados do cache."""
+    with _template_cache_lock:
+        removed = len(_template_cache)
+        _template_cache.clear()
+    logger.debug(f"Cache de templates limpo ({removed} entradas removidas)")
+
+
+def get_template_cache_stats() -> Dict[str, int]:
+    """Retorna as estatísticas de uso do cache.
+
+    Returns:
+        Dict[str, int]: Contadores de hits, misses, evictions e tamanho atual.
+    """
+    with _template_cache_lock:
+        stats = dict(_template_cache_stats)
+        stats['size'] = len(_template_cache)
+    return stats
+
+
+def reset_template_cache_stats() -> None:
+    """Zera os contadores de uso do cache."""
+    with _template_cache_lock:
+        for key in _template_cache_stats:
+            _template_cache_stats[key] = 0
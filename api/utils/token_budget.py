@@ -0,0 +1,255 @@
+"""Estimativa de tokens e orçamento de tamanho dos prompts.
+
+Conta os tokens dos prompts preparados com um tokenizer local (biblioteca
+`tokenizers`, carregado de TOKENIZER_FILE; sem arquivo, ~4 caracteres por
+token) e compara com a janela de contexto do modelo, descontada a
+reserva de saída. Prompts acima do limite são rejeitados antes da chamada ou
+têm o conteúdo do aluno reduzido (truncado ou resumido), conforme a política
+configurada em settings.AI_PROMPT_BUDGET.
+"""
+
+import copy
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from core.types import AIPrompt, JSONDict
+
+logger = logging.getLogger(__name__)
+
+POLICY_NONE = 'none'
+POLICY_REJECT = 'reject'
+POLICY_TRUNCATE = 'truncate'
+POLICY_SUMMARIZE = 'summarize'
+
+# Janelas de contexto por prefixo do nome do modelo (o prefixo mais longo prevalece)
+DEFAULT_CONTEXT_LIMITS: Dict[str, int] = {
+    'gpt-3.5': 16385,
+    'gpt-4': 8192,
+    'gpt-4-turbo': 128000,
+    'gpt-4o': 128000,
+    'gpt-4.1': 1047576,
+    'o1': 200000,
+    'o3': 200000,
+    'o4': 200000,
+    'claude': 200000,
+    'gemini': 1048576,
+    'sonar': 127072,
+    'llama': 128000,
+}
+
+DEFAULT_BUDGET_SETTINGS: Dict[str, Any] = {
+    'POLICY': POLICY_REJECT,
+    'TOKENIZER_FILE': None,
+    'DEFAULT_CONTEXT_LIMIT': 128000,
+    'CONTEXT_LIMITS': {},
+    'OUTPUT_RESERVE': 1024,
+}
+
+TRUNCATION_MARKER = "\n[... conteúdo truncado ...]"
+
+# Tokenizer global (False indica que o carregamento falhou e a heurística é usada)
+_tokenizer = None
+_tokenizer_lock = threading.Lock()
+
+
+def get_budget_settings() -> Dict[str, Any]:
+    """Retorna as configurações de orçamento mescladas aos valores padrão."""
+    return {**DEFAULT_BUDGET_SETTINGS, **getattr(settings, 'AI_PROMPT_BUDGET', {})}
+
+
+def _get_tokenizer() -> Any:
+    """Carrega o tokenizer local uma única vez por processo.
+
+    O tokenizer só é lido de TOKENIZER_FILE (arquivo local); nada é baixado no
+    caminho das requisições. Sem arquivo configurado, a heurística é usada.
+
+    Returns:
+        Any: Instância de tokenizers.Tokenizer ou None se indisponível.
+    """
+    global _tokenizer
+    with _tokenizer_lock:
+        if _tokenizer is None:
+            tokenizer_file = get_budget_settings()['TOKENIZER_FILE']
+            if not tokenizer_file:
+                logger.info("TOKENIZER_FILE não configurado, usando estimativa por caracteres")
+                _tokenizer = False
+                return None
+            try:
+                from tokenizers import Tokenizer
+
+                _tokenizer = Tokenizer.from_file(tokenizer_file)
+                logger.info(f"Tokenizer carregado para estimativa de prompts: {tokenizer_file}")
+            except Exception as e:
+                logger.warning(f"Tokenizer indisponível, usando estimativa por caracteres: {e}")
+                _tokenizer = False
+        return _tokenizer or None
+
+
+def count_tokens(text: str) -> int:
+    """Conta os tokens de um texto.
+
+    Args:
+        text: Texto a ser medido.
+
+    Returns:
+        int: Número de tokens (estimado em ~4 caracteres por token sem tokenizer).
+    """
+    if not text:
+        return 0
+    tokenizer = _get_tokenizer()
+    if tokenizer is None:
+        return max(1, len(text) // 4)
+    return len(tokenizer.encode(text, add_special_tokens=False).ids)
+
+
+def count_prompt_tokens(prompts: AIPrompt) -> int:
+    """Conta os tokens de entrada de uma chamada.
+
+    Args:
+        prompts: Prompts preparados para a chamada.
+
+    Returns:
+        int: Tokens da mensagem de sistema somados aos da mensagem do usuário.
+    """
+    return count_tokens(prompts.system_message or '') + count_tokens(prompts.user_message or '')
+
+
+def get_context_limit(model_name: str) -> int:
+    """Retorna a janela de contexto do modelo.
+
+    Args:
+        model_name: Nome do modelo.
+
+    Returns:
+        int: Limite de tokens de contexto.
+    """
+    config = get_budget_settings()
+    limits = {**DEFAULT_CONTEXT_LIMITS, **config['CONTEXT_LIMITS']}
+    model = (model_name or '').lower()
+    matches = [prefix for prefix in limits if model.startswith(prefix.lower())]
+    if not matches:
+        return config['DEFAULT_CONTEXT_LIMIT']
+    return limits[max(matches, key=len)]
+
+
+def get_prompt_limit(model_name: str, configurations: Optional[JSONDict] = None) -> int:
+    """Retorna o limite de tokens de entrada, descontando a reserva de saída.
+
+    A reserva é o máximo de tokens de saída configurado no modelo ou, na sua
+    ausência, OUTPUT_RESERVE.
+
+    Args:
+        model_name: Nome do modelo.
+        configurations: Configurações enviadas ao modelo.
+
+    Returns:
+        int: Tokens disponíveis para o prompt.
+    """
+    configurations = configurations or {}
+    reserve = (
+        configurations.get('max_tokens')
+        or configurations.get('max_output_tokens')
+        or configurations.get('max_completion_tokens')
+        or get_budget_settings()['OUTPUT_RESERVE']
+    )
+    return max(1, get_context_limit(model_name) - int(reserve))
+
+
+def _string_leaves(value: Any, path: Tuple = ()) -> List[Tuple[Tuple, str]]:
+    """Lista (caminho, texto) de todas as strings de uma estrutura JSON."""
+    if isinstance(value, str):
+        return [(path, value)]
+    if isinstance(value, dict):
+        return [leaf for k, v in value.items() for leaf in _string_leaves(v, path + (k,))]
+    if isinstance(value, list):
+        return [leaf for i, v in enumerate(value) for leaf in _string_leaves(v, path + (i,))]
+    return []
+
+
+def _set_leaf(value: Any, path: Tuple, text: str) -> None:
+    """Substitui a string no caminho informado."""
+    for key in path[:-1]:
+        value = value[key]
+    value[path[-1]] = text
+
+
+def longest_text_fields(student: JSONDict, limit: int = 3) -> List[Tuple[Tuple, str]]:
+    """Retorna os campos de texto mais longos do conteúdo do aluno.
+
+    Args:
+        student: Dados do aluno.
+        limit: Número máximo de campos.
+
+    Returns:
+        List[Tuple[Tuple, str]]: (caminho, texto) em ordem decrescente de tamanho.
+    """
+    leaves = sorted(_string_leaves(student), key=lambda leaf: len(leaf[1]), reverse=True)
+    return leaves[:limit]
+
+
+def replace_text_field(student: JSONDict, path: Tuple, text: str) -> JSONDict:
+    """Retorna uma cópia do conteúdo do aluno com um campo de texto substituído.
+
+    Args:
+        student: Dados do aluno.
+        path: Caminho do campo.
+        text: Novo texto.
+
+    Returns:
+        JSONDict: Cópia alterada.
+    """
+    student = copy.deepcopy(student)
+    _set_leaf(student, path, text)
+    return student
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Corta um texto para caber em `max_tokens`, mantendo o início.
+
+    Args:
+        text: Texto original.
+        max_tokens: Número máximo de tokens.
+
+    Returns:
+        str: Texto truncado com marcador, ou o original se já couber.
+    """
+    tokens = count_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return TRUNCATION_MARKER.strip()
+    keep_chars = int(len(text) * max_tokens / tokens)
+    return text[:keep_chars] + TRUNCATION_MARKER
+
+
+def shrink_student_content(student: JSONDict, excess_tokens: int) -> JSONDict:
+    """Reduz o conteúdo do aluno em pelo menos `excess_tokens`, truncando os textos mais longos.
+
+    Args:
+        student: Dados do aluno (não são alterados).
+        excess_tokens: Tokens que precisam ser removidos.
+
+    Returns:
+        JSONDict: Cópia dos dados com os campos mais longos truncados.
+    """
+    student = copy.deepcopy(student)
+    remaining = excess_tokens
+    for path, text in longest_text_fields(student, limit=len(_string_leaves(student))):
+        if remaining <= 0:
+            break
+        tokens = count_tokens(text)
+        # Margem de 5% para compensar a estimativa proporcional de caracteres
+        target = max(0, tokens - int(remaining * 1.05) - 1)
+        _set_leaf(student, path, truncate_to_tokens(text, target))
+        remaining -= tokens - target
+    return student
+
+
+def reset_tokenizer() -> None:
+    """Descarta o tokenizer carregado, forçando nova leitura das configurações."""
+    global _tokenizer
+    with _tokenizer_lock:
+        _tokenizer = None
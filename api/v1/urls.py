@@ -8,7 +8,7 @@ import logging
 from django.urls import path
 
 from api.exceptions import APIClientException
-from .views import compare, compare_async, operation_status, operations_list
+from .views import compare, compare_async, compare_stream, operation_status, operations_list
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +20,7 @@ urlpatterns = [
 <<<<<<< HEAD
     path('compare/', compare, name='compare'),
     path('compare/async/', compare_async, name='compare_async'),
+    path('compare/stream/', compare_stream, name='compare_stream'),
     path('operations/<str:operation_id>/', operation_status, name='operation_status'),
     path('operations/', operations_list, name='operations_list'),
 =======
@@ -1,2 +1,2 @@
-from .compare_view import compare, compare_async
+from .compare_view import compare, compare_async, compare_stream
 from .operation_view import operation_status, operations_list
@@ -1,8 +1,10 @@
 """View para comparação de dados usando múltiplas IAs."""
 
+import json
 import logging
+from typing import Optional
 
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from rest_framework.decorators import api_view
 from rest_framework import status
 from django.http import HttpRequest, HttpResponse
@@ -13,10 +15,26 @@ from core.types import (
     EntityStatus
 )
 
-from api.service.comparator import compare_data
+from api.service.comparator import compare_data, stream_comparison
 
 logger = logging.getLogger(__name__)
 
+def _request_timeout(request: HttpRequest) -> Optional[float]:
+    """Lê o tempo limite da requisição do cabeçalho X-Request-Timeout (segundos).
+
+    Returns:
+        Optional[float]: Tempo limite informado, ou None se ausente ou inválido.
+    """
+    value = request.META.get('HTTP_X_REQUEST_TIMEOUT')
+    if not value:
+        return None
+    try:
+        timeout = float(value)
+    except ValueError:
+        logger.warning(f"Cabeçalho X-Request-Timeout inválido ignorado: {value}")
+        return None
+    return timeout if timeout > 0 else None
+
 @api_view(['POST'])
 def compare(request: HttpRequest) -> HttpResponse:
     """
@@ -35,7 +53,9 @@ def compare(request: HttpRequest) -> HttpResponse:
     
     try:
         # Executa o processamento síncrono
-        operation_data = compare_data(data=request.data, token_key=token_key, sync=True)
+        operation_data = compare_data(
+            data=request.data, token_key=token_key, sync=True, timeout=_request_timeout(request)
+        )
 
         # Verifica o status da operação
         if operation_data.get_status() == EntityStatus.COMPLETED:
@@ -81,7 +101,9 @@ def compare_async(request: HttpRequest) -> HttpResponse:
     
     try:
         # Cria a operação assíncrona
-        operation_data = compare_data(data=request.data, token_key=token_key, sync=False)
+        operation_data = compare_data(
+            data=request.data, token_key=token_key, sync=False, timeout=_request_timeout(request)
+        )
         
         # Retornamos o resumo da operação imediatamente
         summary = operation_data.get_summary()
@@ -92,3 +114,43 @@ def compare_async(request: HttpRequest) -> HttpResponse:
         # Captura qualquer exceção inesperada
         response = APPResponse.from_exception(e)
         return JsonResponse(response.to_dict(), status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+def compare_stream(request: HttpRequest) -> HttpResponse:
+    """
+    Endpoint para comparação de dados usando múltiplas IAs com resultados em STREAMING.
+    
+    - Recebe dados de instrutor e alunos via POST;
+    - Emite os trechos de texto gerados (registros "delta") das IAs com streaming;
+    - Emite cada resultado (aluno, IA) assim que é concluído;
+    - Finaliza com um registro "summary" (resumo da operação, sem resultados) ou "error".
+    
+    O formato é NDJSON (application/x-ndjson) por padrão, ou Server-Sent Events
+    quando o cabeçalho Accept contém text/event-stream.
+    """
+    version = request.version
+    logger.info(f"Iniciando operação de comparação em streaming (API v{version})")
+    
+    # Extrai e valida token
+    auth_header = request.META.get('HTTP_AUTHORIZATION', '')
+    token_key = auth_header.split(' ')[-1] if ' ' in auth_header else auth_header
+    
+    use_sse = 'text/event-stream' in request.META.get('HTTP_ACCEPT', '')
+    
+    def render(records):
+        for record in records:
+            payload = json.dumps(record, ensure_ascii=False, default=str)
+            if use_sse:
+                yield f"event: {record['type']}\ndata: {payload}\n\n"
+            else:
+                yield payload + "\n"
+    
+    response = StreamingHttpResponse(
+        render(stream_comparison(data=request.data, token_key=token_key, timeout=_request_timeout(request))),
+        content_type='text/event-stream' if use_sse else 'application/x-ndjson',
+        status=status.HTTP_200_OK
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -8,22 +8,30 @@ e logs detalhados de requisições.
 import logging
 import json
 import dataclasses
-from django.http import JsonResponse, HttpRequest, HttpResponse
+import ipaddress
+from django.conf import settings
+from django.http import JsonResponse, HttpRequest, HttpResponse, HttpResponseForbidden
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, get_object_or_404
 from django.db.models import Count, Avg
 from django.utils import timezone
 from datetime import timedelta, datetime
 from django.utils.dateparse import parse_date
+from django_prometheus.exports import ExportToDjangoView
 
 from core.types.errors import APPError
 
 from ..models import APILog
+from api.utils.adaptive_concurrency import get_concurrency_registry
+from api.utils.hedging import get_hedge_stats
+from core.utils.task_executor import get_task_executor
 from accounts.models import UserToken
 from core.types import APPResponse
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_METRICS_ALLOWED_IPS = []
+
 @login_required
 def monitoring_dashboard(request: HttpRequest) -> HttpResponse:
     """Renderiza o dashboard principal de monitoramento.
@@ -248,6 +256,14 @@ def monitoring_stats(request: HttpRequest) -> JsonResponse:
             'period_days': days,
             'tokens': tokens
         }
+        if is_staff:
+            # Métricas de cobertura do processo atual (chamadas duplicadas e vencedores)
+            stats_data['hedging'] = get_hedge_stats()
+            # Ocupação do executor de tarefas compartilhado do processo
+            stats_data['task_executor'] = get_task_executor().stats()
+            # Limites adaptativos de concorrência por provedor e chave
+            registry = get_concurrency_registry()
+            stats_data['concurrency_limits'] = registry.stats() if registry is not None else {}
         
         response = APPResponse.create_success(stats_data)
         return JsonResponse(response.to_dict(), status=200)
@@ -458,3 +474,48 @@ def monitoring_request_details(request: HttpRequest, request_id: int) -> JsonRes
         error = APPError(message=f"Erro ao processar detalhes: {str(e)}")
         response = APPResponse.create_failure(error)
         return JsonResponse(response.to_dict(), status=500)
+
+
+def _metrics_access_allowed(request: HttpRequest) -> bool:
+    """Verifica se a requisição pode ler as métricas Prometheus.
+
+    Usuários staff autenticados sempre têm acesso; os demais só a partir dos
+    endereços (ou redes CIDR) de PROMETHEUS_METRICS_ALLOWED_IPS, vazia por
+    padrão. Usa apenas REMOTE_ADDR, pois X-Forwarded-For pode ser forjado pelo
+    cliente; atrás de um proxy local, REMOTE_ADDR é o do proxy.
+
+    Args:
+        request: Requisição HTTP.
+
+    Returns:
+        bool: True se o acesso for permitido.
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated and user.is_staff:
+        return True
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    for network in getattr(settings, 'PROMETHEUS_METRICS_ALLOWED_IPS', DEFAULT_METRICS_ALLOWED_IPS):
+        try:
+            if address in ipaddress.ip_network(network, strict=False):
+                return True
+        except ValueError:
+            logger.warning(f"Endereço inválido em PROMETHEUS_METRICS_ALLOWED_IPS: {network}")
+    return False
+
+
+def metrics_export(request: HttpRequest) -> HttpResponse:
+    """Exporta as métricas Prometheus para staff e endereços autorizados.
+
+    Args:
+        request: Requisição HTTP.
+
+    Returns:
+        HttpResponse: Métricas no formato de exposição do Prometheus, ou 403.
+    """
+    if not _metrics_access_allowed(request):
+        logger.warning(f"Acesso negado às métricas Prometheus: {request.META.get('REMOTE_ADDR')}")
+        return HttpResponseForbidden("Acesso restrito às métricas")
+    return ExportToDjangoView(request)
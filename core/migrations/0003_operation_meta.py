@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_remove_asynctaskrecord_core_asynct_user_id_d3b65f_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='operation',
+            name='meta',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Metadados'),
+        ),
+    ]
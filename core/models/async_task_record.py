@@ -2,7 +2,12 @@
 
 import logging
 import uuid
+from typing import Optional
+
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Least
+from django.utils import timezone
 
 from accounts.models import UserToken
 from core.models.operations import Operation
@@ -162,6 +167,42 @@ class AsyncTaskRecord(models.Model):
             raise
 
     
+    @classmethod
+    def update_progress(cls, task_id: str, progress: float, status: Optional[EntityStatus] = None) -> int:
+        """Atualiza apenas progresso e status de uma tarefa, com um único UPDATE.
+
+        Args:
+            task_id: ID da tarefa.
+            progress: Progresso atual (0 a 100).
+            status: Novo status da tarefa (opcional).
+
+        Returns:
+            int: Número de registros atualizados.
+        """
+        fields = {'progress': progress, 'updated_at': timezone.now()}
+        if status is not None:
+            fields['status'] = status.value
+        return cls.objects.filter(task_id=task_id).update(**fields)
+
+    @classmethod
+    def increment_progress(cls, task_id: str, delta: float) -> int:
+        """Soma `delta` ao progresso de uma tarefa de forma atômica, limitado a 100.
+
+        Permite que vários workers reportem progresso da mesma tarefa sem
+        sobrescrever as atualizações uns dos outros.
+
+        Args:
+            task_id: ID da tarefa.
+            delta: Pontos percentuais a somar.
+
+        Returns:
+            int: Número de registros atualizados.
+        """
+        return cls.objects.filter(task_id=task_id).update(
+            progress=Least(F('progress') + delta, Value(100.0)),
+            updated_at=timezone.now()
+        )
+
     @classmethod
     def from_async_task(cls, task: AsyncTask, operation: Operation = None) -> 'AsyncTaskRecord':
         """Cria ou atualiza um registro a partir de um AsyncTask.
@@ -27,6 +27,7 @@ class Operation(models.Model):
         user_token: Token usado para autenticar a requisição.
         created_at: Data e hora de criação da operação.
         expiration: Data e hora de expiração da operação.
+        meta: Metadados da operação (ex: estatísticas de deduplicação).
     """
     
     operation_id = models.CharField(
@@ -57,6 +58,11 @@ class Operation(models.Model):
         blank=True,
         verbose_name="Expiração"
     )
+    meta = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Metadados"
+    )
     
     class Meta:
         verbose_name = "Operação"
@@ -100,6 +106,7 @@ class Operation(models.Model):
             created_at=self.created_at,
             updated_at=timezone.now(),  # Usa o tempo atual como última atualização
             expiration=self.expiration,
+            meta=self.meta or {},
             tasks=tasks
         )
         
@@ -160,6 +167,7 @@ class Operation(models.Model):
         operation.user_token = user_token
         operation.operation_type = operation_data.operation_type.value
         operation.expiration = operation_data.expiration
+        operation.meta = operation_data.meta or {}
         operation.save()
         
         # Salvar tarefas associadas
@@ -0,0 +1,106 @@
+# core/tests/test_deadline.py
+
+import threading
+import time
+
+from django.test import SimpleTestCase, override_settings
+
+from core.types import EntityStatus
+from core.types.task import QueueConfig, QueueableTask
+from core.utils.deadline import bounded_timeout, deadline_from_timeout, is_expired
+from core.utils.queue_manager import TaskQueue
+from core.utils.task_executor import reset_task_executor
+
+
+class DeadlineHelpersTests(SimpleTestCase):
+    """Testes das funções de prazo."""
+
+    def test_no_timeout_means_no_deadline(self):
+        self.assertIsNone(deadline_from_timeout(None))
+        self.assertIsNone(deadline_from_timeout(0))
+        self.assertFalse(is_expired(None))
+
+    def test_bounded_timeout_uses_remaining_budget(self):
+        deadline = time.time() + 2.0
+        self.assertLessEqual(bounded_timeout(30.0, deadline), 2.0)
+        self.assertEqual(bounded_timeout(1.0, deadline), 1.0)
+        self.assertEqual(bounded_timeout(30.0, None), 30.0)
+        self.assertEqual(bounded_timeout(30.0, time.time() - 1), 0.0)
+
+
+@override_settings(TASK_EXECUTOR={'MAX_WORKERS': 1})
+class QueueDeadlineTests(SimpleTestCase):
+    """Testes do abandono de tarefas pela fila ao esgotar o prazo."""
+
+    def setUp(self):
+        reset_task_executor()
+        self.addCleanup(reset_task_executor)
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def _queue(self, **overrides):
+        options = dict(name="deadline", max_attempts=3, initial_wait=0.01, max_parallel_first=2)
+        options.update(overrides)
+        return TaskQueue(QueueConfig(**options))
+
+    def test_slow_task_is_abandoned_with_timeout_result(self):
+        results = {}
+        task = QueueableTask(
+            func=lambda: self.release.wait(5) or "tarde demais",
+            result_callback=lambda tid, res: results.setdefault(tid, res),
+            deadline=deadline_from_timeout(0.2),
+            timeout_result=lambda message: {"error": "deadline_exceeded", "message": message}
+        )
+        queue = self._queue()
+        queue.add_task(task)
+
+        start = time.monotonic()
+        queue.process_tasks()
+
+        # O único worker continua preso na chamada: o prazo é entregue pelo temporizador
+        self.assertLess(time.monotonic() - start, 2.0)
+        self.assertFalse(self.release.is_set())
+        self.assertEqual(task.status, EntityStatus.COMPLETED)
+        self.assertEqual(results[task.task_id]["error"], "deadline_exceeded")
+        self.assertEqual(queue.stats.timed_out_tasks, 1)
+
+    def test_waiting_task_expires_without_a_free_slot(self):
+        calls = []
+        deadline = deadline_from_timeout(0.2)
+        queue = self._queue(max_parallel_first=1)
+        queue.add_task(QueueableTask(func=lambda: self.release.wait(5), deadline=deadline))
+        queue.add_task(QueueableTask(func=lambda: calls.append(1), deadline=deadline))
+
+        start = time.monotonic()
+        queue.process_tasks()
+
+        self.assertLess(time.monotonic() - start, 2.0)
+        self.assertEqual(calls, [])
+        self.assertEqual(queue.stats.timed_out_tasks, 2)
+        self.assertEqual(queue.stats.pending_tasks, 0)
+        self.assertEqual(queue.stats.in_progress_tasks, 0)
+
+    def test_timed_out_task_is_not_retried_after_deadline(self):
+        def failing():
+            time.sleep(0.1)
+            raise RuntimeError("falha")
+
+        task = QueueableTask(func=failing, deadline=deadline_from_timeout(0.03))
+        queue = self._queue()
+        queue.add_task(task)
+        queue.process_tasks()
+
+        self.assertEqual(task.status, EntityStatus.FAILED)
+        self.assertEqual(queue.retry_tasks, [])
+        self.assertEqual(task.attempt, 1)
+
+    def test_expired_task_is_not_started(self):
+        calls = []
+        queue = self._queue()
+        task = QueueableTask(func=lambda: calls.append(1), deadline=time.time() - 1)
+        queue.add_task(task)
+        queue.process_tasks()
+
+        self.assertEqual(calls, [])
+        self.assertEqual(task.status, EntityStatus.FAILED)
+        self.assertEqual(queue.stats.timed_out_tasks, 1)
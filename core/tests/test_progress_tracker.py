@@ -0,0 +1,43 @@
+# core/tests/test_progress_tracker.py
+
+import threading
+
+from django.test import SimpleTestCase
+
+from core.utils.progress_tracker import ProgressTracker
+
+
+class ProgressTrackerTests(SimpleTestCase):
+    """Testes do contador de progresso orientado a eventos."""
+
+    def test_notifies_subscribers_on_each_completion(self):
+        received = []
+        tracker = ProgressTracker(4, subscribers=[received.append])
+        for _ in range(4):
+            tracker.complete()
+        self.assertEqual(received, [25.0, 50.0, 75.0, 100.0])
+
+    def test_concurrent_completions_are_counted_once(self):
+        tracker = ProgressTracker(800)
+
+        def worker():
+            for _ in range(100):
+                tracker.complete()
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(tracker.completed, 800)
+        self.assertEqual(tracker.percent, 100.0)
+
+    def test_subscriber_errors_do_not_interrupt_processing(self):
+        def failing(progress):
+            raise RuntimeError("falha")
+
+        received = []
+        tracker = ProgressTracker(2, subscribers=[failing, received.append])
+        self.assertEqual(tracker.complete(), 50.0)
+        self.assertEqual(received, [50.0])
@@ -0,0 +1,40 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from core.types import EntityStatus
+from core.utils.progress_writer import ProgressWriter
+
+
+@mock.patch("core.models.async_task_record.AsyncTaskRecord.update_progress")
+class ProgressWriterTests(SimpleTestCase):
+    """Testes da gravação coalescida de progresso."""
+
+    def test_small_updates_are_coalesced(self, update_progress):
+        writer = ProgressWriter("t1", flush_interval_ms=60_000, min_delta=10.0)
+        for i in range(1, 10):
+            writer.update(float(i), EntityStatus.PROCESSING)
+
+        # Apenas a primeira atualização é gravada; as demais variam menos de 10 pontos
+        self.assertEqual(update_progress.call_count, 1)
+
+        writer.update(12.0, EntityStatus.PROCESSING)
+        self.assertEqual(update_progress.call_count, 2)
+        update_progress.assert_called_with("t1", 12.0, EntityStatus.PROCESSING)
+
+    def test_status_change_forces_flush(self, update_progress):
+        writer = ProgressWriter("t1", flush_interval_ms=60_000, min_delta=50.0)
+        writer.update(1.0, EntityStatus.PROCESSING)
+        writer.update(2.0, EntityStatus.COMPLETED)
+
+        self.assertEqual(update_progress.call_count, 2)
+
+    def test_close_always_writes_final_state(self, update_progress):
+        writer = ProgressWriter("t1", flush_interval_ms=60_000, min_delta=50.0)
+        writer.update(10.0, EntityStatus.PROCESSING)
+        writer.update(99.0, EntityStatus.PROCESSING)
+        writer.close()
+        writer.update(100.0, EntityStatus.PROCESSING)
+
+        update_progress.assert_called_with("t1", 99.0, EntityStatus.PROCESSING)
+        self.assertEqual(writer.writes, 2)
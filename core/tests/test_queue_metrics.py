@@ -0,0 +1,93 @@
+# core/tests/test_queue_metrics.py
+
+import threading
+import time
+
+from django.test import SimpleTestCase, override_settings
+from prometheus_client import REGISTRY
+
+from core.types.task import QueueConfig, QueueableTask
+from core.utils.queue_manager import TaskManager, TaskQueue
+from core.utils.task_executor import reset_task_executor
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class FailOnce:
+    """Função que falha apenas na primeira chamada."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls == 1:
+            raise RuntimeError("falha transitória")
+        return "ok"
+
+
+@override_settings(TASK_EXECUTOR={'MAX_WORKERS': 8})
+class QueueMetricsTests(SimpleTestCase):
+    """Testes dos histogramas de espera, execução e tentativas das filas."""
+
+    def setUp(self):
+        reset_task_executor()
+        self.addCleanup(reset_task_executor)
+
+    def _queue(self, name, **overrides):
+        options = dict(name=name, max_attempts=2, initial_wait=0.01, randomness_factor=0.0, max_parallel_first=1)
+        options.update(overrides)
+        return TaskQueue(QueueConfig(**options), provider="Simulated")
+
+    def test_wait_and_execution_are_observed_per_queue_and_provider(self):
+        queue = self._queue("metricas-espera")
+        for _ in range(3):
+            queue.add_task(QueueableTask(func=time.sleep, args=(0.05,)))
+
+        queue.process_tasks()
+
+        labels = {'queue': "metricas-espera", 'provider': "Simulated"}
+        self.assertEqual(sample('ensinanet_queue_wait_seconds_count', kind='first', **labels), 3)
+        # Com uma vaga, a terceira tarefa espera as duas anteriores
+        self.assertGreaterEqual(sample('ensinanet_queue_wait_seconds_sum', kind='first', **labels), 0.15)
+        self.assertEqual(sample('ensinanet_queue_execution_seconds_count', outcome='completed', **labels), 3)
+        self.assertGreaterEqual(sample('ensinanet_queue_execution_seconds_sum', outcome='completed', **labels), 0.15)
+        self.assertEqual(sample('ensinanet_queue_batch_seconds_count', **labels), 1)
+
+    def test_attempts_count_retries_until_the_final_outcome(self):
+        queue = self._queue("metricas-tentativas")
+        queue.add_task(QueueableTask(func=FailOnce()))
+        queue.add_task(QueueableTask(func=lambda: "ok"))
+
+        queue.process_tasks()
+
+        labels = {'queue': "metricas-tentativas", 'provider': "Simulated", 'status': 'completed'}
+        self.assertEqual(sample('ensinanet_queue_task_attempts_count', **labels), 2)
+        self.assertEqual(sample('ensinanet_queue_task_attempts_sum', **labels), 3)
+        self.assertEqual(sample('ensinanet_queue_wait_seconds_count', queue="metricas-tentativas",
+                                provider="Simulated", kind='retry'), 1)
+        self.assertEqual(sample('ensinanet_queue_execution_seconds_count', queue="metricas-tentativas",
+                                provider="Simulated", outcome='failed'), 1)
+
+    def test_stats_stay_consistent_under_concurrent_updates(self):
+        queue = self._queue("metricas-stats", max_attempts=1, max_parallel_first=-1)
+        adders = [
+            threading.Thread(target=lambda: [queue.add_task(QueueableTask(func=lambda: None)) for _ in range(50)])
+            for _ in range(4)
+        ]
+        for adder in adders:
+            adder.start()
+        for adder in adders:
+            adder.join()
+        self.assertEqual(queue.stats.pending_tasks, 200)
+
+        before = sample('ensinanet_task_manager_run_seconds_count')
+        manager = TaskManager()
+        manager.add_queue(queue)
+        manager.run()
+
+        self.assertEqual(queue.stats.completed_tasks, 200)
+        self.assertEqual(queue.stats.in_progress_tasks, 0)
+        self.assertEqual(sample('ensinanet_task_manager_run_seconds_count'), before + 1)
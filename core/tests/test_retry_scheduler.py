@@ -0,0 +1,94 @@
+# core/tests/test_retry_scheduler.py
+
+import threading
+import time
+
+from django.test import SimpleTestCase, override_settings
+
+from core.types import EntityStatus
+from core.types.task import QueueConfig, QueueableTask
+from core.utils.queue_manager import TaskQueue
+from core.utils.task_executor import get_task_executor, reset_task_executor
+
+
+class FlakyCall:
+    """Função que falha na primeira tentativa (falha transitória) quando marcada."""
+
+    def __init__(self, fails_first: bool, duration: float = 0.02):
+        self.fails_first = fails_first
+        self.duration = duration
+        self.calls = 0
+        self.started_at = []
+        self.finished_at = []
+
+    def __call__(self):
+        self.calls += 1
+        self.started_at.append(time.monotonic())
+        time.sleep(self.duration)
+        self.finished_at.append(time.monotonic())
+        if self.fails_first and self.calls == 1:
+            raise RuntimeError("falha transitória")
+        return "ok"
+
+
+@override_settings(TASK_EXECUTOR={'MAX_WORKERS': 8})
+class RetrySchedulerTests(SimpleTestCase):
+    """Testes da fila de atraso para retentativas."""
+
+    def setUp(self):
+        reset_task_executor()
+        self.addCleanup(reset_task_executor)
+
+    def _queue(self, **overrides):
+        options = dict(name="retry", max_attempts=3, initial_wait=0.3, randomness_factor=0.0,
+                       max_parallel_first=4, max_parallel_retry=1)
+        options.update(overrides)
+        return TaskQueue(QueueConfig(**options))
+
+    def test_backoff_does_not_hold_a_worker(self):
+        queue = self._queue(initial_wait=0.5)
+        call = FlakyCall(fails_first=True)
+        task = QueueableTask(func=call)
+        queue.add_task(task)
+
+        worker = threading.Thread(target=queue.process_tasks)
+        worker.start()
+        time.sleep(0.2)
+        stats = get_task_executor().stats()
+        # Durante o backoff a tarefa está na fila de atraso e nenhum worker está ocupado
+        self.assertEqual(call.calls, 1)
+        self.assertEqual([delayed[2] for delayed in queue._delayed], [task])
+        self.assertEqual((stats['active'], stats['queued']), (0, 0))
+
+        worker.join(5)
+        self.assertEqual(task.status, EntityStatus.COMPLETED)
+        self.assertEqual(call.calls, 2)
+
+    def test_retries_are_dispatched_in_due_order(self):
+        queue = self._queue(max_parallel_first=-1)
+        order = []
+        for name, wait in (("b", 0.2), ("a", 0.1)):
+            task = QueueableTask(func=lambda name=name: order.append(name))
+            with queue._lock:
+                queue._schedule_retry(task, wait)
+
+        queue.process_tasks()
+        self.assertEqual(order, ["a", "b"])
+
+    def test_first_attempts_do_not_wait_for_backoff_with_30_percent_transient_failures(self):
+        """Com 30% de falhas transitórias, as primeiras tentativas não esperam pelo backoff."""
+        queue = self._queue(initial_wait=1.0)
+        calls = [FlakyCall(fails_first=(i % 10) < 3) for i in range(40)]
+        tasks = [QueueableTask(func=call) for call in calls]
+        for task in tasks:
+            queue.add_task(task)
+
+        queue.process_tasks()
+
+        self.assertTrue(all(task.status == EntityStatus.COMPLETED for task in tasks))
+        self.assertEqual(queue.stats.failed_tasks, 12)
+        # Todas as primeiras tentativas terminam antes de qualquer retentativa começar:
+        # dormir no worker faria as falhas atrasarem as tarefas seguintes da fila.
+        retries = [call for call in calls if call.calls == 2]
+        self.assertEqual(len(retries), 12)
+        self.assertLess(max(call.finished_at[0] for call in calls), min(call.started_at[1] for call in retries))
@@ -0,0 +1,211 @@
+# core/tests/test_task_executor.py
+
+import asyncio
+import threading
+import time
+
+from django.test import SimpleTestCase, override_settings
+
+from core.types import EntityStatus
+from core.types.task import QueueConfig, QueueableTask
+from core.utils.queue_manager import TaskManager, TaskQueue
+from core.utils.task_executor import (
+    PRIORITY_INTERACTIVE,
+    PRIORITY_LARGE_BATCH,
+    PRIORITY_SMALL_BATCH,
+    TaskExecutor,
+    get_task_executor,
+    reset_task_executor,
+)
+
+
+class TaskExecutorTests(SimpleTestCase):
+    """Testes do executor compartilhado e seus medidores."""
+
+    def setUp(self):
+        self.executor = TaskExecutor(max_workers=2, max_provider_calls=1)
+        self.addCleanup(self.executor.shutdown, False)
+
+    def test_gauges_report_active_and_queued_work(self):
+        release = threading.Event()
+        futures = [self.executor.submit(release.wait, 5) for _ in range(3)]
+        time.sleep(0.1)
+
+        stats = self.executor.stats()
+        self.assertEqual(stats['active'], 2)
+        self.assertEqual(stats['queued'], 1)
+
+        release.set()
+        for future in futures:
+            future.result(timeout=5)
+        stats = self.executor.stats()
+        self.assertEqual((stats['active'], stats['queued'], stats['completed']), (0, 0, 3))
+
+    def test_timer_runs_callbacks_in_due_order_and_skips_cancelled(self):
+        calls = []
+        done = threading.Event()
+        self.executor.call_later(0.1, lambda: (calls.append('b'), done.set()))
+        self.executor.call_later(0.05, lambda: calls.append('a'))
+        self.executor.call_later(0.01, lambda: calls.append('x')).cancel()
+
+        self.assertTrue(done.wait(2))
+        self.assertEqual(calls, ['a', 'b'])
+
+    def test_provider_slots_are_capped(self):
+        self.assertTrue(self.executor.acquire_provider_slot())
+        self.assertFalse(self.executor.acquire_provider_slot(timeout=0.05))
+        self.assertEqual(self.executor.stats()['provider_calls']['active'], 1)
+
+        self.executor.release_provider_slot()
+        self.assertTrue(self.executor.acquire_provider_slot(timeout=0.05))
+        self.executor.release_provider_slot()
+
+    def test_async_callers_share_the_provider_cap(self):
+        peak = 0
+        active = 0
+
+        async def call():
+            nonlocal peak, active
+            self.assertTrue(await self.executor.acquire_provider_slot_async(timeout=5))
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            self.executor.release_provider_slot()
+
+        async def run_all():
+            await asyncio.gather(*(call() for _ in range(4)))
+
+        asyncio.run(run_all())
+        self.assertEqual(peak, 1)
+
+        # Uma vaga ocupada por uma thread também barra o modo asyncio
+        self.assertTrue(self.executor.acquire_provider_slot())
+        self.assertFalse(asyncio.run(self.executor.acquire_provider_slot_async(timeout=0.05)))
+        self.executor.release_provider_slot()
+        self.assertEqual(self.executor.stats()['provider_calls']['active'], 0)
+
+
+class SchedulingTests(SimpleTestCase):
+    """Testes das classes de prioridade e da divisão justa entre tokens."""
+
+    def setUp(self):
+        self.executor = TaskExecutor(max_workers=1, token_weights={'pesado': 2})
+        self.addCleanup(self.executor.shutdown, False)
+        self.order = []
+        self.gate = threading.Event()
+        # Ocupa o único worker enquanto o trabalho é enfileirado
+        self.blocker = self.executor.submit(self.gate.wait, 5)
+
+    def _enqueue(self, label, priority, tenant):
+        return self.executor.schedule(lambda: self.order.append(label), priority=priority, tenant=tenant)
+
+    def _drain(self, futures):
+        self.gate.set()
+        for future in futures:
+            future.result(timeout=5)
+
+    def test_higher_classes_run_first(self):
+        futures = [
+            self._enqueue("grande", PRIORITY_LARGE_BATCH, "a"),
+            self._enqueue("pequeno", PRIORITY_SMALL_BATCH, "a"),
+            self._enqueue("interativo", PRIORITY_INTERACTIVE, "b"),
+        ]
+        self._drain(futures)
+        self.assertEqual(self.order, ["interativo", "pequeno", "grande"])
+
+    def test_tokens_share_a_class_fairly(self):
+        futures = [self._enqueue(f"lote-{i}", PRIORITY_LARGE_BATCH, "lote") for i in range(6)]
+        futures += [self._enqueue(f"outro-{i}", PRIORITY_LARGE_BATCH, "outro") for i in range(2)]
+        self._drain(futures)
+        # O segundo token não espera as 6 tarefas do primeiro
+        self.assertLessEqual(self.order.index("outro-1"), 3)
+
+    def test_weights_favor_heavier_tokens(self):
+        futures = [self._enqueue(f"leve-{i}", PRIORITY_SMALL_BATCH, "leve") for i in range(4)]
+        futures += [self._enqueue(f"pesado-{i}", PRIORITY_SMALL_BATCH, "pesado") for i in range(4)]
+        self._drain(futures)
+        first_half = self.order[:6]
+        self.assertGreater(sum(label.startswith("pesado") for label in first_half),
+                           sum(label.startswith("leve") for label in first_half))
+
+    def test_wait_time_is_reported_per_class(self):
+        futures = [self._enqueue("grande", PRIORITY_LARGE_BATCH, "a")]
+        time.sleep(0.05)
+        self._drain(futures)
+        classes = self.executor.stats()['classes']
+        self.assertEqual(classes['large_batch']['dispatched'], 1)
+        self.assertGreaterEqual(classes['large_batch']['wait_max'], 0.05)
+        self.assertEqual(classes['interactive']['dispatched'], 1)
+
+
+@override_settings(TASK_EXECUTOR={'MAX_WORKERS': 4})
+class SharedExecutorQueueTests(SimpleTestCase):
+    """Testes das filas executando no executor compartilhado."""
+
+    def setUp(self):
+        reset_task_executor()
+        self.addCleanup(reset_task_executor)
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+
+    def _tracked(self, duration=0.05):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(duration)
+        with self.lock:
+            self.running -= 1
+        return threading.current_thread().name
+
+    def _queue(self, name, size, max_parallel_first=-1):
+        queue = TaskQueue(QueueConfig(name=name, max_parallel_first=max_parallel_first, initial_wait=0.01))
+        for _ in range(size):
+            queue.add_task(QueueableTask(func=self._tracked))
+        return queue
+
+    def test_queues_share_the_bounded_pool(self):
+        manager = TaskManager()
+        queues = [self._queue(f"fila-{i}", 6) for i in range(3)]
+        for queue in queues:
+            manager.add_queue(queue)
+        threads_before = threading.active_count()
+
+        manager.run()
+
+        self.assertLessEqual(self.peak, 4)
+        self.assertEqual(sum(queue.stats.completed_tasks for queue in queues), 18)
+        self.assertLessEqual(threading.active_count(), threads_before + 4 + 1)
+        self.assertEqual(get_task_executor().stats()['active'], 0)
+
+    def test_queue_limit_is_enforced_inside_shared_pool(self):
+        queue = self._queue("limitada", 8, max_parallel_first=2)
+        queue.process_tasks()
+
+        self.assertEqual(self.peak, 2)
+        self.assertEqual(queue.stats.completed_tasks, 8)
+
+    def test_slow_task_is_abandoned_but_keeps_its_slot_until_it_returns(self):
+        settled_on = []
+        queue = TaskQueue(QueueConfig(name="timeout", max_attempts=1, max_parallel_first=1, timeout=0.1))
+        slow_finished = []
+        slow = QueueableTask(
+            func=lambda: (time.sleep(0.4), slow_finished.append(time.monotonic())),
+            timeout_result=lambda message: settled_on.append(time.monotonic()) or "timeout"
+        )
+        fast_started = []
+        fast = QueueableTask(func=lambda: fast_started.append(time.monotonic()))
+        queue.add_task(slow)
+        queue.add_task(fast)
+
+        queue.process_tasks()
+
+        self.assertEqual(slow.result, "timeout")
+        self.assertEqual(fast.status, EntityStatus.COMPLETED)
+        self.assertEqual(queue.stats.timed_out_tasks, 1)
+        # O desfecho do tempo limite não espera a chamada abandonada terminar
+        self.assertEqual(len(settled_on), 1)
+        self.assertLess(settled_on[0], slow_finished[0])
+        # A chamada abandonada ocupa a única vaga até terminar
+        self.assertGreaterEqual(fast_started[0], slow_finished[0])
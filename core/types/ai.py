@@ -38,6 +38,7 @@ class AIResponse(DataModel):
         response: Resposta gerada pela IA.
         thinking: Texto de pensamento gerado pela IA (opcional).
         error: Erro ocorrido durante o processamento, se houver.
+        metadata: Informações adicionais sobre a chamada (ex: uso de cache).
     """
     model_name: str
     configurations: JSONDict
@@ -45,6 +46,7 @@ class AIResponse(DataModel):
     response: Optional[str] = None
     thinking: Optional[str] = None
     error: Optional[APIError] = None
+    metadata: JSONDict = field(default_factory=dict)
 
     def __post_init__(self):
         """Valida os dados após inicialização."""
@@ -71,9 +73,22 @@ class AIPrompt(DataModel):
     Args:
         user_message: Mensagem do usuário contendo a requisição.
         system_message: Mensagem de sistema que define o comportamento (opcional).
+        cache_prefix_length: Número de caracteres iniciais de user_message que
+            não dependem do aluno e podem ser cacheados pelo provedor.
     """
     user_message: str
     system_message: Optional[str] = None
+    cache_prefix_length: int = field(default=0, kw_only=True)
+
+    @property
+    def cacheable_prefix(self) -> str:
+        """Trecho inicial da mensagem do usuário comum a todos os alunos."""
+        return self.user_message[:self.cache_prefix_length]
+
+    @property
+    def variable_suffix(self) -> str:
+        """Trecho da mensagem do usuário específico do aluno."""
+        return self.user_message[self.cache_prefix_length:]
     
     def to_dict(self) -> JSONDict:
         """Converte o prompt para um dicionário.
@@ -267,6 +282,9 @@ class AIConfig(DataModel):
         base_instruction: Instrução base para a IA (system message).
         prompt: Prompt personalizado para a IA.
         responses: Formatos de resposta esperados.
+        use_response_cache: Define se respostas podem ser reaproveitadas do cache.
+        http_options: Opções de transporte HTTP (pool, timeouts, compressão).
+        rate_limits: Limites de requisições ('rpm') e tokens ('tpm') por minuto.
     """
     api_key: str
     api_url: str
@@ -277,6 +295,9 @@ class AIConfig(DataModel):
     base_instruction: str = ''
     prompt: str = ''
     responses: str = ''
+    use_response_cache: bool = False
+    http_options: JSONDict = field(default_factory=dict)
+    rate_limits: JSONDict = field(default_factory=dict)
      
     
     def to_dict(self) -> JSONDict:
@@ -296,6 +317,9 @@ class AIConfig(DataModel):
             "base_instruction": self.base_instruction,
             "prompt": self.prompt,
             "responses": self.responses,
+            "use_response_cache": self.use_response_cache,
+            "http_options": self.http_options,
+            "rate_limits": self.rate_limits,
         })
             
         return base_dict
@@ -319,7 +343,10 @@ class AIConfig(DataModel):
             training_configurations=data.get('training_configurations', {}),
             base_instruction=data.get('base_instruction', ''),
             prompt=data.get('prompt', ''),
-            responses=data.get('responses', '')
+            responses=data.get('responses', ''),
+            use_response_cache=data.get('use_response_cache', False),
+            http_options=data.get('http_options', {}),
+            rate_limits=data.get('rate_limits', {})
         )
 
 class AIModelType(Enum):
@@ -24,6 +24,9 @@ from . import DataModel, JSONDict
 
 logger = logging.getLogger(__name__)
 
+# Comparações com mais alunos que este limite são tarefas grandes (prioridade baixa)
+LARGE_TASK_STUDENT_COUNT = 5
+
 # -----------------------------------------------------------------------------
 # Tipos para Requisição 
 # -----------------------------------------------------------------------------
@@ -36,15 +39,18 @@ class ComparisonRequestData(DataModel):
     Args:
         instructor: Dados do instrutor (resposta referência).
         students: Dicionário de dados dos alunos, indexado por identificador.
+        deadline: Prazo da requisição em epoch (segundos), ou None se não houver.
     """
     instructor: JSONDict
     students: Dict[str, JSONDict]
+    deadline: Optional[float]
     
-    def __init__(self, instructor: JSONDict, students: Dict[str, JSONDict]):
+    def __init__(self, instructor: JSONDict, students: Dict[str, JSONDict], deadline: Optional[float] = None):
         """Inicializa com dados do instrutor e estudantes"""
         super().__init__()
         self.instructor = instructor
         self.students = students
+        self.deadline = deadline
 
     def __post_init__(self):
         """Valida os dados após inicialização.
@@ -85,7 +91,8 @@ class ComparisonRequestData(DataModel):
         base_dict = super().to_dict()
         base_dict.update({
             "instructor": self.instructor,
-            "students": self.students
+            "students": self.students,
+            "deadline": self.deadline
         })
         return base_dict
         
@@ -101,7 +108,8 @@ class ComparisonRequestData(DataModel):
         """
         return cls(
             instructor=data.get('instructor', {}),
-            students=data.get('students', {})
+            students=data.get('students', {}),
+            deadline=data.get('deadline')
         )
         
     def get_student_names(self) -> List[str]:
@@ -260,7 +268,7 @@ class ComparisonTask(QueueableTask):
         Returns:
             bool: True se for uma tarefa grande.
         """
-        return self.student_count > 5
+        return self.student_count > LARGE_TASK_STUDENT_COUNT
     
     def get_summary(self) -> JSONDict:
         """Retorna um resumo da tarefa de comparação.
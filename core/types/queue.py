@@ -31,6 +31,7 @@ class QueueStats(BaseModel):
         failed_tasks (int): Número de tarefas que falharam.
         retry_tasks (int): Número de tarefas aguardando nova tentativa.
         avg_processing_time (float): Tempo médio de processamento em segundos.
+        timed_out_tasks (int): Número de tarefas abandonadas por tempo limite ou prazo.
     """
     queue_name: str
     pending_tasks: int = 0
@@ -39,6 +40,7 @@ class QueueStats(BaseModel):
     failed_tasks: int = 0
     retry_tasks: int = 0
     avg_processing_time: float = 0.0
+    timed_out_tasks: int = 0
     
     def __post_init__(self):
         """Valida os valores após inicialização."""
@@ -481,12 +481,17 @@ class QueueableTask(TaskBase):
         kwargs (Dict): Argumentos nomeados para a função.
         result_callback (Optional[Callable[[str, Any], None]]): Função de callback para processar o resultado.
         attempt (int): Número atual de tentativas de execução.
+        deadline (Optional[float]): Prazo da requisição (epoch); após ele a tarefa é abandonada.
+        timeout_result (Optional[Callable[[str], Any]]): Gera o resultado de uma tarefa
+            abandonada por tempo limite a partir da mensagem de erro.
             """
     func: Callable = field(default=None) 
     args: tuple = ()
     kwargs: Dict = field(default_factory=dict)
     result_callback: Optional[Callable[[str, Any], None]] = None
     attempt: int = 1
+    deadline: Optional[float] = None
+    timeout_result: Optional[Callable[[str], Any]] = None
         
     def __post_init__(self):
         """Valida e registra a criação da tarefa."""
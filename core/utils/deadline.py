@@ -0,0 +1,61 @@
+"""Prazos (deadlines) de ponta a ponta das requisições.
+
+O prazo é um instante absoluto (epoch em segundos), e não uma duração, para
+que possa ser serializado junto com os dados da operação e atravessar
+processos (views, workers do Celery) sem perder o tempo já consumido. Cada
+etapa deriva dele o tempo restante para limitar suas próprias esperas.
+"""
+
+import time
+from typing import Optional
+
+
+def deadline_from_timeout(timeout: Optional[float]) -> Optional[float]:
+    """Converte um tempo limite relativo em prazo absoluto.
+
+    Args:
+        timeout: Segundos a partir de agora (None ou <= 0 = sem prazo).
+
+    Returns:
+        Optional[float]: Prazo em epoch (segundos) ou None.
+    """
+    if not timeout or timeout <= 0:
+        return None
+    return time.time() + float(timeout)
+
+
+def remaining_time(deadline: Optional[float]) -> Optional[float]:
+    """Retorna o tempo restante até o prazo.
+
+    Args:
+        deadline: Prazo em epoch ou None.
+
+    Returns:
+        Optional[float]: Segundos restantes (pode ser negativo) ou None se não há prazo.
+    """
+    if deadline is None:
+        return None
+    return deadline - time.time()
+
+
+def is_expired(deadline: Optional[float]) -> bool:
+    """Indica se o prazo já passou."""
+    remaining = remaining_time(deadline)
+    return remaining is not None and remaining <= 0
+
+
+def bounded_timeout(timeout: Optional[float], deadline: Optional[float]) -> Optional[float]:
+    """Limita um tempo limite ao restante do prazo.
+
+    Args:
+        timeout: Tempo limite próprio da etapa (None = sem limite).
+        deadline: Prazo da requisição.
+
+    Returns:
+        Optional[float]: Menor entre os dois (nunca negativo), ou None se ambos ausentes.
+    """
+    remaining = remaining_time(deadline)
+    if remaining is None:
+        return timeout
+    remaining = max(0.0, remaining)
+    return remaining if timeout is None else min(timeout, remaining)
@@ -2,23 +2,25 @@
 
 Fornece funções para converter documentos PDF e Word para texto
 usando o docling como biblioteca de processamento.
+
+O docling (e seus modelos) é importado apenas na primeira conversão, quando
+uma requisição traz um arquivo, e não na inicialização dos processos.
 """
 
 import os
 import tempfile
 import logging
 from pathlib import Path
-
-from docling.document_converter import DocumentConverter, PdfFormatOption
-from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
-from docling.datamodel.base_models import InputFormat
-from docling.datamodel.pipeline_options import PdfPipelineOptions
+from typing import TYPE_CHECKING
 
 from core.exceptions import FileProcessingException
 
+if TYPE_CHECKING:
+    from docling.datamodel.pipeline_options import PdfPipelineOptions
+
 logger = logging.getLogger(__name__)
 
-def _get_pipeline_options() -> PdfPipelineOptions:
+def _get_pipeline_options() -> 'PdfPipelineOptions':
     """Configura as opções do pipeline docling.
     
     Tenta obter configurações personalizadas do banco de dados ou
@@ -28,6 +30,8 @@ def _get_pipeline_options() -> PdfPipelineOptions:
         PdfPipelineOptions: Opções configuradas para o pipeline.
     """
     logger.debug("Configurando opções do pipeline docling")
+    from docling.document_converter import PdfFormatOption
+    from docling.datamodel.pipeline_options import PdfPipelineOptions
     
     try:
         from ai_config.models import DoclingConfiguration
@@ -56,12 +60,12 @@ def _get_pipeline_options() -> PdfPipelineOptions:
         extract_tables=False
     )
 
-def _convert_file_to_text(input_path: Path, format: InputFormat) -> str:
+def _convert_file_to_text(input_path: Path, format: str) -> str:
     """Converte um arquivo para texto usando o docling.
     
     Args:
         input_path: Caminho para o arquivo a ser convertido.
-        format: Formato do arquivo de entrada.
+        format: Nome do formato de entrada (membro de docling InputFormat, ex: 'PDF').
         
     Returns:
         str: Texto extraído do documento.
@@ -72,6 +76,10 @@ def _convert_file_to_text(input_path: Path, format: InputFormat) -> str:
     logger.debug(f"Convertendo arquivo para texto: {input_path} (formato: {format})")
     
     try:
+        from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
+        from docling.datamodel.base_models import InputFormat
+        from docling.document_converter import DocumentConverter
+
         # Configurar o conversor com as opções apropriadas
         options = _get_pipeline_options()
         converter = DocumentConverter(
@@ -80,7 +88,7 @@ def _convert_file_to_text(input_path: Path, format: InputFormat) -> str:
         )
         
         # Converter o documento
-        result = converter.convert_document(input_path, format)
+        result = converter.convert_document(input_path, InputFormat[format])
         logger.info(f"Documento convertido com sucesso: {input_path}")
         
         # Exportar como texto plano ou markdown
@@ -148,7 +156,7 @@ def convert_pdf_file_to_text(pdf_path: str) -> str:
         logger.error(error_msg)
         raise FileProcessingException(error_msg)
         
-    return _convert_file_to_text(input_path, InputFormat.PDF)
+    return _convert_file_to_text(input_path, 'PDF')
 
 def convert_pdf_bytes_to_text(pdf_bytes: bytes, filename: str) -> str:
     """Converte o conteúdo de um PDF (em bytes) para texto utilizando o docling.
@@ -186,7 +194,7 @@ def convert_word_file_to_text(word_path: str) -> str:
         logger.error(error_msg)
         raise FileProcessingException(error_msg)
         
-    return _convert_file_to_text(input_path, InputFormat.DOCX)
+    return _convert_file_to_text(input_path, 'DOCX')
 
 def convert_word_bytes_to_text(word_bytes: bytes, filename: str) -> str:
     """Converte o conteúdo de um arquivo Word (em bytes) para texto utilizando o docling.
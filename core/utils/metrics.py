@@ -0,0 +1,66 @@
+"""Métricas Prometheus das filas de tarefas.
+
+Histogramas do tempo de espera por vaga, do tempo de execução e do número de
+tentativas das tarefas, por fila e provedor, e da duração dos lotes. São
+expostos em /metrics pelo django-prometheus (restrito a staff e aos endereços
+de PROMETHEUS_METRICS_ALLOWED_IPS, ver api.views.monitoring.metrics_export).
+
+Em modo multiprocessos (workers do gunicorn ou do Celery), defina a variável
+de ambiente PROMETHEUS_MULTIPROC_DIR com um diretório vazio antes de iniciar
+os processos: cada processo grava suas amostras nele e o /metrics agrega todos.
+Processos encerrados devem ser informados com mark_process_dead().
+"""
+
+import logging
+import os
+
+from prometheus_client import Histogram, multiprocess
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+ATTEMPT_BUCKETS = (1, 2, 3, 4, 5, 10)
+
+QUEUE_WAIT_SECONDS = Histogram(
+    'ensinanet_queue_wait_seconds',
+    'Tempo de espera por vaga na fila antes da execução (sem o backoff das retentativas)',
+    ['queue', 'provider', 'kind'],
+    buckets=LATENCY_BUCKETS
+)
+QUEUE_EXECUTION_SECONDS = Histogram(
+    'ensinanet_queue_execution_seconds',
+    'Duração da execução das tarefas da fila',
+    ['queue', 'provider', 'outcome'],
+    buckets=LATENCY_BUCKETS
+)
+QUEUE_TASK_ATTEMPTS = Histogram(
+    'ensinanet_queue_task_attempts',
+    'Tentativas usadas por tarefa até o desfecho final',
+    ['queue', 'provider', 'status'],
+    buckets=ATTEMPT_BUCKETS
+)
+QUEUE_BATCH_SECONDS = Histogram(
+    'ensinanet_queue_batch_seconds',
+    'Duração do processamento de um lote da fila, do start() à última tarefa',
+    ['queue', 'provider'],
+    buckets=LATENCY_BUCKETS
+)
+TASK_MANAGER_RUN_SECONDS = Histogram(
+    'ensinanet_task_manager_run_seconds',
+    'Duração de TaskManager.run (todas as filas de um job)',
+    buckets=LATENCY_BUCKETS
+)
+
+
+def mark_process_dead(pid: int) -> None:
+    """Descarta as métricas ao vivo de um processo encerrado no modo multiprocessos.
+
+    Args:
+        pid: Identificador do processo encerrado.
+    """
+    if not os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        return
+    try:
+        multiprocess.mark_process_dead(pid)
+    except Exception as e:
+        logger.warning(f"Erro ao descartar métricas do processo {pid}: {e}")
@@ -0,0 +1,66 @@
+"""Acompanhamento de progresso orientado a eventos.
+
+Mantém contadores de tarefas concluídas/total e notifica os assinantes a cada
+conclusão, dispensando threads de monitoramento e recontagens dos resultados.
+"""
+
+import logging
+import threading
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ProgressSubscriber = Callable[[float], None]
+
+
+class ProgressTracker:
+    """Contador thread-safe de tarefas concluídas que publica o percentual.
+
+    Attributes:
+        total: Número total de tarefas esperadas.
+        completed: Número de tarefas concluídas até o momento.
+    """
+
+    def __init__(self, total: int, subscribers: Optional[List[ProgressSubscriber]] = None) -> None:
+        self.total = total
+        self.completed = 0
+        self._subscribers: List[ProgressSubscriber] = list(subscribers or [])
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: ProgressSubscriber) -> None:
+        """Registra uma função chamada com o percentual a cada conclusão.
+
+        Args:
+            callback: Função que recebe o progresso (0 a 100).
+        """
+        self._subscribers.append(callback)
+
+    @property
+    def percent(self) -> float:
+        """Progresso atual em pontos percentuais."""
+        if self.total <= 0:
+            return 100.0
+        return min(100.0, (self.completed / self.total) * 100)
+
+    def complete(self, count: int = 1) -> float:
+        """Registra a conclusão de tarefas e notifica os assinantes.
+
+        Args:
+            count: Número de tarefas concluídas.
+
+        Returns:
+            float: Progresso após a atualização.
+        """
+        with self._lock:
+            self.completed += count
+            progress = self.percent
+        self._notify(progress)
+        return progress
+
+    def _notify(self, progress: float) -> None:
+        """Chama os assinantes fora do lock; erros não interrompem o processamento."""
+        for callback in self._subscribers:
+            try:
+                callback(progress)
+            except Exception as e:
+                logger.error(f"Erro ao notificar progresso: {str(e)}")
@@ -0,0 +1,115 @@
+"""Gravação coalescida de progresso de tarefas assíncronas.
+
+Callbacks de progresso podem ser chamados dezenas de vezes por segundo durante
+uma comparação. Este módulo agrupa essas atualizações e grava no banco apenas
+as colunas de progresso e status, com um único UPDATE, limitando a frequência
+de escrita por intervalo de tempo ou variação mínima de progresso.
+"""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+from django.conf import settings
+
+from core.types import EntityStatus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL_MS = 1000
+DEFAULT_MIN_DELTA = 5.0
+
+
+class ProgressWriter:
+    """Agrupa atualizações de progresso de uma AsyncTask antes de persisti-las.
+
+    Uma atualização é gravada quando o status muda, quando se passaram pelo menos
+    `flush_interval_ms` desde a última gravação ou quando o progresso variou pelo
+    menos `min_delta` pontos percentuais. close() sempre grava o estado final.
+
+    Attributes:
+        task_id: ID da tarefa cujo registro será atualizado.
+        flush_interval_ms: Intervalo mínimo entre gravações (milissegundos).
+        min_delta: Variação de progresso que força uma gravação imediata.
+        writes: Número de UPDATEs executados.
+    """
+
+    def __init__(
+        self,
+        task_id: str,
+        flush_interval_ms: Optional[int] = None,
+        min_delta: Optional[float] = None
+    ) -> None:
+        self.task_id = task_id
+        self.flush_interval_ms = (
+            flush_interval_ms if flush_interval_ms is not None
+            else getattr(settings, 'PROGRESS_FLUSH_INTERVAL_MS', DEFAULT_FLUSH_INTERVAL_MS)
+        )
+        self.min_delta = (
+            min_delta if min_delta is not None
+            else getattr(settings, 'PROGRESS_FLUSH_MIN_DELTA', DEFAULT_MIN_DELTA)
+        )
+        self.writes = 0
+
+        self._lock = threading.Lock()
+        self._progress: Optional[float] = None
+        self._status: Optional[EntityStatus] = None
+        self._flushed_progress: Optional[float] = None
+        self._flushed_status: Optional[EntityStatus] = None
+        self._last_flush = 0.0
+        self._closed = False
+
+    def update(self, progress: float, status: Optional[EntityStatus] = None) -> None:
+        """Registra um novo valor de progresso, gravando-o se necessário.
+
+        Args:
+            progress: Progresso atual (0 a 100).
+            status: Status atual da tarefa (opcional).
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._progress = progress
+            if status is not None:
+                self._status = status
+            if self._should_flush():
+                self._flush()
+
+    def flush(self) -> None:
+        """Grava imediatamente o último estado registrado, se houver mudança."""
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        """Grava o estado final e ignora atualizações posteriores."""
+        with self._lock:
+            self._flush()
+            self._closed = True
+
+    def _should_flush(self) -> bool:
+        """Decide se o estado pendente deve ser gravado agora."""
+        if self._flushed_progress is None or self._status != self._flushed_status:
+            return True
+        if abs(self._progress - self._flushed_progress) >= self.min_delta:
+            return True
+        return (time.monotonic() - self._last_flush) * 1000 >= self.flush_interval_ms
+
+    def _flush(self) -> None:
+        """Executa o UPDATE das colunas de progresso/status (chamado com o lock)."""
+        if self._progress is None:
+            return
+        if self._progress == self._flushed_progress and self._status == self._flushed_status:
+            return
+
+        from core.models.async_task_record import AsyncTaskRecord
+
+        try:
+            AsyncTaskRecord.update_progress(self.task_id, self._progress, self._status)
+            self.writes += 1
+        except Exception as e:
+            logger.error(f"Erro ao gravar progresso da tarefa {self.task_id}: {str(e)}")
+            return
+        self._flushed_progress = self._progress
+        self._flushed_status = self._status
+        self._last_flush = time.monotonic()
@@ -5,13 +5,16 @@ com suporte a execução paralela e retentativas com backoff exponencial,
 permitindo a execução eficiente de operações demoradas ou com alta taxa de falha.
 """
 
+import functools
+import heapq
+import itertools
 import logging
 import time
 import random
 import threading
 import sys
-from concurrent.futures import ThreadPoolExecutor
-from typing import Any, List
+from collections import deque
+from typing import Any, List, Optional, Tuple
 
 from core.types import (
     QueueableTask, 
@@ -20,44 +23,129 @@ from core.types import (
     QueueStats,
     EntityStatus
 )
+from core.utils.deadline import bounded_timeout, is_expired
+from core.utils.metrics import (
+    QUEUE_BATCH_SECONDS,
+    QUEUE_EXECUTION_SECONDS,
+    QUEUE_TASK_ATTEMPTS,
+    QUEUE_WAIT_SECONDS,
+    TASK_MANAGER_RUN_SECONDS
+)
+from core.utils.task_executor import PRIORITY_INTERACTIVE, get_task_executor
 
 logger = logging.getLogger(__name__)
 
+
+class TaskTimeoutError(Exception):
+    """Tarefa abandonada por exceder o tempo limite da fila ou o prazo da requisição."""
+
+    def __init__(self, message: str, deadline_exceeded: bool = False):
+        super().__init__(message)
+        self.deadline_exceeded = deadline_exceeded
+
+
+class _TaskRun:
+    """Execução de uma tarefa da fila no executor compartilhado.
+
+    Attributes:
+        task: Tarefa executada.
+        kind: 'first' (primeira tentativa) ou 'retry' (retentativa).
+        enqueued: Instante (monotônico) em que a execução passou a aguardar vaga.
+        started: Instante de início da execução.
+        timer: Agendamento no executor: o prazo da requisição enquanto a execução
+            aguarda vaga e, depois de iniciada, o tempo limite.
+        settled: Se o desfecho já foi registrado (conclusão ou tempo limite).
+    """
+
+    __slots__ = ('task', 'kind', 'enqueued', 'started', 'timer', 'settled')
+
+    def __init__(self, task: QueueableTask, kind: str):
+        self.task = task
+        self.kind = kind
+        self.enqueued = time.monotonic()
+        self.started = time.time()
+        self.timer = None
+        self.settled = False
+
+
 class TaskQueue:
     """Fila de tarefas com parâmetros configuráveis.
     
-    Gerencia uma coleção de tarefas executáveis com suporte a retentativas
-    e controle de concorrência por semáforos.
+    Gerencia uma coleção de tarefas executáveis com suporte a retentativas.
+    As tarefas executam no executor compartilhado do processo
+    (core.utils.task_executor); a fila controla apenas quantas das suas
+    tarefas estão em execução ao mesmo tempo. Com um limitador compartilhado
+    (por exemplo, o limite adaptativo do provedor), cada execução também ocupa
+    uma vaga dele, e a fila é avisada quando o limitador libera capacidade.
+    
+    Tarefas que falham entram em uma fila de atraso (heap ordenado pelo
+    instante de vencimento do backoff) e são submetidas quando vencem, sem
+    que nenhuma thread fique dormindo durante a espera.
+    
+    As estatísticas (stats) são atualizadas sob _lock, e os tempos de espera,
+    de execução e as tentativas de cada tarefa alimentam os histogramas de
+    core.utils.metrics, rotulados pela fila e pelo provedor.
     
     Attributes:
         config: Configuração da fila.
         tasks: Lista de tarefas a serem executadas.
         retry_tasks: Lista de tarefas para retentativa.
-        first_semaphore: Controle de concorrência para primeiras tentativas.
-        retry_semaphore: Controle de concorrência para retentativas.
+        limits: Máximo de execuções simultâneas por tipo ('first' e 'retry').
+        priority: Classe de prioridade das tarefas no executor compartilhado.
+        tenant: Token dono das tarefas, para a divisão justa entre tokens.
+        limiter: Limitador de concorrência compartilhado entre filas (opcional).
+        provider: Provedor atendido pela fila, usado como rótulo das métricas.
         stats: Estatísticas da fila.
     """
     
-    def __init__(self, config: QueueConfig):
+    def __init__(
+        self,
+        config: QueueConfig,
+        priority: int = PRIORITY_INTERACTIVE,
+        tenant: Optional[str] = None,
+        limiter: Optional[Any] = None,
+        provider: str = ''
+    ):
         """Inicializa a fila com a configuração fornecida.
         
         Args:
             config: Configuração com parâmetros da fila.
+            priority: Classe de prioridade (PRIORITY_* de core.utils.task_executor).
+            tenant: Identificador do token dono das tarefas (None = compartilhado).
+            limiter: Objeto com try_acquire(), release(), subscribe() e unsubscribe()
+                (ex.: api.utils.adaptive_concurrency.AIMDLimiter) consultado a cada execução.
+            provider: Nome do provedor atendido pela fila (rótulo das métricas).
         """
         self.config = config
+        self.priority = priority
+        self.tenant = tenant
+        self.limiter = limiter
+        self.provider = provider
         self.tasks = []  # Lista simples para armazenar tarefas
         self.retry_tasks = []  # Lista simples para armazenar tarefas para retry
         
-        # Semáforos para controle de concorrência
+        # Limites de concorrência da fila (<= 0 = ilimitado)
         max_parallel_first = config.max_parallel_first if config.max_parallel_first > 0 else sys.maxsize
-        self.first_semaphore = threading.Semaphore(max_parallel_first)
-        self.retry_semaphore = threading.Semaphore(config.max_parallel_retry)
+        max_parallel_retry = config.max_parallel_retry if config.max_parallel_retry > 0 else sys.maxsize
+        self.limits = {'first': max_parallel_first, 'retry': max_parallel_retry}
+        
+        # Estado do processamento em lote
+        self._lock = threading.RLock()
+        self._running = {'first': 0, 'retry': 0}
+        self._waiting = {'first': deque(), 'retry': deque()}
+        self._outstanding = 0
+        self._delayed = []  # heap de (vencimento, sequência, tarefa)
+        self._delayed_sequence = itertools.count()
+        self._delayed_timer = None
+        self._finished = threading.Event()
+        self._finished.set()
+        self._batch_started = None
         
         # Estatísticas
         self.stats = QueueStats(queue_name=config.name)
         
         logger.info(f"Fila '{config.name}' criada com {max_parallel_first} workers para primeiras tentativas"
-                   f" e {config.max_parallel_retry} workers para retentativas")
+                   f" e {max_parallel_retry} workers para retentativas")
     
     def add_task(self, task: QueueableTask) -> None:
         """Adiciona uma tarefa à fila.
@@ -65,12 +153,18 @@ class TaskQueue:
         Args:
             task: Tarefa a ser adicionada.
         """
-        self.tasks.append(task)
-        self.stats.pending_tasks += 1
+        with self._lock:
+            self.tasks.append(task)
+            self.stats.pending_tasks += 1
         logger.debug(f"Tarefa {task.task_id} adicionada à fila '{self.config.name}'")
     
     def _run_task(self, task: QueueableTask) -> QueueableTask:
-        """Executa uma tarefa e gerencia retentativas se necessário.
+        """Executa uma tarefa, aguardando na thread atual, e gerencia retentativas se necessário.
+        
+        Uma tarefa com falha é agendada na fila de atraso e executada pelo
+        próximo process_tasks (ou start) quando o backoff vencer. O tempo limite
+        e o prazo só são impostos pelo caminho do lote (process_tasks); aqui a
+        tarefa apenas não é iniciada se o prazo já tiver passado.
         
         Args:
             task: Tarefa a ser executada.
@@ -78,30 +172,85 @@ class TaskQueue:
         Returns:
             QueueableTask: Tarefa atualizada após execução.
         """
-        # Atualizar estatísticas
-        self.stats.pending_tasks -= 1
-        self.stats.in_progress_tasks += 1
-        
+        with self._lock:
+            self._begin(task)
         start_time = time.time()
         
-        # Executar a função da tarefa diretamente
         try:
-            # Aqui faríamos o equivalente a executar a tarefa
-            # Precisamos invocar a função da tarefa com seus argumentos e atualizar seu status
+            if is_expired(task.deadline):
+                raise self._timeout_error(0.0, True)
             result = task.func(*task.args, **task.kwargs)
-            
-            # Atualizar a tarefa com o resultado
-            task.set_result(result)
         except Exception as e:
-            # Em caso de exceção, marcar a tarefa como falha
-            task.set_failure(str(e))
+            outcome = self._apply_outcome(task, error=e)
+        else:
+            outcome = self._apply_outcome(task, result=result)
+        
+        with self._lock:
+            wait_time = self._after_execution(task, time.time() - start_time, outcome)
+            if wait_time is not None:
+                self._schedule_retry(task, wait_time)
+        
+        return task
+    
+    def _labels(self) -> dict:
+        """Rótulos de fila e provedor das métricas."""
+        return {'queue': self.config.name, 'provider': self.provider}
+    
+    def _begin(self, task: QueueableTask) -> None:
+        """Atualiza as estatísticas no início da execução de uma tarefa (com _lock)."""
+        self.stats.pending_tasks -= 1
+        self.stats.in_progress_tasks += 1
+    
+    def _apply_outcome(self, task: QueueableTask, result: Any = None, error: Optional[BaseException] = None) -> str:
+        """Registra na tarefa o resultado ou o erro da execução.
         
-        elapsed_time = time.time() - start_time
+        Roda fora de _lock, pois o resultado dispara o callback da tarefa.
         
-        # Atualizar estatísticas após execução
+        Args:
+            task: Tarefa executada.
+            result: Resultado da função da tarefa.
+            error: Exceção levantada pela execução, se houver.
+            
+        Returns:
+            str: Desfecho da execução para as métricas ('completed', 'failed' ou 'timeout').
+        """
+        if error is None:
+            try:
+                # Atualizar a tarefa com o resultado
+                task.set_result(result)
+            except Exception as e:
+                task.set_failure(str(e))
+        elif isinstance(error, TaskTimeoutError):
+            with self._lock:
+                self.stats.timed_out_tasks += 1
+            logger.warning(f"Tarefa {task.task_id} abandonada: {error}")
+            if task.timeout_result:
+                # O resultado de timeout é definitivo: não há retentativa
+                task.set_result(task.timeout_result(str(error)))
+            else:
+                task.set_failure(str(error))
+            return 'timeout'
+        else:
+            # Em caso de exceção, marcar a tarefa como falha
+            task.set_failure(str(error))
+        return 'completed' if task.status == EntityStatus.COMPLETED else 'failed'
+    
+    def _after_execution(self, task: QueueableTask, elapsed_time: float, outcome: str) -> Optional[float]:
+        """Atualiza as estatísticas após a execução e decide sobre a retentativa (com _lock).
+        
+        Args:
+            task: Tarefa executada.
+            elapsed_time: Duração da execução em segundos.
+            outcome: Desfecho retornado por _apply_outcome.
+            
+        Returns:
+            Optional[float]: Espera antes da nova tentativa, ou None se não houver retentativa.
+        """
         self.stats.in_progress_tasks -= 1
+        QUEUE_EXECUTION_SECONDS.labels(outcome=outcome, **self._labels()).observe(elapsed_time)
         
         if task.status == EntityStatus.COMPLETED:
+            QUEUE_TASK_ATTEMPTS.labels(status='completed', **self._labels()).observe(task.attempt)
             self.stats.completed_tasks += 1
             # Contribuir para o tempo médio de execução
             if self.stats.avg_processing_time == 0:
@@ -112,39 +261,56 @@ class TaskQueue:
                 self.stats.avg_processing_time = (alpha * elapsed_time) + ((1 - alpha) * self.stats.avg_processing_time)
                 
             logger.debug(f"Tarefa {task.task_id} concluída com sucesso em {elapsed_time:.3f}s")
-            return task
+            return None
         
         # Falha na execução
         self.stats.failed_tasks += 1
         
-        # Verificar se deve tentar novamente
-        if self.config.should_retry(task.attempt, Exception(str(task.error))):
+        # Verificar se deve tentar novamente (nunca após o prazo da requisição)
+        if not is_expired(task.deadline) and self.config.should_retry(task.attempt, Exception(str(task.error))):
             # Calcular tempo de espera antes da próxima tentativa
-            wait_time = self._calculate_delay(task.attempt)
+            wait_time = self._calculate_delay(task.attempt + 1)
             
             # Incrementar contador de tentativa
             task.attempt += 1
-            
-            # Adicionar à fila de retentativa
-            self.retry_tasks.append(task)
             self.stats.retry_tasks += 1
             
             logger.warning(f"Tarefa {task.task_id} falhou (tentativa #{task.attempt-1}). "
                          f"Agendando nova tentativa em {wait_time:.1f}s")
-            
-            # Esperar antes da próxima tentativa
-            time.sleep(wait_time)
-        else:
-            # Não tentar novamente, retornar erro
-            logger.error(f"Tarefa {task.task_id} falhou permanentemente após {task.attempt} tentativas: {task.error}")
+            return wait_time
         
-        return task
+        # Não tentar novamente, retornar erro
+        QUEUE_TASK_ATTEMPTS.labels(status='failed', **self._labels()).observe(task.attempt)
+        logger.error(f"Tarefa {task.task_id} falhou permanentemente após {task.attempt} tentativas: {task.error}")
+        return None
+    
+    def _timeout_for(self, task: QueueableTask) -> Tuple[Optional[float], bool]:
+        """Calcula o tempo limite da execução a partir da fila e do prazo da tarefa.
+        
+        Args:
+            task: Tarefa a ser executada.
+            
+        Returns:
+            Tuple[Optional[float], bool]: Tempo limite (None = sem limite) e se ele
+            é determinado pelo prazo da requisição.
+        """
+        timeout = bounded_timeout(self.config.timeout, task.deadline)
+        deadline_bound = timeout is not None and (self.config.timeout is None or timeout < self.config.timeout)
+        return timeout, deadline_bound
+    
+    @staticmethod
+    def _timeout_error(timeout: float, deadline_bound: bool) -> TaskTimeoutError:
+        """Cria o erro de tempo limite de uma execução."""
+        if timeout <= 0:
+            return TaskTimeoutError("Prazo da requisição esgotado antes da execução", deadline_exceeded=True)
+        reason = "prazo da requisição" if deadline_bound else "tempo limite da fila"
+        return TaskTimeoutError(f"Tarefa excedeu o {reason} ({timeout:.1f}s)", deadline_exceeded=deadline_bound)
     
     def _calculate_delay(self, attempt: int) -> float:
         """Calcula o tempo de espera antes da próxima tentativa.
         
         Args:
-            attempt: Número da tentativa atual.
+            attempt: Número da próxima tentativa.
             
         Returns:
             Tempo de espera em segundos.
@@ -160,67 +326,263 @@ class TaskQueue:
         
         return max(0.1, delay)  # Mínimo de 100ms
 
-    def process_tasks(self) -> None:
-        """Processa todas as tarefas na fila.
+    def start(self) -> None:
+        """Submete as tarefas da fila ao executor compartilhado sem bloquear.
         
-        As tarefas são executadas em paralelo respeitando os limites de concorrência
-        definidos na configuração. Tarefas que falharem podem ser agendadas para retentativa.
+        No máximo `limits` execuções da fila ficam no executor ao mesmo tempo;
+        cada execução concluída libera a vaga para a próxima tarefa da fila.
+        Use wait() para aguardar o término.
         """
-        if not self.tasks and not self.retry_tasks:
-            logger.debug(f"Fila '{self.config.name}' vazia, nada a processar")
-            return
-            
-        logger.info(f"Iniciando processamento da fila '{self.config.name}': "
-                   f"{len(self.tasks)} tarefas, {len(self.retry_tasks)} retentativas")
-        
-        # Criar thread pool para processar as tarefas
-        with ThreadPoolExecutor() as executor:
-            # Processar primeiras tentativas
-            first_futures = []
-            for task in self.tasks:
-                # Esperar por um slot disponível
-                self.first_semaphore.acquire()
-                
-                # Criar função para executar a tarefa e liberar o semáforo
-                def process_with_semaphore(task=task):
-                    try:
-                        return self._run_task(task)
-                    finally:
-                        self.first_semaphore.release()
-                
-                # Submeter tarefa para o pool
-                future = executor.submit(process_with_semaphore)
-                first_futures.append(future)
+        with self._lock:
+            retries = len(self._delayed) + len(self._waiting['retry'])
+            if not self.tasks and not retries:
+                return
             
-            # Processar retentativas
-            retry_futures = []
-            for task in self.retry_tasks:
-                # Esperar por um slot disponível
-                self.retry_semaphore.acquire()
-                
-                # Criar função para executar a tarefa e liberar o semáforo
-                def process_retry_with_semaphore(task=task):
-                    try:
-                        return self._run_task(task)
-                    finally:
-                        self.retry_semaphore.release()
-                
-                # Submeter tarefa para o pool
-                future = executor.submit(process_retry_with_semaphore)
-                retry_futures.append(future)
+            logger.info(f"Iniciando processamento da fila '{self.config.name}': "
+                       f"{len(self.tasks)} tarefas, {retries} retentativas")
             
-            # Aguardar todas as tarefas terminarem
-            for future in first_futures + retry_futures:
-                future.result()  # Isso forçará qualquer exceção não tratada a ser levantada
+            if self._finished.is_set():
+                self._batch_started = time.monotonic()
+            self._finished.clear()
+            # Retentativas agendadas por _run_task já estão na fila de atraso
+            self._outstanding += len(self.tasks) + retries
+            for task in self.tasks:
+                self._enqueue(_TaskRun(task, 'first'))
+            if self.limiter is not None:
+                self.limiter.subscribe(self._on_limiter_capacity)
+            self._dispatch()
+    
+    def wait(self) -> None:
+        """Aguarda o término das tarefas submetidas por start() e limpa a fila."""
+        self._finished.wait()
+        if self.limiter is not None:
+            self.limiter.unsubscribe(self._on_limiter_capacity)
         
-        # Limpar a fila
-        self.tasks.clear()
-        self.retry_tasks.clear()
-        self.stats.retry_tasks = 0
-        self.stats.pending_tasks = 0
+        with self._lock:
+            if self._batch_started is not None:
+                QUEUE_BATCH_SECONDS.labels(**self._labels()).observe(time.monotonic() - self._batch_started)
+                self._batch_started = None
+            
+            # Limpar a fila
+            self.tasks.clear()
+            self.retry_tasks.clear()
+            self.stats.retry_tasks = 0
+            self.stats.pending_tasks = 0
         
         logger.info(f"Processamento da fila '{self.config.name}' concluído: "
                    f"{self.stats.completed_tasks} sucesso, {self.stats.failed_tasks} falhas")
+    
+    def _schedule_retry(self, task: QueueableTask, wait_time: float) -> None:
+        """Coloca uma tarefa na fila de atraso até o fim do backoff (com _lock).
+        
+        Args:
+            task: Tarefa a ser executada novamente.
+            wait_time: Espera antes da nova tentativa, em segundos.
+        """
+        due = time.monotonic() + wait_time
+        heapq.heappush(self._delayed, (due, next(self._delayed_sequence), task))
+        self.retry_tasks.append(task)
+        self.stats.pending_tasks += 1
+        self._arm_delayed_timer()
+    
+    def _arm_delayed_timer(self) -> None:
+        """Agenda no executor o despertar para o próximo vencimento da fila de atraso (com _lock)."""
+        if not self._delayed:
+            return
+        due = self._delayed[0][0]
+        if self._delayed_timer is not None:
+            if self._delayed_timer.when <= due:
+                return
+            self._delayed_timer.cancel()
+        self._delayed_timer = get_task_executor().call_later(due - time.monotonic(), self._release_delayed)
+    
+    def _release_delayed(self) -> None:
+        """Move as retentativas vencidas para a espera por vaga e as submete."""
+        with self._lock:
+            self._delayed_timer = None
+            now = time.monotonic()
+            while self._delayed and self._delayed[0][0] <= now:
+                _, _, task = heapq.heappop(self._delayed)
+                self._enqueue(_TaskRun(task, 'retry'))
+            self._arm_delayed_timer()
+            # Fora de um processamento em lote, as retentativas aguardam o próximo start()
+            if not self._finished.is_set():
+                self._dispatch()
+    
+    def _enqueue(self, run: _TaskRun) -> None:
+        """Coloca uma execução na espera por vaga, com o prazo da tarefa armado (com _lock).
+        
+        Args:
+            run: Execução a aguardar vaga.
+        """
+        self._waiting[run.kind].append(run)
+        if run.task.deadline is not None:
+            run.timer = get_task_executor().call_later(
+                run.task.deadline - time.time(),
+                functools.partial(self._expire_waiting, run)
+            )
+    
+    def _dispatch(self) -> None:
+        """Submete as execuções em espera enquanto houver vagas na fila (com _lock).
+        
+        Execuções cujo prazo já passou não ocupam vaga: são encerradas pelo
+        temporizador do executor com o desfecho de prazo esgotado.
+        """
+        executor = get_task_executor()
+        for kind in ('first', 'retry'):
+            waiting = self._waiting[kind]
+            while waiting and self._running[kind] < self.limits[kind]:
+                if is_expired(waiting[0].task.deadline):
+                    executor.call_later(0, functools.partial(self._expire_run, waiting.popleft()))
+                    continue
+                if self.limiter is not None and not self.limiter.try_acquire():
+                    return
+                self._running[kind] += 1
+                executor.schedule(
+                    functools.partial(self._execute_run, waiting.popleft()),
+                    priority=self.priority,
+                    tenant=self.tenant
+                )
+    
+    def _expire_waiting(self, run: _TaskRun) -> None:
+        """Encerra uma execução que ainda aguardava vaga quando o prazo venceu.
+        
+        Roda na thread do temporizador; sem efeito se a execução já foi submetida.
+        
+        Args:
+            run: Execução cujo prazo venceu.
+        """
+        with self._lock:
+            waiting = self._waiting[run.kind]
+            if run not in waiting:
+                return
+            waiting.remove(run)
+        self._expire_run(run)
+    
+    def _expire_run(self, run: _TaskRun) -> None:
+        """Registra o prazo esgotado de uma execução retirada da espera, sem executá-la.
+        
+        Args:
+            run: Execução retirada da espera por vaga.
+        """
+        with self._lock:
+            self._begin_run(run)
+        run.started = time.time()
+        self._settle(run, error=self._timeout_error(0.0, True))
+    
+    def _begin_run(self, run: _TaskRun) -> None:
+        """Atualiza as estatísticas ao retirar uma execução da espera (com _lock)."""
+        self._begin(run.task)
+        if run.kind == 'retry':
+            self.stats.retry_tasks -= 1
+    
+    def _on_limiter_capacity(self) -> None:
+        """Submete execuções em espera quando o limitador compartilhado libera capacidade."""
+        with self._lock:
+            if not self._finished.is_set():
+                self._dispatch()
+    
+    def _execute_run(self, run: _TaskRun) -> None:
+        """Executa uma tarefa em uma thread do executor compartilhado.
+        
+        O tempo limite é aplicado pelo temporizador do executor: ao vencer, o
+        desfecho de tempo limite é registrado na própria thread do temporizador
+        (sem depender de um worker livre, pois todos podem estar presos em
+        chamadas atrasadas) e a tarefa é abandonada. A vaga da fila (e do
+        limitador) continua ocupada até a função terminar nesta thread, para
+        que chamadas abandonadas não excedam os limites.
+        
+        Args:
+            run: Execução a realizar.
+        """
+        task = run.task
+        if run.timer is not None:
+            # O prazo de espera por vaga deixa de valer; o tempo limite o substitui
+            run.timer.cancel()
+            run.timer = None
+        with self._lock:
+            self._begin_run(run)
+            QUEUE_WAIT_SECONDS.labels(kind=run.kind, **self._labels()).observe(time.monotonic() - run.enqueued)
+        run.started = time.time()
+        
+        try:
+            timeout, deadline_bound = self._timeout_for(task)
+            if timeout is not None and timeout <= 0:
+                self._settle(run, error=self._timeout_error(timeout, deadline_bound))
+                return
+            if timeout is not None:
+                executor = get_task_executor()
+                run.timer = executor.call_later(
+                    timeout,
+                    functools.partial(self._settle, run, error=self._timeout_error(timeout, deadline_bound))
+                )
+            
+            try:
+                result = task.func(*task.args, **task.kwargs)
+            except BaseException as e:
+                self._settle(run, error=e)
+            else:
+                self._settle(run, result=result)
+        finally:
+            self._release_slot(run)
+    
+    def _settle(self, run: _TaskRun, result: Any = None, error: Optional[BaseException] = None) -> None:
+        """Registra o desfecho de uma execução.
+        
+        Apenas o primeiro desfecho é considerado: o resultado de uma tarefa já
+        abandonada por tempo limite é descartado. A vaga da execução é liberada
+        separadamente, por _release_slot, quando a função termina.
+        
+        Args:
+            run: Execução concluída.
+            result: Resultado da função da tarefa.
+            error: Exceção da execução, se houver.
+        """
+        with self._lock:
+            if run.settled:
+                return
+            run.settled = True
+        if run.timer is not None:
+            run.timer.cancel()
+        
+        outcome = self._apply_outcome(run.task, result=result, error=error)
+        
+        with self._lock:
+            wait_time = self._after_execution(run.task, time.time() - run.started, outcome)
+            if wait_time is not None:
+                self._schedule_retry(run.task, wait_time)
+            else:
+                self._outstanding -= 1
+            if self._outstanding == 0:
+                self._finished.set()
+    
+    def _release_slot(self, run: _TaskRun) -> None:
+        """Libera a vaga de uma execução cuja função terminou e submete a próxima.
+        
+        Args:
+            run: Execução encerrada.
+        """
+        with self._lock:
+            self._running[run.kind] -= 1
+            if self.limiter is None and not self._finished.is_set():
+                self._dispatch()
+        # Fora do _lock: a liberação avisa as filas do limitador, inclusive esta
+        if self.limiter is not None:
+            self.limiter.release()
+
+    def process_tasks(self) -> None:
+        """Processa todas as tarefas na fila.
+        
+        As tarefas são executadas em paralelo no executor compartilhado, respeitando
+        os limites de concorrência definidos na configuração. Tarefas que falharem
+        podem ser agendadas para retentativa.
+        """
+        if not self.tasks and not self._delayed and not self._waiting['retry']:
+            logger.debug(f"Fila '{self.config.name}' vazia, nada a processar")
+            return
+        
+        self.start()
+        self.wait()
 
 class TaskManager:
     """Gerenciador de múltiplas filas de tarefas.
@@ -258,7 +620,8 @@ class TaskManager:
     def run(self) -> None:
         """Executa o processamento de todas as filas.
         
-        Cada fila é processada em sua própria thread, permitindo execução paralela.
+        Todas as filas submetem suas tarefas ao executor compartilhado do processo
+        e são aguardadas na thread atual, sem threads dedicadas por fila.
         """
         if not self.queues:
             logger.debug("Nenhuma fila a processar")
@@ -266,23 +629,17 @@ class TaskManager:
             
         logger.info(f"Iniciando processamento de {len(self.queues)} filas")
         self._processing = True
+        start_time = time.monotonic()
         
         try:
-            # Criar threads para processar cada fila
-            threads = []
             for queue in self.queues:
-                thread = threading.Thread(
-                    target=queue.process_tasks,
-                    name=f"queue-{queue.config.name}"
-                )
-                thread.daemon = True  # Permitir que o programa termine mesmo que a thread ainda esteja rodando
-                threads.append(thread)
-                thread.start()
+                queue.start()
             
-            # Aguardar todas as threads terminarem
-            for thread in threads:
-                thread.join()
+            # Aguardar todas as filas terminarem
+            for queue in self.queues:
+                queue.wait()
                 
             logger.info("Processamento de filas concluído")
         finally:
+            TASK_MANAGER_RUN_SECONDS.observe(time.monotonic() - start_time)
             self._processing = False
@@ -0,0 +1,404 @@
+"""Serviço de execução compartilhado pelas filas de tarefas do processo.
+
+Todas as TaskQueue submetem suas tarefas a um único pool de threads limitado
+(TASK_EXECUTOR['MAX_WORKERS']), em vez de criar um pool por fila a cada
+requisição. Os limites de paralelismo de cada fila (QueueConfig) continuam
+valendo: a fila só submete uma nova tarefa quando uma das suas termina.
+
+O serviço também oferece:
+- um temporizador único (heap de vencimentos em uma thread) para tempos
+  limite, sem uma thread auxiliar por tarefa;
+- um limite global de chamadas simultâneas aos provedores de IA no processo
+  (TASK_EXECUTOR['MAX_PROVIDER_CALLS']), respeitado pelas threads e pelas
+  comparações no modo asyncio;
+- medidores (gauges) de trabalho ativo e enfileirado.
+
+Quando todos os workers estão ocupados, o trabalho aguarda no escalonador do
+executor, que escolhe o próximo item por classe de prioridade (interativa >
+lote pequeno > lote grande, de forma estrita: lotes grandes usam apenas a
+capacidade ociosa) e, dentro da classe, por enfileiramento justo ponderado
+entre tokens (start-time fair queuing): um token com muitas tarefas não
+atrasa os demais tokens da mesma classe.
+"""
+
+import asyncio
+import functools
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+
+from core.types import JSONDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TASK_EXECUTOR_SETTINGS: Dict[str, Any] = {
+    # Threads de trabalho do processo (compartilhadas por todas as filas)
+    'MAX_WORKERS': 32,
+    # Chamadas simultâneas aos provedores de IA no processo (0 = sem limite)
+    'MAX_PROVIDER_CALLS': 0,
+    # Peso de cada token (id do UserToken) na divisão justa; padrão 1.0
+    'TOKEN_WEIGHTS': {},
+}
+
+# Classes de prioridade (menor valor = maior prioridade)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_SMALL_BATCH = 1
+PRIORITY_LARGE_BATCH = 2
+
+PRIORITY_NAMES: Dict[int, str] = {
+    PRIORITY_INTERACTIVE: 'interactive',
+    PRIORITY_SMALL_BATCH: 'small_batch',
+    PRIORITY_LARGE_BATCH: 'large_batch',
+}
+
+# Amostras de espera mantidas por classe para os percentis
+WAIT_SAMPLES = 1000
+# Intervalo entre tentativas de obter vaga de provedor no modo asyncio (segundos)
+PROVIDER_SLOT_POLL_INTERVAL = 0.01
+
+# Instância global para uso em toda a aplicação
+_task_executor = None
+_task_executor_lock = threading.Lock()
+
+
+class TimerHandle:
+    """Agendamento do temporizador, que pode ser cancelado antes de vencer."""
+
+    __slots__ = ('when', 'callback', 'cancelled')
+
+    def __init__(self, when: float, callback: Callable[[], Any]) -> None:
+        self.when = when
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """Cancela o agendamento (sem efeito se já executado)."""
+        self.cancelled = True
+
+
+class _WorkItem:
+    """Trabalho aguardando um worker no escalonador."""
+
+    __slots__ = ('func', 'future', 'priority', 'tenant', 'enqueued', 'finish_tag')
+
+    def __init__(self, func: Callable[[], Any], priority: int, tenant: Optional[str]) -> None:
+        self.func = func
+        self.future = Future()
+        self.priority = priority
+        self.tenant = tenant
+        self.enqueued = time.monotonic()
+        self.finish_tag = 0.0
+
+
+class TaskExecutor:
+    """Pool de threads limitado, escalonador, temporizador e limite de chamadas aos provedores.
+
+    Attributes:
+        max_workers: Número máximo de threads de trabalho.
+        max_provider_calls: Chamadas simultâneas permitidas aos provedores (0 = sem limite).
+        token_weights: Peso de cada token na divisão justa dentro de uma classe.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_provider_calls: int = 0,
+        token_weights: Optional[Dict[str, float]] = None
+    ) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.max_provider_calls = max(0, int(max_provider_calls))
+        self.token_weights = {str(token): float(weight) for token, weight in (token_weights or {}).items()}
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='task-executor')
+
+        self._lock = threading.Lock()
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+
+        # Escalonador: heap por classe de (tag de início, sequência, item)
+        self._pending: Dict[int, List[Any]] = {priority: [] for priority in PRIORITY_NAMES}
+        self._virtual_time: Dict[int, float] = {priority: 0.0 for priority in PRIORITY_NAMES}
+        self._finish_tags: Dict[Any, float] = {}
+        self._sequence = itertools.count()
+        self._waits: Dict[int, deque] = {priority: deque(maxlen=WAIT_SAMPLES) for priority in PRIORITY_NAMES}
+        self._dispatched: Dict[int, int] = {priority: 0 for priority in PRIORITY_NAMES}
+
+        self._provider_semaphore = (
+            threading.BoundedSemaphore(self.max_provider_calls) if self.max_provider_calls else None
+        )
+        self._provider_active = 0
+        self._provider_waiting = 0
+
+        self._timers: List[Any] = []
+        self._timer_sequence = itertools.count()
+        self._timer_condition = threading.Condition()
+        self._timer_thread: Optional[threading.Thread] = None
+
+        logger.info(f"Executor de tarefas criado: {self.max_workers} workers, "
+                    f"limite de chamadas aos provedores={self.max_provider_calls or 'ilimitado'}")
+
+    def submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Submete uma função ao pool compartilhado com prioridade interativa.
+
+        Args:
+            func: Função a executar.
+            *args: Argumentos posicionais.
+            **kwargs: Argumentos nomeados.
+
+        Returns:
+            Future: Resultado futuro da função.
+        """
+        return self.schedule(functools.partial(func, *args, **kwargs))
+
+    def schedule(
+        self,
+        func: Callable[[], Any],
+        priority: int = PRIORITY_INTERACTIVE,
+        tenant: Optional[str] = None
+    ) -> Future:
+        """Enfileira uma função no escalonador do executor.
+
+        Args:
+            func: Função sem argumentos.
+            priority: Classe de prioridade (PRIORITY_*).
+            tenant: Identificador do token para a divisão justa (None = compartilhado).
+
+        Returns:
+            Future: Resultado futuro da função.
+        """
+        if priority not in PRIORITY_NAMES:
+            priority = PRIORITY_INTERACTIVE
+        item = _WorkItem(func, priority, tenant)
+        weight = self.token_weights.get(str(tenant), 1.0) if tenant is not None else 1.0
+        key = (priority, tenant)
+        with self._lock:
+            # Start-time fair queuing: a tag de início do item é o maior entre o
+            # tempo virtual da classe e o término do item anterior do mesmo token
+            start_tag = max(self._virtual_time[priority], self._finish_tags.get(key, 0.0))
+            item.finish_tag = start_tag + 1.0 / max(weight, 1e-6)
+            self._finish_tags[key] = item.finish_tag
+            heapq.heappush(self._pending[priority], (start_tag, next(self._sequence), item))
+            self._dispatch()
+        return item.future
+
+    def _dispatch(self) -> None:
+        """Entrega itens pendentes aos workers livres, por prioridade e tag de início (com _lock)."""
+        while self._active < self.max_workers:
+            priority = next((p for p in sorted(self._pending) if self._pending[p]), None)
+            if priority is None:
+                return
+            start_tag, _, item = heapq.heappop(self._pending[priority])
+            self._virtual_time[priority] = start_tag
+            key = (priority, item.tenant)
+            if self._finish_tags.get(key) == item.finish_tag:
+                # Último item pendente do token na classe
+                del self._finish_tags[key]
+            self._waits[priority].append(time.monotonic() - item.enqueued)
+            self._dispatched[priority] += 1
+            self._active += 1
+            try:
+                self._executor.submit(self._run_item, item)
+            except RuntimeError as e:
+                self._active -= 1
+                item.future.set_exception(e)
+
+    def _run_item(self, item: _WorkItem) -> None:
+        """Executa um item em um worker e libera a vaga para o próximo."""
+        failed = False
+        try:
+            if item.future.set_running_or_notify_cancel():
+                try:
+                    item.future.set_result(item.func())
+                except BaseException as e:
+                    failed = True
+                    item.future.set_exception(e)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+                self._failed += int(failed)
+                self._dispatch()
+
+    def call_later(self, delay: float, callback: Callable[[], Any]) -> TimerHandle:
+        """Agenda uma função para ser chamada após o intervalo informado.
+
+        As funções agendadas executam na thread do temporizador e devem ser
+        rápidas (por exemplo, marcar um resultado ou submeter trabalho ao pool).
+
+        Args:
+            delay: Intervalo em segundos.
+            callback: Função sem argumentos.
+
+        Returns:
+            TimerHandle: Agendamento, que pode ser cancelado.
+        """
+        handle = TimerHandle(time.monotonic() + max(0.0, delay), callback)
+        with self._timer_condition:
+            heapq.heappush(self._timers, (handle.when, next(self._timer_sequence), handle))
+            if self._timer_thread is None:
+                self._timer_thread = threading.Thread(
+                    target=self._run_timers, name='task-executor-timer', daemon=True
+                )
+                self._timer_thread.start()
+            self._timer_condition.notify()
+        return handle
+
+    def _run_timers(self) -> None:
+        """Laço da thread do temporizador: executa os agendamentos vencidos."""
+        while True:
+            with self._timer_condition:
+                while not self._timers:
+                    self._timer_condition.wait()
+                when, _, handle = self._timers[0]
+                now = time.monotonic()
+                if when > now:
+                    self._timer_condition.wait(when - now)
+                    continue
+                heapq.heappop(self._timers)
+            if handle.cancelled:
+                continue
+            try:
+                handle.callback()
+            except Exception as e:
+                logger.exception(f"Erro em função agendada no executor de tarefas: {e}")
+
+    def acquire_provider_slot(self, timeout: Optional[float] = None) -> bool:
+        """Reserva uma vaga de chamada simultânea aos provedores.
+
+        Args:
+            timeout: Tempo máximo de espera em segundos (None = sem limite).
+
+        Returns:
+            bool: True se a vaga foi obtida; False se o tempo de espera acabou.
+        """
+        if self._provider_semaphore is None:
+            with self._lock:
+                self._provider_active += 1
+            return True
+        with self._lock:
+            self._provider_waiting += 1
+        try:
+            acquired = self._provider_semaphore.acquire(timeout=timeout)
+        finally:
+            with self._lock:
+                self._provider_waiting -= 1
+                self._provider_active += int(acquired)
+        return acquired
+
+    async def acquire_provider_slot_async(self, timeout: Optional[float] = None) -> bool:
+        """Versão assíncrona de acquire_provider_slot, que espera sem bloquear o event loop.
+
+        A vaga é disputada com as threads pelo mesmo semáforo, sem bloqueio; a
+        espera é feita com asyncio.sleep, de modo que um cancelamento não deixa
+        vaga presa.
+
+        Args:
+            timeout: Tempo máximo de espera em segundos (None = sem limite).
+
+        Returns:
+            bool: True se a vaga foi obtida; False se o tempo de espera acabou.
+        """
+        if self._provider_semaphore is None:
+            return self.acquire_provider_slot()
+        give_up = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._provider_waiting += 1
+        acquired = False
+        try:
+            while not (acquired := self._provider_semaphore.acquire(blocking=False)):
+                if give_up is not None and time.monotonic() >= give_up:
+                    break
+                await asyncio.sleep(PROVIDER_SLOT_POLL_INTERVAL)
+        finally:
+            with self._lock:
+                self._provider_waiting -= 1
+                self._provider_active += int(acquired)
+        return acquired
+
+    def has_provider_capacity(self) -> bool:
+        """Indica se há vaga livre no limite de chamadas simultâneas aos provedores."""
+        with self._lock:
+            return not self.max_provider_calls or self._provider_active < self.max_provider_calls
+
+    def release_provider_slot(self) -> None:
+        """Libera uma vaga obtida com acquire_provider_slot."""
+        with self._lock:
+            self._provider_active -= 1
+        if self._provider_semaphore is not None:
+            self._provider_semaphore.release()
+
+    def stats(self) -> JSONDict:
+        """Retorna os medidores atuais do executor.
+
+        Returns:
+            JSONDict: Workers, tarefas ativas/enfileiradas/concluídas, espera por classe
+            de prioridade (segundos, últimas WAIT_SAMPLES amostras) e chamadas aos provedores.
+        """
+        with self._lock:
+            classes = {}
+            for priority, name in PRIORITY_NAMES.items():
+                waits = sorted(self._waits[priority])
+                classes[name] = {
+                    'queued': len(self._pending[priority]),
+                    'dispatched': self._dispatched[priority],
+                    'wait_avg': round(sum(waits) / len(waits), 4) if waits else 0.0,
+                    'wait_p50': round(_percentile(waits, 50), 4),
+                    'wait_p95': round(_percentile(waits, 95), 4),
+                    'wait_max': round(waits[-1], 4) if waits else 0.0,
+                }
+            return {
+                'max_workers': self.max_workers,
+                'active': self._active,
+                'queued': sum(len(pending) for pending in self._pending.values()),
+                'completed': self._completed,
+                'failed': self._failed,
+                'classes': classes,
+                'provider_calls': {
+                    'limit': self.max_provider_calls,
+                    'active': self._provider_active,
+                    'waiting': self._provider_waiting,
+                },
+                'scheduled_timers': len(self._timers),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Encerra o pool de threads."""
+        self._executor.shutdown(wait=wait)
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    """Percentil (vizinho mais próximo) de uma lista ordenada; 0.0 se vazia."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(percentile / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def get_task_executor() -> TaskExecutor:
+    """Obtém o executor de tarefas do processo, criando-o conforme settings.TASK_EXECUTOR.
+
+    Returns:
+        TaskExecutor: Instância compartilhada.
+    """
+    global _task_executor
+    with _task_executor_lock:
+        if _task_executor is None:
+            config = {**DEFAULT_TASK_EXECUTOR_SETTINGS, **getattr(settings, 'TASK_EXECUTOR', {})}
+            _task_executor = TaskExecutor(config['MAX_WORKERS'], config['MAX_PROVIDER_CALLS'], config['TOKEN_WEIGHTS'])
+        return _task_executor
+
+
+def reset_task_executor() -> None:
+    """Descarta o executor global (as tarefas em andamento terminam normalmente)."""
+    global _task_executor
+    with _task_executor_lock:
+        if _task_executor is not None:
+            _task_executor.shutdown(wait=False)
+        _task_executor = None
@@ -8,6 +8,7 @@ from __future__ import absolute_import, unicode_literals
 import os
 import logging
 from celery import Celery
+from celery.signals import worker_process_shutdown
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
@@ -42,6 +43,10 @@ try:
             'task': 'ai_config.tasks.update_training_status',
             'schedule': 60.0,
         },
+        'poll-comparison-batches': {
+            'task': 'poll_comparison_batches',
+            'schedule': float(os.getenv('COMPARISON_BATCH_POLL_INTERVAL', '60')),
+        },
     }
     
     logger.info("Celery configurado com sucesso")
@@ -49,6 +54,12 @@ except Exception as e:
     logger.error(f"Erro ao configurar Celery: {e}", exc_info=True)
     raise
 
+@worker_process_shutdown.connect
+def mark_metrics_process_dead(pid=None, **kwargs):
+    """Descarta as métricas ao vivo do processo filho encerrado (PROMETHEUS_MULTIPROC_DIR)."""
+    from core.utils.metrics import mark_process_dead
+    mark_process_dead(pid or os.getpid())
+
 @app.task(bind=True)
 def debug_task(self):
     """Task para debug do Celery.
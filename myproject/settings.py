@@ -42,6 +42,7 @@ INSTALLED_APPS = [
     'dj_rest_auth',
     'dj_rest_auth.registration',
     'markdownx',
+    'django_prometheus',
 
     # Aplicações locais
     'accounts',
@@ -382,8 +383,164 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media/')
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
+# Processamento de comparações
+# 'threads' usa o TaskManager (executor de tarefas compartilhado, ver TASK_EXECUTOR); 'asyncio' usa um único event loop por job
+COMPARISON_EXECUTION_MODE = os.getenv('COMPARISON_EXECUTION_MODE', 'threads')
+
+# Número máximo de templates de prompt compilados mantidos em cache por processo
+PROMPT_TEMPLATE_CACHE_SIZE = int(os.getenv('PROMPT_TEMPLATE_CACHE_SIZE', '256'))
+
+# Cache de respostas das APIs de IA
+# BACKEND: 'memory' (processo), 'django' (settings.CACHES), 'sqlite' (tabela local) ou 'none'
+AI_RESPONSE_CACHE = {
+    'BACKEND': os.getenv('AI_RESPONSE_CACHE_BACKEND', 'memory'),
+    'TTL': int(os.getenv('AI_RESPONSE_CACHE_TTL', '3600')),
+    'MAX_ENTRIES': int(os.getenv('AI_RESPONSE_CACHE_MAX_ENTRIES', '1000')),
+    'CACHE_ALIAS': os.getenv('AI_RESPONSE_CACHE_ALIAS', 'default'),
+    'SQLITE_PATH': os.path.join(BASE_DIR, 'ai_response_cache.sqlite3'),
+}
+
+# Gravação de progresso de tarefas: intervalo mínimo entre gravações (ms) e variação que força gravação (%)
+PROGRESS_FLUSH_INTERVAL_MS = int(os.getenv('PROGRESS_FLUSH_INTERVAL_MS', '1000'))
+PROGRESS_FLUSH_MIN_DELTA = float(os.getenv('PROGRESS_FLUSH_MIN_DELTA', '5.0'))
+
+# Modo em lote (Batch API dos provedores) para comparações assíncronas grandes
+COMPARISON_BATCH_MODE = os.getenv('COMPARISON_BATCH_MODE', 'False').lower() in ('true', '1')
+COMPARISON_BATCH_MIN_STUDENTS = int(os.getenv('COMPARISON_BATCH_MIN_STUDENTS', '50'))
+
+# Pool de clientes de SDK dos provedores de IA (reuso de conexões HTTP keep-alive)
+AI_CLIENT_POOL = {
+    'ENABLED': os.getenv('AI_CLIENT_POOL_ENABLED', 'True').lower() in ('true', '1'),
+    'IDLE_TIMEOUT': int(os.getenv('AI_CLIENT_POOL_IDLE_TIMEOUT', '300')),
+    'MAX_SIZE': int(os.getenv('AI_CLIENT_POOL_MAX_SIZE', '64')),
+}
+
+# Execução distribuída de comparações: shards (provedor, bloco de alunos) despachados como chord
+# COMPARISON_SHARD_PROVIDER_QUEUES no formato "OpenAi=ai-openai,Gemini=ai-gemini"
+COMPARISON_SHARDING = {
+    'ENABLED': os.getenv('COMPARISON_SHARDING_ENABLED', 'False').lower() in ('true', '1'),
+    'MIN_STUDENTS': int(os.getenv('COMPARISON_SHARDING_MIN_STUDENTS', '20')),
+    'CHUNK_SIZE': int(os.getenv('COMPARISON_SHARD_CHUNK_SIZE', '10')),
+    'QUEUE': os.getenv('COMPARISON_SHARD_QUEUE') or None,
+    'PROVIDER_QUEUES': dict(
+        item.split('=', 1) for item in os.getenv('COMPARISON_SHARD_PROVIDER_QUEUES', '').split(',') if '=' in item
+    ),
+}
+
+# Limitador de taxa (RPM/TPM) das chamadas às IAs; limites definidos por configuração global
+# BACKEND: 'memory' (por processo) ou 'redis' (compartilhado entre processos)
+AI_RATE_LIMIT = {
+    'BACKEND': os.getenv('AI_RATE_LIMIT_BACKEND', 'memory'),
+    'REDIS_URL': os.getenv('AI_RATE_LIMIT_REDIS_URL', os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')),
+    'KEY_PREFIX': 'ai_rate:',
+    'MAX_WAIT': float(os.getenv('AI_RATE_LIMIT_MAX_WAIT', '60')),
+}
+
+# Orçamento de tokens dos prompts: POLICY 'reject', 'truncate', 'summarize' ou 'none'
+# CONTEXT_LIMITS sobrepõe as janelas de contexto por prefixo de modelo (ex: {'gpt-4o': 128000})
+# TOKENIZER_FILE: tokenizer.json local (ex: o do gpt2); sem ele, estima ~4 caracteres por token
+AI_PROMPT_BUDGET = {
+    'POLICY': os.getenv('AI_PROMPT_BUDGET_POLICY', 'reject'),
+    'TOKENIZER_FILE': os.getenv('AI_PROMPT_TOKENIZER_FILE') or None,
+    'DEFAULT_CONTEXT_LIMIT': int(os.getenv('AI_DEFAULT_CONTEXT_LIMIT', '128000')),
+    'CONTEXT_LIMITS': {},
+    'OUTPUT_RESERVE': int(os.getenv('AI_PROMPT_OUTPUT_RESERVE', '1024')),
+}
+
+# Cache de prefixo dos prompts nos provedores (instrução base + dados do instrutor)
+AI_PROMPT_PREFIX_CACHE = {
+    'ENABLED': os.getenv('AI_PROMPT_PREFIX_CACHE_ENABLED', 'True').lower() in ('true', '1'),
+    'MIN_PREFIX_TOKENS': int(os.getenv('AI_PROMPT_PREFIX_MIN_TOKENS', '1024')),
+    'CACHED_CONTENT_TTL': int(os.getenv('AI_PROMPT_CACHED_CONTENT_TTL', '900')),
+    # Intervalo (s) sem nova tentativa após falha ao criar o cache no provedor
+    'CREATE_FAILURE_TTL': int(os.getenv('AI_PROMPT_CACHE_CREATE_FAILURE_TTL', '300')),
+}
+
+# Requisições de cobertura (hedging) para chamadas acima do p95 do provedor.
+# Também precisa ser habilitado por configuração de IA do token (hedge_enabled).
+COMPARISON_HEDGING = {
+    'ENABLED': os.getenv('COMPARISON_HEDGING_ENABLED', 'False').lower() in ('true', '1'),
+    'PERCENTILE': float(os.getenv('COMPARISON_HEDGING_PERCENTILE', '95')),
+    'MIN_SAMPLES': int(os.getenv('COMPARISON_HEDGING_MIN_SAMPLES', '20')),
+    'MIN_DELAY': float(os.getenv('COMPARISON_HEDGING_MIN_DELAY', '0.5')),
+    'MAX_HEDGES_PER_MINUTE': int(os.getenv('COMPARISON_HEDGING_MAX_PER_MINUTE', '30')),
+    'MAX_HEDGE_RATIO': float(os.getenv('COMPARISON_HEDGING_MAX_RATIO', '0.1')),
+}
+
+# Prazo padrão (segundos) das comparações síncronas; o cabeçalho X-Request-Timeout
+# o substitui por requisição. 0 = sem prazo.
+COMPARISON_REQUEST_TIMEOUT = float(os.getenv('COMPARISON_REQUEST_TIMEOUT', '0'))
+
+# Registros (deltas e resultados) que a comparação em streaming acumula à espera
+# do cliente; com a fila cheia, a geração aguarda o cliente consumir.
+COMPARISON_STREAM_QUEUE_SIZE = int(os.getenv('COMPARISON_STREAM_QUEUE_SIZE', '256'))
+
+# Streaming das respostas das IAs. O endpoint de comparação em streaming sempre
+# o utiliza; ENABLED o aplica a todas as chamadas, para que o limite de tokens de
+# saída interrompa gerações descontroladas.
+AI_STREAMING = {
+    'ENABLED': os.getenv('AI_STREAMING_ENABLED', 'False').lower() in ('true', '1'),
+    'MAX_OUTPUT_TOKENS': int(os.getenv('AI_STREAMING_MAX_OUTPUT_TOKENS', '8192')),
+}
+
+# Cassete de chamadas às IAs: 'record' grava cada chamada em PATH (JSONL) e
+# 'replay' serve as respostas gravadas sem acessar os provedores. ON_MISS define
+# o tratamento de chamadas não gravadas no replay ('error' ou 'live').
+AI_CASSETTE = {
+    'MODE': os.getenv('AI_CASSETTE_MODE', 'off'),
+    'PATH': os.getenv('AI_CASSETTE_PATH', str(BASE_DIR / 'ai_cassette.jsonl')),
+    'PRESERVE_LATENCY': os.getenv('AI_CASSETTE_PRESERVE_LATENCY', 'False').lower() in ('true', '1'),
+    'ON_MISS': os.getenv('AI_CASSETTE_ON_MISS', 'error'),
+}
+
+# Executor de tarefas compartilhado por todas as filas do processo (TaskQueue).
+# MAX_PROVIDER_CALLS limita as chamadas simultâneas aos provedores de IA no
+# processo (0 = sem limite). As tarefas são escalonadas por classe (interativa >
+# lote pequeno > lote grande) e divididas de forma justa entre tokens, com os
+# pesos de TOKEN_WEIGHTS (id do UserToken -> peso, padrão 1.0).
+TASK_EXECUTOR = {
+    'MAX_WORKERS': int(os.getenv('TASK_EXECUTOR_MAX_WORKERS', '32')),
+    'MAX_PROVIDER_CALLS': int(os.getenv('TASK_EXECUTOR_MAX_PROVIDER_CALLS', '0')),
+    'TOKEN_WEIGHTS': {},
+}
+
+# Limite adaptativo (AIMD) de chamadas simultâneas por provedor e chave de API,
+# no lugar dos limites fixos das filas de comparação. O limite cresce
+# INCREASE_STEP por rodada de chamadas saudáveis e é multiplicado por
+# DECREASE_FACTOR em respostas 429, timeouts ou latência acima de
+# LATENCY_SPIKE_RATIO vezes a linha de base, entre MIN_LIMIT e MAX_LIMIT.
+COMPARISON_ADAPTIVE_CONCURRENCY = {
+    'ENABLED': os.getenv('COMPARISON_ADAPTIVE_CONCURRENCY_ENABLED', 'True').lower() in ('true', '1'),
+    'INITIAL_LIMIT': int(os.getenv('COMPARISON_CONCURRENCY_INITIAL', '3')),
+    'MIN_LIMIT': int(os.getenv('COMPARISON_CONCURRENCY_MIN', '1')),
+    'MAX_LIMIT': int(os.getenv('COMPARISON_CONCURRENCY_MAX', '16')),
+    'INCREASE_STEP': float(os.getenv('COMPARISON_CONCURRENCY_INCREASE_STEP', '1')),
+    'DECREASE_FACTOR': float(os.getenv('COMPARISON_CONCURRENCY_DECREASE_FACTOR', '0.5')),
+    'LATENCY_SPIKE_RATIO': float(os.getenv('COMPARISON_CONCURRENCY_LATENCY_SPIKE_RATIO', '2.0')),
+    'DECREASE_COOLDOWN': float(os.getenv('COMPARISON_CONCURRENCY_DECREASE_COOLDOWN', '2.0')),
+}
+
+# Métricas Prometheus em /metrics (django-prometheus), incluindo os histogramas
+# das filas de tarefas (core.utils.metrics). Com vários processos (gunicorn,
+# workers do Celery), exporte PROMETHEUS_MULTIPROC_DIR apontando para um
+# diretório compartilhado e vazio a cada deploy: o /metrics agrega todos eles.
+PROMETHEUS_EXPORT_MIGRATIONS = False
+# Endereços ou redes (CIDR) que podem ler /metrics sem login de staff (ex: o servidor Prometheus).
+# Vazio por padrão (somente staff). Atrás de um proxy reverso local (nginx, gunicorn em loopback),
+# todas as requisições externas chegam de 127.0.0.1: nesse caso, nunca inclua o loopback aqui.
+PROMETHEUS_METRICS_ALLOWED_IPS = [
+    ip.strip() for ip in os.getenv('PROMETHEUS_METRICS_ALLOWED_IPS', '').split(',') if ip.strip()
+]
+
 <<<<<<< HEAD
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+# Necessário para os chords do modo sharded. Somente os shards (cabeçalho do chord,
+# ignore_result=False) gravam resultado; as demais tasks reportam o estado pela
+# Operation no banco e não ocupam o backend.
+CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", CELERY_BROKER_URL)
+CELERY_TASK_IGNORE_RESULT = True
+# Resultados dos shards são consumidos pelo callback do chord logo após a conclusão
+CELERY_RESULT_EXPIRES = int(os.getenv("CELERY_RESULT_EXPIRES", str(60 * 60 * 6)))
 
 # Log final da inicialização
 logger.info("Configurações do projeto carregadas com sucesso")
@@ -17,6 +17,7 @@ from django.conf.urls.static import static
 from django.urls.resolvers import URLPattern, URLResolver
 from typing import List, Union
 from accounts.views import CustomConfirmEmailView
+from api.views.monitoring import metrics_export
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +25,7 @@ urlpatterns: List[Union[URLPattern, URLResolver]] = [
 =======
 
 from accounts.views import CustomConfirmEmailView
+from api.views.monitoring import metrics_export
 
 urlpatterns = [
 >>>>>>> 8a343d3 (Adiciona namespace às URLs da API e corrige redirecionamento na view de índice; remove arquivos JSON temporários e atualiza templates para usar URLs nomeadas com namespace.)
@@ -47,6 +49,10 @@ urlpatterns = [
     # APIs e Configurações
     path('api/', include('api.urls', namespace='api')),
     path('ai-config/', include('ai_config.urls', namespace='ai_config')),
+    
+    # Métricas Prometheus (/metrics), restritas a staff e PROMETHEUS_METRICS_ALLOWED_IPS;
+    # agrega os processos em PROMETHEUS_MULTIPROC_DIR
+    path('metrics', metrics_export, name='prometheus-django-metrics'),
 <<<<<<< HEAD
     
     # Versão do Cliente